@@ -91,6 +91,10 @@ def create_app(config_class=Config):
     # Caleb's routes
     from app.resources.project_resource import project_bp
     from app.resources.activity_resource import activity_bp
+    from app.resources.leaderboard_resource import leaderboard_bp
+    from app.resources.search_resource import search_bp
+    from app.resources.notification_resource import notification_bp
+    from app.resources.job_resource import jobs_bp
     
     # Monica's route — Freelancer Vetting System 
     from app.resources.freelancer_resource import freelancer_bp
@@ -107,9 +111,42 @@ def create_app(config_class=Config):
     app.register_blueprint(dashboard_bp, url_prefix="/api/dashboard")
     app.register_blueprint(review_bp, url_prefix="/api/reviews")
     app.register_blueprint(activity_bp, url_prefix="/api/activity")
+    app.register_blueprint(leaderboard_bp, url_prefix="/api/leaderboard")
+    app.register_blueprint(search_bp, url_prefix="/api/search")
+    app.register_blueprint(notification_bp, url_prefix="/api/notifications")
+    app.register_blueprint(jobs_bp, url_prefix="/api/jobs")
     app.register_blueprint(skills_bp, url_prefix="/api")
     app.register_blueprint(test_bp, url_prefix="/api")
 
+    # Buffered activity logging (flushed by a background thread and at exit)
+    from app.services.audit_buffer import audit_buffer
+
+    audit_buffer.init_app(app)
+
+    # Automatic audit trail for opted-in models (AUDIT_CAPTURE_MODELS)
+    from app.services.audit_capture import init_audit_capture
+
+    init_audit_capture(app)
+
+    # Realtime push of notifications and dashboard invalidations (SSE)
+    from app.services.realtime_service import init_realtime
+
+    init_realtime(app)
+
+    # Domain events: subscribers (email, in-app notifications, audit) run after commit
+    from app.services import event_handlers  # noqa: F401  (registers the subscribers)
+    from app.services.event_bus import event_bus
+
+    event_bus.init_app(app)
+
+    # Background jobs (flask jobs worker) and their built-in tasks
+    from app.services import job_tasks  # noqa: F401  (registers the tasks)
+
+    # CLI commands (flask activity / outbox / jobs ...)
+    from app.cli import register_cli
+
+    register_cli(app)
+
     # FIXED: CORS Configuration AFTER Blueprint Registration
     # Load from .env → FRONTEND_URLS=http://localhost:5173,https://reel-brief-frontend.vercel.app
     frontend_urls_str = os.getenv("FRONTEND_URLS", "http://localhost:5173")
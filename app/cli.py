@@ -0,0 +1,195 @@
+"""
+CLI Commands
+Owner: Caleb
+Description: Maintenance commands registered on the Flask CLI (run them from cron).
+    flask activity maintain [--retention-months 12] [--months-ahead 3]
+    flask outbox dispatch [--limit 100] [--loop] [--interval 5]
+    flask outbox status
+    flask outbox purge [--days 14]
+    flask jobs worker [--concurrency 4] [--pool thread|process] [--queues a,b] [--once]
+    flask jobs enqueue <task> [--payload '{"limit": 50}'] [--queue default] [--priority 0]
+    flask jobs schedules
+    flask jobs status
+    flask invoices generate [--completed-before 2026-10-31] [--due-days 14] [--dry-run] [--render]
+    flask invoices render-pdfs [--force] [--batch-size 100]
+"""
+
+import json
+import time
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models.job import Job, JobSchedule
+from app.models.outbox import OutboxMessage
+from app.services.activity_service import drop_expired_partitions, ensure_partitions
+from app.services.event_bus import event_bus
+from app.services.invoice_pdf_service import prerender_invoices
+from app.services.invoice_service import generate_invoices
+from app.services.job_service import TASKS, Worker, enqueue, sync_schedules
+
+activity_cli = AppGroup("activity", help="Activity log maintenance")
+outbox_cli = AppGroup("outbox", help="Transactional outbox delivery")
+jobs_cli = AppGroup("jobs", help="Background jobs")
+invoices_cli = AppGroup("invoices", help="Billing")
+
+
+@activity_cli.command("maintain")
+@click.option(
+    "--retention-months", type=int, default=None, help="Override the configured retention"
+)
+@click.option("--months-ahead", type=int, default=None, help="Partitions to create ahead of now")
+def maintain_activity_log(retention_months, months_ahead):
+    """Create upcoming monthly partitions and drop those past retention"""
+    created = ensure_partitions(months_ahead=months_ahead)
+    retention = drop_expired_partitions(retention_months=retention_months)
+    db.session.commit()
+
+    click.echo(f"Created partitions: {', '.join(created) or 'none'}")
+    click.echo(f"Dropped partitions: {', '.join(retention['dropped_partitions']) or 'none'}")
+    click.echo(f"Deleted rows: {retention['deleted_rows']}")
+
+
+@outbox_cli.command("dispatch")
+@click.option("--limit", type=int, default=100, help="Messages per pass")
+@click.option("--loop", is_flag=True, help="Keep dispatching until interrupted")
+@click.option("--interval", type=float, default=5.0, help="Seconds between passes with --loop")
+def dispatch_outbox(limit, loop, interval):
+    """Deliver due outbox messages (retries and dispatches lost to a restart)"""
+    while True:
+        summary = event_bus.dispatch_pending(limit=limit)
+        if summary or not loop:
+            click.echo(", ".join(f"{status}: {n}" for status, n in summary.items()) or "Idle")
+        if not loop:
+            return
+        if sum(summary.values()) < limit:
+            time.sleep(interval)
+
+
+@outbox_cli.command("status")
+def outbox_status():
+    """Count outbox messages by status"""
+    rows = db.session.query(OutboxMessage.status, func.count()).group_by(OutboxMessage.status)
+    for status, count in rows:
+        click.echo(f"{status}: {count}")
+
+
+@outbox_cli.command("purge")
+@click.option("--days", type=int, default=None, help="Override OUTBOX_RETENTION_DAYS")
+def purge_outbox(days):
+    """Delete delivered messages older than the retention window"""
+    click.echo(f"Deleted messages: {event_bus.purge_delivered(days=days)}")
+
+
+@jobs_cli.command("worker")
+@click.option("--concurrency", type=int, default=None, help="Override JOBS_CONCURRENCY")
+@click.option(
+    "--pool", type=click.Choice(["thread", "process"]), default=None, help="Override JOBS_POOL"
+)
+@click.option("--queues", default=None, help="Comma-separated queues (override JOBS_QUEUES)")
+@click.option("--once", is_flag=True, help="Run the jobs due now, then exit")
+def run_worker(concurrency, pool, queues, once):
+    """Run queued jobs and cron schedules until interrupted"""
+    worker = Worker(
+        current_app._get_current_object(),
+        concurrency=concurrency,
+        pool=pool,
+        queues=queues.split(",") if queues else None,
+    )
+    click.echo(
+        f"Worker {worker.worker_id}: {worker.concurrency} {worker.pool}(s) "
+        f"on {', '.join(worker.queues)}"
+    )
+    summary = worker.run(once=once)
+    click.echo(", ".join(f"{status}: {n}" for status, n in summary.items()) or "No jobs run")
+
+
+@jobs_cli.command("enqueue")
+@click.argument("task_name")
+@click.option("--payload", default=None, help="JSON object of task arguments")
+@click.option("--queue", default=None, help="Defaults to the task's queue")
+@click.option("--priority", type=int, default=0, help="Higher runs first")
+def enqueue_job(task_name, payload, queue, priority):
+    """Queue a registered task"""
+    try:
+        job = enqueue(
+            task_name, json.loads(payload) if payload else None, queue=queue, priority=priority
+        )
+    except (ValueError, json.JSONDecodeError) as e:
+        raise click.ClickException(str(e))
+    db.session.commit()
+    click.echo(f"Queued job {job.id} ({job.task} on {job.queue})")
+
+
+@jobs_cli.command("schedules")
+def list_schedules():
+    """Sync JOB_SCHEDULES and list them with their next run"""
+    sync_schedules()
+    for schedule in JobSchedule.query.order_by(JobSchedule.name):
+        state = schedule.next_run_at.isoformat() if schedule.enabled else "disabled"
+        click.echo(f"{schedule.name}: {schedule.task} '{schedule.cron}' next {state}")
+
+
+@jobs_cli.command("status")
+def jobs_status():
+    """Count jobs by status and list the registered tasks"""
+    rows = db.session.query(Job.status, func.count()).group_by(Job.status)
+    for status, count in rows:
+        click.echo(f"{status}: {count}")
+    click.echo(f"Tasks: {', '.join(sorted(TASKS))}")
+
+
+@invoices_cli.command("generate")
+@click.option(
+    "--completed-before",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+    help="Only projects completed before this date",
+)
+@click.option("--due-days", type=int, default=None, help="Override INVOICE_PAYMENT_TERMS_DAYS")
+@click.option("--dry-run", is_flag=True, help="Report eligible projects without invoicing")
+@click.option("--render", is_flag=True, help="Also render the new invoices' PDFs")
+@click.option("--verbose", is_flag=True, help="Print every project's outcome")
+def generate_project_invoices(completed_before, due_days, dry_run, render, verbose):
+    """Invoice every completed project that has no invoice yet"""
+    started = time.monotonic()
+    report = generate_invoices(
+        completed_before=completed_before, due_days=due_days, dry_run=dry_run
+    )
+    if verbose:
+        for result in report["results"]:
+            detail = result.get("invoice_number") or result.get("reason") or ""
+            click.echo(f"project {result['project_id']}: {result['status']} {detail}".rstrip())
+    summary = ", ".join(f"{status}: {n}" for status, n in report["summary"].items())
+    click.echo(f"{summary or 'Nothing to invoice'} ({time.monotonic() - started:.2f}s)")
+
+    created_ids = [r["invoice_id"] for r in report["results"] if r["status"] == "created"]
+    if render and created_ids:
+        _echo_render_summary(prerender_invoices(invoice_ids=created_ids))
+
+
+@invoices_cli.command("render-pdfs")
+@click.option("--force", is_flag=True, help="Render even when the stored PDF is current")
+@click.option("--batch-size", type=int, default=100, help="Invoices per batch")
+def render_invoice_pdfs(force, batch_size):
+    """Render missing or outdated invoice PDFs"""
+    _echo_render_summary(prerender_invoices(force=force, batch_size=batch_size))
+
+
+def _echo_render_summary(summary):
+    click.echo(
+        f"PDFs rendered: {summary['rendered']}, cached: {summary['cached']}, "
+        f"failed: {summary['failed']}"
+    )
+    if summary["failed_ids"]:
+        click.echo(f"Failed invoice ids: {', '.join(map(str, summary['failed_ids']))}")
+
+
+def register_cli(app):
+    app.cli.add_command(activity_cli)
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(invoices_cli)
@@ -31,10 +31,84 @@ class Config:
     CLOUDINARY_API_KEY = os.getenv("CLOUDINARY_API_KEY")
     CLOUDINARY_API_SECRET = os.getenv("CLOUDINARY_API_SECRET")
 
+    # File Storage
+    # STORAGE_BACKEND: "cloudinary" or "local" (deliverables); CVs default to local disk
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "cloudinary")
+    CV_STORAGE_BACKEND = os.getenv("CV_STORAGE_BACKEND", "local")
+    LOCAL_STORAGE_ROOT = os.getenv("LOCAL_STORAGE_ROOT", os.path.join(os.getcwd(), "uploads"))
+    LOCAL_STORAGE_URL_PREFIX = os.getenv("LOCAL_STORAGE_URL_PREFIX", "/api/auth/uploads")
+    # Set to an nginx internal location (e.g. /protected-uploads) to serve via X-Accel-Redirect
+    LOCAL_STORAGE_ACCEL_REDIRECT = os.getenv("LOCAL_STORAGE_ACCEL_REDIRECT")
+    USE_X_SENDFILE = os.getenv("USE_X_SENDFILE", "false").lower() == "true"
+
     # CORS / Frontend
     FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
     FRONTEND_URLS = os.getenv("FRONTEND_URLS", "http://localhost:5173")
 
+    # Leaderboard: Bayesian prior (mean rating and weight in "phantom" reviews)
+    LEADERBOARD_PRIOR_MEAN = float(os.getenv("LEADERBOARD_PRIOR_MEAN", "3.5"))
+    LEADERBOARD_PRIOR_WEIGHT = float(os.getenv("LEADERBOARD_PRIOR_WEIGHT", "5"))
+
+    # Activity log: monthly partitions created ahead of time, whole months dropped after retention
+    ACTIVITY_LOG_RETENTION_MONTHS = int(os.getenv("ACTIVITY_LOG_RETENTION_MONTHS", "12"))
+    ACTIVITY_LOG_PARTITIONS_AHEAD = int(os.getenv("ACTIVITY_LOG_PARTITIONS_AHEAD", "3"))
+
+    # Activity log buffering: events are written in batches by a background thread
+    AUDIT_BUFFER_BATCH_SIZE = int(os.getenv("AUDIT_BUFFER_BATCH_SIZE", "500"))
+    AUDIT_BUFFER_FLUSH_INTERVAL = float(os.getenv("AUDIT_BUFFER_FLUSH_INTERVAL", "1.0"))
+    AUDIT_BUFFER_MAX_PENDING = int(os.getenv("AUDIT_BUFFER_MAX_PENDING", "10000"))
+
+    # Automatic audit capture: model class name -> tracked attributes (None tracks every column);
+    # unset uses app.services.audit_capture.DEFAULT_CAPTURE_MODELS
+    AUDIT_CAPTURE_ENABLED = os.getenv("AUDIT_CAPTURE_ENABLED", "true").lower() == "true"
+
+    # Realtime (Server-Sent Events): "auto" uses LISTEN/NOTIFY on PostgreSQL, else in-process
+    REALTIME_BROKER = os.getenv("REALTIME_BROKER", "auto")
+    REALTIME_HEARTBEAT_SECONDS = int(os.getenv("REALTIME_HEARTBEAT_SECONDS", "15"))
+    REALTIME_STREAM_MAX_SECONDS = int(os.getenv("REALTIME_STREAM_MAX_SECONDS", "300"))
+
+    # Domain event subscribers run in this many background threads after commit
+    EVENT_BUS_WORKERS = int(os.getenv("EVENT_BUS_WORKERS", "4"))
+    # Transactional outbox: failed deliveries retry with backoff, then are marked failed
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+    OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+    OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "14"))
+
+    # Background jobs (flask jobs worker): JOBS_POOL is "thread" or "process"
+    JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "4"))
+    JOBS_POOL = os.getenv("JOBS_POOL", "thread")
+    JOBS_QUEUES = os.getenv("JOBS_QUEUES", "default,maintenance").split(",")
+    JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "1.0"))
+    JOBS_LEASE_SECONDS = int(os.getenv("JOBS_LEASE_SECONDS", "900"))
+    # Cron schedules (UTC), synced to job_schedules when a worker starts
+    JOB_SCHEDULES = {
+        "outbox-dispatch": {"task": "outbox.dispatch", "cron": "* * * * *"},
+        "outbox-purge": {"task": "outbox.purge", "cron": "30 3 * * *"},
+        "activity-maintain": {"task": "activity.maintain", "cron": "0 3 * * *"},
+        "invoices-overdue": {"task": "invoices.mark_overdue", "cron": "5 * * * *"},
+        "idempotency-purge": {"task": "idempotency.purge", "cron": "45 3 * * *"},
+    }
+    # Overdue invoice sweep: invoices updated (and reminded) per transaction
+    OVERDUE_SWEEP_BATCH_SIZE = int(os.getenv("OVERDUE_SWEEP_BATCH_SIZE", "1000"))
+
+    # Invoice and escrow numbers (PREFIX-YEAR-000001); a block size above 1 caches numbers
+    # per process (fewer round trips under burst billing, gaps after a restart)
+    INVOICE_NUMBER_PREFIX = os.getenv("INVOICE_NUMBER_PREFIX", "INV")
+    ESCROW_NUMBER_PREFIX = os.getenv("ESCROW_NUMBER_PREFIX", "ESC")
+    INVOICE_NUMBER_BLOCK_SIZE = int(os.getenv("INVOICE_NUMBER_BLOCK_SIZE", "1"))
+
+    # Batch billing: projects invoiced per transaction and default payment terms
+    INVOICE_BATCH_SIZE = int(os.getenv("INVOICE_BATCH_SIZE", "500"))
+    INVOICE_PAYMENT_TERMS_DAYS = int(os.getenv("INVOICE_PAYMENT_TERMS_DAYS", "14"))
+
+    # Invoice PDFs: render processes (0, or gevent workers: in the request) and where files
+    # go (default: STORAGE_BACKEND)
+    INVOICE_PDF_WORKERS = int(os.getenv("INVOICE_PDF_WORKERS", "2"))
+    INVOICE_PDF_STORAGE_BACKEND = os.getenv("INVOICE_PDF_STORAGE_BACKEND")
+
+    # Idempotency-Key responses (escrow and invoice payments) are replayed for this long
+    IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+
     # Pagination
     DEFAULT_PAGE_SIZE = 20
     MAX_PAGE_SIZE = 100
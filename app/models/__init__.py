@@ -7,7 +7,7 @@ Description: Central model registry for the ReelBrief backend.
 from pathlib import Path
 
 from app.extensions import db
-from app.models.activity_log import ActivityLog
+from app.models.activity_log import ActivityAction, ActivityLog
 
 # --- Core Models ---
 from app.models.user import User
@@ -23,15 +23,23 @@ from app.models.freelancer_profile import FreelancerProfile
 # from app.models.freelancer_profile import FreelancerProfile
 from app.models.skill import Skill, FreelancerSkill
 from app.models.project import Project, ProjectSkill
+from app.models.project_version_head import ProjectVersionHead
 # from app.models.deliverable import Deliverable
 # from app.models.feedback import Feedback
 # from app.models.escrow_transaction import EscrowTransaction
 # from app.models.portfolio_item import PortfolioItem
+from app.models.idempotency_key import IdempotencyKey
 from app.models.invoice import Invoice
-from app.models.notification import Notification
+from app.models.invoice_number_sequence import InvoiceNumberSequence
+from app.models.job import Job, JobSchedule
+from app.models.notification import Notification, NotificationCounter
+from app.models.outbox import OutboxDelivery, OutboxMessage
 from app.models.portfolio_item import PortfolioItem
 from app.models.project import Project
 from app.models.review import Review
+from app.models.freelancer_rating import FreelancerRatingAggregate
+from app.models.leaderboard import FreelancerLeaderboardEntry
+from app.models.search_document import SearchDocument
 
 # --- Explicit imports (required for Flask-Migrate) ---
 from app.models.user import User
@@ -44,12 +52,24 @@ __all__ = [
     'FreelancerSkill',
     "Project",
     'ProjectSkill',
+    "ProjectVersionHead",
     "Deliverable",
     "Feedback",
     "EscrowTransaction",
     "PortfolioItem",
     "Notification",
+    "NotificationCounter",
+    "OutboxMessage",
+    "OutboxDelivery",
+    "Job",
+    "JobSchedule",
     "Review",
+    "FreelancerRatingAggregate",
+    "FreelancerLeaderboardEntry",
+    "SearchDocument",
     "ActivityLog",
+    "ActivityAction",
     "Invoice",
+    "InvoiceNumberSequence",
+    "IdempotencyKey",
 ]
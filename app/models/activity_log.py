@@ -55,23 +55,81 @@ Description: Tracks all important actions in the system for auditing.
 #         }
 
 
-from app import db
 from datetime import datetime
 
+from sqlalchemy import DDL, event, insert, inspect, select
+
+from app import db
+from app.utils.upsert import dialect_insert
+
+
+class ActivityAction(db.Model):
+    """Normalized action codes; exact action filters go through this small table's btree"""
+    __tablename__ = 'activity_actions'
+
+    id = db.Column(db.Integer, primary_key=True)
+    code = db.Column(db.String(100), unique=True, nullable=False)
+
+    def __repr__(self):
+        return f"<ActivityAction {self.code}>"
+
+    @staticmethod
+    def resolve_id(connection, code):
+        """Id for an action code, inserting the code the first time it is seen"""
+        table = ActivityAction.__table__
+        lookup = select(table.c.id).where(table.c.code == code)
+        action_id = connection.execute(lookup).scalar()
+        if action_id is not None:
+            return action_id
+
+        stmt = dialect_insert(connection, table)
+        if stmt is not None:
+            connection.execute(stmt.values(code=code).on_conflict_do_nothing())
+        else:
+            connection.execute(insert(table).values(code=code))
+        return connection.execute(lookup).scalar()
+
+
 class ActivityLog(db.Model):
+    """
+    On PostgreSQL the table is range-partitioned by month on created_at (see
+    migration d81f3b6a2c47 and app.services.activity_service), so its physical
+    primary key is (id, created_at); id alone stays unique and is the ORM identity.
+    """
     __tablename__ = 'activity_logs'
-    
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     action = db.Column(db.String(100), nullable=False)
+    action_id = db.Column(db.Integer, db.ForeignKey('activity_actions.id'), nullable=True)
     resource_type = db.Column(db.String(50), nullable=False)
     resource_id = db.Column(db.Integer, nullable=True)
     details = db.Column(db.JSON, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Newest-first listing, optionally narrowed to one user or one exact action code
+        db.Index('idx_activity_logs_created', created_at.desc()),
+        db.Index('idx_activity_logs_user_created', 'user_id', created_at.desc()),
+        db.Index('idx_activity_logs_action_created', 'action_id', created_at.desc()),
+        # Substring (ILIKE '%term%') filters; plain btrees on other databases
+        db.Index(
+            'idx_activity_logs_action_trgm',
+            'action',
+            postgresql_using='gin',
+            postgresql_ops={'action': 'gin_trgm_ops'},
+        ),
+        db.Index(
+            'idx_activity_logs_resource_type_trgm',
+            'resource_type',
+            postgresql_using='gin',
+            postgresql_ops={'resource_type': 'gin_trgm_ops'},
+        ),
+    )
+
     # Add relationship to User
     user = db.relationship('User', backref='activity_logs', lazy='joined')
-    
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -82,4 +140,23 @@ class ActivityLog(db.Model):
             "user_id": self.user_id,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "details": self.details or {},
-        }
\ No newline at end of file
+        }
+
+
+event.listen(
+    ActivityLog.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+@event.listens_for(ActivityLog, "before_insert")
+def _link_action_code(mapper, connection, target):
+    if target.action and target.action_id is None:
+        target.action_id = ActivityAction.resolve_id(connection, target.action)
+
+
+@event.listens_for(ActivityLog, "before_update")
+def _relink_action_code(mapper, connection, target):
+    if inspect(target).attrs.action.history.has_changes():
+        target.action_id = ActivityAction.resolve_id(connection, target.action)
@@ -5,7 +5,11 @@ Description: Tracks file uploads with version control and Cloudinary integration
 """
 
 from app.extensions import db
+from app.models.project import Project
+from app.models.project_version_head import ProjectVersionHead
 from datetime import datetime
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import aliased
 
 
 class Deliverable(db.Model):
@@ -27,14 +31,18 @@ class Deliverable(db.Model):
     file_url = db.Column(db.Text, nullable=False)
     file_type = db.Column(db.String(50))  # image, video, document
     file_size = db.Column(db.Integer)  # bytes
+    # Storage key: Cloudinary public_id or local path
     cloudinary_public_id = db.Column(db.String(255))
+    storage_backend = db.Column(db.String(20), default="cloudinary", nullable=False)
     thumbnail_url = db.Column(db.Text)
+    preview_urls = db.Column(db.JSON)  # eager derivatives: thumbnails, posters, low-res previews
 
     # -------------------- Metadata --------------------
     title = db.Column(db.String(255))
     description = db.Column(db.Text)
     change_notes = db.Column(db.Text)  # what changed from previous version
     status = db.Column(db.String(20), default="pending", nullable=False)
+    unresolved_feedback_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
 
     # -------------------- Timestamps --------------------
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -46,7 +54,7 @@ class Deliverable(db.Model):
     # - deliverable has many feedback_items
     # - deliverable belongs to uploader (User)
     # - deliverable belongs to reviewer (User)
-    project = db.relationship("Project", back_populates="deliverables")
+    project = db.relationship("Project", back_populates="deliverables", foreign_keys=[project_id])
     uploader = db.relationship("User", foreign_keys=[uploaded_by], backref="uploaded_deliverables")
     reviewer = db.relationship("User", foreign_keys=[reviewed_by], backref="reviewed_deliverables")
     feedback_items = db.relationship(
@@ -63,8 +71,13 @@ class Deliverable(db.Model):
     def __repr__(self):
         return f"<Deliverable {self.id} v{self.version_number} - {self.title}>"
 
-    def to_dict(self, include_feedback=False):
-        """Convert deliverable to dictionary representation"""
+    def to_dict(self, include_feedback=False, feedback=None):
+        """
+        Convert deliverable to dictionary representation.
+
+        Pass pre-loaded feedback threads (see feedback_service.load_feedback_threads)
+        to avoid a query per deliverable when serializing many at once.
+        """
         data = {
             "id": self.id,
             "project_id": self.project_id,
@@ -73,11 +86,14 @@ class Deliverable(db.Model):
             "file_type": self.file_type,
             "file_size": self.file_size,
             "cloudinary_public_id": self.cloudinary_public_id,
+            "storage_backend": self.storage_backend,
             "thumbnail_url": self.thumbnail_url,
+            "previews": self.preview_urls or {},
             "title": self.title,
             "description": self.description,
             "change_notes": self.change_notes,
             "status": self.status,
+            "unresolved_feedback_count": self.unresolved_feedback_count,
             "uploaded_by": self.uploaded_by,
             "uploaded_at": self.uploaded_at.isoformat() if self.uploaded_at else None,
             "reviewed_at": self.reviewed_at.isoformat() if self.reviewed_at else None,
@@ -103,37 +119,68 @@ class Deliverable(db.Model):
             ),
         }
 
-        if include_feedback:
-            data["feedback"] = [f.to_dict() for f in self.feedback_items]
+        if feedback is not None:
+            data["feedback"] = feedback
+        elif include_feedback:
+            from app.services.feedback_service import load_feedback_thread
+
+            data["feedback"] = load_feedback_thread(self.id)
 
         return data
 
     @staticmethod
     def get_next_version_number(project_id):
-        """Get the next version number for a project"""
-        latest = (
-            Deliverable.query.filter_by(project_id=project_id)
+        """Get the next version number for a project (atomic, race-free)"""
+        return ProjectVersionHead.allocate(project_id)
+
+    def promote_to_latest(self):
+        """Point project.latest_version_id at this deliverable unless a newer version is there"""
+        current = aliased(Deliverable)
+        current_version = (
+            select(current.version_number)
+            .where(current.id == Project.latest_version_id)
+            .scalar_subquery()
+        )
+        db.session.execute(
+            update(Project)
+            .where(
+                Project.id == self.project_id,
+                or_(Project.latest_version_id.is_(None), current_version < self.version_number),
+            )
+            .values(latest_version_id=self.id)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def refresh_latest_version(project_id):
+        """Recompute project.latest_version_id (used after a deliverable is deleted)"""
+        newest = (
+            select(Deliverable.id)
+            .where(Deliverable.project_id == project_id)
             .order_by(Deliverable.version_number.desc())
-            .first()
+            .limit(1)
+            .scalar_subquery()
+        )
+        db.session.execute(
+            update(Project)
+            .where(Project.id == project_id)
+            .values(latest_version_id=newest)
+            .execution_options(synchronize_session=False)
         )
-        return (latest.version_number + 1) if latest else 1
 
     def approve(self, reviewed_by_id):
-        """Approve this deliverable"""
+        """Approve this deliverable (the caller commits, together with its side effects)"""
         self.status = "approved"
         self.reviewed_by = reviewed_by_id
         self.reviewed_at = datetime.utcnow()
-        db.session.commit()
 
     def request_revision(self):
         """Mark deliverable as needing revision"""
         self.status = "revision_requested"
         self.reviewed_at = datetime.utcnow()
-        db.session.commit()
 
     def reject(self, reviewed_by_id):
         """Reject this deliverable"""
         self.status = "rejected"
         self.reviewed_by = reviewed_by_id
         self.reviewed_at = datetime.utcnow()
-        db.session.commit()
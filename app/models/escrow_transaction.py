@@ -32,13 +32,17 @@ class EscrowTransaction(db.Model):
     released_at = db.Column(db.DateTime, nullable=True)
     refunded_at = db.Column(db.DateTime, nullable=True)
     notes = db.Column(db.Text, nullable=True)
-    
+    # Optimistic lock: every UPDATE checks and bumps it (see escrow_service)
+    version = db.Column(db.Integer, nullable=False, server_default="1")
+
     
     project = db.relationship('Project', back_populates='escrow_transactions')
     client = db.relationship("User", foreign_keys=[client_id])
     freelancer = db.relationship("User", foreign_keys=[freelancer_id])
     admin = db.relationship("User", foreign_keys=[admin_id])
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self):
         return f"<EscrowTransaction {self.id} Project:{self.project_id} ${self.amount} Status:{self.status}>"
 
@@ -70,4 +74,5 @@ class EscrowTransaction(db.Model):
                 self.released_at.isoformat() if self.released_at else self.held_at.isoformat()
             ),
             "notes": self.notes,
+            "version": self.version,
         }
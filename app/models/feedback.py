@@ -5,8 +5,12 @@ Description: Client feedback with priority levels and threaded comments
 """
 
 from datetime import datetime
+
+from sqlalchemy import event, inspect, select, update
+
 from app.extensions import db
 from app.models.deliverable import Deliverable  # Direct import — breaks circular dependency
+from app.models.project import Project
 from app.models.user import User  # Import only what’s needed
 
 
@@ -31,7 +35,10 @@ class Feedback(db.Model):
     priority = db.Column(db.String(20))  # low, medium, high
 
     # Status
-    is_resolved = db.Column(db.Boolean, default=False, nullable=False)
+    # active_history: resolving or reopening moves the open-feedback counters
+    is_resolved = db.column_property(
+        db.Column(db.Boolean, default=False, nullable=False), active_history=True
+    )
 
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -86,6 +93,8 @@ class Feedback(db.Model):
 
         return data
 
+    # Deliverable/Project unresolved_feedback_count follow every insert, resolve,
+    # unresolve and delete through the mapper events at the bottom of this module.
     def resolve(self):
         self.is_resolved = True
         self.resolved_at = datetime.utcnow()
@@ -107,6 +116,71 @@ class Feedback(db.Model):
 
     @staticmethod
     def get_unresolved_count(deliverable_id):
-        return Feedback.query.filter_by(
-            deliverable_id=deliverable_id, is_resolved=False
-        ).count()
+        return (
+            db.session.query(Deliverable.unresolved_feedback_count)
+            .filter(Deliverable.id == deliverable_id)
+            .scalar()
+            or 0
+        )
+
+    @staticmethod
+    def adjust_unresolved_counters(deltas, connection=None):
+        """
+        Shift the denormalized open-feedback counters with atomic increments.
+
+        Args:
+            deltas: dict of deliverable_id -> change in unresolved feedback
+            connection: Connection to run on (defaults to the session's)
+        """
+        connection = connection or db.session.connection()
+        deliverables = Deliverable.__table__
+        projects = Project.__table__
+
+        for deliverable_id, delta in deltas.items():
+            if not delta:
+                continue
+            connection.execute(
+                update(deliverables)
+                .where(deliverables.c.id == deliverable_id)
+                .values(
+                    unresolved_feedback_count=deliverables.c.unresolved_feedback_count + delta
+                )
+            )
+            connection.execute(
+                update(projects)
+                .where(
+                    projects.c.id
+                    == select(deliverables.c.project_id)
+                    .where(deliverables.c.id == deliverable_id)
+                    .scalar_subquery()
+                )
+                .values(unresolved_feedback_count=projects.c.unresolved_feedback_count + delta)
+            )
+
+
+@event.listens_for(Feedback, "after_insert")
+def _count_new_feedback(mapper, connection, target):
+    if not target.is_resolved:
+        Feedback.adjust_unresolved_counters({target.deliverable_id: 1}, connection)
+
+
+# Counter events compare the counted column's prior value with its new one. SQLAlchemy
+# only records the prior value of an attribute that was loaded before assignment, so
+# those columns are declared with active_history=True (here, and on Notification.is_read
+# and Review.freelancer_id); otherwise setting an unloaded column to the value it
+# already has would read as a change and shift the counter.
+@event.listens_for(Feedback, "after_update")
+def _count_resolution_change(mapper, connection, target):
+    history = inspect(target).attrs.is_resolved.history
+    if not history.has_changes():
+        return
+    was_resolved = bool(history.deleted and history.deleted[0])
+    if was_resolved != bool(target.is_resolved):
+        delta = -1 if target.is_resolved else 1
+        Feedback.adjust_unresolved_counters({target.deliverable_id: delta}, connection)
+
+
+@event.listens_for(Feedback, "after_delete")
+def _count_removed_feedback(mapper, connection, target):
+    if not target.is_resolved:
+        Feedback.adjust_unresolved_counters({target.deliverable_id: -1}, connection)
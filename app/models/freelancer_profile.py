@@ -6,8 +6,12 @@ Description: Extended profile for freelancers with CV, skills, and availability
 
 from datetime import datetime
 
+from sqlalchemy import event, inspect
+
 from app.extensions import db
 
+from .leaderboard import FreelancerLeaderboardEntry
+
 # TODO: Monica - Implement FreelancerProfile model
 #
 # Required fields:
@@ -60,7 +64,11 @@ class FreelancerProfile(db.Model):
 
     # Primary identifiers
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), unique=True, nullable=False)
+    # active_history: moving a profile also refreshes the previous user's leaderboard row
+    user_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey("users.id"), unique=True, nullable=False),
+        active_history=True,
+    )
 
     #  Basic info
     name = db.Column(db.String(150), nullable=False)
@@ -135,3 +143,21 @@ class FreelancerProfile(db.Model):
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "skills": [skill.name for skill in self.skills],
         }
+
+
+# Keep the leaderboard's availability columns in step with the profile
+@event.listens_for(FreelancerProfile, "after_insert")
+def _add_to_leaderboard(mapper, connection, target):
+    FreelancerLeaderboardEntry.refresh([target.user_id], connection)
+
+
+@event.listens_for(FreelancerProfile, "after_update")
+def _update_leaderboard(mapper, connection, target):
+    state = inspect(target)
+    if any(
+        state.attrs[field].history.has_changes()
+        for field in ("open_to_work", "application_status", "user_id")
+    ):
+        # A profile moved to another user leaves the previous user without one
+        previous = state.attrs.user_id.history.deleted
+        FreelancerLeaderboardEntry.refresh({target.user_id, *previous}, connection)
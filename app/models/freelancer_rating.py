@@ -0,0 +1,233 @@
+"""
+Freelancer Rating Aggregate Model - Materialized Review Statistics
+Owner: Caleb
+Description: One row per freelancer holding running sums and counts over their public
+reviews (overall, per dimension, star histogram). Kept current by Review mapper events so
+stats endpoints read a single row instead of every review.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import and_, func, insert, select, update
+
+from app.extensions import db
+from app.utils.upsert import dialect_insert
+
+SUBRATING_FIELDS = ("communication", "quality", "timeliness")
+
+
+def star_bucket(average):
+    """
+    Histogram bucket (1-5) for a review's average rating.
+
+    Uses round() like the distribution always has, so halves go to the even bucket
+    (2.5 -> 2, 3.5 -> 4).
+    """
+    return min(5, max(1, round(average)))
+
+
+def star_bucket_clause(average, stars):
+    """SQL condition matching star_bucket(average) == stars."""
+    # An even bucket takes the .5 ties on both sides, an odd one neither
+    if stars % 2 == 0:
+        lower, upper = average >= stars - 0.5, average <= stars + 0.5
+    else:
+        lower, upper = average > stars - 0.5, average < stars + 0.5
+    if stars == 1:
+        return upper
+    if stars == 5:
+        return lower
+    return and_(lower, upper)
+
+
+class FreelancerRatingAggregate(db.Model):
+    __tablename__ = "freelancer_rating_aggregates"
+
+    freelancer_id = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    # Overall
+    review_count = db.Column(db.Integer, default=0, nullable=False)
+    rating_sum = db.Column(db.Integer, default=0, nullable=False)
+    # Sum of Review.average_rating(), which the public "average_rating" has always used
+    average_rating_sum = db.Column(db.Float, default=0, nullable=False)
+
+    # Per dimension (sub-ratings are optional, so each keeps its own count)
+    communication_sum = db.Column(db.Integer, default=0, nullable=False)
+    communication_count = db.Column(db.Integer, default=0, nullable=False)
+    quality_sum = db.Column(db.Integer, default=0, nullable=False)
+    quality_count = db.Column(db.Integer, default=0, nullable=False)
+    timeliness_sum = db.Column(db.Integer, default=0, nullable=False)
+    timeliness_count = db.Column(db.Integer, default=0, nullable=False)
+
+    # Star histogram over the rounded average rating
+    stars_1 = db.Column(db.Integer, default=0, nullable=False)
+    stars_2 = db.Column(db.Integer, default=0, nullable=False)
+    stars_3 = db.Column(db.Integer, default=0, nullable=False)
+    stars_4 = db.Column(db.Integer, default=0, nullable=False)
+    stars_5 = db.Column(db.Integer, default=0, nullable=False)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<FreelancerRatingAggregate freelancer={self.freelancer_id} n={self.review_count}>"
+
+    @property
+    def average_rating(self):
+        return round(self.average_rating_sum / self.review_count, 2) if self.review_count else 0
+
+    def average_for(self, dimension):
+        count = getattr(self, f"{dimension}_count")
+        return round(getattr(self, f"{dimension}_sum") / count, 2) if count else 0
+
+    def to_dict(self):
+        return {
+            "total_reviews": self.review_count,
+            "average_rating": self.average_rating,
+            "rating_distribution": {n: getattr(self, f"stars_{n}") for n in range(1, 6)},
+            "average_communication": self.average_for("communication"),
+            "average_quality": self.average_for("quality"),
+            "average_timeliness": self.average_for("timeliness"),
+        }
+
+    @staticmethod
+    def empty_stats():
+        return {
+            "total_reviews": 0,
+            "average_rating": 0,
+            "rating_distribution": {n: 0 for n in range(1, 6)},
+            "average_communication": 0,
+            "average_quality": 0,
+            "average_timeliness": 0,
+        }
+
+    @staticmethod
+    def contribution(values):
+        """
+        Column deltas a single public review adds to its freelancer's aggregate.
+
+        Args:
+            values: dict with rating, communication_rating, quality_rating,
+                timeliness_rating
+
+        Returns:
+            dict: column name -> delta
+        """
+        subratings = [
+            values.get(f"{d}_rating")
+            for d in SUBRATING_FIELDS
+            if values.get(f"{d}_rating") is not None
+        ]
+        average = sum(subratings) / len(subratings) if subratings else float(values["rating"])
+
+        delta = {
+            "review_count": 1,
+            "rating_sum": values["rating"],
+            "average_rating_sum": round(average, 2),
+            f"stars_{star_bucket(round(average, 2))}": 1,
+        }
+        for dimension in SUBRATING_FIELDS:
+            value = values.get(f"{dimension}_rating")
+            if value is not None:
+                delta[f"{dimension}_sum"] = value
+                delta[f"{dimension}_count"] = 1
+        return delta
+
+    @staticmethod
+    def apply(connection, freelancer_id, delta, sign=1):
+        """
+        Atomically add (sign=1) or subtract (sign=-1) a delta with an upsert.
+
+        Args:
+            connection: Connection to run on (mapper events pass their own)
+            freelancer_id: Freelancer whose aggregate changes
+            delta: dict of column name -> amount (see contribution())
+            sign: 1 to add, -1 to remove
+        """
+        table = FreelancerRatingAggregate.__table__
+        values = {column: sign * amount for column, amount in delta.items()}
+        now = datetime.utcnow()
+        increments = {column: table.c[column] + amount for column, amount in values.items()}
+        increments["updated_at"] = now
+
+        stmt = dialect_insert(connection, table)
+        if stmt is not None:
+            stmt = stmt.values(
+                {
+                    **FreelancerRatingAggregate._zeros(),
+                    **values,
+                    "freelancer_id": freelancer_id,
+                    "updated_at": now,
+                }
+            )
+            connection.execute(
+                stmt.on_conflict_do_update(index_elements=[table.c.freelancer_id], set_=increments)
+            )
+            return
+
+        result = connection.execute(
+            update(table).where(table.c.freelancer_id == freelancer_id).values(**increments)
+        )
+        if result.rowcount == 0:
+            connection.execute(
+                insert(table).values(
+                    {
+                        **FreelancerRatingAggregate._zeros(),
+                        **values,
+                        "freelancer_id": freelancer_id,
+                        "updated_at": now,
+                    }
+                )
+            )
+
+    @staticmethod
+    def _zeros():
+        return {
+            column.name: 0
+            for column in FreelancerRatingAggregate.__table__.columns
+            if column.name not in ("freelancer_id", "updated_at")
+        }
+
+    @staticmethod
+    def rebuild(freelancer_ids=None, connection=None):
+        """
+        Recompute aggregates from the reviews table with grouped queries.
+
+        Used when an update's previous values are unknown and for maintenance.
+
+        Args:
+            freelancer_ids: Optional list of freelancers to rebuild (default: all)
+            connection: Connection to run on (defaults to the session's)
+        """
+        from app.models.review import Review
+
+        connection = connection or db.session.connection()
+        table = FreelancerRatingAggregate.__table__
+
+        average = Review.average_rating_expression()
+        columns = [
+            Review.freelancer_id.label("freelancer_id"),
+            func.count(Review.id).label("review_count"),
+            func.sum(Review.rating).label("rating_sum"),
+            func.sum(average).label("average_rating_sum"),
+        ]
+        for dimension in SUBRATING_FIELDS:
+            field = getattr(Review, f"{dimension}_rating")
+            columns.append(func.coalesce(func.sum(field), 0).label(f"{dimension}_sum"))
+            columns.append(func.count(field).label(f"{dimension}_count"))
+        for n in range(1, 6):
+            columns.append(func.count().filter(star_bucket_clause(average, n)).label(f"stars_{n}"))
+
+        query = select(*columns).where(Review.is_public.is_(True)).group_by(Review.freelancer_id)
+        delete = table.delete()
+        if freelancer_ids is not None:
+            query = query.where(Review.freelancer_id.in_(freelancer_ids))
+            delete = delete.where(table.c.freelancer_id.in_(freelancer_ids))
+
+        rows = [
+            dict(row._mapping, updated_at=datetime.utcnow()) for row in connection.execute(query)
+        ]
+        connection.execute(delete)
+        if rows:
+            connection.execute(insert(table), rows)
@@ -0,0 +1,60 @@
+"""
+Idempotency Key Model
+Owner: Caleb
+Description: Responses of write requests sent with an Idempotency-Key header, per user and
+key. The row is claimed in the same transaction as the request's own writes, so a retried
+or duplicated request either waits for the first one and replays its response, or runs
+again when the first one rolled back.
+"""
+
+from datetime import datetime
+
+from app.extensions import db
+from app.utils.upsert import dialect_insert
+
+
+class IdempotencyKey(db.Model):
+    __tablename__ = "idempotency_keys"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    key = db.Column(db.String(255), primary_key=True)
+    # sha256 of method, path and body: a key reused for another request is rejected
+    request_hash = db.Column(db.String(64), nullable=False)
+    endpoint = db.Column(db.String(100), nullable=False)
+    status_code = db.Column(db.Integer, nullable=True)
+    response = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey user:{self.user_id} {self.key} {self.status_code}>"
+
+    @staticmethod
+    def claim(session, user_id, key, endpoint, request_hash):
+        """
+        Insert the key row unless it exists. A concurrent claim of the same key blocks on
+        the unique index until the first transaction ends.
+
+        Returns:
+            bool: True when this transaction owns the key
+        """
+        table = IdempotencyKey.__table__
+        values = {
+            "user_id": user_id,
+            "key": key,
+            "endpoint": endpoint,
+            "request_hash": request_hash,
+            "created_at": datetime.utcnow(),
+        }
+        stmt = dialect_insert(session.get_bind(), table)
+        if stmt is None:
+            if session.get(IdempotencyKey, (user_id, key)) is not None:
+                return False
+            session.execute(table.insert().values(values))
+            return True
+
+        stmt = (
+            stmt.values(values)
+            .on_conflict_do_nothing(index_elements=[table.c.user_id, table.c.key])
+            .returning(table.c.key)
+        )
+        return session.execute(stmt).first() is not None
@@ -5,6 +5,9 @@ Description: Represents an official payment request between freelancer/agency an
 """
 
 from datetime import datetime
+
+from sqlalchemy import text
+
 from app.extensions import db
 
 
@@ -25,6 +28,10 @@ class Invoice(db.Model):
     status = db.Column(db.String(20), default="unpaid", nullable=False)  # unpaid, paid, overdue, cancelled
 
     pdf_url = db.Column(db.String(255), nullable=True)
+    # Rendered PDF: storage key and content hash it was rendered from (see invoice_pdf_service)
+    pdf_key = db.Column(db.String(255), nullable=True)
+    pdf_hash = db.Column(db.String(64), nullable=True)
+    pdf_storage_backend = db.Column(db.String(20), nullable=True)
     notes = db.Column(db.Text, nullable=True)
 
     # Optional link to EscrowTransaction
@@ -35,6 +42,17 @@ class Invoice(db.Model):
     client = db.relationship("User", foreign_keys=[client_id], lazy="joined")
     freelancer = db.relationship("User", foreign_keys=[freelancer_id], lazy="joined")
 
+    # Overdue sweep: only unpaid invoices are indexed, so it stays small as history grows
+    __table_args__ = (
+        db.Index(
+            "idx_invoices_unpaid_due",
+            "due_date",
+            "id",
+            postgresql_where=text("status = 'unpaid'"),
+            sqlite_where=text("status = 'unpaid'"),
+        ),
+    )
+
     def __repr__(self):
         return f"<Invoice {self.invoice_number} | {self.status}>"
 
@@ -0,0 +1,70 @@
+"""
+Invoice Number Sequence Model
+Owner: Caleb
+Description: One counter row per document prefix and year (INV-2026, ESC-2026, ...).
+Numbers are reserved by advancing next_value with a single upsert, in blocks when many
+are needed at once.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.utils.upsert import dialect_insert
+
+
+class InvoiceNumberSequence(db.Model):
+    __tablename__ = "invoice_number_sequences"
+
+    prefix = db.Column(db.String(20), primary_key=True)
+    year = db.Column(db.Integer, primary_key=True)
+    # First number not yet handed out
+    next_value = db.Column(db.BigInteger, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<InvoiceNumberSequence {self.prefix}-{self.year} next={self.next_value}>"
+
+    @staticmethod
+    def reserve(connection, prefix, year, count):
+        """
+        Reserve count consecutive numbers with one atomic upsert.
+
+        Returns:
+            int: The first reserved number (the block is [first, first + count))
+        """
+        table = InvoiceNumberSequence.__table__
+        values = {
+            "prefix": prefix,
+            "year": year,
+            "next_value": 1 + count,
+            "updated_at": datetime.utcnow(),
+        }
+        stmt = dialect_insert(connection, table)
+        if stmt is None:
+            # Fallback: lock the row, then advance it
+            row = connection.execute(
+                table.select()
+                .where(table.c.prefix == prefix, table.c.year == year)
+                .with_for_update()
+            ).first()
+            if row is None:
+                connection.execute(insert(table).values(values))
+                return 1
+            connection.execute(
+                table.update()
+                .where(table.c.prefix == prefix, table.c.year == year)
+                .values(next_value=row.next_value + count, updated_at=values["updated_at"])
+            )
+            return row.next_value
+
+        stmt = stmt.values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.prefix, table.c.year],
+            set_={
+                "next_value": table.c.next_value + count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(table.c.next_value)
+        return connection.execute(stmt).scalar_one() - count
@@ -0,0 +1,120 @@
+"""
+Job Model - Background Job Queue
+Owner: Caleb
+Description: Database-backed job queue and cron schedules. Workers claim queued jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of them can share the table without an
+external broker.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import text
+
+from app.extensions import db
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed", "cancelled")
+
+
+class Job(db.Model):
+    __tablename__ = "jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    task = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.JSON, nullable=True)
+    queue = db.Column(db.String(50), nullable=False, default="default")
+    priority = db.Column(db.Integer, nullable=False, default=0)
+
+    status = db.Column(db.String(20), nullable=False, default="queued")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # Lease held by the worker running the job; an expired lease is picked up again
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_until = db.Column(db.DateTime, nullable=True)
+
+    result = db.Column(db.JSON, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    # Deduplicates enqueues, e.g. one run per schedule tick across workers
+    unique_key = db.Column(db.String(255), nullable=True, unique=True)
+    created_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # Claim order over queued jobs only; finished history does not bloat it
+        db.Index(
+            "idx_jobs_claim",
+            "queue",
+            priority.desc(),
+            "run_at",
+            "id",
+            postgresql_where=text("status = 'queued'"),
+            sqlite_where=text("status = 'queued'"),
+        ),
+        db.Index(
+            "idx_jobs_running_lease",
+            "locked_until",
+            postgresql_where=text("status = 'running'"),
+            sqlite_where=text("status = 'running'"),
+        ),
+        db.Index("idx_jobs_status_created", "status", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<Job {self.id} {self.task} {self.status}>"
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "task": self.task,
+            "payload": self.payload,
+            "queue": self.queue,
+            "priority": self.priority,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "run_at": self.run_at.isoformat() if self.run_at else None,
+            "locked_by": self.locked_by,
+            "result": self.result,
+            "last_error": self.last_error,
+            "created_by": self.created_by,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class JobSchedule(db.Model):
+    """A cron schedule that enqueues a task; synced from config JOB_SCHEDULES"""
+
+    __tablename__ = "job_schedules"
+
+    name = db.Column(db.String(100), primary_key=True)
+    task = db.Column(db.String(100), nullable=False)
+    cron = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.JSON, nullable=True)
+    queue = db.Column(db.String(50), nullable=False, default="default")
+    enabled = db.Column(db.Boolean, nullable=False, default=True)
+
+    next_run_at = db.Column(db.DateTime, nullable=False)
+    last_run_at = db.Column(db.DateTime, nullable=True)
+    last_job_id = db.Column(db.Integer, nullable=True)
+
+    def __repr__(self):
+        return f"<JobSchedule {self.name} '{self.cron}'>"
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "task": self.task,
+            "cron": self.cron,
+            "payload": self.payload,
+            "queue": self.queue,
+            "enabled": self.enabled,
+            "next_run_at": self.next_run_at.isoformat() if self.next_run_at else None,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_job_id": self.last_job_id,
+        }
@@ -0,0 +1,165 @@
+"""
+Freelancer Leaderboard Model - Ranked "Top Rated" Index
+Owner: Caleb
+Description: One row per freelancer with a Bayesian-adjusted rating score and their
+availability, indexed in rank order. Rows are refreshed incrementally by Review and
+FreelancerProfile mapper events, so browsing never touches the reviews table.
+"""
+
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import delete, insert, select
+
+from app.extensions import db
+from app.utils.upsert import dialect_insert
+
+DEFAULT_PRIOR_MEAN = 3.5
+DEFAULT_PRIOR_WEIGHT = 5
+
+
+def bayesian_score(review_count, rating_sum, prior_mean, prior_weight):
+    """
+    Bayesian average: the freelancer's mean rating shrunk toward the prior.
+
+    A freelancer with few reviews starts near prior_mean and moves toward their
+    own average as reviews accumulate (prior_weight acts as that many phantom reviews).
+    """
+    return (prior_weight * prior_mean + rating_sum) / (prior_weight + review_count)
+
+
+class FreelancerLeaderboardEntry(db.Model):
+    __tablename__ = "freelancer_leaderboard"
+
+    freelancer_id = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    profile_id = db.Column(
+        db.Integer, db.ForeignKey("freelancer_profiles.id", ondelete="SET NULL"), nullable=True
+    )
+
+    review_count = db.Column(db.Integer, default=0, nullable=False)
+    average_rating = db.Column(db.Float, default=0, nullable=False)
+    score = db.Column(db.Float, nullable=False)
+
+    is_approved = db.Column(db.Boolean, default=False, nullable=False)
+    open_to_work = db.Column(db.Boolean, default=False, nullable=False)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    # Rank order for the default browse (approved + open to work) and for keyset cursors
+    __table_args__ = (
+        db.Index(
+            "idx_leaderboard_rank",
+            "is_approved",
+            "open_to_work",
+            score.desc(),
+            freelancer_id.desc(),
+        ),
+    )
+
+    user = db.relationship("User", foreign_keys=[freelancer_id])
+    profile = db.relationship("FreelancerProfile", foreign_keys=[profile_id])
+
+    def __repr__(self):
+        return (
+            f"<FreelancerLeaderboardEntry freelancer={self.freelancer_id} score={self.score:.3f}>"
+        )
+
+    def to_dict(self):
+        return {
+            "freelancer_id": self.freelancer_id,
+            "profile_id": self.profile_id,
+            "name": self.profile.name if self.profile else None,
+            "score": round(self.score, 4),
+            "average_rating": self.average_rating,
+            "review_count": self.review_count,
+            "open_to_work": self.open_to_work,
+            "hourly_rate": self.profile.hourly_rate if self.profile else None,
+            "skills": [skill.name for skill in self.profile.skills] if self.profile else [],
+        }
+
+    @staticmethod
+    def prior():
+        config = current_app.config
+        return (
+            config.get("LEADERBOARD_PRIOR_MEAN", DEFAULT_PRIOR_MEAN),
+            config.get("LEADERBOARD_PRIOR_WEIGHT", DEFAULT_PRIOR_WEIGHT),
+        )
+
+    @staticmethod
+    def refresh(freelancer_ids=None, connection=None):
+        """
+        Recompute leaderboard rows from the rating aggregates and profiles.
+
+        Args:
+            freelancer_ids: Freelancers to refresh (default: every freelancer)
+            connection: Connection to run on (mapper events pass their own)
+        """
+        from app.models.freelancer_profile import FreelancerProfile
+        from app.models.freelancer_rating import FreelancerRatingAggregate
+        from app.models.user import User
+
+        connection = connection or db.session.connection()
+        table = FreelancerLeaderboardEntry.__table__
+        users = User.__table__
+        aggregates = FreelancerRatingAggregate.__table__
+        profiles = FreelancerProfile.__table__
+        prior_mean, prior_weight = FreelancerLeaderboardEntry.prior()
+
+        query = select(
+            users.c.id,
+            profiles.c.id.label("profile_id"),
+            profiles.c.application_status,
+            profiles.c.open_to_work,
+            aggregates.c.review_count,
+            aggregates.c.average_rating_sum,
+        ).select_from(
+            users.outerjoin(aggregates, aggregates.c.freelancer_id == users.c.id).outerjoin(
+                profiles, profiles.c.user_id == users.c.id
+            )
+        )
+        if freelancer_ids is not None:
+            query = query.where(users.c.id.in_(list(freelancer_ids)))
+        else:
+            query = query.where(users.c.role == "freelancer")
+
+        now = datetime.utcnow()
+        rows = []
+        for row in connection.execute(query):
+            count = row.review_count or 0
+            total = row.average_rating_sum or 0
+            rows.append(
+                {
+                    "freelancer_id": row.id,
+                    "profile_id": row.profile_id,
+                    "review_count": count,
+                    "average_rating": round(total / count, 2) if count else 0,
+                    "score": bayesian_score(count, total, prior_mean, prior_weight),
+                    "is_approved": row.application_status == "approved",
+                    "open_to_work": bool(row.open_to_work),
+                    "updated_at": now,
+                }
+            )
+        if not rows:
+            return
+
+        stmt = dialect_insert(connection, table)
+        if stmt is not None:
+            connection.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[table.c.freelancer_id],
+                    set_={
+                        column: stmt.excluded[column]
+                        for column in rows[0]
+                        if column != "freelancer_id"
+                    },
+                ),
+                rows,
+            )
+            return
+
+        connection.execute(
+            delete(table).where(table.c.freelancer_id.in_([row["freelancer_id"] for row in rows]))
+        )
+        connection.execute(insert(table), rows)
@@ -1,12 +1,17 @@
 """
 Notification Model - Email & In-App Notifications
 Owner: Ryan
-Description: Tracks notifications sent to users with email status.
+Description: Tracks notifications sent to users with email status. Each user's unread
+count is cached in notification_counters and kept current by the mapper events at the
+bottom of this module (bulk paths in notification_service adjust it themselves).
 """
 
 from datetime import datetime
 
+from sqlalchemy import event, func, inspect, select, update
+
 from app.extensions import db
+from app.utils.upsert import dialect_insert
 
 
 class Notification(db.Model):
@@ -23,7 +28,8 @@ class Notification(db.Model):
     related_project_id = db.Column(db.Integer, db.ForeignKey("projects.id"), nullable=True)
     related_deliverable_id = db.Column(db.Integer, db.ForeignKey("deliverables.id"), nullable=True)
 
-    is_read = db.Column(db.Boolean, default=False)
+    # active_history: reading or unreading moves the user's unread counter
+    is_read = db.column_property(db.Column(db.Boolean, default=False), active_history=True)
     is_emailed = db.Column(db.Boolean, default=False)
     email_sent_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -31,8 +37,11 @@ class Notification(db.Model):
     # -------------------- Relationships --------------------
     user = db.relationship("User", back_populates="notifications")
 
-    # Index for fast unread queries
-    __table_args__ = (db.Index("idx_user_unread", "user_id", "is_read"),)
+    # Unread lookups and mark-all-read; inbox keyset pagination on (user_id, created_at, id)
+    __table_args__ = (
+        db.Index("idx_user_unread", "user_id", "is_read"),
+        db.Index("idx_notifications_user_created", "user_id", "created_at", "id"),
+    )
 
     # -------------------- Methods --------------------
     def to_dict(self):
@@ -53,3 +62,114 @@ class Notification(db.Model):
 
     def __repr__(self):
         return f"<Notification user_id={self.user_id} type={self.type}>"
+
+
+class NotificationCounter(db.Model):
+    """Cached unread notification count, one row per user"""
+
+    __tablename__ = "notification_counters"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<NotificationCounter user_id={self.user_id} unread={self.unread_count}>"
+
+    @staticmethod
+    def get_unread_count(user_id):
+        return (
+            db.session.query(NotificationCounter.unread_count)
+            .filter(NotificationCounter.user_id == user_id)
+            .scalar()
+            or 0
+        )
+
+    @staticmethod
+    def adjust(deltas, connection=None):
+        """
+        Shift unread counters with one atomic upsert for all users.
+
+        Args:
+            deltas: dict of user_id -> change in unread notifications
+            connection: Connection to run on (defaults to the session's)
+        """
+        connection = connection or db.session.connection()
+        table = NotificationCounter.__table__
+        now = datetime.utcnow()
+        # Sorted so concurrent fan-outs lock counter rows in the same order
+        rows = [
+            {"user_id": user_id, "unread_count": delta, "updated_at": now}
+            for user_id, delta in sorted(deltas.items())
+            if delta
+        ]
+        if not rows:
+            return
+
+        stmt = dialect_insert(connection, table)
+        if stmt is not None:
+            connection.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[table.c.user_id],
+                    set_={
+                        "unread_count": table.c.unread_count + stmt.excluded.unread_count,
+                        "updated_at": stmt.excluded.updated_at,
+                    },
+                ),
+                rows,
+            )
+            return
+
+        for row in rows:
+            result = connection.execute(
+                update(table)
+                .where(table.c.user_id == row["user_id"])
+                .values(unread_count=table.c.unread_count + row["unread_count"], updated_at=now)
+            )
+            if result.rowcount == 0:
+                connection.execute(table.insert().values(row))
+
+    @staticmethod
+    def rebuild(user_ids=None, connection=None):
+        """Recount unread notifications from the notifications table"""
+        connection = connection or db.session.connection()
+        table = NotificationCounter.__table__
+        notifications = Notification.__table__
+
+        query = (
+            select(notifications.c.user_id, func.count().label("unread_count"))
+            .where(notifications.c.is_read.is_(False))
+            .group_by(notifications.c.user_id)
+        )
+        delete = table.delete()
+        if user_ids is not None:
+            query = query.where(notifications.c.user_id.in_(user_ids))
+            delete = delete.where(table.c.user_id.in_(user_ids))
+
+        now = datetime.utcnow()
+        rows = [dict(row._mapping, updated_at=now) for row in connection.execute(query)]
+        connection.execute(delete)
+        if rows:
+            connection.execute(table.insert(), rows)
+
+
+@event.listens_for(Notification, "after_insert")
+def _count_new_notification(mapper, connection, target):
+    if not target.is_read:
+        NotificationCounter.adjust({target.user_id: 1}, connection)
+
+
+@event.listens_for(Notification, "after_update")
+def _count_read_change(mapper, connection, target):
+    history = inspect(target).attrs.is_read.history
+    if not history.has_changes():
+        return
+    was_read = bool(history.deleted and history.deleted[0])
+    if was_read != bool(target.is_read):
+        NotificationCounter.adjust({target.user_id: -1 if target.is_read else 1}, connection)
+
+
+@event.listens_for(Notification, "after_delete")
+def _count_removed_notification(mapper, connection, target):
+    if not target.is_read:
+        NotificationCounter.adjust({target.user_id: -1}, connection)
@@ -0,0 +1,136 @@
+"""
+Outbox Model - Transactional Outbox
+Owner: Ryan
+Description: Domain events written in the same transaction as the change they describe.
+The outbox dispatcher delivers them to subscribers after commit, at least once, and
+records each subscriber's success in outbox_deliveries so a redelivery skips it.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, insert, or_, update
+
+from app.extensions import db
+from app.utils.upsert import dialect_insert
+
+STATUSES = ("pending", "processing", "done", "failed")
+
+
+class OutboxMessage(db.Model):
+    __tablename__ = "outbox_messages"
+
+    id = db.Column(db.Integer, primary_key=True)
+    topic = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    # Publishing the same key twice stores one message
+    idempotency_key = db.Column(db.String(255), nullable=False, unique=True)
+
+    status = db.Column(db.String(20), nullable=False, default="pending")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # Lease of the dispatcher processing the message; expired leases are retried
+    locked_until = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    processed_at = db.Column(db.DateTime, nullable=True)
+
+    deliveries = db.relationship(
+        "OutboxDelivery", back_populates="message", cascade="all, delete-orphan"
+    )
+
+    # Dispatcher scan: due messages by status and time
+    __table_args__ = (db.Index("idx_outbox_status_available", "status", "available_at"),)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "topic": self.topic,
+            "payload": self.payload,
+            "idempotency_key": self.idempotency_key,
+            "status": self.status,
+            "attempts": self.attempts,
+            "available_at": self.available_at.isoformat() if self.available_at else None,
+            "last_error": self.last_error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "processed_at": self.processed_at.isoformat() if self.processed_at else None,
+        }
+
+    def __repr__(self):
+        return f"<OutboxMessage {self.id} {self.topic} {self.status}>"
+
+    @staticmethod
+    def enqueue(session, topic, payload, idempotency_key):
+        """
+        Add a message to the current transaction.
+
+        Returns:
+            int | None: The new message id, or None if the key was already published
+        """
+        table = OutboxMessage.__table__
+        now = datetime.utcnow()
+        values = {
+            "topic": topic,
+            "payload": payload,
+            "idempotency_key": idempotency_key,
+            "status": "pending",
+            "attempts": 0,
+            "available_at": now,
+            "created_at": now,
+        }
+        stmt = dialect_insert(session.connection(), table)
+        if stmt is not None:
+            stmt = (
+                stmt.values(values)
+                .on_conflict_do_nothing(index_elements=[table.c.idempotency_key])
+                .returning(table.c.id)
+            )
+        else:
+            stmt = insert(table).values(values).returning(table.c.id)
+        return session.execute(stmt).scalar()
+
+    @staticmethod
+    def due_clause(now):
+        """Messages ready to process: pending and due, or processing with an expired lease"""
+        return or_(
+            and_(OutboxMessage.status == "pending", OutboxMessage.available_at <= now),
+            and_(OutboxMessage.status == "processing", OutboxMessage.locked_until < now),
+        )
+
+    @staticmethod
+    def claim(session, message_id, now, lease_seconds):
+        """
+        Take the lease on a message with one conditional UPDATE, so concurrent
+        dispatchers never process the same message at the same time.
+
+        Returns:
+            bool: True if this caller now owns the message
+        """
+        result = session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id == message_id, OutboxMessage.due_clause(now))
+            .values(
+                status="processing",
+                attempts=OutboxMessage.attempts + 1,
+                locked_until=now + timedelta(seconds=lease_seconds),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+
+class OutboxDelivery(db.Model):
+    """A subscriber that has already handled a message"""
+
+    __tablename__ = "outbox_deliveries"
+
+    message_id = db.Column(
+        db.Integer, db.ForeignKey("outbox_messages.id", ondelete="CASCADE"), primary_key=True
+    )
+    handler = db.Column(db.String(100), primary_key=True)
+    delivered_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    message = db.relationship("OutboxMessage", back_populates="deliveries")
+
+    def __repr__(self):
+        return f"<OutboxDelivery {self.message_id} {self.handler}>"
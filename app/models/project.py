@@ -33,6 +33,17 @@ class Project(db.Model):
     project_type = db.Column(db.String(100))
     priority = db.Column(db.String(50), default="normal")
 
+    # Denormalized pointer to the highest deliverable version (kept by Deliverable.promote_to_latest)
+    latest_version_id = db.Column(
+        db.Integer,
+        db.ForeignKey(
+            "deliverables.id", use_alter=True, name="fk_projects_latest_version", ondelete="SET NULL"
+        ),
+        nullable=True,
+    )
+    # Open feedback across all deliverables (kept by Feedback mapper events)
+    unresolved_feedback_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+
     # -------------------- Time Tracking --------------------
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     matched_at = db.Column(db.DateTime)
@@ -55,11 +66,18 @@ class Project(db.Model):
         "User", foreign_keys=[freelancer_id], backref="freelancer_projects"
     )
     admin = db.relationship("User", foreign_keys=[admin_id])
-    deliverables = db.relationship("Deliverable", back_populates="project", lazy=True)
+    deliverables = db.relationship(
+        "Deliverable", back_populates="project", lazy=True, foreign_keys="Deliverable.project_id"
+    )
     # escrow_transaction = db.relationship("EscrowTransaction", backref="project", uselist=False)
 
     # Placeholder one-to-one relationships (for future expansion)
-    deliverables = db.relationship('Deliverable', back_populates='project', lazy=True)
+    deliverables = db.relationship(
+        'Deliverable', back_populates='project', lazy=True, foreign_keys='Deliverable.project_id'
+    )
+    latest_version = db.relationship(
+        'Deliverable', foreign_keys=[latest_version_id], viewonly=True
+    )
     escrow_transactions = db.relationship('EscrowTransaction', back_populates='project', cascade='all, delete-orphan')
     portfolio_items = db.relationship('PortfolioItem', back_populates='project', cascade='all, delete-orphan')
 
@@ -96,6 +114,8 @@ class Project(db.Model):
                 else "Unassigned"
             ),
             "progress": self._calculate_progress(),  # Caleb's method
+            "latest_version_id": self.latest_version_id,
+            "unresolved_feedback_count": self.unresolved_feedback_count,
             "deliverables": [
                 {
                     "id": d.id,
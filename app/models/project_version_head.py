@@ -0,0 +1,72 @@
+"""
+Project Version Head Model - Per-Project Deliverable Version Counter
+Owner: Cindy
+Description: One row per project holding the last allocated deliverable version number.
+Versions are allocated with an atomic UPDATE ... RETURNING, so concurrent uploads never
+collide and allocation never sorts the deliverables table.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+
+
+class ProjectVersionHead(db.Model):
+    __tablename__ = "project_version_heads"
+
+    project_id = db.Column(
+        db.Integer, db.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    last_version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ProjectVersionHead project={self.project_id} v{self.last_version}>"
+
+    @staticmethod
+    def allocate(project_id):
+        """
+        Reserve the next version number for a project.
+
+        The UPDATE holds the head row lock until the surrounding transaction
+        commits, serializing uploads per project only. The first upload of a
+        project seeds the head from any versions that predate the counter.
+        """
+        increment = (
+            update(ProjectVersionHead)
+            .where(ProjectVersionHead.project_id == project_id)
+            .values(
+                last_version=ProjectVersionHead.last_version + 1,
+                updated_at=datetime.utcnow(),
+            )
+            .returning(ProjectVersionHead.last_version)
+            .execution_options(synchronize_session=False)
+        )
+
+        version = db.session.execute(increment).scalar()
+        if version is not None:
+            return version
+
+        from app.models.deliverable import Deliverable
+
+        seed = (
+            db.session.query(func.coalesce(func.max(Deliverable.version_number), 0))
+            .filter(Deliverable.project_id == project_id)
+            .scalar()
+        )
+        try:
+            with db.session.begin_nested():
+                db.session.execute(
+                    insert(ProjectVersionHead).values(
+                        project_id=project_id,
+                        last_version=seed + 1,
+                        updated_at=datetime.utcnow(),
+                    )
+                )
+            return seed + 1
+        except IntegrityError:
+            # Another upload created the head first; take the next number from it
+            return db.session.execute(increment).scalar()
@@ -6,9 +6,21 @@ Description: Star ratings and reviews for completed projects
 
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint
+from sqlalchemy import CheckConstraint, Float, Numeric, case, cast, event, func, inspect
 
 from app.extensions import db
+from app.models.freelancer_rating import FreelancerRatingAggregate
+from app.models.leaderboard import FreelancerLeaderboardEntry
+
+# Columns that feed the freelancer rating aggregate
+AGGREGATED_FIELDS = (
+    "freelancer_id",
+    "rating",
+    "communication_rating",
+    "quality_rating",
+    "timeliness_rating",
+    "is_public",
+)
 
 
 class Review(db.Model):
@@ -17,7 +29,10 @@ class Review(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey("projects.id"), unique=True, nullable=False)
     client_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
-    freelancer_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    # active_history: a reassigned review leaves the previous freelancer's aggregate
+    freelancer_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False), active_history=True
+    )
 
     rating = db.Column(
         db.Integer,
@@ -71,6 +86,18 @@ class Review(db.Model):
         ]
         return round(sum(ratings) / len(ratings), 2) if ratings else float(self.rating)
 
+    @staticmethod
+    def average_rating_expression():
+        """SQL equivalent of average_rating() for use in grouped queries"""
+        subratings = [Review.communication_rating, Review.quality_rating, Review.timeliness_rating]
+        total = sum(func.coalesce(field, 0) for field in subratings)
+        count = sum(case((field.isnot(None), 1), else_=0) for field in subratings)
+        average = case(
+            (count > 0, cast(total, Float) / count),
+            else_=cast(Review.rating, Float),
+        )
+        return func.round(cast(average, Numeric), 2, type_=Float)
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -86,3 +113,69 @@ class Review(db.Model):
             "is_public": self.is_public,
             "created_at": self.created_at.isoformat(),
         }
+
+
+def _current_values(target):
+    return {field: getattr(target, field) for field in AGGREGATED_FIELDS}
+
+
+def _aggregate_values(target):
+    """Previous and current aggregated field values, or None if any is not loaded"""
+    state = inspect(target)
+    old, new = {}, {}
+    for field in AGGREGATED_FIELDS:
+        history = state.attrs[field].history
+        previous = history.deleted or history.unchanged
+        current = history.added or history.unchanged
+        if not previous or not current:
+            return None
+        old[field], new[field] = previous[0], current[0]
+    return old, new
+
+
+@event.listens_for(Review, "after_insert")
+def _add_to_rating_aggregate(mapper, connection, target):
+    if target.is_public:
+        FreelancerRatingAggregate.apply(
+            connection,
+            target.freelancer_id,
+            FreelancerRatingAggregate.contribution(_current_values(target)),
+        )
+        FreelancerLeaderboardEntry.refresh([target.freelancer_id], connection)
+
+
+@event.listens_for(Review, "after_update")
+def _update_rating_aggregate(mapper, connection, target):
+    values = _aggregate_values(target)
+    if values is None:
+        # Previous values were never loaded; recount the freelancer(s) instead
+        history = inspect(target).attrs.freelancer_id.history
+        freelancer_ids = {target.freelancer_id, *history.deleted}
+        FreelancerRatingAggregate.rebuild(list(freelancer_ids), connection)
+        FreelancerLeaderboardEntry.refresh(freelancer_ids, connection)
+        return
+
+    old, new = values
+    if old == new:
+        return
+    if old["is_public"]:
+        FreelancerRatingAggregate.apply(
+            connection, old["freelancer_id"], FreelancerRatingAggregate.contribution(old), sign=-1
+        )
+    if new["is_public"]:
+        FreelancerRatingAggregate.apply(
+            connection, new["freelancer_id"], FreelancerRatingAggregate.contribution(new)
+        )
+    FreelancerLeaderboardEntry.refresh({old["freelancer_id"], new["freelancer_id"]}, connection)
+
+
+@event.listens_for(Review, "before_delete")
+def _remove_from_rating_aggregate(mapper, connection, target):
+    if target.is_public:
+        FreelancerRatingAggregate.apply(
+            connection,
+            target.freelancer_id,
+            FreelancerRatingAggregate.contribution(_current_values(target)),
+            sign=-1,
+        )
+        FreelancerLeaderboardEntry.refresh([target.freelancer_id], connection)
@@ -0,0 +1,262 @@
+"""
+Search Document Model - Full-Text Search Index
+Owner: Cindy
+Description: One row per searchable project, deliverable and feedback item, kept in sync by
+ORM events. PostgreSQL indexes it with a generated, weighted tsvector column and a GIN index;
+SQLite (tests) uses an FTS5 external-content table maintained by triggers.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DDL, delete, event, inspect, select
+
+from app.extensions import db
+from app.models.deliverable import Deliverable
+from app.models.feedback import Feedback
+from app.models.project import Project
+from app.utils.upsert import dialect_insert
+
+
+class SearchDocument(db.Model):
+    __tablename__ = "search_documents"
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(20), nullable=False)  # project, deliverable, feedback
+    entity_id = db.Column(db.Integer, nullable=False)
+
+    # Scope columns for visibility filtering and cascade cleanup
+    project_id = db.Column(db.Integer, db.ForeignKey("projects.id", ondelete="CASCADE"))
+    deliverable_id = db.Column(db.Integer, db.ForeignKey("deliverables.id", ondelete="CASCADE"))
+
+    title = db.Column(db.String(255))
+    body = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    # search_vector (PostgreSQL) and search_documents_fts (SQLite) are created by the DDL below
+
+    __table_args__ = (
+        db.UniqueConstraint("entity_type", "entity_id", name="uq_search_documents_entity"),
+        db.Index("idx_search_documents_project", "project_id"),
+        db.Index("idx_search_documents_deliverable", "deliverable_id"),
+    )
+
+    def __repr__(self):
+        return f"<SearchDocument {self.entity_type}:{self.entity_id}>"
+
+    @staticmethod
+    def upsert(connection, documents):
+        """
+        Insert or replace index rows.
+
+        Args:
+            connection: Connection to run on (mapper events pass their own)
+            documents: List of dicts with entity_type, entity_id, project_id,
+                deliverable_id, title and body
+        """
+        if not documents:
+            return
+        table = SearchDocument.__table__
+        now = datetime.utcnow()
+        rows = [dict(document, updated_at=now) for document in documents]
+
+        stmt = dialect_insert(connection, table)
+        if stmt is not None:
+            connection.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[table.c.entity_type, table.c.entity_id],
+                    set_={
+                        column: stmt.excluded[column]
+                        for column in (
+                            "project_id",
+                            "deliverable_id",
+                            "title",
+                            "body",
+                            "updated_at",
+                        )
+                    },
+                ),
+                rows,
+            )
+            return
+
+        for row in rows:
+            SearchDocument.remove(connection, row["entity_type"], [row["entity_id"]])
+        connection.execute(table.insert(), rows)
+
+    @staticmethod
+    def remove(connection, entity_type, entity_ids):
+        table = SearchDocument.__table__
+        connection.execute(
+            delete(table).where(
+                table.c.entity_type == entity_type, table.c.entity_id.in_(entity_ids)
+            )
+        )
+
+
+def project_document(project):
+    return {
+        "entity_type": "project",
+        "entity_id": project.id,
+        "project_id": project.id,
+        "deliverable_id": None,
+        "title": project.title,
+        "body": project.description,
+    }
+
+
+def deliverable_document(deliverable):
+    return {
+        "entity_type": "deliverable",
+        "entity_id": deliverable.id,
+        "project_id": deliverable.project_id,
+        "deliverable_id": deliverable.id,
+        "title": deliverable.title,
+        "body": "\n".join(
+            part for part in (deliverable.description, deliverable.change_notes) if part
+        ),
+    }
+
+
+def feedback_document(feedback, project_id):
+    return {
+        "entity_type": "feedback",
+        "entity_id": feedback.id,
+        "project_id": project_id,
+        "deliverable_id": feedback.deliverable_id,
+        "title": feedback.feedback_type,
+        "body": feedback.content,
+    }
+
+
+def feedback_project_ids(connection, deliverable_ids):
+    """Map deliverable ids to project ids with one query"""
+    deliverables = Deliverable.__table__
+    rows = connection.execute(
+        select(deliverables.c.id, deliverables.c.project_id).where(
+            deliverables.c.id.in_(set(deliverable_ids))
+        )
+    )
+    return dict(rows.all())
+
+
+def index_feedback(connection, feedback_items):
+    """Index feedback rows written outside the unit of work (e.g. bulk inserts)"""
+    if not feedback_items:
+        return
+    project_ids = feedback_project_ids(connection, [f.deliverable_id for f in feedback_items])
+    SearchDocument.upsert(
+        connection,
+        [feedback_document(f, project_ids.get(f.deliverable_id)) for f in feedback_items],
+    )
+
+
+# -------------------- Dialect-specific full-text DDL --------------------
+
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE search_documents ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX idx_search_documents_vector ON search_documents USING GIN (search_vector)",
+]
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5(
+        title, body, content='search_documents', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN
+        INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN
+        INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN
+        INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(
+        SearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql")
+    )
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        SearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    SearchDocument.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS search_documents_fts").execute_if(dialect="sqlite"),
+)
+
+
+# -------------------- Index maintenance --------------------
+
+
+def _changed(target, fields):
+    state = inspect(target)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+@event.listens_for(Project, "after_insert")
+def _index_new_project(mapper, connection, target):
+    SearchDocument.upsert(connection, [project_document(target)])
+
+
+@event.listens_for(Project, "after_update")
+def _reindex_project(mapper, connection, target):
+    if _changed(target, ("title", "description")):
+        SearchDocument.upsert(connection, [project_document(target)])
+
+
+@event.listens_for(Project, "after_delete")
+def _unindex_project(mapper, connection, target):
+    table = SearchDocument.__table__
+    connection.execute(delete(table).where(table.c.project_id == target.id))
+
+
+@event.listens_for(Deliverable, "after_insert")
+def _index_new_deliverable(mapper, connection, target):
+    SearchDocument.upsert(connection, [deliverable_document(target)])
+
+
+@event.listens_for(Deliverable, "after_update")
+def _reindex_deliverable(mapper, connection, target):
+    if _changed(target, ("title", "description", "change_notes", "project_id")):
+        SearchDocument.upsert(connection, [deliverable_document(target)])
+
+
+@event.listens_for(Deliverable, "after_delete")
+def _unindex_deliverable(mapper, connection, target):
+    table = SearchDocument.__table__
+    connection.execute(delete(table).where(table.c.deliverable_id == target.id))
+
+
+@event.listens_for(Feedback, "after_insert")
+def _index_new_feedback(mapper, connection, target):
+    index_feedback(connection, [target])
+
+
+@event.listens_for(Feedback, "after_update")
+def _reindex_feedback(mapper, connection, target):
+    if _changed(target, ("content", "feedback_type", "deliverable_id")):
+        index_feedback(connection, [target])
+
+
+@event.listens_for(Feedback, "after_delete")
+def _unindex_feedback(mapper, connection, target):
+    SearchDocument.remove(connection, "feedback", [target.id])
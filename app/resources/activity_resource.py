@@ -4,12 +4,12 @@ Owner: Caleb
 Description: Provides API endpoints for viewing and managing Activity Logs (audit trail).
 """
 
-from datetime import datetime
-
 from flask import Blueprint, jsonify, request
 
 from app.extensions import db
-from app.models import ActivityLog, User
+from app.models import ActivityLog
+from app.services.activity_service import clear_activities, list_activities
+from app.services.audit_buffer import audit_buffer
 
 activity_bp = Blueprint("activity", __name__, url_prefix="/api/activity")
 
@@ -17,21 +17,14 @@ activity_bp = Blueprint("activity", __name__, url_prefix="/api/activity")
 @activity_bp.route("/", methods=["GET"])
 def get_all_activities():
     try:
-        limit = int(request.args.get("limit", 20))
-        user_id = request.args.get("user_id")
-        role = request.args.get("role")
-        action_filter = request.args.get("action")
-
-        query = ActivityLog.query
-
-        if user_id:
-            query = query.filter_by(user_id=user_id)
-        if role:
-            query = query.join(User).filter(User.role_as == int(role))
-        if action_filter:
-            query = query.filter(ActivityLog.action.ilike(f"%{action_filter}%"))
-
-        logs = query.order_by(ActivityLog.created_at.desc()).limit(limit).all()
+        logs = list_activities(
+            limit=int(request.args.get("limit", 20)),
+            user_id=request.args.get("user_id", type=int),
+            role=request.args.get("role"),
+            action=request.args.get("action"),
+            action_code=request.args.get("action_code"),
+            resource_type=request.args.get("resource_type"),
+        )
 
         return jsonify([log.to_dict() for log in logs]), 200
     except Exception as e:
@@ -50,21 +43,30 @@ def get_activity(activity_id):
 def create_activity():
     try:
         data = request.get_json()
-        new_log = ActivityLog(
-            user_id=data.get("user_id"),
+        if not data or not data.get("action") or not data.get("resource_type"):
+            return jsonify({"error": "action and resource_type are required"}), 400
+
+        # Buffered: the row is written by the next batch flush, not in this request
+        accepted = audit_buffer.log(
             action=data.get("action"),
+            resource_type=data.get("resource_type"),
+            resource_id=data.get("resource_id"),
+            user_id=data.get("user_id"),
             details=data.get("details"),
-            ip_address=request.remote_addr,
-            created_at=datetime.utcnow(),
         )
-        db.session.add(new_log)
-        db.session.commit()
-        return jsonify({"message": "Activity log created", "log": new_log.to_dict()}), 201
+        if not accepted:
+            return jsonify({"error": "Activity log is overloaded, try again later"}), 503
+        return jsonify({"message": "Activity log accepted"}), 202
     except Exception as e:
-        db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
+@activity_bp.route("/buffer", methods=["GET"])
+def get_buffer_metrics():
+    """Audit buffer throughput and backpressure counters for this worker process"""
+    return jsonify(audit_buffer.metrics()), 200
+
+
 @activity_bp.route("/<int:activity_id>", methods=["DELETE"])
 def delete_activity(activity_id):
     try:
@@ -83,7 +85,7 @@ def delete_activity(activity_id):
 @activity_bp.route("/clear", methods=["DELETE"])
 def clear_all_activities():
     try:
-        db.session.query(ActivityLog).delete()
+        clear_activities()
         db.session.commit()
         return jsonify({"message": "All activity logs cleared"}), 200
     except Exception as e:
@@ -9,7 +9,7 @@ import secrets
 import traceback
 from datetime import datetime, timedelta
 
-from flask import Blueprint, jsonify, request, current_app, send_from_directory
+from flask import Blueprint, jsonify, request, current_app
 from flask_jwt_extended import (
     create_access_token,
     create_refresh_token,
@@ -25,6 +25,7 @@ from app.services.email_service import (
     send_password_reset_email,
     send_verification_email,
 )
+from app.services.storage_service import CV_FOLDER, get_storage
 
 auth_bp = Blueprint("auth_bp", __name__, url_prefix="/api/auth")
 
@@ -83,20 +84,13 @@ def register():
             if file_ext not in allowed_extensions:
                 return jsonify({"error": "Only PDF, DOC, and DOCX files are allowed"}), 400
 
-            # Create uploads directory
-            upload_dir = os.path.join(current_app.root_path, 'uploads')
-            os.makedirs(upload_dir, exist_ok=True)
-            
-            # Generate unique filename
-            import uuid
-            from werkzeug.utils import secure_filename
-            filename = secure_filename(file.filename)
-            unique_filename = f"{uuid.uuid4().hex}_{filename}"
-            file_path = os.path.join(upload_dir, unique_filename)
-            
-            # Save file
-            file.save(file_path)
-            
+            storage = get_storage(current_app.config.get("CV_STORAGE_BACKEND"))
+            stored = storage.save(file, folder=CV_FOLDER, file_type="document")
+            if not stored["success"]:
+                db.session.rollback()
+                return jsonify({"error": "CV upload failed"}), 500
+            filename = stored.get("filename") or file.filename
+
             # Create FreelancerProfile with CV data
             try:
                 from app.models.freelancer_profile import FreelancerProfile
@@ -105,7 +99,7 @@ def register():
                     name=f"{user.first_name} {user.last_name}",
                     email=user.email,
                     cv_filename=filename,
-                    cv_url=f"/uploads/{unique_filename}",
+                    cv_url=stored["url"],
                     cv_uploaded_at=datetime.utcnow(),
                     application_status="pending",
                     open_to_work=True,
@@ -287,7 +281,15 @@ def reset_password():
 
 
 # -------------------- Serve uploaded CVs --------------------
-@auth_bp.route("/uploads/<filename>")
+# Only the CV folder is public: deliverables and invoice PDFs are served by their
+# authenticated routes. Filenames cannot contain "/", so other folders are unreachable.
+@auth_bp.route(f"/uploads/{CV_FOLDER}/<filename>")
 def serve_uploaded_file(filename: str):
-    upload_dir = os.path.join(os.getcwd(), "uploads")
-    return send_from_directory(upload_dir, filename)
+    """Serve an uploaded CV (Range/ETag aware, offloaded to the web server if configured)."""
+    return get_storage("local").serve(f"{CV_FOLDER}/{filename}")
+
+
+@auth_bp.route("/uploads/<filename>")
+def serve_legacy_cv(filename: str):
+    """Serve a CV uploaded before the storage layer (stored at the top of the upload root)."""
+    return get_storage("local").serve(filename)
@@ -38,7 +38,7 @@ def get_stats():
         total_projects = Project.query.count()
         total_users = User.query.count()
         escrow_released = EscrowTransaction.query.filter_by(status="released").count()
-        escrow_in_escrow = EscrowTransaction.query.filter_by(status="in_escrow").count()
+        escrow_in_escrow = EscrowTransaction.query.filter_by(status="held").count()
 
         stats = [
             {"label": "Total Users", "value": total_users, "color": "blue"},
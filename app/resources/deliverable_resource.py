@@ -7,22 +7,31 @@ Description: Upload files, track versions, manage deliverable lifecycle
 import os
 import re
 from datetime import datetime, timedelta
-from flask import Blueprint, current_app, jsonify, request
+from flask import Blueprint, current_app, jsonify, request, url_for
 from flask_jwt_extended import get_jwt_identity, jwt_required
+from sqlalchemy import case, func, null, select
+from sqlalchemy.orm import joinedload
 from werkzeug.utils import secure_filename
 
 from app.extensions import db
 from app.models.deliverable import Deliverable
+from app.models.feedback import Feedback
 from app.models.project import Project
 from app.models.user import User
 from app.services.cloudinary_service import CloudinaryService
-from app.services.email_service import (
-    send_deliverable_approved_notification,
-    send_deliverable_feedback_notification,
-    send_email,
+from app.services.feedback_service import load_feedback_threads
+from app.services.job_service import enqueue
+from app.services.preview_service import backfill_deliverable_previews
+from app.services.storage_service import get_storage
+from app.services.event_bus import (
+    DeliverableApproved,
+    DeliverableRejected,
+    DeliverableSubmitted,
+    RevisionRequested,
+    publish,
 )
 from app.models.portfolio_item import PortfolioItem
-from app.models.escrow_transaction import EscrowTransaction
+from app.services.escrow_service import EscrowStateError, release_project_escrow
 from app.utils.decorators import role_required
 
 deliverable_bp = Blueprint("deliverables", __name__, url_prefix="/api/deliverables")
@@ -30,6 +39,7 @@ deliverable_bp = Blueprint("deliverables", __name__, url_prefix="/api/deliverabl
 # Constants
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt', 'zip', 'jpg', 'jpeg', 'png', 'mp4', 'mov', 'avi'}
+MAX_SYNC_BACKFILL = 500  # deliverables a request may backfill inline; more goes to a job
 
 # Helper functions
 def validate_deliverable_data(title, description, change_notes):
@@ -87,6 +97,14 @@ def error_response(message, status_code, details=None):
         response["details"] = details
     return jsonify(response), status_code
 
+
+def _is_project_member(project, user_id):
+    """Admins, and the project's client and freelancer, may read its deliverables"""
+    user = User.query.get(user_id)
+    if not user or not project:
+        return False
+    return user.role == "admin" or user.id in (project.client_id, project.freelancer_id)
+
 @deliverable_bp.route("/projects/<int:project_id>", methods=["GET"])
 @jwt_required()
 def get_project_deliverables(project_id):
@@ -128,6 +146,28 @@ def get_project_deliverables(project_id):
         current_app.logger.error(f"Error fetching deliverables: {str(e)}")
         return error_response("Failed to fetch deliverables", 500, str(e))
 
+
+@deliverable_bp.route("/projects/<int:project_id>/latest", methods=["GET"])
+@jwt_required()
+def get_latest_deliverable(project_id):
+    """Get the newest deliverable version of a project (no sort, uses latest_version_id)"""
+    try:
+        project = Project.query.get(project_id)
+        if not project:
+            return error_response("Project not found", 404)
+
+        if not project.latest_version:
+            return error_response("No deliverables for this project", 404)
+
+        return jsonify({
+            "success": True,
+            "deliverable": project.latest_version.to_dict(include_feedback=False),
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error fetching latest deliverable: {str(e)}")
+        return error_response("Failed to fetch latest deliverable", 500, str(e))
+
 @deliverable_bp.route("/freelancer/my-deliverables", methods=["GET"])
 @jwt_required()
 def get_my_deliverables():
@@ -183,12 +223,22 @@ def download_deliverable(deliverable_id):
     """Get secure download URL for deliverable"""
     try:
         deliverable = Deliverable.query.get_or_404(deliverable_id)
-        
-        # Generate signed URL for secure download (expires in 1 hour)
-        download_url = CloudinaryService.generate_download_url(
-            deliverable.cloudinary_public_id,
-            expires_in=3600  # 1 hour
-        )
+        if not _is_project_member(deliverable.project, get_jwt_identity()):
+            return error_response("Access denied", 403)
+
+        storage = get_storage(deliverable.storage_backend)
+        if storage.name == "local":
+            # Served by this API after the same membership check
+            download_url = url_for(
+                "deliverables.serve_deliverable_file", deliverable_id=deliverable.id
+            )
+        else:
+            # Generate signed URL for secure download (expires in 1 hour)
+            download_url = storage.download_url(
+                deliverable.cloudinary_public_id,
+                expires_in=3600,  # 1 hour
+                file_type=deliverable.file_type,
+            )
         
         if not download_url:
             return error_response("Failed to generate download URL", 500)
@@ -204,6 +254,17 @@ def download_deliverable(deliverable_id):
         current_app.logger.error(f"Error generating download URL: {str(e)}")
         return error_response("Failed to generate download URL", 500, str(e))
 
+
+@deliverable_bp.route("/<int:deliverable_id>/file", methods=["GET"])
+@jwt_required()
+def serve_deliverable_file(deliverable_id):
+    """Stream the deliverable's file to a project member (Range/ETag aware)"""
+    deliverable = Deliverable.query.get_or_404(deliverable_id)
+    if not _is_project_member(deliverable.project, get_jwt_identity()):
+        return error_response("Access denied", 403)
+
+    return get_storage(deliverable.storage_backend).serve(deliverable.cloudinary_public_id)
+
 @deliverable_bp.route("", methods=["POST"])
 @jwt_required()
 @role_required("freelancer")
@@ -242,12 +303,9 @@ def create_deliverable():
         except ValueError as ve:
             return error_response(str(ve), 400)
         
-        if not all([
-            os.getenv("CLOUDINARY_CLOUD_NAME"),
-            os.getenv("CLOUDINARY_API_KEY"),
-            os.getenv("CLOUDINARY_API_SECRET")
-        ]):
-            current_app.logger.error("Cloudinary credentials missing!")
+        storage = get_storage()
+        if not storage.is_configured():
+            current_app.logger.error(f"Storage backend '{storage.name}' is not configured!")
             return error_response("File upload service not configured", 500)
 
         if not CloudinaryService.allowed_file(file.filename):
@@ -256,10 +314,10 @@ def create_deliverable():
         file_type = CloudinaryService.get_file_type(file.filename)
 
         folder = f"reelbrief/project_{project_id}"
-        upload_result = CloudinaryService.upload_file(file, folder=folder)
+        upload_result = storage.save(file, folder=folder, file_type=file_type)
 
         if not upload_result["success"]:
-            current_app.logger.error(f"Cloudinary upload failed: {upload_result.get('error')}")
+            current_app.logger.error(f"File upload failed: {upload_result.get('error')}")
             return error_response("File upload failed", 500, upload_result.get("error"))
 
         version_number = Deliverable.get_next_version_number(project_id)
@@ -270,8 +328,10 @@ def create_deliverable():
             file_url=upload_result["url"],
             file_type=file_type,
             file_size=upload_result.get("bytes"),
-            cloudinary_public_id=upload_result["public_id"],
+            cloudinary_public_id=upload_result["key"],
+            storage_backend=storage.name,
             thumbnail_url=upload_result.get("thumbnail_url"),
+            preview_urls=upload_result.get("derivatives") or null(),
             title=title or f"Version {version_number}",
             description=description,
             change_notes=change_notes,
@@ -280,45 +340,16 @@ def create_deliverable():
         )
 
         db.session.add(deliverable)
+        db.session.flush()
+        if storage.name == "local":
+            # Local files are not public; point at the authenticated file route
+            deliverable.file_url = url_for(
+                "deliverables.serve_deliverable_file", deliverable_id=deliverable.id
+            )
+        deliverable.promote_to_latest()
+        publish(DeliverableSubmitted(project_id, current_user_id, deliverable.id))
         db.session.commit()
 
-        # Send notification to client
-        try:
-            project = Project.query.get(project_id)
-            if project and project.client_id:
-                client = User.query.get(project.client_id)
-                freelancer = User.query.get(current_user_id)
-
-                if client and client.email:
-                    frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
-                    send_email(
-                        recipient=client.email,
-                        subject=f"New Deliverable: {deliverable.title}",
-                        html_content=f"""
-                        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                            <h2 style="color: #1E3A8A;">New Deliverable Submitted</h2>
-                            <p>Hello {client.first_name},</p>
-                            <p><strong>{freelancer.first_name} {freelancer.last_name}</strong> has uploaded a new deliverable:</p>
-                            
-                            <div style="background-color: #F3F4F6; padding: 15px; border-radius: 8px; margin: 20px 0;">
-                                <h3 style="margin: 0 0 10px 0; color: #1F2937;">{deliverable.title}</h3>
-                                <p style="margin: 5px 0;"><strong>Version:</strong> {deliverable.version_number}</p>
-                                <p style="margin: 5px 0;"><strong>Project:</strong> {project.title}</p>
-                                {f'<p style="margin: 5px 0;"><strong>Changes:</strong> {change_notes}</p>' if change_notes else ''}
-                            </div>
-                            
-                            <a href="{frontend_url}/deliverables/{deliverable.id}" 
-                               style="display: inline-block; background-color: #1E3A8A; color: white; 
-                                      padding: 12px 24px; text-decoration: none; border-radius: 6px; margin: 20px 0;">
-                                Review Deliverable
-                            </a>
-                        </div>
-                        """,
-                    )
-                    current_app.logger.info(f"Notification sent to client: {client.email}")
-        except Exception as email_error:
-            current_app.logger.error(f"Email notification failed: {str(email_error)}")
-
         return jsonify({
             "success": True,
             "message": "Deliverable uploaded successfully",
@@ -380,11 +411,14 @@ def delete_deliverable(deliverable_id):
         deliverable = Deliverable.query.get_or_404(deliverable_id)
 
         if deliverable.cloudinary_public_id:
-            CloudinaryService.delete_file(
-                deliverable.cloudinary_public_id, resource_type="image"
+            get_storage(deliverable.storage_backend).delete(
+                deliverable.cloudinary_public_id, file_type=deliverable.file_type
             )
 
+        project_id = deliverable.project_id
         db.session.delete(deliverable)
+        db.session.flush()
+        Deliverable.refresh_latest_version(project_id)
         db.session.commit()
 
         return jsonify({
@@ -405,8 +439,10 @@ def get_deliverable_versions(deliverable_id):
         deliverable = Deliverable.query.get_or_404(deliverable_id)
         project_id = deliverable.project_id
 
+        # Uploader/reviewer are needed by to_dict; load them with the versions
         versions = (
             Deliverable.query.filter_by(project_id=project_id)
+            .options(joinedload(Deliverable.uploader), joinedload(Deliverable.reviewer))
             .order_by(Deliverable.version_number.asc())
             .all()
         )
@@ -415,6 +451,7 @@ def get_deliverable_versions(deliverable_id):
             "success": True,
             "versions": [v.to_dict(include_feedback=False) for v in versions],
             "total_versions": len(versions),
+            "latest_version_id": deliverable.project.latest_version_id if deliverable.project else None,
         }), 200
 
     except Exception as e:
@@ -459,83 +496,28 @@ def approve_deliverable(deliverable_id):
                         f"Auto-generated portfolio item for project {project.id}, "
                         f"freelancer {project.freelancer_id}"
                     )
-                    
-                    # Send notification to project freelancer
-                    project_freelancer = User.query.get(project.freelancer_id)
-                    if project_freelancer and project_freelancer.email:
-                        try:
-                            frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
-                            send_email(
-                                recipient=project_freelancer.email,
-                                subject="🎉 Portfolio Item Added Automatically!",
-                                html_content=f"""
-                                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                                    <h2 style="color: #1E3A8A;">Portfolio Item Added</h2>
-                                    <p>Hello {project_freelancer.first_name},</p>
-                                    <p>Great news! Your project <strong>"{project.title}"</strong> has been automatically added to your portfolio.</p>
-                                    <p>Clients can now see this completed work when browsing your profile.</p>
-                                    
-                                    <div style="background-color: #F3F4F6; padding: 15px; border-radius: 8px; margin: 20px 0;">
-                                        <h3 style="margin: 0 0 10px 0; color: #1F2937;">{project.title}</h3>
-                                        <p style="margin: 5px 0;"><strong>Status:</strong> Completed & Approved</p>
-                                        <p style="margin: 5px 0;"><strong>Deliverable:</strong> {deliverable.title}</p>
-                                        <p style="margin: 5px 0;"><strong>Added to Portfolio:</strong> {datetime.utcnow().strftime('%B %d, %Y')}</p>
-                                    </div>
-                                    
-                                    <a href="{frontend_url}/portfolio" 
-                                       style="display: inline-block; background-color: #1E3A8A; color: white; 
-                                              padding: 12px 24px; text-decoration: none; border-radius: 6px; margin: 20px 0;">
-                                        View My Portfolio
-                                    </a>
-                                    
-                                    <p style="color: #6B7280; font-size: 14px;">
-                                        You can manage visibility of this item in your portfolio settings.
-                                    </p>
-                                </div>
-                                """
-                            )
-                        except Exception as portfolio_email_error:
-                            current_app.logger.error(f"Portfolio notification email failed: {str(portfolio_email_error)}")
                 
         except Exception as portfolio_error:
             current_app.logger.error(f"Portfolio auto-generation failed: {str(portfolio_error)}")
             # Don't fail the whole approval if portfolio generation fails
 
-        # Approval notification
-        try:
-            project_freelancer = User.query.get(project.freelancer_id)
-            if project_freelancer and project_freelancer.email:
-                send_deliverable_approved_notification(
-                    project_freelancer.email,
-                    deliverable.title,
-                    project.title
-                )
-                current_app.logger.info(f"Approval notification sent to project freelancer: {project_freelancer.email}")
-        except Exception as email_error:
-            current_app.logger.error(f"Email notification failed: {str(email_error)}")
-
-        # Escrow Payment Release Logic
-        try:
-            escrow = EscrowTransaction.query.filter_by(project_id=project.id, status="held").first()
-
-            if escrow:
-                escrow.status = "released"
-                escrow.released_at = datetime.utcnow()
-
-                # Send payment notification
-                try:
-                    project_freelancer = User.query.get(project.freelancer_id)
-                    if project_freelancer and project_freelancer.email:
-                        from app.services.email_service import send_payment_released_notification
-                        send_payment_released_notification(
-                            project_freelancer.email, float(escrow.amount), project.title
-                        )
-                        current_app.logger.info(f"Payment released: ${escrow.amount}")
-                except Exception as payment_email_error:
-                    current_app.logger.error(f"Payment notification failed: {str(payment_email_error)}")
-        except Exception as escrow_error:
-            current_app.logger.error(f"Escrow release failed: {str(escrow_error)}")
-
+        # Escrow Payment Release Logic (row-locked; a no-op unless the escrow is still held)
+        released_amount = None
+        escrow = release_project_escrow(project.id)
+        if escrow:
+            released_amount = float(escrow.amount)
+            current_app.logger.info(f"Payment released: ${escrow.amount}")
+
+        # Approval, portfolio and payment emails/notifications run after commit
+        publish(
+            DeliverableApproved(
+                deliverable.project_id,
+                current_user_id,
+                deliverable.id,
+                portfolio_created=portfolio_created,
+                escrow_released_amount=released_amount,
+            )
+        )
         db.session.commit()
 
         return jsonify({
@@ -546,6 +528,9 @@ def approve_deliverable(deliverable_id):
             "portfolio_created": portfolio_created
         }), 200
 
+    except EscrowStateError as e:
+        db.session.rollback()
+        return error_response(str(e), 409)
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error approving deliverable: {str(e)}")
@@ -578,22 +563,13 @@ def request_revision(deliverable_id):
         )
 
         db.session.add(feedback)
+        publish(
+            RevisionRequested(
+                deliverable.project_id, current_user_id, deliverable.id, feedback=feedback.content
+            )
+        )
         db.session.commit()
 
-        #  Get the project's assigned freelancer
-        try:
-            project = Project.query.get(deliverable.project_id)
-            project_freelancer = User.query.get(project.freelancer_id)
-            
-            if project_freelancer and project_freelancer.email:
-                send_deliverable_feedback_notification(
-                    project_freelancer.email,  # Use project freelancer email
-                    deliverable.title,
-                    feedback.content
-                )
-                current_app.logger.info(f"Revision notification sent to project freelancer: {project_freelancer.email}")
-        except Exception as email_error:
-            current_app.logger.error(f"Email notification failed: {str(email_error)}")
         return jsonify({
             "success": True,
             "message": "Revision requested successfully",
@@ -630,23 +606,13 @@ def reject_deliverable(deliverable_id):
         )
 
         db.session.add(feedback)
+        publish(
+            DeliverableRejected(
+                deliverable.project_id, current_user_id, deliverable.id, reason=feedback.content
+            )
+        )
         db.session.commit()
 
-        # Get the project's assigned freelancer for notifications
-        try:
-            project = Project.query.get(deliverable.project_id)
-            project_freelancer = User.query.get(project.freelancer_id)
-            
-            if project_freelancer and project_freelancer.email:
-                send_deliverable_feedback_notification(
-                    project_freelancer.email,  # FIXED: Use project freelancer email
-                    deliverable.title,
-                    f"REJECTED: {data.get('reason', 'Deliverable rejected')}",
-                )
-                current_app.logger.info(f"Rejection notification sent to project freelancer: {project_freelancer.email}")
-        except Exception as email_error:
-            current_app.logger.error(f"Email notification failed: {str(email_error)}")
-
         return jsonify({
             "success": True,
             "message": "Deliverable rejected",
@@ -674,9 +640,11 @@ def compare_versions():
         if version1.project_id != version2.project_id:
             return error_response("Versions must be from the same project", 400)
 
+        threads = load_feedback_threads([version1.id, version2.id])
+
         comparison = {
-            "version1": version1.to_dict(include_feedback=True),
-            "version2": version2.to_dict(include_feedback=True),
+            "version1": version1.to_dict(feedback=threads[version1.id]),
+            "version2": version2.to_dict(feedback=threads[version2.id]),
             "differences": {
                 "version_diff": version2.version_number - version1.version_number,
                 "time_diff_hours": (version2.uploaded_at - version1.uploaded_at).total_seconds() / 3600,
@@ -693,6 +661,134 @@ def compare_versions():
         current_app.logger.error(f"Error comparing versions: {str(e)}")
         return error_response("Failed to compare versions", 500, str(e))
 
+
+@deliverable_bp.route("/previews/backfill", methods=["POST"])
+@jwt_required()
+@role_required("admin")
+def backfill_previews():
+    """
+    Generate eager previews for deliverables uploaded before the derivative pipeline.
+
+    With a limit (at most MAX_SYNC_BACKFILL) the batch runs in the request; without one
+    the whole-table backfill is queued as a background job.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        try:
+            batch_size = min(int(data.get("batch_size", 100)), 500)
+            limit = data.get("limit")
+            if limit is not None:
+                limit = int(limit)
+        except (TypeError, ValueError):
+            return error_response("batch_size and limit must be integers", 400)
+
+        if limit is None:
+            job = enqueue("deliverables.backfill_previews", {"batch_size": batch_size})
+            db.session.commit()
+            return jsonify({"success": True, "job_id": job.id}), 202
+
+        if not 0 < limit <= MAX_SYNC_BACKFILL:
+            return error_response(f"limit must be between 1 and {MAX_SYNC_BACKFILL}", 400)
+
+        summary = backfill_deliverable_previews(batch_size=batch_size, limit=limit)
+
+        return jsonify({"success": True, "summary": summary}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error backfilling previews: {str(e)}")
+        return error_response("Failed to backfill previews", 500, str(e))
+
+
+@deliverable_bp.route("/projects/<int:project_id>/timeline", methods=["GET"])
+@jwt_required()
+def get_version_timeline(project_id):
+    """Pairwise deltas (size, time, status) across every version of a project"""
+    try:
+        project_deliverables = select(Deliverable.id).where(Deliverable.project_id == project_id)
+        feedback_counts = (
+            db.session.query(
+                Feedback.deliverable_id.label("deliverable_id"),
+                func.count(Feedback.id).label("feedback_count"),
+                func.sum(case((Feedback.is_resolved.is_(False), 1), else_=0)).label("unresolved_count"),
+            )
+            .filter(Feedback.deliverable_id.in_(project_deliverables))
+            .group_by(Feedback.deliverable_id)
+            .subquery()
+        )
+
+        # One query: LAG over the version chain plus aggregated feedback counts
+        previous = {"partition_by": Deliverable.project_id, "order_by": Deliverable.version_number}
+        rows = (
+            db.session.query(
+                Deliverable.id,
+                Deliverable.version_number,
+                Deliverable.title,
+                Deliverable.status,
+                Deliverable.file_type,
+                Deliverable.file_size,
+                Deliverable.thumbnail_url,
+                Deliverable.uploaded_at,
+                func.lag(Deliverable.id).over(**previous).label("previous_id"),
+                func.lag(Deliverable.status, type_=Deliverable.status.type)
+                .over(**previous)
+                .label("previous_status"),
+                func.lag(Deliverable.uploaded_at, type_=Deliverable.uploaded_at.type)
+                .over(**previous)
+                .label("previous_uploaded_at"),
+                (Deliverable.file_size - func.lag(Deliverable.file_size).over(**previous)).label(
+                    "size_diff_bytes"
+                ),
+                func.coalesce(feedback_counts.c.feedback_count, 0).label("feedback_count"),
+                func.coalesce(feedback_counts.c.unresolved_count, 0).label("unresolved_count"),
+            )
+            .outerjoin(feedback_counts, feedback_counts.c.deliverable_id == Deliverable.id)
+            .filter(Deliverable.project_id == project_id)
+            .order_by(Deliverable.version_number.asc())
+            .all()
+        )
+
+        timeline = []
+        for row in rows:
+            delta = None
+            if row.previous_id is not None:
+                delta = {
+                    "previous_id": row.previous_id,
+                    "size_diff_bytes": row.size_diff_bytes,
+                    "time_diff_hours": (
+                        (row.uploaded_at - row.previous_uploaded_at).total_seconds() / 3600
+                        if row.uploaded_at and row.previous_uploaded_at
+                        else None
+                    ),
+                    "previous_status": row.previous_status,
+                    "status_changed": row.previous_status != row.status,
+                }
+
+            timeline.append({
+                "id": row.id,
+                "version_number": row.version_number,
+                "title": row.title,
+                "status": row.status,
+                "file_type": row.file_type,
+                "file_size": row.file_size,
+                "thumbnail_url": row.thumbnail_url,
+                "uploaded_at": row.uploaded_at.isoformat() if row.uploaded_at else None,
+                "feedback_count": int(row.feedback_count),
+                "unresolved_feedback_count": int(row.unresolved_count),
+                "delta": delta,
+            })
+
+        return jsonify({
+            "success": True,
+            "project_id": project_id,
+            "timeline": timeline,
+            "total_versions": len(timeline),
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error building version timeline: {str(e)}")
+        return error_response("Failed to build version timeline", 500, str(e))
+
 @deliverable_bp.route("/portfolio/items", methods=["GET"])
 @jwt_required()
 def get_my_portfolio_items():
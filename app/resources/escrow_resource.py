@@ -2,34 +2,47 @@
 Escrow Resource
 Owner: Caleb
 Description:
-Handles escrow transactions for projects — creation, release, refund, and retrieval.
-Integrated with JWT authentication and role-based access control.
+Handles escrow transactions for projects — creation, release, refund, dispute, and retrieval.
+Integrated with JWT authentication and role-based access control. Status changes go through
+the escrow state machine (escrow_service) and accept an Idempotency-Key header.
 """
 
-from datetime import datetime
-
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
 
 from app.extensions import db
 from app.models.escrow_transaction import EscrowTransaction
 from app.models.project import Project
+from app.services import escrow_service
+from app.services.escrow_service import EscrowStateError
+from app.services.idempotency_service import idempotent
 
 escrow_bp = Blueprint("escrow_bp", __name__, url_prefix="/api/escrow")
 
 
+def _expected_version(data):
+    """Optional optimistic-lock version sent by the client (None when absent)"""
+    version = data.get("version")
+    if version is None:
+        return None
+    if isinstance(version, bool) or not isinstance(version, int):
+        raise ValueError("version must be an integer")
+    return version
+
+
 @escrow_bp.post("/create")
 @jwt_required()
+@idempotent
 def create_escrow():
     """Create an escrow transaction for a project."""
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     claims = get_jwt()
     role = claims.get("role")
 
     if role not in ["client", "admin"]:
         return jsonify({"error": "Unauthorized to create escrow"}), 403
 
-    data = request.get_json()
+    data = request.get_json() or {}
     project_id = data.get("project_id")
     amount = data.get("amount")
 
@@ -40,85 +53,124 @@ def create_escrow():
     if not project:
         return jsonify({"error": "Project not found"}), 404
 
-    existing_escrow = EscrowTransaction.query.filter_by(project_id=project_id).first()
-    if existing_escrow:
-        return jsonify({"error": "Escrow already exists for this project"}), 409
-
-    escrow = EscrowTransaction(
-        project_id=project_id,
-        client_id=user_id,
-        freelancer_id=getattr(project, "freelancer_id", None),
-        amount=amount,
-        status="in_escrow",
-        created_at=datetime.utcnow(),
-    )
+    if not project.freelancer_id:
+        return jsonify({"error": "Project has no freelancer assigned"}), 400
 
-    db.session.add(escrow)
-    db.session.commit()
+    try:
+        escrow = escrow_service.create_escrow(
+            project,
+            client_id=user_id,
+            amount=amount,
+            admin_id=user_id if role == "admin" else None,
+            payment_method=data.get("payment_method"),
+        )
+    except EscrowStateError as e:
+        return jsonify({"error": str(e)}), 409
 
     return jsonify({"message": "Escrow created successfully", "escrow": escrow.to_dict()}), 201
 
 
-@escrow_bp.post("/release")
-@jwt_required()
-def release_escrow():
-    """Release escrow funds to freelancer."""
-    claims = get_jwt()
-    role = claims.get("role")
-
-    if role not in ["client", "admin"]:
-        return jsonify({"error": "Unauthorized to release funds"}), 403
+def _load_for_action(data, user_id, role, roles, action):
+    """Common checks for release/refund/dispute; returns (escrow_id, error response)"""
+    if role not in roles:
+        return None, (jsonify({"error": f"Unauthorized to {action} funds"}), 403)
 
-    data = request.get_json()
     escrow_id = data.get("escrow_id")
-
     if not escrow_id:
-        return jsonify({"error": "Missing escrow_id"}), 400
+        return None, (jsonify({"error": "Missing escrow_id"}), 400)
 
-    escrow = EscrowTransaction.query.get(escrow_id)
+    escrow = db.session.get(EscrowTransaction, escrow_id)
     if not escrow:
-        return jsonify({"error": "Escrow not found"}), 404
+        return None, (jsonify({"error": "Escrow not found"}), 404)
+
+    if role == "client" and user_id != escrow.client_id:
+        return None, (jsonify({"error": f"Only the funding client can {action} this escrow"}), 403)
+    if role == "freelancer" and user_id != escrow.freelancer_id:
+        return None, (jsonify({"error": "You are not the freelancer on this escrow"}), 403)
 
-    if escrow.status != "in_escrow":
-        return jsonify({"error": "Funds already released or refunded"}), 400
+    return escrow_id, None
 
-    escrow.status = "released"
-    escrow.released_at = datetime.utcnow()
 
-    db.session.commit()
+@escrow_bp.post("/release")
+@jwt_required()
+@idempotent
+def release_escrow():
+    """Release escrow funds to freelancer (admins also resolve disputes this way)."""
+    user_id = int(get_jwt_identity())
+    role = get_jwt().get("role")
+    data = request.get_json() or {}
+
+    escrow_id, error = _load_for_action(data, user_id, role, ["client", "admin"], "release")
+    if error:
+        return error
+
+    try:
+        escrow = escrow_service.release_escrow(
+            escrow_id,
+            expected_version=_expected_version(data),
+            resolve_dispute=role == "admin",
+        )
+    except EscrowStateError as e:
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     return jsonify({"message": "Funds released successfully", "escrow": escrow.to_dict()}), 200
 
 
 @escrow_bp.post("/refund")
 @jwt_required()
+@idempotent
 def refund_escrow():
     """Refund escrow to client if project is cancelled or disputed."""
-    claims = get_jwt()
-    role = claims.get("role")
-
-    if role not in ["client", "admin"]:
-        return jsonify({"error": "Unauthorized to refund funds"}), 403
-
-    data = request.get_json()
-    escrow_id = data.get("escrow_id")
-
-    if not escrow_id:
-        return jsonify({"error": "Missing escrow_id"}), 400
-
-    escrow = EscrowTransaction.query.get(escrow_id)
-    if not escrow:
-        return jsonify({"error": "Escrow not found"}), 404
-
-    if escrow.status != "in_escrow":
-        return jsonify({"error": "Cannot refund. Funds already released or refunded"}), 400
+    user_id = int(get_jwt_identity())
+    role = get_jwt().get("role")
+    data = request.get_json() or {}
+
+    escrow_id, error = _load_for_action(data, user_id, role, ["client", "admin"], "refund")
+    if error:
+        return error
+
+    try:
+        escrow = escrow_service.refund_escrow(
+            escrow_id,
+            reason=data.get("reason"),
+            expected_version=_expected_version(data),
+            resolve_dispute=role == "admin",
+        )
+    except EscrowStateError as e:
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    escrow.status = "refunded"
-    escrow.refunded_at = datetime.utcnow()
+    return jsonify({"message": "Funds refunded successfully", "escrow": escrow.to_dict()}), 200
 
-    db.session.commit()
 
-    return jsonify({"message": "Funds refunded successfully", "escrow": escrow.to_dict()}), 200
+@escrow_bp.post("/dispute")
+@jwt_required()
+@idempotent
+def dispute_escrow():
+    """Freeze held funds until an admin releases or refunds them."""
+    user_id = int(get_jwt_identity())
+    role = get_jwt().get("role")
+    data = request.get_json() or {}
+
+    escrow_id, error = _load_for_action(
+        data, user_id, role, ["client", "freelancer", "admin"], "dispute"
+    )
+    if error:
+        return error
+
+    try:
+        escrow = escrow_service.dispute_escrow(
+            escrow_id, reason=data.get("reason"), expected_version=_expected_version(data)
+        )
+    except EscrowStateError as e:
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"message": "Escrow disputed", "escrow": escrow.to_dict()}), 200
 
 
 @escrow_bp.get("/<int:project_id>")
@@ -3,9 +3,27 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.feedback import Feedback
 from app.models.deliverable import Deliverable
+from app.models.project import Project
+from app.services.feedback_service import (
+    create_feedback_batch,
+    load_feedback_thread,
+    set_feedback_resolution,
+    validate_feedback_items,
+)
 
 feedback_bp = Blueprint('feedback', __name__)
 
+MAX_COUNT_IDS = 500
+MAX_BATCH_SIZE = 200
+
+
+def _parse_id_list(raw):
+    """Parse a comma-separated id list from a query string"""
+    if not raw:
+        return []
+    return list({int(part) for part in raw.split(',') if part.strip()})
+
+
 @feedback_bp.route('/', methods=['POST'])
 @jwt_required()
 def submit_feedback():
@@ -99,6 +117,117 @@ def submit_feedback():
             'success': False
         }), 500
 
+
+@feedback_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def submit_feedback_bulk():
+    """Submit many feedback items for one deliverable in a single INSERT"""
+    try:
+        current_user_id = get_jwt_identity()
+        data = request.get_json() or {}
+        items = data.get('items')
+
+        if not data.get('deliverable_id') or not isinstance(items, list) or not items:
+            return jsonify({
+                'error': 'Validation failed',
+                'message': 'deliverable_id and a non-empty items list are required',
+                'success': False
+            }), 400
+
+        if len(items) > MAX_BATCH_SIZE:
+            return jsonify({
+                'error': 'Validation failed',
+                'message': f'At most {MAX_BATCH_SIZE} items per request',
+                'success': False
+            }), 400
+
+        deliverable = Deliverable.query.get(data['deliverable_id'])
+        if not deliverable:
+            return jsonify({
+                'error': 'Deliverable not found',
+                'message': f'Deliverable with ID {data["deliverable_id"]} does not exist',
+                'success': False
+            }), 404
+
+        errors = validate_feedback_items(items, deliverable.id)
+        if errors:
+            return jsonify({
+                'error': 'Validation failed',
+                'message': f'{len(errors)} invalid item(s); nothing was saved',
+                'details': {'items': errors},
+                'success': False
+            }), 400
+
+        created = create_feedback_batch(deliverable.id, current_user_id, items)
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'message': f'{len(created)} feedback items submitted',
+            'feedback': [feedback.to_dict(include_replies=False) for feedback in created]
+        }), 201
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'error': 'Failed to submit feedback',
+            'message': str(e),
+            'success': False
+        }), 500
+
+
+@feedback_bp.route('/batch/resolve', methods=['PUT'])
+@jwt_required()
+def resolve_feedback_batch():
+    return _set_batch_resolution(True)
+
+
+@feedback_bp.route('/batch/unresolve', methods=['PUT'])
+@jwt_required()
+def unresolve_feedback_batch():
+    return _set_batch_resolution(False)
+
+
+def _set_batch_resolution(resolved):
+    """Resolve or unresolve a list of feedback ids with one UPDATE"""
+    action = 'resolve' if resolved else 'unresolve'
+    try:
+        feedback_ids = (request.get_json() or {}).get('feedback_ids')
+
+        if not isinstance(feedback_ids, list) or not feedback_ids:
+            return jsonify({
+                'error': 'Validation failed',
+                'message': 'feedback_ids must be a non-empty list',
+                'success': False
+            }), 400
+
+        if len(feedback_ids) > MAX_COUNT_IDS:
+            return jsonify({
+                'error': 'Validation failed',
+                'message': f'At most {MAX_COUNT_IDS} ids per request',
+                'success': False
+            }), 400
+
+        changed_ids = set_feedback_resolution(feedback_ids, resolved)
+        db.session.commit()
+        changed = set(changed_ids)
+
+        return jsonify({
+            'success': True,
+            'message': f'{len(changed_ids)} feedback items marked as {action}d',
+            'updated_ids': changed_ids,
+            'unchanged_ids': [fid for fid in feedback_ids if fid not in changed]
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'error': f'Failed to {action} feedback',
+            'message': str(e),
+            'success': False
+        }), 500
+
+
 @feedback_bp.route('/deliverable/<int:deliverable_id>', methods=['GET'])
 @jwt_required()
 def get_deliverable_feedback(deliverable_id):
@@ -111,14 +240,14 @@ def get_deliverable_feedback(deliverable_id):
                 'success': False
             }), 404
         
-        # Get feedback for this deliverable using your model's static method
-        feedback_list = Feedback.get_feedback_for_deliverable(deliverable_id)
+        # Whole thread tree (all reply levels) in one query
+        feedback_list = load_feedback_thread(deliverable_id)
         
         return jsonify({
             'success': True,
             'deliverable_id': deliverable_id,
-            'feedback': [feedback.to_dict() for feedback in feedback_list],
-            'unresolved_count': Feedback.get_unresolved_count(deliverable_id)
+            'feedback': feedback_list,
+            'unresolved_count': deliverable.unresolved_feedback_count
         }), 200
         
     except Exception as e:
@@ -128,6 +257,63 @@ def get_deliverable_feedback(deliverable_id):
             'success': False
         }), 500
 
+
+@feedback_bp.route('/unresolved-counts', methods=['GET'])
+@jwt_required()
+def get_unresolved_counts():
+    """Open-feedback badges for many deliverables and/or projects in one call"""
+    try:
+        deliverable_ids = _parse_id_list(request.args.get('deliverable_ids'))
+        project_ids = _parse_id_list(request.args.get('project_ids'))
+
+        if not deliverable_ids and not project_ids:
+            return jsonify({
+                'error': 'Validation failed',
+                'message': 'Provide deliverable_ids and/or project_ids',
+                'success': False
+            }), 400
+
+        if len(deliverable_ids) + len(project_ids) > MAX_COUNT_IDS:
+            return jsonify({
+                'error': 'Validation failed',
+                'message': f'At most {MAX_COUNT_IDS} ids per request',
+                'success': False
+            }), 400
+
+        deliverable_counts = {}
+        if deliverable_ids:
+            rows = db.session.query(Deliverable.id, Deliverable.unresolved_feedback_count).filter(
+                Deliverable.id.in_(deliverable_ids)
+            )
+            deliverable_counts = {str(row_id): count for row_id, count in rows}
+
+        project_counts = {}
+        if project_ids:
+            rows = db.session.query(Project.id, Project.unresolved_feedback_count).filter(
+                Project.id.in_(project_ids)
+            )
+            project_counts = {str(row_id): count for row_id, count in rows}
+
+        return jsonify({
+            'success': True,
+            'deliverables': deliverable_counts,
+            'projects': project_counts
+        }), 200
+
+    except ValueError:
+        return jsonify({
+            'error': 'Validation failed',
+            'message': 'ids must be a comma-separated list of integers',
+            'success': False
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to fetch unresolved counts',
+            'message': str(e),
+            'success': False
+        }), 500
+
+
 @feedback_bp.route('/<int:feedback_id>/resolve', methods=['PUT'])
 @jwt_required()
 def resolve_feedback(feedback_id):
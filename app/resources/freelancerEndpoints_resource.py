@@ -1,8 +1,9 @@
 # app/routes/freelancer_routes.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app.extensions import db
 from app.models.freelancer import Freelancer
 from app.schemas.freelancer_schema import FreelancerSchema
+from app.services.storage_service import CV_FOLDER, get_storage
 
 freelancer_bp = Blueprint("freelancer", __name__, url_prefix="/api/freelancers")
 schema = FreelancerSchema()
@@ -33,13 +34,20 @@ def submit_freelancer():
     cv_file = request.files.get("cv")
     portfolio_file = request.files.get("portfolio")
 
-    cv_url = f"/uploads/{cv_file.filename}" if cv_file else None
-    portfolio_url = f"/uploads/{portfolio_file.filename}" if portfolio_file else None
+    storage = get_storage(current_app.config.get("CV_STORAGE_BACKEND"))
+    cv_url = None
+    portfolio_url = None
 
     if cv_file:
-        cv_file.save(f"uploads/{cv_file.filename}")
+        stored = storage.save(cv_file, folder=CV_FOLDER, file_type="document")
+        if not stored["success"]:
+            return jsonify({"success": False, "error": "CV upload failed"}), 500
+        cv_url = stored["url"]
     if portfolio_file:
-        portfolio_file.save(f"uploads/{portfolio_file.filename}")
+        stored = storage.save(portfolio_file, folder=CV_FOLDER, file_type="document")
+        if not stored["success"]:
+            return jsonify({"success": False, "error": "Portfolio upload failed"}), 500
+        portfolio_url = stored["url"]
 
     freelancer = Freelancer(
         name=name,
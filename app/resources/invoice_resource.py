@@ -5,13 +5,19 @@ Description: Handles creation, retrieval, and payment of invoices.
 """
 
 from datetime import datetime
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
 from sqlalchemy.exc import IntegrityError
 from app.extensions import db
-from app.models.escrow_transaction import EscrowTransaction
 from app.models.invoice import Invoice
 from app.models.project import Project
+from app.services.escrow_service import EscrowStateError, pay_invoice as pay_invoice_with_escrow
+from app.services.idempotency_service import idempotent
+from app.services.invoice_number_service import next_invoice_number
+from app.services.invoice_pdf_service import ensure_invoice_pdf
+from app.services.invoice_service import generate_invoices
+from app.services.job_service import enqueue
+from app.services.storage_service import get_storage
 
 invoice_bp = Blueprint("invoice_bp", __name__, url_prefix="/api/invoices")
 
@@ -65,6 +71,38 @@ def get_invoice(invoice_id):
     return jsonify({"invoice": invoice.to_dict()}), 200
 
 
+# -------------------- GET /api/invoices/<id>/pdf --------------------
+@invoice_bp.get("/<int:invoice_id>/pdf")
+@jwt_required()
+def download_invoice_pdf(invoice_id):
+    """Download the invoice PDF; rendered only when the invoice changed since last time."""
+    user_id = get_jwt_identity()
+    claims = get_jwt()
+    role = claims.get("role")
+
+    invoice = Invoice.query.get_or_404(invoice_id)
+
+    if role != "admin" and user_id not in [invoice.client_id, invoice.freelancer_id]:
+        return jsonify({"error": "Access denied"}), 403
+
+    try:
+        digest = ensure_invoice_pdf(invoice)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Invoice {invoice_id} PDF failed: {str(e)}")
+        return jsonify({"error": "Could not generate the invoice PDF"}), 500
+
+    # The ETag is the content hash, so unchanged invoices are answered without storage access
+    if digest in request.if_none_match:
+        response = current_app.response_class(status=304)
+    else:
+        response = get_storage(invoice.pdf_storage_backend).serve(
+            invoice.pdf_key, download_name=f"{invoice.invoice_number}.pdf"
+        )
+    response.set_etag(digest)
+    return response
+
+
 # -------------------- POST /api/invoices --------------------
 @invoice_bp.post("/")
 @jwt_required()
@@ -96,7 +134,7 @@ def create_invoice():
     if role == "freelancer" and project.freelancer_id != user_id:
         return jsonify({"error": "You cannot invoice this project"}), 403
 
-    invoice_number = f"INV-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+    invoice_number = next_invoice_number()
 
     new_invoice = Invoice(
         project_id=project_id,
@@ -121,9 +159,57 @@ def create_invoice():
     }), 201
 
 
+# -------------------- POST /api/invoices/batch --------------------
+@invoice_bp.post("/batch")
+@jwt_required()
+def create_invoices_batch():
+    """
+    Invoice every completed project that has no invoice yet (admin only).
+
+    Body (all optional): project_ids, completed_before (YYYY-MM-DD), due_days, dry_run.
+    Returns one result per project: created, skipped (with reason) or eligible (dry run).
+    """
+    claims = get_jwt()
+    if claims.get("role") != "admin":
+        return jsonify({"error": "Only admins can run batch invoicing"}), 403
+
+    data = request.get_json(silent=True) or {}
+    project_ids = data.get("project_ids")
+    if project_ids is not None and (
+        not isinstance(project_ids, list) or not all(isinstance(i, int) for i in project_ids)
+    ):
+        return jsonify({"error": "project_ids must be a list of integers"}), 400
+
+    try:
+        completed_before = (
+            datetime.strptime(data["completed_before"], "%Y-%m-%d")
+            if data.get("completed_before")
+            else None
+        )
+        due_days = int(data["due_days"]) if data.get("due_days") is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid completed_before or due_days"}), 400
+
+    report = generate_invoices(
+        project_ids=project_ids,
+        completed_before=completed_before,
+        due_days=due_days,
+        dry_run=bool(data.get("dry_run")),
+    )
+    created_ids = [r["invoice_id"] for r in report["results"] if r["status"] == "created"]
+    if created_ids:
+        # Pre-render the run's PDFs in the background so downloads are instant
+        job = enqueue("invoices.render_pdfs", {"invoice_ids": created_ids})
+        db.session.commit()
+        report["render_job_id"] = job.id
+
+    return jsonify(report), 200 if report["dry_run"] else 201
+
+
 # -------------------- PATCH /api/invoices/<id>/pay --------------------
 @invoice_bp.patch("/<int:invoice_id>/pay")
 @jwt_required()
+@idempotent
 def pay_invoice(invoice_id):
     """Mark an invoice as paid (client only)."""
     user_id = get_jwt_identity()
@@ -135,20 +221,14 @@ def pay_invoice(invoice_id):
     if role != "client" or user_id != invoice.client_id:
         return jsonify({"error": "Only the client who owns this invoice can pay it"}), 403
 
-    if invoice.status == "paid":
-        return jsonify({"message": "Invoice already paid"}), 200
-
-    invoice.status = "paid"
-    invoice.paid_at = datetime.utcnow()
-
-    # Optional: update escrow
-    if invoice.escrow_id:
-        escrow = EscrowTransaction.query.get(invoice.escrow_id)
-        if escrow:
-            escrow.status = "released"
-            escrow.released_at = datetime.utcnow()
+    # Locks escrow then invoice and releases a held escrow through the state machine
+    try:
+        invoice, paid_now = pay_invoice_with_escrow(invoice_id)
+    except EscrowStateError as e:
+        return jsonify({"error": str(e)}), 409
 
-    db.session.commit()
+    if not paid_now:
+        return jsonify({"message": "Invoice already paid"}), 200
     return jsonify({"message": "Invoice marked as paid", "invoice": invoice.to_dict()}), 200
 
 
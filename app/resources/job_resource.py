@@ -0,0 +1,240 @@
+"""
+Job Resource
+Owner: Caleb
+Description: Admin API for background jobs: list and inspect jobs, queue a registered task,
+retry failed jobs, cancel queued ones, and view the cron schedules. The submitter of a
+job may also read its status.
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models.job import JOB_STATUSES, Job, JobSchedule
+from app.models.user import User
+from app.services.job_service import TASKS, cancel_job, enqueue, retry_job
+from app.utils.decorators import role_required
+
+jobs_bp = Blueprint("jobs", __name__)
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+@jobs_bp.route("/", methods=["GET"])
+@jwt_required()
+@role_required("admin")
+def list_jobs():
+    """
+    Jobs, newest first
+    ---
+    tags:
+      - Jobs
+    parameters:
+      - in: query
+        name: status
+        type: string
+        enum: [queued, running, succeeded, failed, cancelled]
+      - in: query
+        name: task
+        type: string
+      - in: query
+        name: limit
+        type: integer
+        default: 50
+        description: Page size (max 200)
+      - in: query
+        name: before_id
+        type: integer
+        description: Last id of the previous page
+    responses:
+      200:
+        description: One page of jobs
+      400:
+        description: Unknown status
+    """
+    status = request.args.get("status")
+    if status and status not in JOB_STATUSES:
+        return jsonify({"success": False, "error": f"Unknown status: {status}"}), 400
+
+    limit = max(1, min(request.args.get("limit", DEFAULT_LIMIT, type=int), MAX_LIMIT))
+    query = Job.query
+    if status:
+        query = query.filter(Job.status == status)
+    if request.args.get("task"):
+        query = query.filter(Job.task == request.args["task"])
+    before_id = request.args.get("before_id", type=int)
+    if before_id:
+        query = query.filter(Job.id < before_id)
+
+    jobs = query.order_by(Job.id.desc()).limit(limit + 1).all()
+    page = jobs[:limit]
+    return (
+        jsonify(
+            {
+                "success": True,
+                "jobs": [job.to_dict() for job in page],
+                "next_before_id": page[-1].id if len(jobs) > limit else None,
+            }
+        ),
+        200,
+    )
+
+
+@jobs_bp.route("/stats", methods=["GET"])
+@jwt_required()
+@role_required("admin")
+def job_stats():
+    """Job counts by status and the age of the oldest due job"""
+    counts = dict(db.session.query(Job.status, func.count()).group_by(Job.status).all())
+    oldest_due = (
+        db.session.query(func.min(Job.run_at))
+        .filter(Job.status == "queued", Job.run_at <= datetime.utcnow())
+        .scalar()
+    )
+    return (
+        jsonify(
+            {
+                "success": True,
+                "counts": {status: counts.get(status, 0) for status in JOB_STATUSES},
+                "oldest_due_seconds": (
+                    (datetime.utcnow() - oldest_due).total_seconds() if oldest_due else None
+                ),
+                "tasks": sorted(TASKS),
+            }
+        ),
+        200,
+    )
+
+
+@jobs_bp.route("/schedules", methods=["GET"])
+@jwt_required()
+@role_required("admin")
+def list_schedules():
+    """Cron schedules and their next run"""
+    schedules = JobSchedule.query.order_by(JobSchedule.name).all()
+    return jsonify({"success": True, "schedules": [s.to_dict() for s in schedules]}), 200
+
+
+@jobs_bp.route("/<int:job_id>", methods=["GET"])
+@jwt_required()
+def get_job(job_id):
+    """
+    Status and result of one job (admins, or the user who queued it)
+    ---
+    tags:
+      - Jobs
+    responses:
+      200:
+        description: The job
+      404:
+        description: Job not found
+    """
+    job = Job.query.get(job_id)
+    user = User.query.get(get_jwt_identity())
+    if not job or not user or (user.role != "admin" and job.created_by != user.id):
+        return jsonify({"success": False, "error": "Job not found"}), 404
+    return jsonify({"success": True, "job": job.to_dict()}), 200
+
+
+@jobs_bp.route("/", methods=["POST"])
+@jwt_required()
+@role_required("admin")
+def create_job():
+    """
+    Queue a registered task
+    ---
+    tags:
+      - Jobs
+    parameters:
+      - in: body
+        name: body
+        schema:
+          type: object
+          required: [task]
+          properties:
+            task:
+              type: string
+            payload:
+              type: object
+            queue:
+              type: string
+            priority:
+              type: integer
+            run_at:
+              type: string
+              format: date-time
+            unique_key:
+              type: string
+    responses:
+      201:
+        description: Job queued
+      400:
+        description: Unknown task or invalid fields
+      409:
+        description: A job with this unique_key already exists
+    """
+    data = request.get_json() or {}
+    payload = data.get("payload") or {}
+    if not isinstance(payload, dict):
+        return jsonify({"success": False, "error": "payload must be an object"}), 400
+
+    run_at = None
+    if data.get("run_at"):
+        try:
+            run_at = datetime.fromisoformat(data["run_at"])
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "error": "run_at must be an ISO datetime"}), 400
+
+    try:
+        job = enqueue(
+            data.get("task"),
+            payload,
+            run_at=run_at,
+            queue=data.get("queue"),
+            priority=int(data.get("priority", 0)),
+            unique_key=data.get("unique_key"),
+            created_by=int(get_jwt_identity()),
+        )
+    except (TypeError, ValueError) as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 400
+    if job is None:
+        db.session.rollback()
+        return jsonify({"success": False, "error": "A job with this unique_key exists"}), 409
+
+    db.session.commit()
+    return jsonify({"success": True, "job": job.to_dict()}), 201
+
+
+@jobs_bp.route("/<int:job_id>/retry", methods=["POST"])
+@jwt_required()
+@role_required("admin")
+def retry(job_id):
+    """Queue a failed or cancelled job again"""
+    if not retry_job(job_id):
+        db.session.rollback()
+        return _not_changed(job_id, "Only failed or cancelled jobs can be retried")
+    db.session.commit()
+    return jsonify({"success": True, "job": Job.query.get(job_id).to_dict()}), 200
+
+
+@jobs_bp.route("/<int:job_id>/cancel", methods=["POST"])
+@jwt_required()
+@role_required("admin")
+def cancel(job_id):
+    """Cancel a job that has not started"""
+    if not cancel_job(job_id):
+        db.session.rollback()
+        return _not_changed(job_id, "Only queued jobs can be cancelled")
+    db.session.commit()
+    return jsonify({"success": True, "job": Job.query.get(job_id).to_dict()}), 200
+
+
+def _not_changed(job_id, message):
+    if Job.query.get(job_id) is None:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+    return jsonify({"success": False, "error": message}), 409
@@ -0,0 +1,83 @@
+"""
+Leaderboard Resource
+Owner: Caleb
+Description: "Top rated" freelancer browsing ranked by Bayesian rating, with cursor
+pagination, skill filters and availability.
+"""
+
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required
+
+from app.extensions import db
+from app.services.leaderboard_service import get_leaderboard, rebuild_leaderboard
+from app.utils.decorators import role_required
+
+leaderboard_bp = Blueprint("leaderboard", __name__)
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+@leaderboard_bp.route("/", methods=["GET"])
+def list_top_freelancers():
+    """
+    Top rated freelancers
+    ---
+    tags:
+      - Leaderboard
+    parameters:
+      - in: query
+        name: limit
+        type: integer
+        default: 20
+        description: Page size (max 100)
+      - in: query
+        name: cursor
+        type: string
+        description: next_cursor from the previous page
+      - in: query
+        name: skills
+        type: string
+        description: Comma-separated skill names (any match); may be repeated
+      - in: query
+        name: open_to_work
+        type: string
+        enum: ["true", "false", "any"]
+        default: "true"
+    responses:
+      200:
+        description: One page of the leaderboard
+      400:
+        description: Invalid cursor
+    """
+    limit = max(1, min(request.args.get("limit", DEFAULT_LIMIT, type=int), MAX_LIMIT))
+    skills = [
+        name.strip()
+        for value in request.args.getlist("skills")
+        for name in value.split(",")
+        if name.strip()
+    ]
+    availability = request.args.get("open_to_work", "true").lower()
+    open_to_work = None if availability == "any" else availability == "true"
+
+    try:
+        page = get_leaderboard(
+            limit=limit, cursor=request.args.get("cursor"), skills=skills, open_to_work=open_to_work
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    return jsonify({"success": True, "limit": limit, **page}), 200
+
+
+@leaderboard_bp.route("/rebuild", methods=["POST"])
+@jwt_required()
+@role_required("admin")
+def rebuild():
+    """Recompute every leaderboard row (admin only)"""
+    try:
+        total = rebuild_leaderboard()
+        return jsonify({"success": True, "entries": total}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 500
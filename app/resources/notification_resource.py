@@ -0,0 +1,274 @@
+"""
+Notification Resource
+Owner: Ryan
+Description: The signed-in user's notification inbox (cursor pagination, unread count,
+mark read) and realtime delivery of notifications and dashboard invalidations over
+Server-Sent Events. Each open stream holds a gunicorn thread (gunicorn.conf.py), or a
+greenlet when gevent workers are opted into.
+"""
+
+import time
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_jwt_extended import decode_token, get_jwt_identity, jwt_required, verify_jwt_in_request
+
+from app.extensions import db
+from app.models.notification import Notification, NotificationCounter
+from app.services.notification_service import get_inbox, mark_all_read, mark_read
+from app.services.realtime_service import format_sse, get_broker
+
+notification_bp = Blueprint("notifications", __name__)
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+MAX_MARK_IDS = 500
+RECONNECT_MS = 3000
+REPLAY_LIMIT = 100
+
+
+@notification_bp.route("/", methods=["GET"])
+@jwt_required()
+def list_notifications():
+    """
+    The signed-in user's notifications, newest first
+    ---
+    tags:
+      - Notifications
+    parameters:
+      - in: query
+        name: limit
+        type: integer
+        default: 20
+        description: Page size (max 100)
+      - in: query
+        name: cursor
+        type: string
+        description: next_cursor from the previous page
+      - in: query
+        name: unread
+        type: boolean
+        default: false
+      - in: query
+        name: type
+        type: string
+    responses:
+      200:
+        description: One page of notifications and the unread count
+      400:
+        description: Invalid cursor
+    """
+    limit = max(1, min(request.args.get("limit", DEFAULT_LIMIT, type=int), MAX_LIMIT))
+    try:
+        page = get_inbox(
+            int(get_jwt_identity()),
+            limit=limit,
+            cursor=request.args.get("cursor"),
+            unread_only=request.args.get("unread", "false").lower() == "true",
+            notification_type=request.args.get("type"),
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    return jsonify({"success": True, "limit": limit, **page}), 200
+
+
+@notification_bp.route("/unread-count", methods=["GET"])
+@jwt_required()
+def unread_count():
+    """
+    Unread notification count (one primary-key lookup)
+    ---
+    tags:
+      - Notifications
+    responses:
+      200:
+        description: The cached unread count
+    """
+    count = NotificationCounter.get_unread_count(int(get_jwt_identity()))
+    return jsonify({"success": True, "unread_count": count}), 200
+
+
+@notification_bp.route("/read", methods=["POST"])
+@jwt_required()
+def read_notifications():
+    """
+    Mark notifications read
+    ---
+    tags:
+      - Notifications
+    parameters:
+      - in: body
+        name: body
+        schema:
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+              description: Notification ids; omit to mark every notification read
+    responses:
+      200:
+        description: Number of notifications marked read and the new unread count
+      400:
+        description: Invalid ids
+    """
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    ids = data.get("ids")
+
+    try:
+        if ids is None:
+            changed = mark_all_read(user_id)
+        else:
+            if not isinstance(ids, list) or len(ids) > MAX_MARK_IDS:
+                return (
+                    jsonify(
+                        {"success": False, "error": f"ids must be a list of at most {MAX_MARK_IDS}"}
+                    ),
+                    400,
+                )
+            changed = mark_read(user_id, [int(i) for i in ids])
+        db.session.commit()
+    except (TypeError, ValueError):
+        db.session.rollback()
+        return jsonify({"success": False, "error": "ids must be integers"}), 400
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error marking notifications read: {str(e)}")
+        return jsonify({"success": False, "error": "Failed to mark notifications read"}), 500
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "marked_read": changed,
+                "unread_count": NotificationCounter.get_unread_count(user_id),
+            }
+        ),
+        200,
+    )
+
+
+@notification_bp.route("/<int:notification_id>/read", methods=["POST"])
+@jwt_required()
+def read_notification(notification_id):
+    """
+    Mark one notification read
+    ---
+    tags:
+      - Notifications
+    responses:
+      200:
+        description: Marked read (idempotent)
+      404:
+        description: Notification not found
+    """
+    user_id = int(get_jwt_identity())
+    notification = Notification.query.filter_by(id=notification_id, user_id=user_id).first()
+    if not notification:
+        return jsonify({"success": False, "error": "Notification not found"}), 404
+
+    mark_read(user_id, [notification_id])
+    db.session.commit()
+    return (
+        jsonify(
+            {
+                "success": True,
+                "notification": notification.to_dict(),
+                "unread_count": NotificationCounter.get_unread_count(user_id),
+            }
+        ),
+        200,
+    )
+
+
+def _stream_user_id():
+    """
+    Identity from the Authorization header, or from ?token= because the browser
+    EventSource API cannot set headers.
+    """
+    verify_jwt_in_request(optional=True)
+    identity = get_jwt_identity()
+    token = request.args.get("token")
+    if identity is None and token:
+        decoded = decode_token(token)
+        if decoded.get("type") != "access":
+            raise ValueError("Access token required")
+        identity = decoded["sub"]
+    return int(identity) if identity is not None else None
+
+
+@notification_bp.route("/stream", methods=["GET"])
+def stream_notifications():
+    """
+    Server-Sent Events stream of the user's notifications
+    ---
+    tags:
+      - Notifications
+    parameters:
+      - in: query
+        name: token
+        type: string
+        description: Access token (for EventSource, which cannot send headers)
+      - in: header
+        name: Last-Event-ID
+        type: integer
+        description: Replay notifications newer than this id after a reconnect
+    responses:
+      200:
+        description: text/event-stream with notification, dashboard and resync events
+      401:
+        description: Missing or invalid token
+    """
+    try:
+        user_id = _stream_user_id()
+    except Exception:
+        return jsonify({"error": "Invalid or expired token"}), 401
+    if user_id is None:
+        return jsonify({"error": "Authorization required"}), 401
+
+    config = current_app.config
+    heartbeat = config.get("REALTIME_HEARTBEAT_SECONDS", 15)
+    max_seconds = config.get("REALTIME_STREAM_MAX_SECONDS", 300)
+
+    # Subscribe before reading the replay so nothing committed in between is missed
+    subscription = get_broker().subscribe(user_id)
+
+    replay = []
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    if last_event_id and last_event_id.isdigit():
+        missed = (
+            Notification.query.filter(
+                Notification.user_id == user_id, Notification.id > int(last_event_id)
+            )
+            .order_by(Notification.id)
+            .limit(REPLAY_LIMIT)
+            .all()
+        )
+        replay = [{"event": "notification", "id": n.id, "data": n.to_dict()} for n in missed]
+    # Idle streams must not hold a pooled database connection
+    db.session.remove()
+
+    def generate():
+        replayed_up_to = replay[-1]["id"] if replay else 0
+        deadline = time.monotonic() + max_seconds
+        try:
+            yield f"retry: {RECONNECT_MS}\n\n"
+            yield format_sse({"event": "ready", "data": {"user_id": user_id}})
+            for event in replay:
+                yield format_sse(event)
+            # Close periodically; EventSource reconnects with Last-Event-ID
+            while time.monotonic() < deadline:
+                event = subscription.get(timeout=heartbeat)
+                if event is None:
+                    yield ": keepalive\n\n"
+                elif event["event"] != "notification" or event["id"] > replayed_up_to:
+                    yield format_sse(event)
+        finally:
+            subscription.close()
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
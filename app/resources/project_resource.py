@@ -13,29 +13,11 @@ from ..models.skill import Skill
 from ..extensions import db
 from ..services.project_service import ProjectService
 from app.models.user import User
-import sendgrid
-import os
-from sendgrid.helpers.mail import Mail
+from app.services.event_bus import FreelancerAssigned, publish
 
 project_bp = Blueprint("projects", __name__, url_prefix="/api/projects")
 
 
-# Helper: send email (used on assignment)
-
-def send_email(to_email, subject, html):
-    sg = sendgrid.SendGridAPIClient(api_key=os.getenv("SENDGRID_API_KEY"))
-    msg = Mail(
-        from_email="noreply@freelancer-system.com",
-        to_emails=to_email,
-        subject=subject,
-        html_content=html,
-    )
-    try:
-        sg.send(msg)
-    except Exception as e:
-        print("Email error:", str(e))
-
-
 @project_bp.route("", methods=["GET"])
 @jwt_required()
 def get_projects():
@@ -227,14 +209,9 @@ def assign_freelancer(project_id):
     project.matched_at = db.func.now()
     freelancer_profile.open_to_work = False
 
+    publish(FreelancerAssigned(project.id, get_jwt_identity(), freelancer_user.id))
     db.session.commit()
 
-    send_email(
-        freelancer_user.email,
-        "New Project Assigned",
-        f"<p>Hi {freelancer_user.first_name},</p><p>You've been assigned to project <b>{project.title}</b>.</p>",
-    )
-
     return jsonify({
         "message": "Freelancer assigned successfully", 
         "project": project.to_dict()
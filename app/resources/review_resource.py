@@ -10,9 +10,19 @@ from app import db
 from app.models.review import Review
 from app.models.project import Project
 from app.models.user import User
+from app.services.pagination_service import paginate_query
+from app.services.review_analytics_service import (
+    TREND_PERIODS,
+    get_rating_trends,
+    get_review_statistics,
+    get_user_review_summary,
+)
 
 review_bp = Blueprint('reviews', __name__)
 
+MAX_REVIEWS_PER_PAGE = 50
+MAX_STATS_FREELANCERS = 100
+
 @review_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_review():
@@ -231,7 +241,7 @@ def get_project_review(project_id):
 @review_bp.route('/freelancer/<int:freelancer_id>', methods=['GET'])
 def get_freelancer_reviews(freelancer_id):
     """
-    Get all public reviews for a freelancer
+    Get public reviews for a freelancer (paginated, newest first)
     ---
     tags:
       - Reviews
@@ -241,6 +251,15 @@ def get_freelancer_reviews(freelancer_id):
         required: true
         type: integer
         description: ID of the freelancer
+      - in: query
+        name: page
+        type: integer
+        default: 1
+      - in: query
+        name: per_page
+        type: integer
+        default: 10
+        description: Reviews per page (max 50)
     responses:
       200:
         description: Reviews retrieved successfully
@@ -256,29 +275,24 @@ def get_freelancer_reviews(freelancer_id):
                 'message': f'Freelancer with ID {freelancer_id} does not exist'
             }), 404
         
-        # Get public reviews for freelancer
-        reviews = Review.query.filter_by(freelancer_id=freelancer_id, is_public=True).all()
-        
-        # Calculate statistics
-        total_reviews = len(reviews)
-        if total_reviews > 0:
-            avg_rating = sum(review.average_rating() for review in reviews) / total_reviews
-            avg_rating = round(avg_rating, 2)
-        else:
-            avg_rating = 0
+        page = request.args.get('page', 1, type=int)
+        per_page = min(request.args.get('per_page', 10, type=int), MAX_REVIEWS_PER_PAGE)
+
+        # Get one page of public reviews; statistics come from the rating aggregate
+        reviews = paginate_query(
+            Review.query.filter_by(freelancer_id=freelancer_id, is_public=True)
+            .order_by(Review.created_at.desc(), Review.id.desc()),
+            page=page,
+            per_page=per_page
+        )
         
         return jsonify({
             'success': True,
             'freelancer_id': freelancer_id,
             'freelancer_name': f"{freelancer.first_name} {freelancer.last_name}",
-            'reviews': [review.to_dict() for review in reviews],
-            'statistics': {
-                'total_reviews': total_reviews,
-                'average_rating': avg_rating,
-                'average_communication': calculate_average_subrating(reviews, 'communication_rating'),
-                'average_quality': calculate_average_subrating(reviews, 'quality_rating'),
-                'average_timeliness': calculate_average_subrating(reviews, 'timeliness_rating')
-            }
+            'reviews': [review.to_dict() for review in reviews['items']],
+            'pagination': reviews['meta'],
+            'statistics': get_review_statistics([freelancer_id])[freelancer_id]
         }), 200
         
     except Exception as e:
@@ -306,26 +320,11 @@ def get_my_reviews():
         reviews_as_client = Review.query.filter_by(client_id=current_user_id).all()
         reviews_as_freelancer = Review.query.filter_by(freelancer_id=current_user_id).all()
         
-        # Calculate statistics for freelancer reviews
-        public_freelancer_reviews = [r for r in reviews_as_freelancer if r.is_public]
-        total_public_reviews = len(public_freelancer_reviews)
-        
-        if total_public_reviews > 0:
-            avg_freelancer_rating = sum(review.average_rating() for review in public_freelancer_reviews) / total_public_reviews
-            avg_freelancer_rating = round(avg_freelancer_rating, 2)
-        else:
-            avg_freelancer_rating = 0
-        
         return jsonify({
             'success': True,
             'reviews_as_client': [review.to_dict() for review in reviews_as_client],
             'reviews_as_freelancer': [review.to_dict() for review in reviews_as_freelancer],
-            'statistics': {
-                'total_reviews_given': len(reviews_as_client),
-                'total_reviews_received': len(reviews_as_freelancer),
-                'average_rating_received': avg_freelancer_rating,
-                'public_reviews_count': total_public_reviews
-            }
+            'statistics': get_user_review_summary(current_user_id)
         }), 200
         
     except Exception as e:
@@ -549,6 +548,11 @@ def get_freelancer_review_stats(freelancer_id):
         required: true
         type: integer
         description: ID of the freelancer
+      - in: query
+        name: trend
+        type: string
+        enum: [day, month, year]
+        description: Also return review count and average rating per period
     responses:
       200:
         description: Statistics retrieved successfully
@@ -564,61 +568,71 @@ def get_freelancer_review_stats(freelancer_id):
                 'message': f'Freelancer with ID {freelancer_id} does not exist'
             }), 404
         
-        # Get all public reviews for freelancer
-        reviews = Review.query.filter_by(freelancer_id=freelancer_id, is_public=True).all()
+        response = {
+            'success': True,
+            'freelancer_id': freelancer_id,
+            'freelancer_name': f"{freelancer.first_name} {freelancer.last_name}",
+            'statistics': get_review_statistics([freelancer_id])[freelancer_id]
+        }
+
+        period = request.args.get('trend')
+        if period:
+            if period not in TREND_PERIODS:
+                return jsonify({
+                    'error': 'Invalid trend period',
+                    'message': f'trend must be one of: {", ".join(TREND_PERIODS)}'
+                }), 400
+            response['trend'] = get_rating_trends([freelancer_id], period=period)[freelancer_id]
         
-        # Calculate detailed statistics
-        total_reviews = len(reviews)
+        return jsonify(response), 200
         
-        if total_reviews == 0:
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to fetch review statistics',
+            'message': str(e)
+        }), 500
+
+@review_bp.route('/stats/freelancers', methods=['GET'])
+def get_freelancers_review_stats():
+    """
+    Get review statistics for many freelancers at once
+    ---
+    tags:
+      - Reviews
+    parameters:
+      - in: query
+        name: ids
+        required: true
+        type: string
+        description: Comma-separated freelancer IDs (max 100)
+    responses:
+      200:
+        description: Statistics retrieved successfully
+      400:
+        description: Missing or invalid ids
+    """
+    try:
+        raw_ids = request.args.get('ids', '')
+        try:
+            freelancer_ids = {int(part) for part in raw_ids.split(',') if part.strip()}
+        except ValueError:
+            freelancer_ids = None
+
+        if not freelancer_ids or len(freelancer_ids) > MAX_STATS_FREELANCERS:
             return jsonify({
-                'success': True,
-                'freelancer_id': freelancer_id,
-                'freelancer_name': f"{freelancer.first_name} {freelancer.last_name}",
-                'statistics': {
-                    'total_reviews': 0,
-                    'average_rating': 0,
-                    'rating_distribution': {1: 0, 2: 0, 3: 0, 4: 0, 5: 0},
-                    'average_communication': 0,
-                    'average_quality': 0,
-                    'average_timeliness': 0
-                }
-            }), 200
-        
-        # Calculate averages
-        avg_rating = sum(review.average_rating() for review in reviews) / total_reviews
-        avg_rating = round(avg_rating, 2)
-        
-        # Calculate rating distribution
-        rating_distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-        for review in reviews:
-            rating = round(review.average_rating())
-            if 1 <= rating <= 5:
-                rating_distribution[rating] += 1
-        
+                'error': 'Invalid ids',
+                'message': f'ids must list between 1 and {MAX_STATS_FREELANCERS} freelancer IDs'
+            }), 400
+
+        statistics = get_review_statistics(freelancer_ids)
+
         return jsonify({
             'success': True,
-            'freelancer_id': freelancer_id,
-            'freelancer_name': f"{freelancer.first_name} {freelancer.last_name}",
-            'statistics': {
-                'total_reviews': total_reviews,
-                'average_rating': avg_rating,
-                'rating_distribution': rating_distribution,
-                'average_communication': calculate_average_subrating(reviews, 'communication_rating'),
-                'average_quality': calculate_average_subrating(reviews, 'quality_rating'),
-                'average_timeliness': calculate_average_subrating(reviews, 'timeliness_rating')
-            }
+            'statistics': {str(freelancer_id): stats for freelancer_id, stats in statistics.items()}
         }), 200
-        
+
     except Exception as e:
         return jsonify({
             'error': 'Failed to fetch review statistics',
             'message': str(e)
         }), 500
-
-def calculate_average_subrating(reviews, rating_field):
-    """Calculate average for a specific sub-rating"""
-    ratings = [getattr(review, rating_field) for review in reviews if getattr(review, rating_field) is not None]
-    if not ratings:
-        return 0
-    return round(sum(ratings) / len(ratings), 2)
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Search Resource
+Owner: Cindy
+Description: Full-text search across projects, deliverables and feedback the user can see
+"""
+
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+from app.extensions import db
+from app.models.user import User
+from app.services.search_service import ENTITY_TYPES, rebuild_search_index, search
+from app.utils.decorators import role_required
+
+search_bp = Blueprint("search", __name__)
+
+MAX_LIMIT = 50
+
+
+@search_bp.route("/", methods=["GET"])
+@jwt_required()
+def search_everything():
+    """
+    Ranked full-text search with highlighted snippets
+    ---
+    tags:
+      - Search
+    parameters:
+      - in: query
+        name: q
+        type: string
+        required: true
+      - in: query
+        name: types
+        type: string
+        description: Comma-separated subset of project, deliverable, feedback
+      - in: query
+        name: limit
+        type: integer
+        default: 20
+      - in: query
+        name: offset
+        type: integer
+        default: 0
+    responses:
+      200:
+        description: Search results ordered by relevance
+      400:
+        description: Missing query or unknown type
+    """
+    raw_query = (request.args.get("q") or "").strip()
+    if not raw_query:
+        return jsonify({"success": False, "error": "Query parameter 'q' is required"}), 400
+
+    entity_types = [t.strip() for t in request.args.get("types", "").split(",") if t.strip()]
+    unknown = set(entity_types) - set(ENTITY_TYPES)
+    if unknown:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "error": f"Unknown types: {', '.join(sorted(unknown))}. Use: {', '.join(ENTITY_TYPES)}",
+                }
+            ),
+            400,
+        )
+
+    limit = max(1, min(request.args.get("limit", 20, type=int), MAX_LIMIT))
+    offset = max(0, request.args.get("offset", 0, type=int))
+
+    user = User.query.get(get_jwt_identity())
+    if not user:
+        return jsonify({"success": False, "error": "User not found"}), 404
+
+    try:
+        results = search(user, raw_query, entity_types=entity_types, limit=limit, offset=offset)
+    except Exception as e:
+        current_app.logger.error(f"Search failed: {str(e)}")
+        return jsonify({"success": False, "error": "Search failed"}), 500
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "query": raw_query,
+                "results": results,
+                "limit": limit,
+                "offset": offset,
+            }
+        ),
+        200,
+    )
+
+
+@search_bp.route("/rebuild", methods=["POST"])
+@jwt_required()
+@role_required("admin")
+def rebuild_index():
+    """Rebuild the search index from scratch (admin only)"""
+    try:
+        return jsonify({"success": True, "indexed": rebuild_search_index()}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 500
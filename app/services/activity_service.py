@@ -0,0 +1,211 @@
+"""
+Activity Service
+Owner: Caleb
+Description: Index-friendly filtering of the activity log. Substring filters are served by
+pg_trgm GIN indexes, exact action codes by the activity_actions dimension and its btree.
+Also manages the monthly PostgreSQL partitions: creation ahead of time, retention by
+dropping whole partitions, and TRUNCATE for clearing.
+"""
+
+import re
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import select, text
+
+from app.extensions import db
+from app.models.activity_log import ActivityAction, ActivityLog
+from app.models.user import User
+
+DEFAULT_RETENTION_MONTHS = 12
+DEFAULT_PARTITIONS_AHEAD = 3
+DEFAULT_PARTITION = "activity_logs_default"
+PARTITION_NAME = re.compile(r"^activity_logs_p(\d{4})_(\d{2})$")
+
+
+def escape_like(term):
+    """Escape LIKE wildcards so user input only ever matches literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def contains(column, term):
+    return column.ilike(f"%{escape_like(term)}%", escape="\\")
+
+
+def filter_activities(
+    query, action=None, action_code=None, resource_type=None, user_id=None, role=None
+):
+    """
+    Apply activity-log filters to a query or select.
+
+    Args:
+        query: ActivityLog query/select to narrow
+        action: Case-insensitive substring of the action
+        action_code: Exact action code (btree lookup through activity_actions)
+        resource_type: Case-insensitive substring of the resource type
+        user_id: Only this user's activity
+        role: Only activity by users with this role
+
+    Returns:
+        The filtered query
+    """
+    if user_id is not None:
+        query = query.where(ActivityLog.user_id == user_id)
+
+    if role:
+        query = query.where(ActivityLog.user_id.in_(select(User.id).where(User.role == role)))
+
+    if action_code:
+        code_id = select(ActivityAction.id).where(ActivityAction.code == action_code)
+        query = query.where(ActivityLog.action_id == code_id.scalar_subquery())
+
+    if action:
+        query = query.where(contains(ActivityLog.action, action))
+
+    if resource_type:
+        query = query.where(contains(ActivityLog.resource_type, resource_type))
+
+    return query
+
+
+def list_activities(limit=20, **filters):
+    """Newest activity first, filtered as in filter_activities"""
+    query = filter_activities(ActivityLog.query, **filters)
+    return query.order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc()).limit(limit).all()
+
+
+# -------------------- Partition maintenance (PostgreSQL) --------------------
+
+
+def month_start(value):
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(month, months):
+    years, index = divmod(month.month - 1 + months, 12)
+    return datetime(month.year + years, index + 1, 1)
+
+
+def partition_name(month):
+    return f"activity_logs_p{month:%Y_%m}"
+
+
+def is_partitioned(connection):
+    """True when activity_logs is a partitioned PostgreSQL table"""
+    if connection.dialect.name != "postgresql":
+        return False
+    relkind = connection.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass('activity_logs')")
+    ).scalar()
+    return relkind == "p"
+
+
+def list_partitions(connection):
+    """Month start -> partition name for every monthly partition"""
+    rows = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass('activity_logs')"
+        )
+    )
+    partitions = {}
+    for (name,) in rows:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[datetime(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def create_partition(connection, month):
+    """
+    Create and attach the partition for one month.
+
+    Rows that already landed in the default partition for that month are moved
+    into the new partition first, otherwise PostgreSQL refuses the attach.
+    """
+    name = partition_name(month)
+    lower, upper = month.isoformat(sep=" "), add_months(month, 1).isoformat(sep=" ")
+    connection.execute(text(f"CREATE TABLE {name} (LIKE activity_logs INCLUDING DEFAULTS)"))
+    connection.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :lower AND created_at < :upper RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"lower": lower, "upper": upper},
+    )
+    connection.execute(
+        text(
+            f"ALTER TABLE activity_logs ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        )
+    )
+    return name
+
+
+def ensure_partitions(months_ahead=None, now=None):
+    """
+    Create any missing monthly partitions from the current month to months_ahead.
+
+    Returns:
+        list: Names of the partitions created (empty when not partitioned)
+    """
+    connection = db.session.connection()
+    if not is_partitioned(connection):
+        return []
+    if months_ahead is None:
+        months_ahead = current_app.config.get(
+            "ACTIVITY_LOG_PARTITIONS_AHEAD", DEFAULT_PARTITIONS_AHEAD
+        )
+
+    existing = list_partitions(connection)
+    current = month_start(now or datetime.utcnow())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month not in existing:
+            created.append(create_partition(connection, month))
+    return created
+
+
+def drop_expired_partitions(retention_months=None, now=None):
+    """
+    Apply the retention policy.
+
+    Whole monthly partitions older than the window are dropped, which is instant and
+    leaves no dead tuples, unlike DELETE. Without partitioning this falls back to DELETE.
+
+    Returns:
+        dict: {"dropped_partitions": [...], "deleted_rows": int}
+    """
+    if retention_months is None:
+        retention_months = current_app.config.get(
+            "ACTIVITY_LOG_RETENTION_MONTHS", DEFAULT_RETENTION_MONTHS
+        )
+    cutoff = add_months(month_start(now or datetime.utcnow()), -retention_months)
+
+    connection = db.session.connection()
+    if not is_partitioned(connection):
+        deleted = ActivityLog.query.filter(ActivityLog.created_at < cutoff).delete(
+            synchronize_session=False
+        )
+        return {"dropped_partitions": [], "deleted_rows": deleted}
+
+    dropped = []
+    for month, name in sorted(list_partitions(connection).items()):
+        if add_months(month, 1) <= cutoff:
+            connection.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    deleted = connection.execute(
+        text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :cutoff"), {"cutoff": cutoff}
+    ).rowcount
+    return {"dropped_partitions": dropped, "deleted_rows": deleted}
+
+
+def clear_activities():
+    """Remove every activity log row (TRUNCATE on PostgreSQL)"""
+    connection = db.session.connection()
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("TRUNCATE activity_logs"))
+    else:
+        ActivityLog.query.delete(synchronize_session=False)
@@ -0,0 +1,311 @@
+"""
+Audit Buffer
+Owner: Caleb
+Description: In-memory buffer for activity-log events. Callers enqueue in microseconds; a
+background thread writes batches with one multi-row INSERT (COPY on PostgreSQL) when the
+batch is full or the flush interval passes, and once more at shutdown.
+"""
+
+import atexit
+import io
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models.activity_log import ActivityAction, ActivityLog
+
+COLUMNS = (
+    "user_id",
+    "action",
+    "action_id",
+    "resource_type",
+    "resource_id",
+    "details",
+    "created_at",
+)
+
+DEFAULTS = {
+    "BATCH_SIZE": 500,
+    "FLUSH_INTERVAL": 1.0,
+    "MAX_PENDING": 10000,
+    "BLOCK_TIMEOUT": 0.5,
+}
+
+
+class AuditBuffer:
+    """
+    Buffered activity-log writer.
+
+    Config:
+        AUDIT_BUFFER_ENABLED: False writes every event synchronously (default when TESTING)
+        AUDIT_BUFFER_BATCH_SIZE: Flush as soon as this many events are pending
+        AUDIT_BUFFER_FLUSH_INTERVAL: Seconds between flushes when traffic is light
+        AUDIT_BUFFER_MAX_PENDING: Backpressure threshold; callers wait for the flusher
+        AUDIT_BUFFER_BLOCK_TIMEOUT: Seconds a caller waits before its event is dropped
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._reset()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions["audit_buffer"] = self
+        atexit.register(self.shutdown)
+
+    def _setting(self, name):
+        # Read on use so config changes after create_app (e.g. in tests) apply
+        config = self.app.config if self.app else {}
+        if name == "ENABLED":
+            return config.get("AUDIT_BUFFER_ENABLED", not config.get("TESTING", False))
+        return config.get(f"AUDIT_BUFFER_{name}", DEFAULTS[name])
+
+    @property
+    def enabled(self):
+        return self._setting("ENABLED")
+
+    @property
+    def batch_size(self):
+        return self._setting("BATCH_SIZE")
+
+    @property
+    def flush_interval(self):
+        return self._setting("FLUSH_INTERVAL")
+
+    @property
+    def max_pending(self):
+        return self._setting("MAX_PENDING")
+
+    @property
+    def block_timeout(self):
+        return self._setting("BLOCK_TIMEOUT")
+
+    def _reset(self):
+        # Also called in a forked worker: locks and threads do not survive fork()
+        self._pid = os.getpid()
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._has_work = threading.Condition(self._lock)
+        self._has_room = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+        self._metrics = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "flushes": 0,
+            "flush_failures": 0,
+            "blocked_calls": 0,
+            "blocked_seconds": 0.0,
+            "high_water_mark": 0,
+            "last_flush_rows": 0,
+            "last_flush_seconds": 0.0,
+        }
+
+    # -------------------- Producer side --------------------
+
+    def log(self, action, resource_type, resource_id=None, user_id=None, details=None):
+        """
+        Record an activity event.
+
+        Returns:
+            bool: False if the event was dropped because the buffer stayed full
+        """
+        event = {
+            "user_id": user_id,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "details": details,
+            "created_at": datetime.utcnow(),
+        }
+        if not self.enabled:
+            self._write([event])
+            return True
+
+        if self._pid != os.getpid():
+            self._reset()
+        self._ensure_worker()
+
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                # Backpressure: wait briefly for the flusher rather than grow without bound
+                started = time.perf_counter()
+                self._metrics["blocked_calls"] += 1
+                self._has_work.notify()
+                self._has_room.wait_for(
+                    lambda: len(self._pending) < self.max_pending, timeout=self.block_timeout
+                )
+                self._metrics["blocked_seconds"] += time.perf_counter() - started
+                if len(self._pending) >= self.max_pending:
+                    self._metrics["dropped"] += 1
+                    return False
+
+            self._pending.append(event)
+            self._metrics["enqueued"] += 1
+            pending = len(self._pending)
+            if pending > self._metrics["high_water_mark"]:
+                self._metrics["high_water_mark"] = pending
+            if pending >= self.batch_size:
+                self._has_work.notify()
+        return True
+
+    def metrics(self):
+        with self._lock:
+            metrics = dict(self._metrics, pending=len(self._pending))
+        metrics.update(
+            enabled=self.enabled,
+            batch_size=self.batch_size,
+            flush_interval=self.flush_interval,
+            max_pending=self.max_pending,
+            worker_alive=bool(self._thread and self._thread.is_alive()),
+        )
+        return metrics
+
+    # -------------------- Flushing --------------------
+
+    def _ensure_worker(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="audit-buffer-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                self._has_work.wait_for(
+                    lambda: self._stopping or len(self._pending) >= self.batch_size,
+                    timeout=self.flush_interval,
+                )
+                stopping = self._stopping
+            self.flush()
+            if stopping:
+                return
+
+    def _take_batch(self):
+        with self._lock:
+            count = min(len(self._pending), self.batch_size)
+            batch = [self._pending.popleft() for _ in range(count)]
+            if batch:
+                self._has_room.notify_all()
+            return batch
+
+    def flush(self):
+        """
+        Write everything pending, batch by batch. Safe to call from any thread.
+
+        Returns:
+            int: Rows written
+        """
+        written = 0
+        with self._write_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    return written
+                started = time.perf_counter()
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    self._requeue(batch)
+                    if self.app:
+                        self.app.logger.error(f"Audit buffer flush failed: {str(e)}")
+                    return written
+
+                elapsed = time.perf_counter() - started
+                written += len(batch)
+                with self._lock:
+                    self._metrics["written"] += len(batch)
+                    self._metrics["flushes"] += 1
+                    self._metrics["last_flush_rows"] = len(batch)
+                    self._metrics["last_flush_seconds"] = round(elapsed, 6)
+
+    def _requeue(self, batch):
+        # Keep failed rows for the next attempt, oldest first, within the pending limit
+        with self._lock:
+            self._metrics["flush_failures"] += 1
+            room = max(self.max_pending - len(self._pending), 0)
+            kept = batch[:room]
+            self._metrics["dropped"] += len(batch) - len(kept)
+            self._pending.extendleft(reversed(kept))
+
+    def shutdown(self, timeout=5.0):
+        """Stop the flusher and write whatever is still pending"""
+        thread = self._thread
+        if thread and thread.is_alive() and self._pid == os.getpid():
+            with self._lock:
+                self._stopping = True
+                self._has_work.notify()
+            thread.join(timeout)
+        if self._pending and self.app is not None:
+            self.flush()
+
+    # -------------------- Writing --------------------
+
+    def _write(self, events):
+        with self.app.app_context():
+            with db.engine.begin() as connection:
+                action_ids = {}
+                for event in events:
+                    code = event["action"]
+                    if code not in action_ids:
+                        action_ids[code] = ActivityAction.resolve_id(connection, code)
+                rows = [dict(event, action_id=action_ids[event["action"]]) for event in events]
+
+                if connection.dialect.name == "postgresql":
+                    _copy_rows(connection, rows)
+                else:
+                    connection.execute(insert(ActivityLog.__table__).values(rows))
+
+
+def _copy_field(column, value):
+    """One field in COPY text format (\\N is NULL; backslash, tab and newlines escaped)"""
+    if value is None:
+        return "\\N"
+    if column == "details":
+        value = json.dumps(value)
+    elif column == "created_at":
+        value = value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_rows(connection, rows):
+    """COPY rows into activity_logs through the raw psycopg connection"""
+    data = "".join(
+        "\t".join(_copy_field(column, row[column]) for column in COLUMNS) + "\n" for row in rows
+    )
+    statement = f"COPY activity_logs ({', '.join(COLUMNS)}) FROM STDIN"
+
+    cursor = connection.connection.driver_connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(statement, io.StringIO(data))
+        else:  # psycopg 3
+            with cursor.copy(statement) as copy:
+                copy.write(data)
+    finally:
+        cursor.close()
+
+
+audit_buffer = AuditBuffer()
@@ -0,0 +1,192 @@
+"""
+Audit Capture
+Owner: Caleb
+Description: Records state changes of opted-in models in the activity log automatically.
+before_flush diffs the tracked attributes of new, dirty and deleted objects; after_flush
+writes one compact ActivityLog row per change with a single bulk INSERT in the same
+transaction, so the audit trail commits or rolls back with the change itself.
+"""
+
+import re
+import weakref
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask import current_app, has_app_context, has_request_context
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import event, insert, inspect
+
+from app.extensions import db
+from app.models.activity_log import ActivityAction, ActivityLog
+
+# Model class name -> tracked attributes (None tracks every column)
+DEFAULT_CAPTURE_MODELS = {
+    "Project": ["status", "freelancer_id", "admin_id", "budget", "deadline", "payment_status"],
+    "Deliverable": ["status", "reviewed_by"],
+    "EscrowTransaction": ["status", "amount"],
+    "Invoice": ["status", "amount", "paid_at"],
+}
+
+PENDING_KEY = "audit_capture_pending"
+NEW_ACTIONS_KEY = "audit_capture_new_actions"
+_registered = False
+
+# engine -> {action code: id}; only filled after the transaction that saw the code commits,
+# so a rolled-back INSERT into activity_actions can never leave a dangling id behind
+_action_ids = weakref.WeakKeyDictionary()
+
+
+def capture_models():
+    return current_app.config.get("AUDIT_CAPTURE_MODELS", DEFAULT_CAPTURE_MODELS)
+
+
+def resource_type(obj):
+    """EscrowTransaction -> escrow_transaction"""
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", type(obj).__name__).lower()
+
+
+def _jsonable(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _fields(obj, fields):
+    if fields is None:
+        return [column.key for column in inspect(type(obj)).column_attrs]
+    return fields
+
+
+def snapshot(obj, fields):
+    """Non-null tracked values of a new object"""
+    state = inspect(obj)
+    values = {}
+    for field in _fields(obj, fields):
+        value = state.attrs[field].value
+        if value is not None:
+            values[field] = _jsonable(value)
+    return values
+
+
+def diff(obj, fields):
+    """Tracked attributes changed since load: {field: [old, new]}"""
+    state = inspect(obj)
+    changes = {}
+    for field in _fields(obj, fields):
+        history = state.attrs[field].history
+        if not history.has_changes():
+            continue
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0] if history.added else None
+        if old != new:
+            changes[field] = [_jsonable(old), _jsonable(new)]
+    return changes
+
+
+def _current_actor():
+    if not has_request_context():
+        return None
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+def _before_flush(session, flush_context, instances):
+    if not has_app_context() or not current_app.config.get("AUDIT_CAPTURE_ENABLED", True):
+        return
+    models = capture_models()
+    pending = []
+
+    for obj in session.new:
+        name = type(obj).__name__
+        if name in models:
+            # Snapshot after the INSERT so column defaults are included
+            pending.append((obj, "created", models[name]))
+
+    for obj in session.dirty:
+        name = type(obj).__name__
+        if name in models:
+            changes = diff(obj, models[name])
+            if changes:
+                pending.append((obj, "updated", {"changes": changes}))
+
+    for obj in session.deleted:
+        name = type(obj).__name__
+        if name in models:
+            pending.append((obj, "deleted", {}))
+
+    session.info[PENDING_KEY] = pending
+
+
+def _after_flush(session, flush_context):
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+
+    connection = session.connection()
+    actor = _current_actor()
+    now = datetime.utcnow()
+    action_ids = dict(_action_ids.get(connection.engine, {}))
+    new_actions = session.info.setdefault(NEW_ACTIONS_KEY, {})
+    rows = []
+    for obj, operation, details in pending:
+        if operation == "created":
+            details = {"values": snapshot(obj, details)}
+        kind = resource_type(obj)
+        action = f"{kind}.{operation}"
+        if action not in action_ids:
+            action_ids[action] = ActivityAction.resolve_id(connection, action)
+            new_actions[(connection.engine, action)] = action_ids[action]
+        rows.append(
+            {
+                "user_id": actor,
+                "action": action,
+                "action_id": action_ids[action],
+                "resource_type": kind,
+                "resource_id": inspect(obj).mapper.primary_key_from_instance(obj)[0],
+                "details": details,
+                "created_at": now,
+            }
+        )
+    connection.execute(insert(ActivityLog.__table__), rows)
+
+
+def _after_commit(session):
+    for (engine, action), action_id in session.info.pop(NEW_ACTIONS_KEY, {}).items():
+        _action_ids.setdefault(engine, {})[action] = action_id
+
+
+def _after_rollback(session):
+    session.info.pop(NEW_ACTIONS_KEY, None)
+
+
+def _enable_active_history(models):
+    # Load the old value when an expired tracked attribute is set, so diffs show it
+    classes = {mapper.class_.__name__: mapper for mapper in db.Model.registry.mappers}
+    for name, fields in models.items():
+        mapper = classes.get(name)
+        if mapper is None:
+            continue
+        for attr in mapper.column_attrs:
+            if fields is None or attr.key in fields:
+                mapper.class_manager[attr.key].impl.active_history = True
+
+
+def init_audit_capture(app):
+    """Register the session listeners (once per process; config is read per flush)"""
+    global _registered
+    with app.app_context():
+        _enable_active_history(capture_models())
+    if _registered:
+        return
+    event.listen(db.session, "before_flush", _before_flush)
+    event.listen(db.session, "after_flush", _after_flush)
+    event.listen(db.session, "after_commit", _after_commit)
+    event.listen(db.session, "after_rollback", _after_rollback)
+    _registered = True
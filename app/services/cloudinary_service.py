@@ -12,6 +12,7 @@ import os
 import cloudinary
 import cloudinary.api
 import cloudinary.uploader
+import cloudinary.utils
 from flask import current_app
 from datetime import datetime, timedelta
 from werkzeug.utils import secure_filename
@@ -26,6 +27,26 @@ class CloudinaryService:
     # Track if Cloudinary has been initialized
     _initialized = False
 
+    # Derivatives requested eagerly at upload time so gallery viewers never pay
+    # for on-the-fly transformations. Cloudinary returns eager results in the
+    # order they were requested, so the dict order is significant.
+    IMAGE_DERIVATIVES = {
+        "thumbnail_small": {"width": 150, "height": 150, "crop": "fill", "quality": "auto"},
+        "thumbnail": {"width": 300, "height": 300, "crop": "fill", "quality": "auto"},
+        "preview": {"width": 1280, "crop": "limit", "quality": "auto"},
+        "placeholder": {"width": 32, "crop": "scale", "quality": "auto:low", "effect": "blur:200"},
+    }
+    VIDEO_DERIVATIVES = {
+        "thumbnail_small": {
+            "width": 150, "height": 150, "crop": "fill", "start_offset": "0", "format": "jpg"
+        },
+        "thumbnail": {
+            "width": 300, "height": 300, "crop": "fill", "start_offset": "0", "format": "jpg"
+        },
+        "poster": {"width": 1280, "crop": "limit", "start_offset": "0", "format": "jpg"},
+        "preview": {"width": 480, "crop": "scale", "quality": "auto:low", "format": "mp4"},
+    }
+
     @staticmethod
     def init_cloudinary():
         """Initialize Cloudinary configuration"""
@@ -43,7 +64,7 @@ class CloudinaryService:
     # def upload_file(file, folder):
     #     """Upload a file to Cloudinary."""
     @staticmethod
-    def upload_file(file, folder="reelbrief", resource_type="auto"):
+    def upload_file(file, folder="reelbrief", resource_type="auto", derivatives=None):
         """
         Upload a file to Cloudinary.
 
@@ -51,9 +72,11 @@ class CloudinaryService:
             file: File object from request.files
             folder: Cloudinary folder name (default: 'reelbrief')
             resource_type: Type of file ('image', 'video', 'raw', 'auto')
+            derivatives: Optional file type ('image' or 'video') whose eager
+                derivatives should be generated during the upload
 
         Returns:
-            dict: Upload response with URL, public_id, etc.
+            dict: Upload response with URL, public_id, derivative URLs, etc.
 
         Raises:
             Exception: If upload fails
@@ -64,6 +87,13 @@ class CloudinaryService:
             # Secure the filename
             filename = secure_filename(file.filename)
 
+            upload_options = {}
+            eager = CloudinaryService.get_derivative_transformations(derivatives)
+            if eager:
+                upload_options["eager"] = list(eager.values())
+                # Video transcodes can take longer than the upload request allows
+                upload_options["eager_async"] = derivatives == "video"
+
             # Upload to Cloudinary
             upload_result = cloudinary.uploader.upload(
                 file,
@@ -72,8 +102,17 @@ class CloudinaryService:
                 use_filename=True,
                 unique_filename=True,
                 overwrite=False,
+                **upload_options,
             )
 
+            derivative_urls = {}
+            if eager:
+                derivative_urls = CloudinaryService._build_derivative_urls(
+                    upload_result.get("public_id"),
+                    derivatives,
+                    upload_result.get("eager"),
+                )
+
             return {
                 "success": True,
                 "url": upload_result.get("secure_url"),
@@ -83,7 +122,9 @@ class CloudinaryService:
                 "bytes": upload_result.get("bytes"),
                 "width": upload_result.get("width"),
                 "height": upload_result.get("height"),
-                "thumbnail_url": CloudinaryService._generate_thumbnail_url(upload_result),
+                "thumbnail_url": derivative_urls.get("thumbnail")
+                or CloudinaryService._generate_thumbnail_url(upload_result),
+                "derivatives": derivative_urls,
             }
 
         except Exception as e:
@@ -218,6 +259,101 @@ class CloudinaryService:
 
         return None
 
+    @staticmethod
+    def get_derivative_transformations(file_type):
+        """
+        Return the named eager transformations for a file type.
+
+        Args:
+            file_type: 'image' or 'video' (anything else has no derivatives)
+
+        Returns:
+            dict: Derivative name -> Cloudinary transformation
+        """
+        if file_type == "image":
+            return CloudinaryService.IMAGE_DERIVATIVES
+        if file_type == "video":
+            return CloudinaryService.VIDEO_DERIVATIVES
+        return {}
+
+    @staticmethod
+    def request_derivatives(public_id, file_type):
+        """
+        Generate eager derivatives for an asset that is already uploaded.
+
+        Used to backfill deliverables created before the derivative pipeline.
+
+        Args:
+            public_id: The public ID of the file
+            file_type: 'image' or 'video'
+
+        Returns:
+            dict: Result with derivative URLs keyed by derivative name
+        """
+        eager = CloudinaryService.get_derivative_transformations(file_type)
+        if not eager:
+            return {"success": False, "error": f"No derivatives for file type '{file_type}'"}
+
+        try:
+            CloudinaryService.init_cloudinary()
+
+            result = cloudinary.uploader.explicit(
+                public_id,
+                type="upload",
+                resource_type=file_type,
+                eager=list(eager.values()),
+                eager_async=True,
+            )
+
+            return {
+                "success": True,
+                "derivatives": CloudinaryService._build_derivative_urls(
+                    public_id, file_type, result.get("eager")
+                ),
+            }
+
+        except Exception as e:
+            logger.error(f"Derivative generation failed for {public_id}: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+    @staticmethod
+    def _build_derivative_urls(public_id, file_type, eager_results=None):
+        """
+        Map derivative names to delivery URLs.
+
+        Prefers the URLs Cloudinary returned for the eager transformations and
+        falls back to building the (deterministic) URL for async derivatives.
+
+        Args:
+            public_id: The public ID of the file
+            file_type: 'image' or 'video'
+            eager_results: The 'eager' list from an upload/explicit response
+
+        Returns:
+            dict: Derivative name -> URL
+        """
+        eager_results = eager_results or []
+        urls = {}
+
+        for index, (name, transformation) in enumerate(
+            CloudinaryService.get_derivative_transformations(file_type).items()
+        ):
+            if index < len(eager_results) and eager_results[index].get("secure_url"):
+                urls[name] = eager_results[index]["secure_url"]
+                continue
+
+            options = dict(transformation)
+            url_format = options.pop("format", None)
+            urls[name] = cloudinary.utils.cloudinary_url(
+                public_id,
+                resource_type=file_type,
+                transformation=[options],
+                format=url_format,
+                secure=True,
+            )[0]
+
+        return urls
+
     @staticmethod
     def allowed_file(filename, allowed_extensions=None):
         """
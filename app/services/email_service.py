@@ -154,19 +154,23 @@ def send_deliverable_approved_notification(deliverable, freelancer) -> bool:
     return send_email(freelancer.email, f"Deliverable Approved: {deliverable.title}", html, from_name="ReelBrief Notifications")
 
 
-def send_deliverable_feedback_notification(deliverable, feedback, client) -> bool:
+def send_deliverable_feedback_notification(deliverable, feedback, client, recipient=None) -> bool:
     project_link = f"{BASE_URL}/projects/{deliverable.project_id}"
     deliverable_link = f"{BASE_URL}/deliverables/{deliverable.id}"
     status = "Revision requested" if getattr(feedback, "is_revision_request", False) else "Feedback received"
     color = "#e67e22" if getattr(feedback, "is_revision_request", False) else "#3498db"
-    freelancer_email = getattr(deliverable, "freelancer_email", None) or getattr(feedback.user, "email", None) or getattr(client, "email", None)
+    freelancer_email = (
+        getattr(deliverable, "freelancer_email", None)
+        or getattr(getattr(feedback, "user", None), "email", None)
+        or getattr(client, "email", None)
+    )
 
     html = f"""
     <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
         <h3 style="color:{color};">Deliverable {status}!</h3>
         <p>The client has left feedback on <strong>{deliverable.title}</strong>:</p>
         <blockquote style="background:#f8f9fa; padding:12px; border-left:4px solid {color}; margin:16px 0;">
-            "{getattr(feedback, 'comment', '')}"
+            "{getattr(feedback, 'content', None) or getattr(feedback, 'comment', '')}"
         </blockquote>
         <p>
             <a href="{deliverable_link}" style="color:{color}; font-weight:bold;">View Deliverable →</a>
@@ -178,9 +182,84 @@ def send_deliverable_feedback_notification(deliverable, feedback, client) -> boo
 
 #     subject = f"Feedback: {deliverable.title} – {'Revision Needed' if feedback.is_revision_request else 'Review'}"
 #     return send_email(feedback.user.email, subject, html_content, from_name="ReelBrief Feedback")
-    to_email = freelancer_email or getattr(client, "email", None)
+    to_email = recipient or freelancer_email or getattr(client, "email", None)
     if not to_email:
         current_app.logger.warning(" No recipient email for deliverable feedback notification.")
         return False
     return send_email(to_email, f"Feedback: {deliverable.title}", html, from_name="ReelBrief Feedback")
 
+
+def send_deliverable_submitted_notification(deliverable, project, client, freelancer) -> bool:
+    frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
+    change_notes = (
+        f'<p style="margin: 5px 0;"><strong>Changes:</strong> {deliverable.change_notes}</p>'
+        if deliverable.change_notes
+        else ""
+    )
+    html = f"""
+    <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+        <h2 style="color: #1E3A8A;">New Deliverable Submitted</h2>
+        <p>Hello {client.first_name},</p>
+        <p><strong>{freelancer.first_name} {freelancer.last_name}</strong> has uploaded a new
+        deliverable:</p>
+
+        <div style="background-color: #F3F4F6; padding: 15px; border-radius: 8px; margin: 20px 0;">
+            <h3 style="margin: 0 0 10px 0; color: #1F2937;">{deliverable.title}</h3>
+            <p style="margin: 5px 0;"><strong>Version:</strong> {deliverable.version_number}</p>
+            <p style="margin: 5px 0;"><strong>Project:</strong> {project.title}</p>
+            {change_notes}
+        </div>
+
+        <a href="{frontend_url}/deliverables/{deliverable.id}"
+           style="display: inline-block; background-color: #1E3A8A; color: white;
+                  padding: 12px 24px; text-decoration: none; border-radius: 6px; margin: 20px 0;">
+            Review Deliverable
+        </a>
+    </div>
+    """
+    return send_email(client.email, f"New Deliverable: {deliverable.title}", html)
+
+
+def send_portfolio_item_added_notification(project, deliverable, freelancer, added_at) -> bool:
+    frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
+    html = f"""
+    <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+        <h2 style="color: #1E3A8A;">Portfolio Item Added</h2>
+        <p>Hello {freelancer.first_name},</p>
+        <p>Great news! Your project <strong>"{project.title}"</strong> has been automatically
+        added to your portfolio.</p>
+        <p>Clients can now see this completed work when browsing your profile.</p>
+
+        <div style="background-color: #F3F4F6; padding: 15px; border-radius: 8px; margin: 20px 0;">
+            <h3 style="margin: 0 0 10px 0; color: #1F2937;">{project.title}</h3>
+            <p style="margin: 5px 0;"><strong>Status:</strong> Completed & Approved</p>
+            <p style="margin: 5px 0;"><strong>Deliverable:</strong> {deliverable.title}</p>
+            <p style="margin: 5px 0;">
+                <strong>Added to Portfolio:</strong> {added_at.strftime('%B %d, %Y')}
+            </p>
+        </div>
+
+        <a href="{frontend_url}/portfolio"
+           style="display: inline-block; background-color: #1E3A8A; color: white;
+                  padding: 12px 24px; text-decoration: none; border-radius: 6px; margin: 20px 0;">
+            View My Portfolio
+        </a>
+
+        <p style="color: #6B7280; font-size: 14px;">
+            You can manage visibility of this item in your portfolio settings.
+        </p>
+    </div>
+    """
+    return send_email(freelancer.email, "🎉 Portfolio Item Added Automatically!", html)
+
+
+def send_payment_released_notification(freelancer, amount, project) -> bool:
+    html = f"""
+    <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+        <h3 style="color:#27ae60;">Payment Released</h3>
+        <p>Hello <strong>{freelancer.first_name}</strong>,</p>
+        <p>The escrow payment of <strong>${float(amount):.2f}</strong> for
+        <strong>{project.title}</strong> has been released to you.</p>
+    </div>
+    """
+    return send_email(freelancer.email, f"Payment Released: {project.title}", html)
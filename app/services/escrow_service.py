@@ -0,0 +1,241 @@
+"""
+Escrow Service
+Owner: Caleb
+Description: The escrow state machine. Every status change (release, refund, dispute) goes
+through transition(), which locks the escrow row with SELECT ... FOR UPDATE and writes it
+with an optimistic version check, so concurrent release/refund requests for one escrow
+resolve to exactly one winner without locking any other escrow. Functions flush but never
+commit; the caller commits (see idempotency_service.idempotent).
+
+    held ──release──> released
+     │ └──refund───> refunded
+     └──dispute──> disputed ──release/refund──> released / refunded
+"""
+
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.extensions import db
+from app.models.escrow_transaction import EscrowTransaction
+from app.models.invoice import Invoice
+from app.services.invoice_number_service import next_escrow_number
+
+HELD = "held"
+RELEASED = "released"
+REFUNDED = "refunded"
+DISPUTED = "disputed"
+
+# action -> (statuses it may start from, resulting status)
+TRANSITIONS = {
+    "release": ((HELD, DISPUTED), RELEASED),
+    "refund": ((HELD, DISPUTED), REFUNDED),
+    "dispute": ((HELD,), DISPUTED),
+}
+
+# Escrow status -> Project.payment_status
+PROJECT_PAYMENT_STATUS = {HELD: "in_escrow", RELEASED: "released", REFUNDED: "refunded"}
+
+
+class EscrowStateError(ValueError):
+    """The escrow is not in a state that allows the action, or changed concurrently"""
+
+
+def lock_escrow(escrow_id=None, project_id=None):
+    """
+    Load an escrow by id or project with its row locked until commit, bypassing any stale
+    copy in the session.
+
+    Raises:
+        LookupError: No such escrow
+    """
+    stmt = select(EscrowTransaction).with_for_update()
+    if escrow_id is not None:
+        stmt = stmt.where(EscrowTransaction.id == escrow_id)
+    else:
+        stmt = stmt.where(EscrowTransaction.project_id == project_id)
+    escrow = db.session.scalars(stmt.execution_options(populate_existing=True)).first()
+    if escrow is None:
+        raise LookupError("Escrow not found")
+    return escrow
+
+
+def _settle_invoices(escrow, now):
+    """Released escrow pays its open invoices"""
+    invoices = db.session.scalars(
+        select(Invoice)
+        .where(Invoice.escrow_id == escrow.id, Invoice.status.in_(("unpaid", "overdue")))
+        .with_for_update()
+    ).all()
+    for invoice in invoices:
+        invoice.status = "paid"
+        invoice.paid_at = now
+
+
+def transition(escrow, action, reason=None, expected_version=None, resolve_dispute=False):
+    """
+    Apply a state machine action to a locked escrow and flush it.
+
+    Args:
+        escrow: An escrow from lock_escrow()
+        action: release, refund or dispute
+        reason: Appended to the escrow notes
+        expected_version: Fail unless the escrow is still at this version
+        resolve_dispute: Allow releasing or refunding a disputed escrow (admins)
+
+    Raises:
+        EscrowStateError: The action is not allowed from the current status, the version
+            does not match, or another transaction changed the escrow first
+    """
+    sources, target = TRANSITIONS[action]
+    if expected_version is not None and escrow.version != expected_version:
+        raise EscrowStateError(
+            f"Escrow was modified (version {escrow.version}, expected {expected_version})"
+        )
+    if escrow.status == DISPUTED and action != "dispute" and not resolve_dispute:
+        raise EscrowStateError("Escrow is disputed; only an admin can release or refund it")
+    if escrow.status not in sources:
+        raise EscrowStateError(f"Cannot {action} an escrow that is {escrow.status}")
+
+    now = datetime.utcnow()
+    escrow.status = target
+    if target == RELEASED:
+        escrow.released_at = now
+    elif target == REFUNDED:
+        escrow.refunded_at = now
+    if reason:
+        escrow.notes = f"{escrow.notes}\n{action}: {reason}" if escrow.notes else reason
+
+    try:
+        # UPDATE ... WHERE id = :id AND version = :seen: 0 rows means we lost a race
+        db.session.flush()
+    except StaleDataError:
+        raise EscrowStateError("Escrow was changed by another request; reload and retry")
+
+    if target == RELEASED:
+        _settle_invoices(escrow, now)
+    if target in PROJECT_PAYMENT_STATUS and escrow.project is not None:
+        escrow.project.payment_status = PROJECT_PAYMENT_STATUS[target]
+    return escrow
+
+
+# -------------------- Public API --------------------
+
+
+def create_escrow(
+    project, client_id, amount, admin_id=None, payment_method=None, freelancer_id=None
+):
+    """
+    Hold funds for a project.
+
+    Raises:
+        EscrowStateError: The project already has an escrow
+    """
+    if db.session.scalar(
+        select(EscrowTransaction.id).where(EscrowTransaction.project_id == project.id)
+    ):
+        raise EscrowStateError("Escrow already exists for this project")
+    invoice_number = next_escrow_number()
+    escrow = EscrowTransaction(
+        project_id=project.id,
+        client_id=client_id,
+        freelancer_id=freelancer_id or project.freelancer_id,
+        admin_id=project.admin_id or admin_id,
+        amount=amount,
+        status=HELD,
+        payment_method=payment_method,
+        invoice_number=invoice_number,
+    )
+    db.session.add(escrow)
+    project.payment_status = PROJECT_PAYMENT_STATUS[HELD]
+    try:
+        db.session.flush()
+    except IntegrityError:
+        # Lost the race on the unique project_id
+        raise EscrowStateError("Escrow already exists for this project")
+    return escrow
+
+
+def release_escrow(escrow_id, expected_version=None, resolve_dispute=False):
+    """Pay a held (or, resolving a dispute, disputed) escrow out to the freelancer"""
+    return transition(
+        lock_escrow(escrow_id),
+        "release",
+        expected_version=expected_version,
+        resolve_dispute=resolve_dispute,
+    )
+
+
+def refund_escrow(escrow_id, reason=None, expected_version=None, resolve_dispute=False):
+    """Return a held (or, resolving a dispute, disputed) escrow to the client"""
+    return transition(
+        lock_escrow(escrow_id),
+        "refund",
+        reason=reason,
+        expected_version=expected_version,
+        resolve_dispute=resolve_dispute,
+    )
+
+
+def dispute_escrow(escrow_id, reason=None, expected_version=None):
+    """Freeze a held escrow until an admin releases or refunds it"""
+    return transition(
+        lock_escrow(escrow_id), "dispute", reason=reason, expected_version=expected_version
+    )
+
+
+def release_project_escrow(project_id):
+    """
+    Release the project's escrow if it is still held (deliverable approval).
+
+    Returns:
+        EscrowTransaction | None: The released escrow, None when there was nothing to release
+    """
+    try:
+        escrow = lock_escrow(project_id=project_id)
+    except LookupError:
+        return None
+    if escrow.status != HELD:
+        return None
+    return transition(escrow, "release")
+
+
+def pay_invoice(invoice_id):
+    """
+    Mark an invoice paid, releasing its escrow when still held.
+
+    Locks the escrow before the invoice, the same order as a release, so a payment and a
+    concurrent release cannot deadlock.
+
+    Returns:
+        tuple: (invoice, True) or (invoice, False) when it was already paid
+
+    Raises:
+        LookupError: No such invoice
+        EscrowStateError: The invoice is cancelled or its escrow refunded or disputed
+    """
+    escrow_id = db.session.scalar(select(Invoice.escrow_id).where(Invoice.id == invoice_id))
+    escrow = lock_escrow(escrow_id) if escrow_id else None
+    invoice = db.session.scalars(
+        select(Invoice)
+        .where(Invoice.id == invoice_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).first()
+    if invoice is None:
+        raise LookupError("Invoice not found")
+    if invoice.status == "paid":
+        return invoice, False
+    if invoice.status == "cancelled":
+        raise EscrowStateError("Cannot pay a cancelled invoice")
+
+    if escrow is not None and escrow.status != RELEASED:
+        if escrow.status != HELD:
+            raise EscrowStateError(f"Cannot pay an invoice whose escrow is {escrow.status}")
+        transition(escrow, "release")
+    invoice.status = "paid"
+    invoice.paid_at = invoice.paid_at or datetime.utcnow()
+    db.session.flush()
+    return invoice, True
@@ -0,0 +1,384 @@
+"""
+Event Bus
+Owner: Ryan
+Description: Domain events for the project workflow. Request handlers publish an event
+inside their transaction, which writes it to the transactional outbox; once it commits,
+the subscribers (email, in-app notifications, audit) run in a worker pool with the
+participants loaded in a single query. Delivery is at least once: failed subscribers are
+retried with backoff by `flask outbox dispatch`, and ones that succeeded are skipped.
+Nothing is dispatched for a transaction that rolls back.
+"""
+
+import atexit
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from flask import current_app
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import aliased
+
+from app.extensions import db
+from app.models.deliverable import Deliverable
+from app.models.outbox import OutboxDelivery, OutboxMessage
+from app.models.project import Project
+from app.models.user import User
+
+PENDING_KEY = "event_bus_pending"
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_ATTEMPTS = 8
+DEFAULT_LEASE_SECONDS = 300
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 6 * 3600
+
+# -------------------- Domain events --------------------
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    project_id: int
+    actor_id: Optional[int]
+
+    @property
+    def name(self):
+        return type(self).__name__
+
+    def to_dict(self):
+        return {"event": self.name, **asdict(self)}
+
+    def idempotency_key(self):
+        """Events publishing the same key are stored and delivered once"""
+        return f"{self.name}:{uuid.uuid4().hex}"
+
+
+@dataclass(frozen=True)
+class DeliverableSubmitted(DomainEvent):
+    deliverable_id: int
+
+
+@dataclass(frozen=True)
+class DeliverableApproved(DomainEvent):
+    deliverable_id: int
+    portfolio_created: bool = False
+    escrow_released_amount: Optional[float] = None
+
+    def idempotency_key(self):
+        # A deliverable is approved (and paid out) once
+        return f"{self.name}:{self.deliverable_id}"
+
+
+@dataclass(frozen=True)
+class RevisionRequested(DomainEvent):
+    deliverable_id: int
+    feedback: str = ""
+
+
+@dataclass(frozen=True)
+class DeliverableRejected(DomainEvent):
+    deliverable_id: int
+    reason: str = ""
+
+
+@dataclass(frozen=True)
+class FreelancerAssigned(DomainEvent):
+    freelancer_id: int
+
+
+def event_types():
+    """Event class name -> class, for rebuilding events from the outbox"""
+    types, pending = {}, [DomainEvent]
+    while pending:
+        cls = pending.pop()
+        types[cls.__name__] = cls
+        pending.extend(cls.__subclasses__())
+    return types
+
+
+def retry_delay(attempts):
+    """Exponential backoff before the next delivery attempt"""
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+class EventContext:
+    """The project, deliverable and participants an event is about"""
+
+    def __init__(self, event, project, client, freelancer, deliverable=None):
+        self.event = event
+        self.project = project
+        self.client = client
+        self.freelancer = freelancer
+        self.deliverable = deliverable
+
+
+def load_context(domain_event):
+    """
+    Load everything subscribers need for an event with one query.
+
+    Returns:
+        EventContext, or None when the project no longer exists
+    """
+    Client, Freelancer = aliased(User), aliased(User)
+    columns = [Project, Client, Freelancer]
+    deliverable_id = getattr(domain_event, "deliverable_id", None)
+    if deliverable_id is not None:
+        columns.append(Deliverable)
+
+    query = (
+        select(*columns)
+        .join(Client, Client.id == Project.client_id)
+        .outerjoin(Freelancer, Freelancer.id == Project.freelancer_id)
+        .where(Project.id == domain_event.project_id)
+    )
+    if deliverable_id is not None:
+        query = query.join(
+            Deliverable,
+            (Deliverable.project_id == Project.id) & (Deliverable.id == deliverable_id),
+        )
+
+    row = db.session.execute(query).first()
+    if row is None:
+        return None
+    return EventContext(domain_event, *row)
+
+
+# -------------------- Bus --------------------
+
+
+class EventBus:
+    """
+    After-commit publish/subscribe over the transactional outbox.
+
+    Config:
+        EVENT_BUS_ASYNC: Run subscribers in the worker pool (default: not TESTING)
+        EVENT_BUS_WORKERS: Worker pool size
+        OUTBOX_MAX_ATTEMPTS: Deliveries before a message is marked failed
+        OUTBOX_LEASE_SECONDS: How long a dispatcher owns a message before it is retried
+    """
+
+    def __init__(self):
+        self.app = None
+        self._subscribers = {}
+        self._executor = None
+        self._registered = False
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions["event_bus"] = self
+        if not self._registered:
+            event.listen(db.session, "after_commit", self._after_commit)
+            event.listen(db.session, "after_rollback", self._after_rollback)
+            atexit.register(self.shutdown)
+            self._registered = True
+
+    def _setting(self, name, default):
+        return self.app.config.get(name, default)
+
+    def subscribe(self, *event_types):
+        """Decorator registering a subscriber for one or more event types"""
+
+        def register(handler):
+            for event_type in event_types:
+                self._subscribers.setdefault(event_type, []).append(handler)
+            return handler
+
+        return register
+
+    def subscribers(self, event_type):
+        handlers = []
+        for cls in event_type.__mro__:
+            handlers.extend(self._subscribers.get(cls, ()))
+        return handlers
+
+    # -------------------- Publishing --------------------
+
+    def publish(self, domain_event, session=None, idempotency_key=None):
+        """
+        Write an event to the outbox in the current transaction; subscribers run
+        only once it commits.
+
+        Returns:
+            int | None: Outbox message id, or None if the key was already published
+        """
+        session = session or db.session
+        payload = asdict(domain_event)
+        message_id = OutboxMessage.enqueue(
+            session,
+            domain_event.name,
+            payload,
+            idempotency_key or domain_event.idempotency_key(),
+        )
+        if message_id is not None:
+            session.info.setdefault(PENDING_KEY, []).append(message_id)
+        return message_id
+
+    def _after_commit(self, session):
+        message_ids = session.info.pop(PENDING_KEY, None)
+        if not message_ids or self.app is None:
+            return
+        executor = self._get_executor()
+        futures = [executor.submit(self._dispatch, message_id) for message_id in message_ids]
+        if not self._setting("EVENT_BUS_ASYNC", not self._setting("TESTING", False)):
+            # Synchronous mode (tests): still a separate session, but wait for it
+            for future in futures:
+                future.result()
+
+    def _after_rollback(self, session):
+        session.info.pop(PENDING_KEY, None)
+
+    def _get_executor(self):
+        if self._executor is None:
+            workers = self._setting("EVENT_BUS_WORKERS", DEFAULT_WORKERS)
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="event-bus")
+        return self._executor
+
+    def _dispatch(self, message_id):
+        with self.app.app_context():
+            try:
+                self.process(message_id)
+            except Exception as e:
+                # The message keeps its lease and is retried by the outbox sweeper
+                current_app.logger.error(f"Outbox message {message_id} failed: {str(e)}")
+            finally:
+                db.session.remove()
+
+    # -------------------- Delivery --------------------
+
+    def process(self, message_id, now=None):
+        """
+        Deliver one outbox message to every subscriber that has not handled it yet.
+
+        Each subscriber's work commits together with its delivery record, so a retry
+        skips it. The message ends done, pending (retried with backoff) or failed.
+
+        Returns:
+            str | None: The message's new status, or None if another dispatcher owns it
+        """
+        now = now or datetime.utcnow()
+        session = db.session()
+        # Subscribers commit one by one; keep the loaded context valid between them.
+        # The scoped session is shared with the caller, so restore its setting after.
+        expire_on_commit = session.expire_on_commit
+        session.expire_on_commit = False
+        try:
+            return self._deliver(session, message_id, now)
+        finally:
+            session.expire_on_commit = expire_on_commit
+
+    def _deliver(self, session, message_id, now):
+        claimed = OutboxMessage.claim(
+            session, message_id, now, self._setting("OUTBOX_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)
+        )
+        session.commit()
+        if not claimed:
+            return None
+
+        message = session.get(OutboxMessage, message_id)
+        delivered = {delivery.handler for delivery in message.deliveries}
+        errors = []
+
+        event_type = event_types().get(message.topic)
+        context = None
+        if event_type is None:
+            errors.append(f"Unknown topic {message.topic}")
+        else:
+            domain_event = event_type(**message.payload)
+            try:
+                context = load_context(domain_event)
+            except Exception as e:
+                session.rollback()
+                errors.append(f"load_context: {str(e)}")
+
+        if context is not None:
+            # Each subscriber is isolated: one failing does not stop the others
+            for handler in self.subscribers(event_type):
+                name = handler.__name__
+                if name in delivered:
+                    continue
+                try:
+                    handler(context)
+                    session.add(OutboxDelivery(message_id=message_id, handler=name))
+                    session.commit()
+                except Exception as e:
+                    session.rollback()
+                    errors.append(f"{name}: {str(e)}")
+                    current_app.logger.error(
+                        f"Subscriber {name} failed for {message.topic} #{message_id}: {str(e)}"
+                    )
+
+        status = self._finish(session, message, errors, now)
+        session.commit()
+        return status
+
+    def _finish(self, session, message, errors, now):
+        values = {"locked_until": None}
+        if not errors:
+            values.update(status="done", processed_at=now, last_error=None)
+        elif message.attempts >= self._setting("OUTBOX_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS):
+            values.update(status="failed", last_error="; ".join(errors))
+        else:
+            values.update(
+                status="pending",
+                available_at=now + retry_delay(message.attempts),
+                last_error="; ".join(errors),
+            )
+        session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id == message.id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        return values["status"]
+
+    def dispatch_pending(self, limit=100, now=None):
+        """
+        Deliver due messages: retries, and any whose after-commit dispatch was lost
+        (process restart, crash). Safe to run from several processes at once.
+
+        Returns:
+            dict: Count of messages per resulting status
+        """
+        now = now or datetime.utcnow()
+        message_ids = db.session.scalars(
+            select(OutboxMessage.id)
+            .where(OutboxMessage.due_clause(now))
+            .order_by(OutboxMessage.id)
+            .limit(limit)
+        ).all()
+        db.session.commit()
+
+        summary = {}
+        for message_id in message_ids:
+            status = self.process(message_id, now=now) or "skipped"
+            summary[status] = summary.get(status, 0) + 1
+        return summary
+
+    def purge_delivered(self, days=None, now=None):
+        """
+        Delete delivered messages older than the retention window (OUTBOX_RETENTION_DAYS).
+
+        Returns:
+            int: Messages deleted
+        """
+        if days is None:
+            days = self._setting("OUTBOX_RETENTION_DAYS", 14)
+        cutoff = (now or datetime.utcnow()) - timedelta(days=days)
+        deleted = OutboxMessage.query.filter(
+            OutboxMessage.status == "done", OutboxMessage.processed_at < cutoff
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+event_bus = EventBus()
+
+
+def publish(domain_event, idempotency_key=None):
+    """Publish a domain event from request code (see EventBus.publish)"""
+    return event_bus.publish(domain_event, idempotency_key=idempotency_key)
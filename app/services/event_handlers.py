@@ -0,0 +1,200 @@
+"""
+Event Handlers
+Owner: Ryan
+Description: Subscribers to the project workflow domain events: outbound email, in-app
+notifications and the audit trail. They run after commit in the event bus worker pool,
+each with its own commit, so a failing email never undoes a notification.
+"""
+
+import re
+from datetime import datetime
+from types import SimpleNamespace
+
+from flask import current_app
+
+from app.services.audit_buffer import audit_buffer
+from app.services.email_service import (
+    send_deliverable_approved_notification,
+    send_deliverable_feedback_notification,
+    send_deliverable_submitted_notification,
+    send_payment_released_notification,
+    send_portfolio_item_added_notification,
+    send_project_assignment_email,
+)
+from app.services.event_bus import (
+    DeliverableApproved,
+    DeliverableRejected,
+    DeliverableSubmitted,
+    DomainEvent,
+    FreelancerAssigned,
+    RevisionRequested,
+    event_bus,
+)
+from app.services.notification_service import notify_many
+
+
+def event_code(domain_event):
+    """DeliverableApproved -> deliverable_approved"""
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", domain_event.name).lower()
+
+
+def _has_email(user):
+    return user is not None and bool(user.email)
+
+
+class EmailNotSent(RuntimeError):
+    """The mailer refused an email; the subscriber fails and the outbox retries it"""
+
+
+def _require_sent(sent, description):
+    if not sent:
+        raise EmailNotSent(f"{description} was not sent")
+
+
+# -------------------- Email --------------------
+# One email per subscriber, so a retry resends only the one that failed
+
+
+@event_bus.subscribe(DeliverableSubmitted)
+def email_client_on_submission(context):
+    if _has_email(context.client) and context.freelancer is not None:
+        _require_sent(
+            send_deliverable_submitted_notification(
+                context.deliverable, context.project, context.client, context.freelancer
+            ),
+            "Submission email",
+        )
+
+
+@event_bus.subscribe(DeliverableApproved)
+def email_freelancer_on_approval(context):
+    if _has_email(context.freelancer):
+        _require_sent(
+            send_deliverable_approved_notification(context.deliverable, context.freelancer),
+            "Approval email",
+        )
+
+
+@event_bus.subscribe(DeliverableApproved)
+def email_freelancer_on_portfolio_item(context):
+    if _has_email(context.freelancer) and context.event.portfolio_created:
+        _require_sent(
+            send_portfolio_item_added_notification(
+                context.project, context.deliverable, context.freelancer, datetime.utcnow()
+            ),
+            "Portfolio email",
+        )
+
+
+@event_bus.subscribe(DeliverableApproved)
+def email_freelancer_on_payment_release(context):
+    amount = context.event.escrow_released_amount
+    if _has_email(context.freelancer) and amount is not None:
+        _require_sent(
+            send_payment_released_notification(context.freelancer, amount, context.project),
+            "Payment email",
+        )
+
+
+@event_bus.subscribe(RevisionRequested, DeliverableRejected)
+def email_freelancer_on_review(context):
+    if not _has_email(context.freelancer):
+        return
+    if isinstance(context.event, DeliverableRejected):
+        content = f"REJECTED: {context.event.reason}"
+    else:
+        content = context.event.feedback
+    # Shaped like a Feedback row: the email reads content, is_revision_request and user
+    feedback = SimpleNamespace(content=content, is_revision_request=True, user=context.client)
+    _require_sent(
+        send_deliverable_feedback_notification(
+            context.deliverable, feedback, context.client, recipient=context.freelancer.email
+        ),
+        "Review email",
+    )
+
+
+@event_bus.subscribe(FreelancerAssigned)
+def email_freelancer_on_assignment(context):
+    if _has_email(context.freelancer):
+        _require_sent(
+            send_project_assignment_email(context.project, context.freelancer),
+            "Assignment email",
+        )
+
+
+# -------------------- In-app notifications --------------------
+
+
+def _in_app_notification(context):
+    """(recipient, type, title, message) for an event, or None"""
+    domain_event = context.event
+    project, deliverable = context.project, context.deliverable
+
+    if isinstance(domain_event, DeliverableSubmitted):
+        return (
+            context.client,
+            "deliverable_submitted",
+            "New Deliverable Submitted",
+            f"'{deliverable.title}' (version {deliverable.version_number}) was uploaded "
+            f"for '{project.title}'",
+        )
+    if isinstance(domain_event, DeliverableApproved):
+        message = f"Your deliverable '{deliverable.title}' was approved"
+        if domain_event.escrow_released_amount is not None:
+            message += f" and ${domain_event.escrow_released_amount:.2f} was released"
+        return (context.freelancer, "deliverable_approved", "Deliverable Approved", message)
+    if isinstance(domain_event, RevisionRequested):
+        return (
+            context.freelancer,
+            "revision_requested",
+            "Revision Requested",
+            f"A revision was requested on '{deliverable.title}': {domain_event.feedback}",
+        )
+    if isinstance(domain_event, DeliverableRejected):
+        return (
+            context.freelancer,
+            "deliverable_rejected",
+            "Deliverable Rejected",
+            f"'{deliverable.title}' was rejected: {domain_event.reason}",
+        )
+    if isinstance(domain_event, FreelancerAssigned):
+        return (
+            context.freelancer,
+            "project_assigned",
+            "New Project Assignment",
+            f"You've been assigned to project '{project.title}'",
+        )
+    return None
+
+
+@event_bus.subscribe(DomainEvent)
+def notify_in_app(context):
+    notification = _in_app_notification(context)
+    if notification is None or notification[0] is None:
+        return
+    recipient, notification_type, title, message = notification
+    notify_many(
+        [recipient.id],
+        title,
+        message,
+        notification_type,
+        related_project_id=context.project.id,
+        related_deliverable_id=getattr(context.event, "deliverable_id", None),
+    )
+
+
+# -------------------- Audit --------------------
+
+
+@event_bus.subscribe(DomainEvent)
+def record_audit(context):
+    domain_event = context.event
+    if not audit_buffer.log(
+        f"event.{event_code(domain_event)}",
+        "project",
+        resource_id=domain_event.project_id,
+        user_id=domain_event.actor_id,
+        details=domain_event.to_dict(),
+    ):
+        current_app.logger.warning(f"Audit buffer full; dropped {domain_event.name}")
@@ -0,0 +1,208 @@
+"""
+Feedback Service
+Owner: Cindy
+Description: Loads threaded feedback for one or many deliverables in a single query
+and assembles the reply trees in memory; creates and resolves feedback in batches.
+"""
+
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import joinedload
+
+from app.extensions import db
+from app.models.feedback import Feedback
+from app.models.search_document import index_feedback
+
+FEEDBACK_TYPES = ("comment", "revision", "approval")
+PRIORITIES = ("low", "medium", "high")
+
+
+def build_feedback_tree(items, include_resolved=True):
+    """
+    Assemble flat feedback dicts into nested threads in O(n).
+
+    Args:
+        items: Feedback dicts (as produced by Feedback.to_dict(include_replies=False))
+            in chronological order
+        include_resolved: If False, resolved top-level threads are dropped
+
+    Returns:
+        list: Root feedback dicts, newest first, each with a nested "replies" list
+    """
+    nodes = {item["id"]: dict(item, replies=[]) for item in items}
+    roots = []
+
+    for node in nodes.values():
+        parent = nodes.get(node["parent_feedback_id"])
+        if parent is not None:
+            parent["replies"].append(node)
+        elif node["parent_feedback_id"] is None:
+            roots.append(node)
+
+    if not include_resolved:
+        roots = [root for root in roots if not root["is_resolved"]]
+
+    roots.reverse()
+    return roots
+
+
+def load_feedback_threads(deliverable_ids, include_resolved=True):
+    """
+    Fetch all feedback for the given deliverables with one query.
+
+    Args:
+        deliverable_ids: Iterable of deliverable IDs
+        include_resolved: If False, resolved top-level threads are dropped
+
+    Returns:
+        dict: deliverable_id -> list of root feedback dicts with nested replies
+    """
+    deliverable_ids = list(set(deliverable_ids))
+    if not deliverable_ids:
+        return {}
+
+    rows = (
+        Feedback.query.options(joinedload(Feedback.author))
+        .filter(Feedback.deliverable_id.in_(deliverable_ids))
+        .order_by(Feedback.created_at.asc(), Feedback.id.asc())
+        .all()
+    )
+
+    grouped = {deliverable_id: [] for deliverable_id in deliverable_ids}
+    for feedback in rows:
+        grouped[feedback.deliverable_id].append(feedback.to_dict(include_replies=False))
+
+    return {
+        deliverable_id: build_feedback_tree(items, include_resolved=include_resolved)
+        for deliverable_id, items in grouped.items()
+    }
+
+
+def load_feedback_thread(deliverable_id, include_resolved=True):
+    """Fetch the feedback threads of a single deliverable with one query."""
+    return load_feedback_threads([deliverable_id], include_resolved=include_resolved)[
+        deliverable_id
+    ]
+
+
+def validate_feedback_items(items, deliverable_id):
+    """
+    Validate a batch of feedback items for one deliverable.
+
+    Parent references are checked with a single query.
+
+    Args:
+        items: List of dicts with feedback_type, content, and optional priority
+            and parent_feedback_id
+        deliverable_id: The deliverable every item belongs to
+
+    Returns:
+        list: Error dicts ({"index", "message"}); empty if the batch is valid
+    """
+    errors = []
+    parent_ids = set()
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "message": "Item must be an object"})
+            continue
+        if not item.get("content"):
+            errors.append({"index": index, "message": "Missing required field: content"})
+        if item.get("feedback_type") not in FEEDBACK_TYPES:
+            errors.append(
+                {
+                    "index": index,
+                    "message": f"Invalid feedback_type. Must be one of: {', '.join(FEEDBACK_TYPES)}",
+                }
+            )
+        if item.get("priority") and item["priority"] not in PRIORITIES:
+            errors.append(
+                {
+                    "index": index,
+                    "message": f"Invalid priority. Must be one of: {', '.join(PRIORITIES)}",
+                }
+            )
+        if item.get("parent_feedback_id"):
+            parent_ids.add(item["parent_feedback_id"])
+
+    if parent_ids:
+        known = {
+            row.id
+            for row in db.session.query(Feedback.id).filter(
+                Feedback.id.in_(parent_ids), Feedback.deliverable_id == deliverable_id
+            )
+        }
+        for index, item in enumerate(items):
+            if isinstance(item, dict) and item.get("parent_feedback_id") not in (None, *known):
+                errors.append(
+                    {
+                        "index": index,
+                        "message": f"Parent feedback {item['parent_feedback_id']} not found on this deliverable",
+                    }
+                )
+
+    return errors
+
+
+def create_feedback_batch(deliverable_id, user_id, items):
+    """
+    Insert validated feedback items with a single executemany INSERT.
+
+    ORM bulk inserts skip mapper events, so the unresolved counters and the
+    search index are updated here in one step each. The caller commits.
+
+    Returns:
+        list: The inserted Feedback objects
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "deliverable_id": deliverable_id,
+            "user_id": user_id,
+            "parent_feedback_id": item.get("parent_feedback_id"),
+            "feedback_type": item["feedback_type"],
+            "content": item["content"],
+            "priority": item.get("priority"),
+            "is_resolved": False,
+            "created_at": now,
+        }
+        for item in items
+    ]
+    if not rows:
+        return []
+
+    created = db.session.scalars(insert(Feedback).returning(Feedback), rows).all()
+    Feedback.adjust_unresolved_counters({deliverable_id: len(created)})
+    index_feedback(db.session.connection(), created)
+    return created
+
+
+def set_feedback_resolution(feedback_ids, resolved):
+    """
+    Resolve or unresolve many feedback items with one UPDATE.
+
+    Only rows whose state actually changes are touched, and the counters are
+    adjusted from the returned rows. The caller commits.
+
+    Returns:
+        list: IDs of the feedback items that changed state
+    """
+    if not feedback_ids:
+        return []
+
+    changed = db.session.execute(
+        update(Feedback)
+        .where(Feedback.id.in_(feedback_ids), Feedback.is_resolved.is_(not resolved))
+        .values(is_resolved=resolved, resolved_at=datetime.utcnow() if resolved else None)
+        .returning(Feedback.id, Feedback.deliverable_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    deltas = Counter(row.deliverable_id for row in changed)
+    sign = -1 if resolved else 1
+    Feedback.adjust_unresolved_counters(
+        {deliverable_id: sign * count for deliverable_id, count in deltas.items()}
+    )
+    return [row.id for row in changed]
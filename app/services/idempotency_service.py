@@ -0,0 +1,105 @@
+"""
+Idempotency Service
+Owner: Caleb
+Description: The @idempotent decorator for write endpoints that must not run twice (escrow
+release and refund, invoice payment). Decorated views leave the commit to it: successful
+responses are committed and errors rolled back. With an Idempotency-Key header the
+successful response is also stored under the key in the same transaction, and a retry of
+the same request gets that response back instead of running again.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import delete, update
+
+from app.extensions import db
+from app.models.idempotency_key import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+DEFAULT_TTL_HOURS = 24
+
+
+def request_fingerprint():
+    """sha256 of method, path and raw body"""
+    digest = hashlib.sha256(f"{request.method} {request.path}\n".encode("utf-8"))
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def _replay(user_id, key, fingerprint):
+    record = db.session.get(IdempotencyKey, (user_id, key))
+    if record is None or record.status_code is None:
+        return jsonify({"error": f"A request with this {HEADER} is still in progress"}), 409
+    if record.request_hash != fingerprint:
+        return jsonify({"error": f"{HEADER} was already used for a different request"}), 422
+    response = jsonify(record.response)
+    response.status_code = record.status_code
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(view):
+    """
+    Run a JWT-protected write view in one transaction, deduplicated by Idempotency-Key.
+
+    The key is claimed before the view runs; a concurrent request with the same key waits
+    on the claim and then replays the stored response. Error responses are not stored, so
+    the key can be retried after a 4xx/5xx.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is not None and not 0 < len(key) <= MAX_KEY_LENGTH:
+            return jsonify({"error": f"{HEADER} must be 1-{MAX_KEY_LENGTH} characters"}), 400
+
+        if key:
+            user_id = int(get_jwt_identity())
+            fingerprint = request_fingerprint()
+            if not IdempotencyKey.claim(db.session, user_id, key, request.endpoint, fingerprint):
+                response = _replay(user_id, key, fingerprint)
+                db.session.rollback()
+                return response
+
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+        except Exception:
+            db.session.rollback()
+            raise
+        if response.status_code >= 400:
+            db.session.rollback()
+            return response
+
+        if key:
+            db.session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+                .values(status_code=response.status_code, response=response.get_json(silent=True))
+                .execution_options(synchronize_session=False)
+            )
+        db.session.commit()
+        return response
+
+    return wrapper
+
+
+def purge_expired_keys(hours=None):
+    """
+    Delete stored responses older than IDEMPOTENCY_KEY_TTL_HOURS.
+
+    Returns:
+        int: Number of keys deleted
+    """
+    hours = hours or current_app.config.get("IDEMPOTENCY_KEY_TTL_HOURS", DEFAULT_TTL_HOURS)
+    result = db.session.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.created_at < datetime.utcnow() - timedelta(hours=hours))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,91 @@
+"""
+Invoice Number Service
+Owner: Caleb
+Description: Collision-free document numbers (INV-2026-000042) for invoices and escrow
+transactions. Each reservation is one upsert on invoice_number_sequences in its own
+short transaction, so concurrent requests never wait on one another's commits. Numbers
+are unique and increase per prefix and year; like database sequences they can have gaps
+(rolled-back requests, unused preallocated blocks).
+"""
+
+import threading
+import weakref
+from datetime import datetime
+
+from flask import current_app
+
+from app.extensions import db
+from app.models.invoice_number_sequence import InvoiceNumberSequence
+
+DEFAULT_BLOCK_SIZE = 1
+NUMBER_WIDTH = 6
+
+
+def format_number(prefix, year, value):
+    return f"{prefix}-{year}-{value:0{NUMBER_WIDTH}d}"
+
+
+class InvoiceNumberAllocator:
+    """
+    Hands out numbers one at a time from a per-process block reserved in advance
+    (INVOICE_NUMBER_BLOCK_SIZE), or reserves a whole contiguous block for batch billing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # engine -> {(prefix, year): [next value, end of block]}
+        self._blocks = weakref.WeakKeyDictionary()
+
+    def _reserve(self, prefix, year, count):
+        with db.engine.begin() as connection:
+            return InvoiceNumberSequence.reserve(connection, prefix, year, count)
+
+    def next(self, prefix, year=None):
+        """
+        The next number for prefix in year (default: the current year).
+
+        Returns:
+            str: e.g. INV-2026-000042
+        """
+        year = year or datetime.utcnow().year
+        with self._lock:
+            blocks = self._blocks.setdefault(db.engine, {})
+            block = blocks.get((prefix, year))
+            if block is None or block[0] >= block[1]:
+                size = max(
+                    1, current_app.config.get("INVOICE_NUMBER_BLOCK_SIZE", DEFAULT_BLOCK_SIZE)
+                )
+                first = self._reserve(prefix, year, size)
+                block = blocks[(prefix, year)] = [first, first + size]
+            value = block[0]
+            block[0] += 1
+        return format_number(prefix, year, value)
+
+    def reserve_block(self, prefix, count, year=None):
+        """
+        Reserve count consecutive numbers with one statement (batch invoicing).
+
+        Returns:
+            list: count formatted numbers in order
+        """
+        if count <= 0:
+            return []
+        year = year or datetime.utcnow().year
+        first = self._reserve(prefix, year, count)
+        return [format_number(prefix, year, value) for value in range(first, first + count)]
+
+    def reset(self):
+        """Forget preallocated blocks (their unused numbers become gaps)"""
+        with self._lock:
+            self._blocks = weakref.WeakKeyDictionary()
+
+
+invoice_numbers = InvoiceNumberAllocator()
+
+
+def next_invoice_number():
+    return invoice_numbers.next(current_app.config.get("INVOICE_NUMBER_PREFIX", "INV"))
+
+
+def next_escrow_number():
+    return invoice_numbers.next(current_app.config.get("ESCROW_NUMBER_PREFIX", "ESC"))
@@ -0,0 +1,269 @@
+"""
+Invoice PDF Service
+Owner: Caleb
+Description: Renders invoice PDFs from the Jinja template app/templates/invoices/invoice.txt
+in a process pool and stores them through the storage layer. Files are keyed by a hash of
+the invoice content, template and renderer version, so downloading an unchanged invoice
+never renders again and any change (status, amount, template) produces a new file.
+"""
+
+import atexit
+import hashlib
+import json
+import multiprocessing
+import os
+import textwrap
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import current_app
+from jinja2 import Environment
+from sqlalchemy import select, update
+
+from app.extensions import db
+from app.models.invoice import Invoice
+from app.models.project import Project
+from app.services.storage_service import get_storage
+from app.utils.pdf import render_text_pdf
+
+# Bump when the layout code changes so cached files are rendered again
+RENDERER_VERSION = "1"
+TEMPLATE_PATH = os.path.join("templates", "invoices", "invoice.txt")
+BODY_WIDTH = 80
+DEFAULT_WORKERS = 2
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+# -------------------- Rendering (runs in the pool) --------------------
+
+
+def render_invoice_pdf(context, template_source):
+    """
+    Render one invoice. Pure function of its arguments so it can run in a worker process.
+
+    Template lines starting with "# " are the title, "## " headings, the rest body text.
+
+    Returns:
+        bytes: The PDF
+    """
+    text = Environment(autoescape=False).from_string(template_source).render(**context)
+    lines = []
+    for line in text.splitlines():
+        if line.startswith("# "):
+            lines.append(("title", line[2:]))
+        elif line.startswith("## "):
+            lines.append(("heading", line[3:]))
+        else:
+            lines.extend(("body", part) for part in textwrap.wrap(line, BODY_WIDTH) or [""])
+    return render_text_pdf(lines)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: forking a threaded (or gevent) server process is not safe
+            _executor = ProcessPoolExecutor(
+                max_workers=current_app.config.get("INVOICE_PDF_WORKERS", DEFAULT_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            atexit.register(_executor.shutdown, wait=False)
+        return _executor
+
+
+def _gevent_patched():
+    """True under gevent workers, whose monkey-patching process pools do not support"""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched("threading")
+
+
+def render_many(jobs):
+    """
+    Render (context, template_source) pairs in the process pool, in order.
+
+    With INVOICE_PDF_WORKERS=0, or under gevent workers, they render in the calling thread.
+    """
+    if not jobs:
+        return []
+    if current_app.config.get("INVOICE_PDF_WORKERS", DEFAULT_WORKERS) <= 0 or _gevent_patched():
+        return [render_invoice_pdf(*job) for job in jobs]
+    contexts, sources = zip(*jobs)
+    return list(_get_executor().map(render_invoice_pdf, contexts, sources, chunksize=8))
+
+
+# -------------------- Content and cache keys --------------------
+
+
+def template_source():
+    with open(os.path.join(current_app.root_path, TEMPLATE_PATH), encoding="utf-8") as fh:
+        return fh.read()
+
+
+def _person(user):
+    if user is None:
+        return {"name": "-", "email": ""}
+    return {"name": f"{user.first_name} {user.last_name}", "email": user.email}
+
+
+def invoice_context(invoice, project_title):
+    """Everything the template shows; the cache key is derived from it"""
+    return {
+        "invoice_id": invoice.id,
+        "invoice_number": invoice.invoice_number,
+        "status": invoice.status,
+        "amount": float(invoice.amount),
+        "currency": invoice.currency,
+        "issue_date": invoice.issue_date.isoformat() if invoice.issue_date else None,
+        "due_date": invoice.due_date.isoformat() if invoice.due_date else None,
+        "paid_at": invoice.paid_at.isoformat() if invoice.paid_at else None,
+        "notes": invoice.notes or "",
+        "escrow_id": invoice.escrow_id,
+        "project_title": project_title or f"Project #{invoice.project_id}",
+        "client": _person(invoice.client),
+        "freelancer": _person(invoice.freelancer),
+    }
+
+
+def content_hash(context, source):
+    payload = json.dumps(
+        {"renderer": RENDERER_VERSION, "template": source, "invoice": context}, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def pdf_key(digest):
+    return f"invoices/{digest}.pdf"
+
+
+def _storage_backend():
+    return current_app.config.get("INVOICE_PDF_STORAGE_BACKEND") or current_app.config.get(
+        "STORAGE_BACKEND"
+    )
+
+
+def is_current(invoice, digest):
+    return invoice.pdf_hash == digest and bool(invoice.pdf_key)
+
+
+# -------------------- Public API --------------------
+
+
+def invoice_pdf_url(invoice_id):
+    """The authenticated download route; stored files are never linked directly"""
+    return f"/api/invoices/{invoice_id}/pdf"
+
+
+def _store(storage, digest, data):
+    result = storage.save_bytes(data, pdf_key(digest), content_type="application/pdf")
+    if not result.get("success"):
+        raise RuntimeError(f"Storing invoice PDF failed: {result.get('error')}")
+
+
+def ensure_invoice_pdf(invoice):
+    """
+    Make sure the invoice's stored PDF matches its current content, rendering only when
+    it does not. Commits when the stored file changes.
+
+    Returns:
+        str: The content hash (usable as an ETag)
+    """
+    project_title = db.session.scalar(select(Project.title).where(Project.id == invoice.project_id))
+    source = template_source()
+    context = invoice_context(invoice, project_title)
+    digest = content_hash(context, source)
+    if is_current(invoice, digest):
+        return digest
+
+    backend = _storage_backend()
+    storage = get_storage(backend)
+    key = pdf_key(digest)
+    if not storage.exists(key):
+        _store(storage, digest, render_many([(context, source)])[0])
+
+    invoice.pdf_hash, invoice.pdf_key, invoice.pdf_storage_backend = digest, key, backend
+    invoice.pdf_url = invoice_pdf_url(invoice.id)
+    db.session.commit()
+    return digest
+
+
+def prerender_invoices(invoice_ids=None, force=False, batch_size=100):
+    """
+    Render PDFs for many invoices (e.g. after a billing run).
+
+    Invoices are walked in primary-key order; each batch is loaded with one query, its
+    stale PDFs are rendered in parallel in the process pool, and the new keys are written
+    back with a single bulk UPDATE.
+
+    Args:
+        invoice_ids: Limit to these invoices (default: all)
+        force: Render even when the stored PDF is current
+
+    Returns:
+        dict: Counts of rendered, cached and failed invoices
+    """
+    summary = {"rendered": 0, "cached": 0, "failed": 0, "failed_ids": []}
+    source = template_source()
+    backend = _storage_backend()
+    storage = get_storage(backend)
+    last_id = 0
+
+    while True:
+        query = (
+            db.session.query(Invoice, Project.title)
+            .outerjoin(Project, Project.id == Invoice.project_id)
+            .filter(Invoice.id > last_id)
+        )
+        if invoice_ids is not None:
+            query = query.filter(Invoice.id.in_(invoice_ids))
+        rows = query.order_by(Invoice.id).limit(batch_size).all()
+        if not rows:
+            break
+        last_id = rows[-1][0].id
+
+        stale, mappings = [], []
+        for invoice, project_title in rows:
+            context = invoice_context(invoice, project_title)
+            digest = content_hash(context, source)
+            if not force and is_current(invoice, digest):
+                summary["cached"] += 1
+            elif not force and storage.exists(pdf_key(digest)):
+                summary["cached"] += 1
+                mappings.append((invoice.id, digest))
+            else:
+                stale.append((invoice.id, digest, context))
+
+        rendered = render_many([(context, source) for _, _, context in stale])
+        for (invoice_id, digest, _), data in zip(stale, rendered):
+            try:
+                _store(storage, digest, data)
+                mappings.append((invoice_id, digest))
+                summary["rendered"] += 1
+            except RuntimeError as e:
+                current_app.logger.error(f"Invoice {invoice_id}: {str(e)}")
+                summary["failed"] += 1
+                summary["failed_ids"].append(invoice_id)
+
+        if mappings:
+            db.session.execute(
+                update(Invoice),
+                [
+                    {
+                        "id": invoice_id,
+                        "pdf_hash": digest,
+                        "pdf_key": pdf_key(digest),
+                        "pdf_storage_backend": backend,
+                        "pdf_url": invoice_pdf_url(invoice_id),
+                    }
+                    for invoice_id, digest in mappings
+                ],
+            )
+        db.session.commit()
+        if len(rows) < batch_size:
+            break
+
+    return summary
@@ -0,0 +1,315 @@
+"""
+Invoice Service
+Owner: Caleb
+Description: Invoice work that runs in bulk. Batch billing invoices every completed,
+uninvoiced project with one query and one multi-row INSERT per chunk. The overdue sweeper
+flips unpaid invoices past their due date to overdue with set-based UPDATEs and sends the
+reminders for each batch with one notification INSERT.
+"""
+
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import insert, select, update
+
+from app.extensions import db
+from app.models.escrow_transaction import EscrowTransaction
+from app.models.invoice import Invoice
+from app.models.project import Project
+from app.services.audit_buffer import audit_buffer
+from app.services.invoice_number_service import invoice_numbers
+from app.services.notification_service import create_notifications
+from app.services.realtime_service import publish_after_commit
+
+DEFAULT_SWEEP_BATCH_SIZE = 1000
+DEFAULT_BILLING_BATCH_SIZE = 500
+DEFAULT_PAYMENT_TERMS_DAYS = 14
+
+
+# -------------------- Batch billing --------------------
+
+
+def _billable_projects(after_id, limit, project_ids=None, completed_before=None):
+    """Completed projects without a live invoice, locked for this run (others skip them)"""
+    invoiced = (
+        select(Invoice.id)
+        .where(Invoice.project_id == Project.id, Invoice.status != "cancelled")
+        .exists()
+    )
+    stmt = (
+        select(
+            Project.id,
+            Project.client_id,
+            Project.freelancer_id,
+            Project.budget,
+            EscrowTransaction.id.label("escrow_id"),
+            EscrowTransaction.amount.label("escrow_amount"),
+            EscrowTransaction.currency,
+            EscrowTransaction.status.label("escrow_status"),
+            EscrowTransaction.released_at,
+        )
+        .outerjoin(EscrowTransaction, EscrowTransaction.project_id == Project.id)
+        .where(Project.status == "completed", ~invoiced, Project.id > after_id)
+        .order_by(Project.id)
+        .limit(limit)
+        .with_for_update(of=Project, skip_locked=True)
+    )
+    if project_ids is not None:
+        stmt = stmt.where(Project.id.in_(project_ids))
+    if completed_before is not None:
+        stmt = stmt.where(Project.completed_at < completed_before)
+    return db.session.execute(stmt).all()
+
+
+def _already_invoiced(project_ids):
+    """
+    Which of the locked projects have a live invoice, read in a fresh statement.
+
+    _billable_projects evaluates NOT EXISTS against the snapshot its SELECT started with,
+    so a run that invoiced a project and committed just before we locked its row is only
+    visible to a new statement. Every batch run locks a project before invoicing it, so
+    once we hold the lock this answer cannot change until we commit.
+    """
+    return set(
+        db.session.scalars(
+            select(Invoice.project_id).where(
+                Invoice.project_id.in_(project_ids), Invoice.status != "cancelled"
+            )
+        )
+    )
+
+
+def _invoice_values(project, amount, invoice_number, now, due_days):
+    values = {
+        "project_id": project.id,
+        "client_id": project.client_id,
+        "freelancer_id": project.freelancer_id,
+        "invoice_number": invoice_number,
+        "amount": amount,
+        "currency": project.currency or "USD",
+        "issue_date": now,
+        "due_date": now + timedelta(days=due_days) if due_days else None,
+        "paid_at": None,
+        "status": "unpaid",
+        "escrow_id": project.escrow_id,
+        "notes": "Generated by batch billing",
+    }
+    # Escrow already paid out: the invoice is settled by it
+    if project.escrow_status == "released":
+        values.update(status="paid", paid_at=project.released_at or now)
+    return values
+
+
+def generate_invoices(
+    project_ids=None, completed_before=None, due_days=None, dry_run=False, batch_size=None
+):
+    """
+    Invoice completed projects that have none yet, in chunks of batch_size.
+
+    Each chunk is one SELECT (project, escrow) that locks the chosen projects with SKIP
+    LOCKED, one reservation of consecutive invoice numbers and one multi-row INSERT,
+    committed together. A project a concurrent run invoiced while this one waited for its
+    lock is rechecked after locking and skipped (already_invoiced), so batch runs never
+    invoice a project twice. The amount is the escrow amount, falling back to the project
+    budget; the invoice is linked to the escrow and is already paid when the escrow was
+    released.
+
+    Args:
+        project_ids: Limit the run to these projects
+        completed_before: Only projects completed before this datetime
+        due_days: Payment terms (default INVOICE_PAYMENT_TERMS_DAYS; 0 for no due date)
+        dry_run: Report what would be invoiced without writing
+
+    Returns:
+        dict: Counts per outcome and one result per project considered
+    """
+    config = current_app.config
+    batch_size = batch_size or config.get("INVOICE_BATCH_SIZE", DEFAULT_BILLING_BATCH_SIZE)
+    if due_days is None:
+        due_days = config.get("INVOICE_PAYMENT_TERMS_DAYS", DEFAULT_PAYMENT_TERMS_DAYS)
+    prefix = config.get("INVOICE_NUMBER_PREFIX", "INV")
+    now = datetime.utcnow()
+
+    results = []
+    after_id = 0
+    while True:
+        projects = _billable_projects(after_id, batch_size, project_ids, completed_before)
+        if not projects:
+            db.session.commit()
+            break
+        after_id = projects[-1].id
+
+        invoiced = _already_invoiced([project.id for project in projects])
+        billable = []
+        for project in projects:
+            amount = project.escrow_amount if project.escrow_id else project.budget
+            if project.id in invoiced:
+                results.append(
+                    {"project_id": project.id, "status": "skipped", "reason": "already_invoiced"}
+                )
+            elif project.freelancer_id is None:
+                results.append(
+                    {"project_id": project.id, "status": "skipped", "reason": "no_freelancer"}
+                )
+            elif amount is None or amount <= 0:
+                results.append(
+                    {"project_id": project.id, "status": "skipped", "reason": "no_amount"}
+                )
+            else:
+                billable.append((project, amount))
+
+        if dry_run:
+            results.extend(
+                {"project_id": project.id, "status": "eligible", "amount": float(amount)}
+                for project, amount in billable
+            )
+            db.session.rollback()
+        elif billable:
+            numbers = invoice_numbers.reserve_block(prefix, len(billable))
+            rows = [
+                _invoice_values(project, amount, number, now, due_days)
+                for (project, amount), number in zip(billable, numbers)
+            ]
+            created = db.session.execute(
+                insert(Invoice).returning(
+                    Invoice.id, Invoice.project_id, Invoice.status, sort_by_parameter_order=True
+                ),
+                rows,
+            ).all()
+            audience = {row["client_id"] for row in rows} | {row["freelancer_id"] for row in rows}
+            publish_after_commit(
+                db.session, audience, {"event": "dashboard", "data": {"stale": True}}
+            )
+            db.session.commit()
+
+            for invoice, row in zip(created, rows):
+                results.append(
+                    {
+                        "project_id": invoice.project_id,
+                        "status": "created",
+                        "invoice_id": invoice.id,
+                        "invoice_number": row["invoice_number"],
+                        "invoice_status": invoice.status,
+                        "amount": float(row["amount"]),
+                        "escrow_id": row["escrow_id"],
+                    }
+                )
+                audit_buffer.log(
+                    "invoice.created",
+                    "invoice",
+                    resource_id=invoice.id,
+                    details={"values": {"project_id": invoice.project_id, "batch": True}},
+                )
+        else:
+            db.session.commit()
+
+        if len(projects) < batch_size:
+            break
+
+    if project_ids is not None:
+        seen = {result["project_id"] for result in results}
+        results.extend(
+            {"project_id": project_id, "status": "skipped", "reason": "not_eligible"}
+            for project_id in sorted(set(project_ids) - seen)
+        )
+
+    results.sort(key=lambda result: result["project_id"])
+    summary = {}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    return {"dry_run": dry_run, "summary": summary, "results": results}
+
+
+# -------------------- Overdue sweep --------------------
+
+
+def _overdue_notifications(rows):
+    notifications = []
+    for row in rows:
+        summary = f"Invoice {row.invoice_number} ({row.amount:.2f} {row.currency})"
+        due = row.due_date.strftime("%Y-%m-%d")
+        notifications.append(
+            {
+                "user_id": row.client_id,
+                "type": "invoice_overdue",
+                "title": "Invoice Overdue",
+                "message": f"{summary} was due on {due}. Please arrange payment.",
+                "related_project_id": row.project_id,
+            }
+        )
+        notifications.append(
+            {
+                "user_id": row.freelancer_id,
+                "type": "invoice_overdue",
+                "title": "Invoice Overdue",
+                "message": f"{summary} was due on {due}; the client has been reminded.",
+                "related_project_id": row.project_id,
+            }
+        )
+    return notifications
+
+
+def mark_overdue_invoices(now=None, batch_size=None):
+    """
+    Mark unpaid invoices past their due date as overdue and notify both parties.
+
+    Each batch is one UPDATE ... RETURNING over the partial index of unpaid invoices,
+    committed together with its reminders, so a crash mid-sweep never reminds twice and
+    the next run picks up where this one stopped. Rows locked by a concurrent payment
+    are skipped and left for the next run.
+
+    Returns:
+        list: Ids of the invoices marked overdue
+    """
+    now = now or datetime.utcnow()
+    batch_size = batch_size or current_app.config.get(
+        "OVERDUE_SWEEP_BATCH_SIZE", DEFAULT_SWEEP_BATCH_SIZE
+    )
+
+    marked = []
+    while True:
+        due = (
+            select(Invoice.id)
+            .where(Invoice.status == "unpaid", Invoice.due_date < now)
+            .order_by(Invoice.due_date, Invoice.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        rows = db.session.execute(
+            update(Invoice)
+            .where(Invoice.id.in_(due), Invoice.status == "unpaid")
+            .values(status="overdue")
+            .returning(
+                Invoice.id,
+                Invoice.project_id,
+                Invoice.client_id,
+                Invoice.freelancer_id,
+                Invoice.invoice_number,
+                Invoice.amount,
+                Invoice.currency,
+                Invoice.due_date,
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        if not rows:
+            db.session.commit()
+            break
+
+        create_notifications(_overdue_notifications(rows))
+        # Bulk UPDATEs skip the flush hooks, so queue the dashboard refresh explicitly
+        audience = {row.client_id for row in rows} | {row.freelancer_id for row in rows}
+        publish_after_commit(db.session, audience, {"event": "dashboard", "data": {"stale": True}})
+        db.session.commit()
+
+        for row in rows:
+            audit_buffer.log(
+                "invoice.updated",
+                "invoice",
+                resource_id=row.id,
+                details={"changes": {"status": ["unpaid", "overdue"]}},
+            )
+        marked.extend(row.id for row in rows)
+        if len(rows) < batch_size:
+            break
+
+    return marked
@@ -0,0 +1,512 @@
+"""
+Job Service
+Owner: Caleb
+Description: Lightweight background jobs on top of the jobs table. Tasks register with
+@task, are enqueued inside the caller's transaction, and run in `flask jobs worker`, which
+claims due jobs with FOR UPDATE SKIP LOCKED, runs them in a thread or process pool,
+retries failures with backoff and enqueues cron schedules. No external broker needed.
+"""
+
+import os
+import signal
+import socket
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import insert, select, update
+
+from app.extensions import db
+from app.models.job import Job, JobSchedule
+from app.utils.cron import CronExpression
+from app.utils.upsert import dialect_insert
+
+DEFAULT_QUEUE = "default"
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_LEASE_SECONDS = 900
+RETRY_BASE_SECONDS = 10
+RETRY_MAX_SECONDS = 3600
+
+TASKS = {}
+
+
+class TaskSpec:
+    def __init__(self, name, fn, max_attempts, queue):
+        self.name = name
+        self.fn = fn
+        self.max_attempts = max_attempts
+        self.queue = queue
+
+
+def task(name, max_attempts=DEFAULT_MAX_ATTEMPTS, queue=DEFAULT_QUEUE):
+    """
+    Register a function as a background task.
+
+    The function receives the job payload as keyword arguments and runs inside an app
+    context; its return value (JSON-serializable) is stored as the job result and its
+    session work is committed when it returns.
+    """
+
+    def register(fn):
+        TASKS[name] = TaskSpec(name, fn, max_attempts, queue)
+        return fn
+
+    return register
+
+
+def retry_delay(attempts):
+    """Exponential backoff before a failed job runs again"""
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# -------------------- Enqueueing --------------------
+
+
+def enqueue(
+    task_name,
+    payload=None,
+    run_at=None,
+    queue=None,
+    priority=0,
+    max_attempts=None,
+    unique_key=None,
+    created_by=None,
+    session=None,
+):
+    """
+    Add a job in the current transaction (it becomes visible to workers on commit).
+
+    Args:
+        task_name: Name a function was registered under with @task
+        payload: JSON-serializable keyword arguments for the task
+        run_at: Earliest start time (default: now)
+        unique_key: Skip the enqueue if a job with this key already exists
+
+    Returns:
+        Job | None: The job, or None when unique_key was already used
+
+    Raises:
+        ValueError: If the task is not registered
+    """
+    spec = TASKS.get(task_name)
+    if spec is None:
+        raise ValueError(f"Unknown task: {task_name}")
+
+    session = session or db.session
+    now = datetime.utcnow()
+    values = {
+        "task": task_name,
+        "payload": payload or {},
+        "queue": queue or spec.queue,
+        "priority": priority,
+        "status": "queued",
+        "attempts": 0,
+        "max_attempts": max_attempts or spec.max_attempts,
+        "run_at": run_at or now,
+        "unique_key": unique_key,
+        "created_by": created_by,
+        "created_at": now,
+    }
+
+    stmt = dialect_insert(session.connection(), Job)
+    if stmt is not None:
+        stmt = stmt.values(values)
+        if unique_key:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[Job.unique_key])
+    else:
+        stmt = insert(Job).values(values)
+    return session.scalars(stmt.returning(Job)).first()
+
+
+# -------------------- Claiming and running --------------------
+
+
+def claim_jobs(worker_id, queues, limit, now=None, lease_seconds=None):
+    """
+    Lease up to limit due jobs to this worker and commit.
+
+    The candidate rows are locked with FOR UPDATE SKIP LOCKED, so concurrent workers
+    each get different jobs without waiting on one another.
+
+    Returns:
+        list: Claimed job ids
+    """
+    if limit <= 0:
+        return []
+    now = now or datetime.utcnow()
+    lease_seconds = lease_seconds or current_app.config.get(
+        "JOBS_LEASE_SECONDS", DEFAULT_LEASE_SECONDS
+    )
+
+    candidates = (
+        select(Job.id)
+        .where(Job.status == "queued", Job.run_at <= now, Job.queue.in_(queues))
+        .order_by(Job.priority.desc(), Job.run_at, Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = db.session.scalars(
+        update(Job)
+        .where(Job.id.in_(candidates), Job.status == "queued")
+        .values(
+            status="running",
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=lease_seconds),
+            attempts=Job.attempts + 1,
+            started_at=now,
+        )
+        .returning(Job.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.session.commit()
+    return list(claimed)
+
+
+def extend_leases(worker_id, job_ids, now=None, lease_seconds=None):
+    """
+    Renew the lease on jobs this worker is still running, so a task that outlives
+    JOBS_LEASE_SECONDS is not recovered as abandoned while it runs. Commits.
+
+    Returns:
+        int: Leases extended
+    """
+    if not job_ids:
+        return 0
+    now = now or datetime.utcnow()
+    lease_seconds = lease_seconds or current_app.config.get(
+        "JOBS_LEASE_SECONDS", DEFAULT_LEASE_SECONDS
+    )
+    extended = db.session.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids), Job.status == "running", Job.locked_by == worker_id)
+        .values(locked_until=now + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return extended
+
+
+def recover_expired_leases(now=None):
+    """
+    Put jobs whose worker died (lease expired) back in the queue, or fail them when
+    they are out of attempts. Commits.
+
+    Returns:
+        int: Jobs recovered
+    """
+    now = now or datetime.utcnow()
+    expired = (Job.status == "running", Job.locked_until < now)
+    failed = db.session.execute(
+        update(Job)
+        .where(*expired, Job.attempts >= Job.max_attempts)
+        .values(status="failed", locked_by=None, locked_until=None, finished_at=now)
+        .values(last_error="Lease expired (worker stopped or job too slow)")
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    requeued = db.session.execute(
+        update(Job)
+        .where(*expired)
+        .values(status="queued", locked_by=None, locked_until=None, run_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return failed + requeued
+
+
+def run_job(job_id, worker_id):
+    """
+    Run one claimed job and record the outcome. Commits.
+
+    Returns:
+        str: The job's new status
+    """
+    job = db.session.get(Job, job_id)
+    task_name, payload, attempts, max_attempts = (
+        job.task,
+        job.payload or {},
+        job.attempts,
+        job.max_attempts,
+    )
+    db.session.commit()
+
+    try:
+        spec = TASKS.get(task_name)
+        if spec is None:
+            raise LookupError(f"Unknown task: {task_name}")
+        result = spec.fn(**payload)
+        db.session.commit()
+        values = {"status": "succeeded", "result": result, "last_error": None}
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Job {job_id} ({task_name}) failed: {str(e)}")
+        values = {"last_error": f"{type(e).__name__}: {str(e)}"}
+        if attempts >= max_attempts:
+            values["status"] = "failed"
+        else:
+            values.update(status="queued", run_at=datetime.utcnow() + retry_delay(attempts))
+
+    now = datetime.utcnow()
+    if values["status"] != "queued":
+        values["finished_at"] = now
+    # Only the lease holder may record the outcome
+    db.session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.locked_by == worker_id)
+        .values(locked_by=None, locked_until=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return values["status"]
+
+
+def cancel_job(job_id):
+    """
+    Cancel a job that has not started. The caller commits.
+
+    Returns:
+        bool: False if the job is not queued (already running or finished)
+    """
+    return (
+        db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "queued")
+            .values(status="cancelled", finished_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        == 1
+    )
+
+
+def retry_job(job_id):
+    """
+    Queue a failed or cancelled job again with a fresh set of attempts. The caller commits.
+
+    Returns:
+        bool: False if the job is not failed or cancelled
+    """
+    return (
+        db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status.in_(("failed", "cancelled")))
+            .values(status="queued", attempts=0, run_at=datetime.utcnow(), finished_at=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        == 1
+    )
+
+
+# -------------------- Schedules --------------------
+
+
+def sync_schedules(schedules=None, now=None):
+    """
+    Make job_schedules match config JOB_SCHEDULES: add new entries, update changed
+    ones (recomputing their next run) and disable removed ones. Commits.
+    """
+    schedules = current_app.config.get("JOB_SCHEDULES", {}) if schedules is None else schedules
+    now = now or datetime.utcnow()
+    existing = {schedule.name: schedule for schedule in JobSchedule.query.all()}
+
+    for name, spec in schedules.items():
+        cron = CronExpression(spec["cron"])
+        schedule = existing.pop(name, None)
+        if schedule is None:
+            schedule = JobSchedule(name=name, next_run_at=cron.next_after(now))
+            db.session.add(schedule)
+        elif schedule.cron != spec["cron"] or not schedule.enabled:
+            schedule.next_run_at = cron.next_after(now)
+        schedule.task = spec["task"]
+        schedule.cron = spec["cron"]
+        schedule.payload = spec.get("payload")
+        schedule.queue = spec.get("queue", DEFAULT_QUEUE)
+        schedule.enabled = spec.get("enabled", True)
+
+    for schedule in existing.values():
+        schedule.enabled = False
+    db.session.commit()
+
+
+def enqueue_due_schedules(now=None):
+    """
+    Enqueue one job for every schedule that is due and move it to its next fire time.
+    Several workers may run this at once: advancing next_run_at is a compare-and-set,
+    and the job's unique_key rejects a duplicate tick. Missed ticks collapse into one.
+    Commits.
+
+    Returns:
+        list: Ids of the jobs enqueued
+    """
+    now = now or datetime.utcnow()
+    due = JobSchedule.query.filter(
+        JobSchedule.enabled.is_(True), JobSchedule.next_run_at <= now
+    ).all()
+
+    enqueued = []
+    for schedule in due:
+        tick = schedule.next_run_at
+        advanced = db.session.execute(
+            update(JobSchedule)
+            .where(JobSchedule.name == schedule.name, JobSchedule.next_run_at == tick)
+            .values(next_run_at=CronExpression(schedule.cron).next_after(now), last_run_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not advanced:
+            continue
+        try:
+            job = enqueue(
+                schedule.task,
+                schedule.payload,
+                queue=schedule.queue,
+                unique_key=f"schedule:{schedule.name}:{tick.isoformat()}",
+            )
+        except ValueError as e:
+            current_app.logger.error(f"Schedule {schedule.name}: {str(e)}")
+            continue
+        if job is not None:
+            db.session.execute(
+                update(JobSchedule)
+                .where(JobSchedule.name == schedule.name)
+                .values(last_job_id=job.id)
+                .execution_options(synchronize_session=False)
+            )
+            enqueued.append(job.id)
+    db.session.commit()
+    return enqueued
+
+
+# -------------------- Worker --------------------
+
+_process_app = None
+
+
+def _init_process():
+    # Each pool process builds its own app and engine; connections are not fork-safe
+    global _process_app
+    from app import create_app
+
+    _process_app = create_app()
+
+
+def _run_in_process(job_id, worker_id):
+    with _process_app.app_context():
+        try:
+            return run_job(job_id, worker_id)
+        finally:
+            db.session.remove()
+
+
+class Worker:
+    """
+    Polls the jobs table and runs claimed jobs in a pool.
+
+    Config:
+        JOBS_CONCURRENCY: Jobs run at the same time
+        JOBS_POOL: "thread" (I/O-bound tasks) or "process" (CPU-bound tasks)
+        JOBS_QUEUES: Queues this worker serves
+        JOBS_POLL_INTERVAL: Seconds to wait for work when the queue is empty
+        JOBS_LEASE_SECONDS: How long a claimed job's lease lasts; the worker renews it
+            every third of that while the job runs, so only a stopped worker's jobs expire
+    """
+
+    def __init__(self, app, concurrency=None, pool=None, queues=None, poll_interval=None):
+        config = app.config
+        self.app = app
+        self.concurrency = concurrency or config.get("JOBS_CONCURRENCY", 4)
+        self.pool = pool or config.get("JOBS_POOL", "thread")
+        self.queues = queues or config.get("JOBS_QUEUES") or [DEFAULT_QUEUE]
+        self.poll_interval = poll_interval or config.get("JOBS_POLL_INTERVAL", 1.0)
+        self.lease_seconds = config.get("JOBS_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)
+        self.worker_id = worker_name()
+        self._stopping = threading.Event()
+        self._renewed_at = None
+
+    def stop(self, *_):
+        self._stopping.set()
+
+    def _run_in_thread(self, job_id):
+        with self.app.app_context():
+            try:
+                return run_job(job_id, self.worker_id)
+            finally:
+                db.session.remove()
+
+    def _executor(self):
+        if self.pool == "process":
+            return ProcessPoolExecutor(max_workers=self.concurrency, initializer=_init_process)
+        return ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="job")
+
+    def _submit(self, executor, job_id):
+        if self.pool == "process":
+            return executor.submit(_run_in_process, job_id, self.worker_id)
+        return executor.submit(self._run_in_thread, job_id)
+
+    def _tick(self, free_slots):
+        with self.app.app_context():
+            try:
+                enqueue_due_schedules()
+                recover_expired_leases()
+                return claim_jobs(self.worker_id, self.queues, free_slots)
+            finally:
+                db.session.remove()
+
+    def _heartbeat(self, job_ids, now=None):
+        """Renew the running jobs' leases once a third of the lease has passed"""
+        now = now or datetime.utcnow()
+        if self._renewed_at is not None and now - self._renewed_at < timedelta(
+            seconds=self.lease_seconds / 3
+        ):
+            return
+        self._renewed_at = now
+        with self.app.app_context():
+            try:
+                extend_leases(self.worker_id, job_ids, now, self.lease_seconds)
+            finally:
+                db.session.remove()
+
+    def _collect(self, done, running, summary):
+        for future in done:
+            running.pop(future)
+            status = future.exception() and "crashed" or future.result()
+            summary[status] = summary.get(status, 0) + 1
+
+    def run(self, once=False):
+        """
+        Work until stopped (SIGINT/SIGTERM finish the running jobs first), or with
+        once=True until no due job is left.
+
+        Returns:
+            dict: Count of finished jobs per resulting status
+        """
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+        with self.app.app_context():
+            sync_schedules()
+            db.session.remove()
+
+        summary = {}
+        # future -> job id
+        running = {}
+        with self._executor() as executor:
+            while not self._stopping.is_set():
+                for job_id in self._tick(self.concurrency - len(running)):
+                    running[self._submit(executor, job_id)] = job_id
+                if once and not running:
+                    break
+                if not running:
+                    self._stopping.wait(self.poll_interval)
+                    continue
+                done, _ = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                self._collect(done, running, summary)
+                self._heartbeat(list(running.values()))
+            # Stopping: keep the leases alive until the running jobs finish
+            while running:
+                done, _ = wait(running, timeout=self.poll_interval)
+                self._collect(done, running, summary)
+                self._heartbeat(list(running.values()))
+        return summary
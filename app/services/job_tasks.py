@@ -0,0 +1,59 @@
+"""
+Job Tasks
+Owner: Caleb
+Description: Built-in background tasks run by `flask jobs worker`. Schedules for them are
+set in config JOB_SCHEDULES; the `flask outbox` and `flask activity` commands remain for
+running the same maintenance by hand.
+"""
+
+from app.services.activity_service import drop_expired_partitions, ensure_partitions
+from app.services.event_bus import event_bus
+from app.services.idempotency_service import purge_expired_keys
+from app.services.invoice_pdf_service import prerender_invoices
+from app.services.invoice_service import mark_overdue_invoices
+from app.services.job_service import task
+from app.services.preview_service import backfill_deliverable_previews
+
+
+@task("outbox.dispatch", max_attempts=1, queue="maintenance")
+def dispatch_outbox(limit=100):
+    """Deliver due outbox messages (retries and dispatches lost to a restart)"""
+    return event_bus.dispatch_pending(limit=limit)
+
+
+@task("outbox.purge", queue="maintenance")
+def purge_outbox(days=None):
+    """Delete delivered outbox messages past retention"""
+    return {"deleted": event_bus.purge_delivered(days=days)}
+
+
+@task("activity.maintain", queue="maintenance")
+def maintain_activity_log(retention_months=None, months_ahead=None):
+    """Create upcoming activity log partitions and drop those past retention"""
+    created = ensure_partitions(months_ahead=months_ahead)
+    retention = drop_expired_partitions(retention_months=retention_months)
+    return {"created_partitions": created, **retention}
+
+
+@task("invoices.mark_overdue", queue="maintenance")
+def sweep_overdue_invoices(batch_size=None):
+    """Mark unpaid invoices past due as overdue and send the reminders"""
+    return {"marked_overdue": len(mark_overdue_invoices(batch_size=batch_size))}
+
+
+@task("invoices.render_pdfs")
+def render_invoice_pdfs(invoice_ids=None, force=False):
+    """Pre-render invoice PDFs, e.g. for the invoices of a billing run"""
+    return prerender_invoices(invoice_ids=invoice_ids, force=force)
+
+
+@task("deliverables.backfill_previews", queue="maintenance")
+def backfill_previews(batch_size=100, limit=None):
+    """Request eager Cloudinary previews for deliverables that have none"""
+    return backfill_deliverable_previews(batch_size=batch_size, limit=limit)
+
+
+@task("idempotency.purge", queue="maintenance")
+def purge_idempotency_keys(hours=None):
+    """Delete stored Idempotency-Key responses past IDEMPOTENCY_KEY_TTL_HOURS"""
+    return {"deleted": purge_expired_keys(hours=hours)}
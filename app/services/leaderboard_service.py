@@ -0,0 +1,88 @@
+"""
+Leaderboard Service
+Owner: Caleb
+Description: Serves the ranked freelancer leaderboard with keyset (cursor) pagination
+and skill filters, and rebuilds it from the rating aggregates.
+"""
+
+import base64
+import json
+
+from sqlalchemy import exists, select, tuple_
+from sqlalchemy.orm import joinedload
+
+from app.extensions import db
+from app.models.freelancer_profile import FreelancerProfile
+from app.models.leaderboard import FreelancerLeaderboardEntry
+from app.models.skill import FreelancerSkill, Skill
+
+
+def encode_cursor(entry):
+    """Opaque cursor pointing just after an entry in rank order"""
+    payload = json.dumps([entry.score, entry.freelancer_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        score, freelancer_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(score), int(freelancer_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def get_leaderboard(limit=20, cursor=None, skills=None, open_to_work=True):
+    """
+    One page of approved freelancers ordered by Bayesian score.
+
+    Args:
+        limit: Page size
+        cursor: Cursor from a previous page's next_cursor
+        skills: Optional skill names; freelancers with any of them match
+        open_to_work: True/False to filter on availability, None for everyone
+
+    Returns:
+        dict: {"entries": [...], "next_cursor": str | None}
+    """
+    Entry = FreelancerLeaderboardEntry
+    query = Entry.query.options(
+        joinedload(Entry.profile).selectinload(FreelancerProfile.skills)
+    ).filter(Entry.is_approved.is_(True))
+
+    if open_to_work is not None:
+        query = query.filter(Entry.open_to_work.is_(open_to_work))
+
+    if skills:
+        query = query.filter(
+            exists(
+                select(FreelancerSkill.id)
+                .join(Skill, Skill.id == FreelancerSkill.skill_id)
+                .where(FreelancerSkill.freelancer_id == Entry.profile_id, Skill.name.in_(skills))
+            )
+        )
+
+    if cursor:
+        score, freelancer_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Entry.score, Entry.freelancer_id) < (score, freelancer_id))
+
+    page = query.order_by(Entry.score.desc(), Entry.freelancer_id.desc()).limit(limit + 1).all()
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    return {
+        "entries": [entry.to_dict() for entry in page],
+        "next_cursor": encode_cursor(page[-1]) if has_more else None,
+    }
+
+
+def rebuild_leaderboard():
+    """Recompute every freelancer's leaderboard row (e.g. after changing the prior)"""
+    FreelancerLeaderboardEntry.refresh()
+    db.session.commit()
+    return FreelancerLeaderboardEntry.query.count()
@@ -0,0 +1,223 @@
+"""
+Notification Service
+Owner: Ryan
+Description: In-app inbox over Notification: keyset-paginated listing, read tracking with
+single UPDATE statements, the cached unread counters, and bulk fan-out to many users.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import insert, or_, select, update
+
+from app.extensions import db
+from app.models.notification import Notification, NotificationCounter
+from app.models.user import User
+from app.services.realtime_service import publish_after_commit
+
+
+def encode_cursor(notification):
+    """Opaque cursor pointing just after a notification in newest-first order"""
+    payload = json.dumps([notification.created_at.isoformat(), notification.id]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, notification_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(notification_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def get_inbox(user_id, limit=20, cursor=None, unread_only=False, notification_type=None):
+    """
+    One page of a user's notifications, newest first.
+
+    Pages are addressed by (created_at, id) of the last row seen, so every page is an
+    index range scan on idx_notifications_user_created regardless of depth.
+
+    Args:
+        user_id: Inbox owner
+        limit: Page size
+        cursor: Cursor from a previous page's next_cursor
+        unread_only: Only unread notifications
+        notification_type: Only notifications of this type
+
+    Returns:
+        dict: {"notifications": [...], "next_cursor": str | None, "unread_count": int}
+    """
+    query = Notification.query.filter(Notification.user_id == user_id)
+    if unread_only:
+        query = query.filter(Notification.is_read.is_(False))
+    if notification_type:
+        query = query.filter(Notification.type == notification_type)
+
+    if cursor:
+        created_at, notification_id = decode_cursor(cursor)
+        # Spelled out rather than a row comparison so the index is used on every backend
+        query = query.filter(
+            or_(
+                Notification.created_at < created_at,
+                (Notification.created_at == created_at) & (Notification.id < notification_id),
+            )
+        )
+
+    page = (
+        query.order_by(Notification.created_at.desc(), Notification.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    return {
+        "notifications": [notification.to_dict() for notification in page],
+        "next_cursor": encode_cursor(page[-1]) if has_more else None,
+        "unread_count": NotificationCounter.get_unread_count(user_id),
+    }
+
+
+def _publish_unread_count(user_id):
+    publish_after_commit(
+        db.session,
+        [user_id],
+        {
+            "event": "unread_count",
+            "data": {"unread_count": NotificationCounter.get_unread_count(user_id)},
+        },
+    )
+
+
+def mark_read(user_id, notification_ids):
+    """
+    Mark some of a user's notifications read with one UPDATE. The caller commits.
+
+    Returns:
+        int: Notifications that changed from unread to read
+    """
+    if not notification_ids:
+        return 0
+    changed = db.session.execute(
+        update(Notification)
+        .where(
+            Notification.user_id == user_id,
+            Notification.id.in_(notification_ids),
+            Notification.is_read.is_(False),
+        )
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if changed:
+        NotificationCounter.adjust({user_id: -changed})
+        _publish_unread_count(user_id)
+    return changed
+
+
+def mark_all_read(user_id):
+    """
+    Mark every unread notification of a user read with one UPDATE (served by
+    idx_user_unread). The counter is decremented by the rows changed rather than
+    zeroed, so a notification inserted concurrently keeps its count. The caller commits.
+
+    Returns:
+        int: Notifications marked read
+    """
+    changed = db.session.execute(
+        update(Notification)
+        .where(Notification.user_id == user_id, Notification.is_read.is_(False))
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if changed:
+        NotificationCounter.adjust({user_id: -changed})
+        _publish_unread_count(user_id)
+    return changed
+
+
+def notify_many(
+    user_ids,
+    title,
+    message,
+    notification_type="general",
+    related_project_id=None,
+    related_deliverable_id=None,
+):
+    """
+    Create the same notification for many users (see create_notifications). The caller
+    commits.
+
+    Returns:
+        list: The inserted Notification objects
+    """
+    return create_notifications(
+        {
+            "user_id": user_id,
+            "type": notification_type,
+            "title": title,
+            "message": message,
+            "related_project_id": related_project_id,
+            "related_deliverable_id": related_deliverable_id,
+        }
+        for user_id in sorted(set(user_ids))
+    )
+
+
+def create_notifications(notifications):
+    """
+    Create notifications with a single executemany INSERT; each may have its own
+    recipient and text.
+
+    ORM bulk inserts skip mapper events, so the unread counters are adjusted here with
+    one upsert and the realtime events are queued explicitly. The caller commits.
+
+    Args:
+        notifications: Dicts with user_id, title and message, and optionally type,
+            related_project_id and related_deliverable_id
+
+    Returns:
+        list: The inserted Notification objects
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "type": "general",
+            "related_project_id": None,
+            "related_deliverable_id": None,
+            **notification,
+            "is_read": False,
+            "is_emailed": False,
+            "created_at": now,
+        }
+        for notification in notifications
+    ]
+    if not rows:
+        return []
+
+    created = db.session.scalars(insert(Notification).returning(Notification), rows).all()
+    deltas = {}
+    for notification in created:
+        deltas[notification.user_id] = deltas.get(notification.user_id, 0) + 1
+    NotificationCounter.adjust(deltas)
+    for notification in created:
+        publish_after_commit(
+            db.session,
+            [notification.user_id],
+            {"event": "notification", "id": notification.id, "data": notification.to_dict()},
+        )
+    return created
+
+
+def notify_admins(title, message, notification_type="general", **related):
+    """Notify every active admin (see notify_many). The caller commits."""
+    admin_ids = db.session.scalars(
+        select(User.id).where(User.role == "admin", User.is_active.isnot(False))
+    ).all()
+    return notify_many(admin_ids, title, message, notification_type, **related)
@@ -1,13 +1,18 @@
 """
 Payment Service
 Owner: Caleb
-Description: Handles escrow payments, releases, and refunds logic.
+Description: Handles escrow payments, releases, and refunds logic. Status changes go through
+the escrow state machine in escrow_service; these helpers commit them and notify by email.
 """
 
-from datetime import datetime
+from flask import current_app
+from sqlalchemy import func, select
 
-from models import Escrow, Transaction, db
-from services.email_service import send_payment_notification
+from app.extensions import db
+from app.models.escrow_transaction import EscrowTransaction
+from app.models.project import Project
+from app.services import escrow_service
+from app.services.email_service import send_payment_released_notification
 
 
 def create_escrow(project_id, client_id, freelancer_id, amount):
@@ -20,56 +25,37 @@ def create_escrow(project_id, client_id, freelancer_id, amount):
         freelancer_id (int): ID of the freelancer assigned to the project.
         amount (float): Amount to be held in escrow.
     """
-    escrow = Escrow(
-        project_id=project_id,
-        client_id=client_id,
-        freelancer_id=freelancer_id,
-        amount=amount,
-        status="PENDING",
-        created_at=datetime.utcnow(),
-    )
+    project = db.session.get(Project, project_id)
+    if not project:
+        raise LookupError("Project not found")
 
-    db.session.add(escrow)
+    escrow = escrow_service.create_escrow(
+        project, client_id=client_id, amount=amount, freelancer_id=freelancer_id
+    )
     db.session.commit()
 
-    print(f"Escrow created for Project ID {project_id} - Amount: ${amount}")
+    current_app.logger.info(f"Escrow created for Project ID {project_id} - Amount: ${amount}")
     return escrow
 
 
 def release_payment(escrow_id):
     """
     Release payment from escrow to freelancer.
-    Updates escrow status and records a completed transaction.
+    Moves the escrow to released (paying its open invoices) and emails the freelancer.
     """
-    escrow = Escrow.query.get(escrow_id)
-    if not escrow:
-        raise ValueError("Escrow not found")
-
-    if escrow.status != "PENDING":
-        raise ValueError("Escrow cannot be released. Invalid status.")
-
-    escrow.status = "RELEASED"
-    escrow.released_at = datetime.utcnow()
-
-    transaction = Transaction(
-        user_id=escrow.freelancer_id,
-        amount=escrow.amount,
-        transaction_type="RELEASE",
-        description=f"Payment released for Project ID {escrow.project_id}",
-        created_at=datetime.utcnow(),
-    )
-
-    db.session.add(transaction)
+    escrow = escrow_service.release_escrow(escrow_id)
     db.session.commit()
 
     # Notify freelancer of payment release
     try:
-        send_payment_notification(transaction)
+        send_payment_released_notification(escrow.freelancer, escrow.amount, escrow.project)
     except Exception as e:
-        print(f"Failed to send payment notification: {e}")
+        current_app.logger.error(f"Failed to send payment notification: {e}")
 
-    print(f"Payment released for Escrow ID {escrow_id} - Amount: ${escrow.amount}")
-    return transaction
+    current_app.logger.info(
+        f"Payment released for Escrow ID {escrow_id} - Amount: ${escrow.amount}"
+    )
+    return escrow
 
 
 def refund_payment(escrow_id, reason):
@@ -80,56 +66,27 @@ def refund_payment(escrow_id, reason):
         escrow_id (int): Escrow transaction ID.
         reason (str): Reason for refund.
     """
-    escrow = Escrow.query.get(escrow_id)
-    if not escrow:
-        raise ValueError("Escrow not found")
-
-    if escrow.status not in ["PENDING", "HELD"]:
-        raise ValueError("Only pending or held escrows can be refunded.")
-
-    escrow.status = "REFUNDED"
-    escrow.refund_reason = reason
-    escrow.refunded_at = datetime.utcnow()
-
-    transaction = Transaction(
-        user_id=escrow.client_id,
-        amount=escrow.amount,
-        transaction_type="REFUND",
-        description=f"Refund for Project ID {escrow.project_id}. Reason: {reason}",
-        created_at=datetime.utcnow(),
-    )
-
-    db.session.add(transaction)
+    escrow = escrow_service.refund_escrow(escrow_id, reason=reason)
     db.session.commit()
 
-    # Notify client of refund
-    try:
-        send_payment_notification(transaction)
-    except Exception as e:
-        print(f"Failed to send refund notification: {e}")
-
-    print(f"Escrow ID {escrow_id} refunded. Reason: {reason}")
-    return transaction
+    current_app.logger.info(f"Escrow ID {escrow_id} refunded. Reason: {reason}")
+    return escrow
 
 
 def calculate_freelancer_earnings(freelancer_id):
     """
-    Aggregate released and pending earnings for a freelancer.
+    Aggregate released and pending (held or disputed) earnings for a freelancer.
     """
-    released = (
-        db.session.query(db.func.sum(Escrow.amount))
-        .filter_by(freelancer_id=freelancer_id, status="RELEASED")
-        .scalar()
-        or 0
+    totals = dict(
+        db.session.execute(
+            select(EscrowTransaction.status, func.sum(EscrowTransaction.amount))
+            .where(EscrowTransaction.freelancer_id == freelancer_id)
+            .group_by(EscrowTransaction.status)
+        ).all()
     )
 
-    pending = (
-        db.session.query(db.func.sum(Escrow.amount))
-        .filter_by(freelancer_id=freelancer_id, status="PENDING")
-        .scalar()
-        or 0
+    released = totals.get(escrow_service.RELEASED) or 0
+    pending = sum(
+        totals.get(status) or 0 for status in (escrow_service.HELD, escrow_service.DISPUTED)
     )
-
-    earnings = {"released": float(released), "pending": float(pending)}
-    print(f"Earnings for Freelancer {freelancer_id}: {earnings}")
-    return earnings
+    return {"released": float(released), "pending": float(pending)}
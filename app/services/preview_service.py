@@ -0,0 +1,98 @@
+"""
+Preview Service
+Owner: Cindy
+Description: Backfills eager Cloudinary derivatives (thumbnails, posters, low-res previews)
+for deliverables uploaded before the derivative pipeline existed.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import Text, cast, or_
+
+from app.extensions import db
+from app.models.deliverable import Deliverable
+from app.services.cloudinary_service import CloudinaryService
+
+logger = logging.getLogger(__name__)
+
+PREVIEWABLE_FILE_TYPES = ("image", "video")
+
+
+def backfill_deliverable_previews(batch_size=100, limit=None, max_workers=4):
+    """
+    Request eager derivatives for deliverables that have no stored previews.
+
+    Rows are walked in primary-key order one batch at a time. Cloudinary calls
+    for a batch run concurrently and the resulting URLs are written back with a
+    single bulk UPDATE per batch.
+
+    Args:
+        batch_size: Number of deliverables processed per batch
+        limit: Optional cap on the total number of deliverables processed
+        max_workers: Concurrent Cloudinary requests per batch
+
+    Returns:
+        dict: Counts of processed, updated and failed deliverables
+    """
+    summary = {"processed": 0, "updated": 0, "failed": 0, "failed_ids": []}
+    last_id = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while limit is None or summary["processed"] < limit:
+            size = batch_size if limit is None else min(batch_size, limit - summary["processed"])
+            rows = (
+                db.session.query(
+                    Deliverable.id, Deliverable.cloudinary_public_id, Deliverable.file_type
+                )
+                .filter(
+                    Deliverable.id > last_id,
+                    # Older uploads stored JSON null rather than SQL NULL
+                    or_(
+                        Deliverable.preview_urls.is_(None),
+                        cast(Deliverable.preview_urls, Text) == "null",
+                    ),
+                    Deliverable.cloudinary_public_id.isnot(None),
+                    Deliverable.file_type.in_(PREVIEWABLE_FILE_TYPES),
+                )
+                .order_by(Deliverable.id)
+                .limit(size)
+                .all()
+            )
+            if not rows:
+                break
+
+            results = executor.map(
+                lambda row: CloudinaryService.request_derivatives(
+                    row.cloudinary_public_id, row.file_type
+                ),
+                rows,
+            )
+
+            mappings = []
+            for row, result in zip(rows, results):
+                if result.get("success"):
+                    derivatives = result["derivatives"]
+                    mappings.append(
+                        {
+                            "id": row.id,
+                            "preview_urls": derivatives,
+                            "thumbnail_url": derivatives.get("thumbnail"),
+                        }
+                    )
+                else:
+                    summary["failed"] += 1
+                    summary["failed_ids"].append(row.id)
+
+            if mappings:
+                db.session.bulk_update_mappings(Deliverable, mappings)
+                db.session.commit()
+
+            summary["processed"] += len(rows)
+            summary["updated"] += len(mappings)
+            last_id = rows[-1].id
+
+    logger.info(
+        f"Preview backfill finished: {summary['updated']} updated, {summary['failed']} failed"
+    )
+    return summary
@@ -0,0 +1,279 @@
+"""
+Realtime Service
+Owner: Ryan
+Description: Pushes events (new notifications, dashboard invalidations) to connected users.
+Events are published only after the transaction that caused them commits. A broker fans
+them out to the Server-Sent Events streams open in this process; with PostgreSQL the
+broker relays through LISTEN/NOTIFY so every gunicorn worker and host receives them.
+"""
+
+import json
+import queue
+import selectors
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import event, select, text
+
+from app.extensions import db
+
+CHANNEL = "reelbrief_events"
+# NOTIFY payloads are limited to 8000 bytes; larger events are sent as a resync hint
+MAX_NOTIFY_PAYLOAD = 7900
+PENDING_KEY = "realtime_pending"
+_registered = False
+
+
+class Subscription:
+    """One open stream: a bounded queue of events for a single user"""
+
+    def __init__(self, broker, user_id, max_queue):
+        self.broker = broker
+        self.user_id = user_id
+        self.events = queue.Queue(maxsize=max_queue)
+
+    def push(self, event):
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            # Slow consumer: drop what is queued and tell the client to refetch
+            with self.events.mutex:
+                self.events.queue.clear()
+            self.events.put_nowait({"event": "resync", "data": {"reason": "overflow"}})
+
+    def get(self, timeout):
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """In-process pub/sub; enough for a single worker or as a fallback"""
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        subscription = Subscription(self, user_id, self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def connection_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def deliver(self, user_ids, event):
+        with self._lock:
+            targets = [
+                subscription
+                for user_id in user_ids
+                for subscription in self._subscribers.get(user_id, ())
+            ]
+        for subscription in targets:
+            subscription.push(event)
+
+    def publish(self, user_ids, event):
+        self.deliver(user_ids, event)
+
+
+class PostgresBroker(LocalBroker):
+    """
+    Relays events through PostgreSQL NOTIFY. A listener thread per process holds one
+    LISTEN connection and hands notifications to the local subscribers.
+    """
+
+    def __init__(self, engine, max_queue=100, poll_interval=5.0):
+        super().__init__(max_queue)
+        self.engine = engine
+        self.poll_interval = poll_interval
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        self._ensure_listener()
+        return super().subscribe(user_id)
+
+    def publish(self, user_ids, event):
+        payload = json.dumps({"user_ids": list(user_ids), "event": event}, default=str)
+        if len(payload.encode()) > MAX_NOTIFY_PAYLOAD:
+            payload = json.dumps(
+                {"user_ids": list(user_ids), "event": {"event": "resync", "data": {}}}
+            )
+        with self.engine.connect() as connection:
+            connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": CHANNEL, "payload": payload},
+            )
+            connection.commit()
+
+    def _ensure_listener(self):
+        if self._listener and self._listener.is_alive():
+            return
+        with self._listener_lock:
+            if self._listener and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(
+                target=self._listen, name="realtime-listener", daemon=True
+            )
+            self._listener.start()
+
+    def _listen(self):
+        while True:
+            try:
+                self._listen_once()
+            except Exception:
+                # Connection lost: reconnect after a pause; clients resync via Last-Event-ID
+                time.sleep(self.poll_interval)
+
+    def _listen_once(self):
+        raw = self.engine.raw_connection()
+        try:
+            driver = raw.driver_connection
+            driver.autocommit = True
+            cursor = driver.cursor()
+            cursor.execute(f"LISTEN {CHANNEL}")
+            if hasattr(driver, "poll"):  # psycopg2
+                with selectors.DefaultSelector() as selector:
+                    selector.register(driver, selectors.EVENT_READ)
+                    while True:
+                        if not selector.select(self.poll_interval):
+                            continue
+                        driver.poll()
+                        while driver.notifies:
+                            self._dispatch(driver.notifies.pop(0).payload)
+            else:  # psycopg 3
+                for notify in driver.notifies():
+                    self._dispatch(notify.payload)
+        finally:
+            raw.close()
+
+    def _dispatch(self, payload):
+        message = json.loads(payload)
+        self.deliver(message["user_ids"], message["event"])
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """The process-wide broker, chosen by REALTIME_BROKER (auto, postgres or local)"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                config = current_app.config
+                kind = config.get("REALTIME_BROKER", "auto")
+                max_queue = config.get("REALTIME_MAX_QUEUE", 100)
+                if kind == "auto":
+                    kind = "postgres" if db.engine.dialect.name == "postgresql" else "local"
+                if kind == "postgres":
+                    _broker = PostgresBroker(db.engine, max_queue=max_queue)
+                else:
+                    _broker = LocalBroker(max_queue=max_queue)
+    return _broker
+
+
+def format_sse(event):
+    """Serialize an event dict as a Server-Sent Events frame"""
+    lines = []
+    if event.get("id") is not None:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['event']}")
+    lines.append(f"data: {json.dumps(event.get('data', {}), default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+# -------------------- Publishing after commit --------------------
+
+
+def publish_after_commit(session, user_ids, event):
+    """Queue an event for these users; it is sent only if the transaction commits"""
+    session.info.setdefault(PENDING_KEY, []).append((set(user_ids), event))
+
+
+def _collect(session, flush_context):
+    from app.models.deliverable import Deliverable
+    from app.models.escrow_transaction import EscrowTransaction
+    from app.models.invoice import Invoice
+    from app.models.notification import Notification
+    from app.models.project import Project
+
+    audience = set()
+    deliverable_projects = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Notification):
+            if obj in session.new:
+                publish_after_commit(
+                    session,
+                    [obj.user_id],
+                    {"event": "notification", "id": obj.id, "data": obj.to_dict()},
+                )
+        elif isinstance(obj, (Project, Invoice, EscrowTransaction)):
+            audience.update((obj.client_id, obj.freelancer_id))
+        elif isinstance(obj, Deliverable):
+            deliverable_projects.add(obj.project_id)
+
+    if deliverable_projects:
+        projects = Project.__table__
+        rows = session.connection().execute(
+            select(projects.c.client_id, projects.c.freelancer_id).where(
+                projects.c.id.in_(deliverable_projects)
+            )
+        )
+        for client_id, freelancer_id in rows:
+            audience.update((client_id, freelancer_id))
+
+    audience.discard(None)
+    if audience:
+        publish_after_commit(session, audience, {"event": "dashboard", "data": {"stale": True}})
+
+
+def _after_commit(session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    broker = get_broker()
+    # Coalesce dashboard invalidations: one per user per commit
+    invalidated = set()
+    for user_ids, message in pending:
+        if message["event"] == "dashboard":
+            user_ids = user_ids - invalidated
+            invalidated |= user_ids
+        if not user_ids:
+            continue
+        try:
+            broker.publish(user_ids, message)
+        except Exception as e:
+            current_app.logger.error(f"Realtime publish failed: {str(e)}")
+
+
+def _after_rollback(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+def init_realtime(app):
+    """Register the session listeners that feed the broker (once per process)"""
+    global _registered
+    if _registered:
+        return
+    event.listen(db.session, "after_flush", _collect)
+    event.listen(db.session, "after_commit", _after_commit)
+    event.listen(db.session, "after_rollback", _after_rollback)
+    _registered = True
@@ -0,0 +1,182 @@
+"""
+Review Analytics Service
+Owner: Caleb
+Description: Review statistics (counts, per-dimension averages, star histograms, trends)
+for one or many freelancers, computed with grouped SQL or read from the rating aggregates.
+"""
+
+from sqlalchemy import case, func, or_
+
+from app.extensions import db
+from app.models.freelancer_rating import (
+    SUBRATING_FIELDS,
+    FreelancerRatingAggregate,
+    star_bucket_clause,
+)
+from app.models.review import Review
+
+TREND_PERIODS = {
+    # period -> (PostgreSQL to_char format, SQLite strftime format)
+    "day": ("YYYY-MM-DD", "%Y-%m-%d"),
+    "month": ("YYYY-MM", "%Y-%m"),
+    "year": ("YYYY", "%Y"),
+}
+
+
+def _round(value):
+    return round(float(value), 2) if value is not None else 0
+
+
+def get_review_statistics(freelancer_ids):
+    """
+    Review statistics for many freelancers.
+
+    Reads the materialized aggregates in one query and falls back to grouped SQL
+    for freelancers without an aggregate row.
+
+    Args:
+        freelancer_ids: Iterable of freelancer user IDs
+
+    Returns:
+        dict: freelancer_id -> statistics dict
+    """
+    freelancer_ids = set(freelancer_ids)
+    if not freelancer_ids:
+        return {}
+
+    statistics = {
+        aggregate.freelancer_id: aggregate.to_dict()
+        for aggregate in FreelancerRatingAggregate.query.filter(
+            FreelancerRatingAggregate.freelancer_id.in_(freelancer_ids)
+        )
+    }
+
+    missing = freelancer_ids - statistics.keys()
+    if missing:
+        statistics.update(compute_review_statistics(missing))
+
+    for freelancer_id in freelancer_ids:
+        statistics.setdefault(freelancer_id, FreelancerRatingAggregate.empty_stats())
+    return statistics
+
+
+def compute_review_statistics(freelancer_ids, public_only=True):
+    """
+    Compute review statistics directly from the reviews table with one grouped query.
+
+    Args:
+        freelancer_ids: Iterable of freelancer user IDs
+        public_only: Only count public reviews (as the public endpoints do)
+
+    Returns:
+        dict: freelancer_id -> statistics dict (freelancers without reviews are omitted)
+    """
+    average = Review.average_rating_expression()
+    columns = [
+        Review.freelancer_id,
+        func.count(Review.id).label("total_reviews"),
+        func.avg(average).label("average_rating"),
+    ]
+    for dimension in SUBRATING_FIELDS:
+        columns.append(
+            func.avg(getattr(Review, f"{dimension}_rating")).label(f"average_{dimension}")
+        )
+    for stars in range(1, 6):
+        columns.append(
+            func.sum(case((star_bucket_clause(average, stars), 1), else_=0)).label(f"stars_{stars}")
+        )
+
+    query = db.session.query(*columns).filter(Review.freelancer_id.in_(list(freelancer_ids)))
+    if public_only:
+        query = query.filter(Review.is_public.is_(True))
+
+    statistics = {}
+    for row in query.group_by(Review.freelancer_id):
+        statistics[row.freelancer_id] = {
+            "total_reviews": row.total_reviews,
+            "average_rating": _round(row.average_rating),
+            "rating_distribution": {
+                stars: int(getattr(row, f"stars_{stars}") or 0) for stars in range(1, 6)
+            },
+            **{
+                f"average_{dimension}": _round(getattr(row, f"average_{dimension}"))
+                for dimension in SUBRATING_FIELDS
+            },
+        }
+    return statistics
+
+
+def _period_expression(period):
+    """Bucket label for Review.created_at in the active database dialect"""
+    pg_format, sqlite_format = TREND_PERIODS[period]
+    if db.engine.dialect.name == "postgresql":
+        return func.to_char(Review.created_at, pg_format)
+    return func.strftime(sqlite_format, Review.created_at)
+
+
+def get_rating_trends(freelancer_ids, period="month", since=None, public_only=True):
+    """
+    Review count and average rating per time bucket, grouped in SQL.
+
+    Args:
+        freelancer_ids: Iterable of freelancer user IDs
+        period: 'day', 'month' or 'year'
+        since: Optional datetime lower bound on created_at
+        public_only: Only count public reviews
+
+    Returns:
+        dict: freelancer_id -> list of {"period", "total_reviews", "average_rating"}, oldest first
+    """
+    if period not in TREND_PERIODS:
+        raise ValueError(f"period must be one of: {', '.join(TREND_PERIODS)}")
+    freelancer_ids = list(freelancer_ids)
+
+    bucket = _period_expression(period).label("period")
+    query = db.session.query(
+        Review.freelancer_id,
+        bucket,
+        func.count(Review.id).label("total_reviews"),
+        func.avg(Review.average_rating_expression()).label("average_rating"),
+    ).filter(Review.freelancer_id.in_(freelancer_ids))
+    if public_only:
+        query = query.filter(Review.is_public.is_(True))
+    if since is not None:
+        query = query.filter(Review.created_at >= since)
+
+    trends = {freelancer_id: [] for freelancer_id in freelancer_ids}
+    for row in query.group_by(Review.freelancer_id, bucket).order_by(Review.freelancer_id, bucket):
+        trends[row.freelancer_id].append(
+            {
+                "period": row.period,
+                "total_reviews": row.total_reviews,
+                "average_rating": _round(row.average_rating),
+            }
+        )
+    return trends
+
+
+def get_user_review_summary(user_id):
+    """
+    Given/received review counts for a user in one grouped query, plus their
+    public rating from the aggregates.
+
+    Returns:
+        dict: total_reviews_given, total_reviews_received, average_rating_received,
+            public_reviews_count
+    """
+    counts = (
+        db.session.query(
+            func.sum(case((Review.client_id == user_id, 1), else_=0)).label("given"),
+            func.sum(case((Review.freelancer_id == user_id, 1), else_=0)).label("received"),
+        )
+        .filter(or_(Review.client_id == user_id, Review.freelancer_id == user_id))
+        .one()
+    )
+    received = get_review_statistics([user_id])[user_id]
+
+    return {
+        "total_reviews_given": int(counts.given or 0),
+        "total_reviews_received": int(counts.received or 0),
+        "average_rating_received": received["average_rating"],
+        "public_reviews_count": received["total_reviews"],
+    }
@@ -0,0 +1,195 @@
+"""
+Search Service
+Owner: Cindy
+Description: Ranked, highlighted full-text search over projects, deliverables and feedback,
+restricted to the projects the requesting user may see. Uses PostgreSQL tsvector/GIN in
+production and SQLite FTS5 in tests.
+"""
+
+import html
+import re
+
+from sqlalchemy import column, func, literal_column, select, table
+
+from app.extensions import db
+from app.models.deliverable import Deliverable
+from app.models.feedback import Feedback
+from app.models.project import Project
+from app.models.search_document import (
+    SearchDocument,
+    deliverable_document,
+    index_feedback,
+    project_document,
+)
+
+ENTITY_TYPES = ("project", "deliverable", "feedback")
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+# The database delimits matches with these private-use characters; render_snippet escapes
+# the indexed text before swapping them for the HTML tags above
+MATCH_START = "\ue000"
+MATCH_STOP = "\ue001"
+
+# SQLite FTS5 shadow of search_documents (see app.models.search_document)
+search_documents_fts = table("search_documents_fts", column("rowid"))
+
+
+def visible_project_ids(user):
+    """Subquery of project ids a user can search, or None for unrestricted (admins)"""
+    if user.role == "admin":
+        return None
+    if user.role == "client":
+        return select(Project.id).where(Project.client_id == user.id)
+    return select(Project.id).where(Project.freelancer_id == user.id)
+
+
+def _fts5_query(raw):
+    """Turn free text into an FTS5 query of quoted terms (all must match, last is a prefix)"""
+    terms = re.findall(r"\w+", raw)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def render_snippet(snippet):
+    """HTML-escape a database snippet, then turn its match delimiters into <mark> tags"""
+    if snippet is None:
+        return None
+    escaped = html.escape(snippet)
+    return escaped.replace(MATCH_START, HIGHLIGHT_START).replace(MATCH_STOP, HIGHLIGHT_STOP)
+
+
+def search(user, raw_query, entity_types=None, limit=20, offset=0):
+    """
+    Search the index.
+
+    Args:
+        user: The requesting User (drives visibility)
+        raw_query: Free-text query as typed by the user
+        entity_types: Optional subset of ENTITY_TYPES
+        limit: Page size
+        offset: Rows to skip
+
+    Returns:
+        list: Result dicts ordered by relevance with an HTML snippet (escaped text,
+            matches wrapped in <mark>)
+    """
+    if db.engine.dialect.name == "postgresql":
+        query = _postgres_query(raw_query)
+    else:
+        query = _sqlite_query(raw_query)
+    if query is None:
+        return []
+
+    if entity_types:
+        query = query.where(SearchDocument.entity_type.in_(entity_types))
+
+    visible = visible_project_ids(user)
+    if visible is not None:
+        query = query.where(SearchDocument.project_id.in_(visible))
+
+    rows = db.session.execute(query.limit(limit).offset(offset)).all()
+    return [
+        {
+            "entity_type": row.entity_type,
+            "entity_id": row.entity_id,
+            "project_id": row.project_id,
+            "deliverable_id": row.deliverable_id,
+            "title": row.title,
+            "snippet": render_snippet(row.snippet),
+            "rank": float(row.rank),
+        }
+        for row in rows
+    ]
+
+
+def _postgres_query(raw_query):
+    tsquery = func.websearch_to_tsquery("english", raw_query)
+    vector = literal_column("search_documents.search_vector")
+    rank = func.ts_rank_cd(vector, tsquery)
+    snippet = func.ts_headline(
+        "english",
+        func.coalesce(SearchDocument.body, SearchDocument.title, ""),
+        tsquery,
+        f"StartSel={MATCH_START}, StopSel={MATCH_STOP}, MaxFragments=2, MaxWords=25",
+    )
+    return (
+        select(
+            SearchDocument.entity_type,
+            SearchDocument.entity_id,
+            SearchDocument.project_id,
+            SearchDocument.deliverable_id,
+            SearchDocument.title,
+            snippet.label("snippet"),
+            rank.label("rank"),
+        )
+        .where(vector.op("@@")(tsquery))
+        .order_by(rank.desc(), SearchDocument.id.desc())
+    )
+
+
+def _sqlite_query(raw_query):
+    match = _fts5_query(raw_query)
+    if match is None:
+        return None
+    # bm25 is lower-is-better; weight title matches above body matches like setweight A/B
+    rank = literal_column("bm25(search_documents_fts, 4.0, 1.0)")
+    snippet = literal_column(
+        f"snippet(search_documents_fts, 1, '{MATCH_START}', '{MATCH_STOP}', '…', 25)"
+    )
+    return (
+        select(
+            SearchDocument.entity_type,
+            SearchDocument.entity_id,
+            SearchDocument.project_id,
+            SearchDocument.deliverable_id,
+            SearchDocument.title,
+            snippet.label("snippet"),
+            (-rank).label("rank"),
+        )
+        .select_from(SearchDocument)
+        .join(search_documents_fts, search_documents_fts.c.rowid == SearchDocument.id)
+        .where(literal_column("search_documents_fts").op("MATCH")(match))
+        .order_by(rank, SearchDocument.id.desc())
+    )
+
+
+def _index_projects(connection, projects):
+    SearchDocument.upsert(connection, [project_document(project) for project in projects])
+
+
+def _index_deliverables(connection, deliverables):
+    SearchDocument.upsert(connection, [deliverable_document(item) for item in deliverables])
+
+
+def rebuild_search_index(batch_size=500):
+    """
+    Re-index every project, deliverable and feedback item in keyset batches.
+
+    Returns:
+        int: Number of documents written
+    """
+    connection = db.session.connection()
+    indexers = (
+        (Project, _index_projects),
+        (Deliverable, _index_deliverables),
+        (Feedback, index_feedback),
+    )
+
+    written = 0
+    for model, index_batch in indexers:
+        last_id = 0
+        while True:
+            batch = (
+                model.query.filter(model.id > last_id).order_by(model.id).limit(batch_size).all()
+            )
+            if not batch:
+                break
+            index_batch(connection, batch)
+            written += len(batch)
+            last_id = batch[-1].id
+
+    db.session.commit()
+    return written
@@ -0,0 +1,283 @@
+"""
+Storage Service
+Owner: Cindy
+Description: Pluggable file storage with Cloudinary and local-disk backends.
+The local backend hands file serving to the web server (X-Sendfile / X-Accel-Redirect)
+or to wsgi.file_wrapper, so large files are never read into Python.
+"""
+
+import logging
+import mimetypes
+import os
+import uuid
+
+import cloudinary.uploader
+from flask import abort, current_app, redirect, send_file
+from werkzeug.security import safe_join
+from werkzeug.utils import secure_filename
+
+from app.services.cloudinary_service import CloudinaryService
+
+logger = logging.getLogger(__name__)
+
+# Uploaded CVs are the only files served publicly by URL; everything else goes through
+# authenticated routes (deliverable file, invoice PDF)
+CV_FOLDER = "cvs"
+
+
+class StorageBackend:
+    """Interface shared by all storage backends."""
+
+    name = None
+
+    def is_configured(self):
+        """Return True if the backend can accept uploads."""
+        raise NotImplementedError
+
+    def save(self, file, folder, file_type=None):
+        """
+        Store an uploaded file.
+
+        Args:
+            file: FileStorage object from request.files
+            folder: Logical folder, e.g. 'reelbrief/project_1'
+            file_type: Optional file type ('image', 'video', 'document')
+
+        Returns:
+            dict: {"success", "key", "url", "bytes", "thumbnail_url", "derivatives", ...}
+        """
+        raise NotImplementedError
+
+    def save_bytes(self, data, key, content_type=None):
+        """Store raw bytes under an exact key and return the same shape as save()."""
+        raise NotImplementedError
+
+    def exists(self, key):
+        """Return True if an object is stored under key."""
+        raise NotImplementedError
+
+    def delete(self, key, file_type=None):
+        """Delete a stored file."""
+        raise NotImplementedError
+
+    def url_for(self, key):
+        """Return the public URL for a stored file."""
+        raise NotImplementedError
+
+    def download_url(self, key, expires_in=3600, file_type=None):
+        """Return a (possibly signed) URL for downloading a stored file."""
+        return self.url_for(key)
+
+    def serve(self, key, download_name=None):
+        """Return a Flask response that delivers the stored file."""
+        raise NotImplementedError
+
+
+class CloudinaryStorage(StorageBackend):
+    """Cloudinary-hosted storage (files are served by Cloudinary's CDN)."""
+
+    name = "cloudinary"
+
+    # Cloudinary resource types by file type; documents uploaded with "auto" land as images
+    RESOURCE_TYPES = {"image": "image", "video": "video", "raw": "raw"}
+
+    def is_configured(self):
+        return all(
+            [
+                os.getenv("CLOUDINARY_CLOUD_NAME"),
+                os.getenv("CLOUDINARY_API_KEY"),
+                os.getenv("CLOUDINARY_API_SECRET"),
+            ]
+        )
+
+    def save(self, file, folder, file_type=None):
+        result = CloudinaryService.upload_file(file, folder=folder, derivatives=file_type)
+        if result.get("success"):
+            result["key"] = result.get("public_id")
+        return result
+
+    def save_bytes(self, data, key, content_type=None):
+        try:
+            CloudinaryService.init_cloudinary()
+
+            upload_result = cloudinary.uploader.upload(
+                data, public_id=key, resource_type="raw", overwrite=True
+            )
+            return {
+                "success": True,
+                "key": upload_result.get("public_id"),
+                "url": upload_result.get("secure_url"),
+                "bytes": upload_result.get("bytes"),
+            }
+        except Exception as e:
+            logger.error(f"Cloudinary raw upload failed: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+    def exists(self, key):
+        return CloudinaryService.get_file_metadata(key, resource_type="raw").get("success", False)
+
+    def delete(self, key, file_type=None):
+        return CloudinaryService.delete_file(
+            key, resource_type=self.RESOURCE_TYPES.get(file_type, "image")
+        )
+
+    def url_for(self, key):
+        return CloudinaryService.generate_secure_url(key)
+
+    def download_url(self, key, expires_in=3600, file_type=None):
+        return CloudinaryService.generate_download_url(key, expires_in=expires_in)
+
+    def serve(self, key, download_name=None):
+        url = self.download_url(key)
+        if not url:
+            abort(404)
+        return redirect(url)
+
+
+class LocalStorage(StorageBackend):
+    """
+    Local-disk storage.
+
+    Files live under LOCAL_STORAGE_ROOT. When LOCAL_STORAGE_ACCEL_REDIRECT is set
+    (nginx internal location) the response only carries an X-Accel-Redirect header;
+    with USE_X_SENDFILE Flask emits X-Sendfile; otherwise send_file streams through
+    wsgi.file_wrapper (sendfile under gunicorn). All paths support Range and ETag.
+    """
+
+    name = "local"
+
+    def __init__(self, root=None, url_prefix=None):
+        self._root = root
+        self._url_prefix = url_prefix
+
+    @property
+    def root(self):
+        return self._root or current_app.config.get(
+            "LOCAL_STORAGE_ROOT", os.path.join(os.getcwd(), "uploads")
+        )
+
+    @property
+    def url_prefix(self):
+        prefix = self._url_prefix or current_app.config.get(
+            "LOCAL_STORAGE_URL_PREFIX", "/api/auth/uploads"
+        )
+        return prefix.rstrip("/")
+
+    def is_configured(self):
+        return True
+
+    def _path(self, key):
+        path = safe_join(self.root, key)
+        if path is None:
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def save(self, file, folder, file_type=None):
+        try:
+            filename = secure_filename(file.filename) or "upload"
+            key = "/".join(
+                part for part in [folder.strip("/"), f"{uuid.uuid4().hex}_{filename}"] if part
+            )
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            file.save(path)
+
+            return {
+                "success": True,
+                "key": key,
+                "public_id": key,
+                "url": self.url_for(key),
+                "filename": filename,
+                "format": filename.rsplit(".", 1)[-1].lower() if "." in filename else None,
+                "bytes": os.path.getsize(path),
+                "thumbnail_url": None,
+                "derivatives": {},
+            }
+        except Exception as e:
+            logger.error(f"Local storage save failed: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+    def save_bytes(self, data, key, content_type=None):
+        try:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so readers never see a partial file
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+            return {"success": True, "key": key, "url": self.url_for(key), "bytes": len(data)}
+        except Exception as e:
+            logger.error(f"Local storage save failed: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+    def exists(self, key):
+        try:
+            return os.path.isfile(self._path(key))
+        except ValueError:
+            return False
+
+    def delete(self, key, file_type=None):
+        try:
+            os.remove(self._path(key))
+            return {"success": True, "result": "ok"}
+        except FileNotFoundError:
+            return {"success": False, "result": "not found"}
+        except Exception as e:
+            logger.error(f"Local storage delete failed: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+    def url_for(self, key):
+        return f"{self.url_prefix}/{key}"
+
+    def serve(self, key, download_name=None):
+        try:
+            path = self._path(key)
+        except ValueError:
+            abort(404)
+        if not os.path.isfile(path):
+            abort(404)
+
+        accel_prefix = current_app.config.get("LOCAL_STORAGE_ACCEL_REDIRECT")
+        if accel_prefix:
+            # nginx serves the bytes (with Range/ETag) from its internal location
+            response = current_app.response_class(status=200)
+            response.headers["X-Accel-Redirect"] = f"{accel_prefix.rstrip('/')}/{key}"
+            response.headers["Content-Type"] = (
+                mimetypes.guess_type(path)[0] or "application/octet-stream"
+            )
+            if download_name:
+                response.headers["Content-Disposition"] = f'attachment; filename="{download_name}"'
+            return response
+
+        return send_file(
+            path,
+            conditional=True,
+            etag=True,
+            as_attachment=bool(download_name),
+            download_name=download_name,
+            max_age=current_app.config.get("LOCAL_STORAGE_MAX_AGE", 3600),
+        )
+
+
+BACKENDS = {
+    CloudinaryStorage.name: CloudinaryStorage,
+    LocalStorage.name: LocalStorage,
+}
+
+
+def get_storage(name=None):
+    """
+    Return a storage backend instance.
+
+    Args:
+        name: Backend name ('cloudinary' or 'local'); defaults to STORAGE_BACKEND
+
+    Returns:
+        StorageBackend
+    """
+    name = name or current_app.config.get("STORAGE_BACKEND", CloudinaryStorage.name)
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown storage backend: {name}")
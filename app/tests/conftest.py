@@ -3,15 +3,19 @@ import os
 import sys
 
 import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager
 
 # Add the parent directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from app import models  # noqa: F401 (registers every table)
 from app import create_app, db
+from app.services.invoice_number_service import invoice_numbers
 
 
 @pytest.fixture(scope="session")
-def app():
+def app(tmp_path_factory):
     """Create and configure test application"""
     app = create_app()
 
@@ -24,6 +28,10 @@ def app():
             "WTF_CSRF_ENABLED": False,
             "JWT_SECRET_KEY": "test-secret-key",
             "SECRET_KEY": "test-secret-key",
+            # Keep uploads on local disk so tests never touch Cloudinary
+            "STORAGE_BACKEND": "local",
+            "CV_STORAGE_BACKEND": "local",
+            "LOCAL_STORAGE_ROOT": str(tmp_path_factory.mktemp("uploads")),
         }
     )
 
@@ -96,3 +104,29 @@ def init_database(app):
         yield db
 
         db.session.remove()
+
+
+@pytest.fixture
+def sqlite_app(tmp_path):
+    """
+    Minimal app on a file-backed SQLite database, so every thread gets its own connection.
+    create_app needs PostgreSQL; modules register the blueprints they exercise.
+    """
+    sqlite_app = Flask(__name__)
+    sqlite_app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'test.db'}",
+        SQLALCHEMY_ENGINE_OPTIONS={"connect_args": {"timeout": 30}},
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        JWT_SECRET_KEY="test-secret-key-with-enough-bytes!",
+        TESTING=True,
+    )
+    db.init_app(sqlite_app)
+    JWTManager(sqlite_app)
+    with sqlite_app.app_context():
+        # portfolio_items needs PostgreSQL (ARRAY)
+        tables = [table for table in db.metadata.sorted_tables if table.name != "portfolio_items"]
+        db.metadata.create_all(db.engine, tables=tables)
+    # Preallocated invoice-number blocks belong to the previous test's database
+    invoice_numbers.reset()
+    yield sqlite_app
+    invoice_numbers.reset()
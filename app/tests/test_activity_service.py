@@ -0,0 +1,65 @@
+"""
+Activity Service Tests
+Owner: Caleb
+Description: Activity-log filters compile to index-friendly SQL
+"""
+
+# Run this test as pytest app/tests/test_activity_service.py -v
+
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models.activity_log import ActivityLog
+from app.services.activity_service import (
+    PARTITION_NAME,
+    add_months,
+    escape_like,
+    filter_activities,
+    month_start,
+    partition_name,
+)
+
+
+def compile_filters(**filters):
+    statement = filter_activities(select(ActivityLog.id), **filters)
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestFilterActivities:
+    """Test suite for filter_activities"""
+
+    def test_substring_filter_uses_ilike_on_the_log(self):
+        """Test long action filters hit the trigram-indexed column directly"""
+        sql = compile_filters(action="deliver")
+
+        assert "activity_logs.action ILIKE" in sql
+        assert "activity_actions" not in sql
+
+    def test_exact_action_code_compares_ids(self):
+        """Test action_code is an equality on action_id"""
+        sql = compile_filters(action_code="submitted a deliverable")
+
+        assert "activity_logs.action_id = (SELECT activity_actions.id" in sql
+        assert "ILIKE" not in sql
+
+    def test_escape_like_neutralizes_wildcards(self):
+        """Test user-supplied % and _ only match literally"""
+        assert escape_like("100%_done\\") == "100\\%\\_done\\\\"
+
+
+class TestPartitionMonths:
+    """Test suite for monthly partition arithmetic"""
+
+    def test_add_months_crosses_year_boundaries(self):
+        """Test month offsets roll over into the next and previous years"""
+        assert add_months(datetime(2026, 11, 1), 3) == datetime(2027, 2, 1)
+        assert add_months(datetime(2026, 1, 1), -13) == datetime(2024, 12, 1)
+
+    def test_partition_name_round_trips(self):
+        """Test partition names encode the month they hold"""
+        name = partition_name(month_start(datetime(2026, 7, 19, 13, 5)))
+
+        assert name == "activity_logs_p2026_07"
+        assert PARTITION_NAME.match(name).groups() == ("2026", "07")
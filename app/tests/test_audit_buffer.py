@@ -0,0 +1,70 @@
+"""
+Audit Buffer Tests
+Owner: Caleb
+Description: Batching, retry and backpressure of the buffered activity logger
+"""
+
+# Run this test as pytest app/tests/test_audit_buffer.py -v
+
+import pytest
+from flask import Flask
+
+from app.services.audit_buffer import AuditBuffer
+
+
+@pytest.fixture
+def buffer():
+    app = Flask(__name__)
+    app.config.update(
+        AUDIT_BUFFER_ENABLED=True,
+        AUDIT_BUFFER_BATCH_SIZE=3,
+        AUDIT_BUFFER_FLUSH_INTERVAL=60,
+        AUDIT_BUFFER_MAX_PENDING=5,
+        AUDIT_BUFFER_BLOCK_TIMEOUT=0.01,
+    )
+    audit = AuditBuffer(app)
+    audit.batches = []
+    audit._write = audit.batches.append
+    # Keep the background flusher out of the way; tests flush explicitly
+    audit._ensure_worker = lambda: None
+    yield audit
+    audit._write = lambda events: None
+
+
+class TestAuditBuffer:
+    """Test suite for AuditBuffer"""
+
+    def test_flush_writes_in_batches(self, buffer):
+        """Test pending events are written oldest first in batch_size chunks"""
+        for i in range(4):
+            buffer.log("created project", "project", resource_id=i)
+
+        assert buffer.flush() == 4
+        assert [len(batch) for batch in buffer.batches] == [3, 1]
+        assert [event["resource_id"] for event in buffer.batches[0]] == [0, 1, 2]
+        assert buffer.metrics()["written"] == 4
+
+    def test_failed_flush_keeps_events(self, buffer):
+        """Test a failed write puts the batch back for the next attempt"""
+        buffer.log("created project", "project", resource_id=1)
+
+        def fail(events):
+            raise RuntimeError("database unavailable")
+
+        buffer._write = fail
+        assert buffer.flush() == 0
+        assert buffer.metrics()["pending"] == 1
+        assert buffer.metrics()["flush_failures"] == 1
+
+        buffer._write = buffer.batches.append
+        assert buffer.flush() == 1
+
+    def test_full_buffer_drops_after_waiting(self, buffer):
+        """Test backpressure: a full buffer blocks briefly, then drops and counts"""
+        results = [buffer.log("created project", "project") for _ in range(6)]
+        metrics = buffer.metrics()
+
+        assert results == [True] * 5 + [False]
+        assert metrics["dropped"] == 1
+        assert metrics["blocked_calls"] == 1
+        assert metrics["high_water_mark"] == 5
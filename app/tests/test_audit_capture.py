@@ -0,0 +1,61 @@
+"""
+Audit Capture Tests
+Owner: Caleb
+Description: Attribute diffs and snapshots recorded by automatic audit capture
+"""
+
+# Run this test as pytest app/tests/test_audit_capture.py -v
+
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.escrow_transaction import EscrowTransaction
+from app.models.project import Project
+from app.services.audit_capture import diff, resource_type, snapshot
+
+
+def loaded_project(**values):
+    """A Project whose attributes look as if they were loaded from the database"""
+    project = Project()
+    for key, value in values.items():
+        set_committed_value(project, key, value)
+    return project
+
+
+class TestAuditCapture:
+    """Test suite for audit capture helpers"""
+
+    def test_diff_reports_old_and_new_values(self):
+        """Test only tracked, actually changed attributes are reported"""
+        project = loaded_project(status="submitted", title="Logo", budget=Decimal("100.00"))
+        project.status = "in_progress"
+        project.title = "New logo"
+        project.budget = Decimal("100.00")
+
+        assert diff(project, ["status", "budget"]) == {"status": ["submitted", "in_progress"]}
+
+    def test_diff_serializes_values_for_json(self):
+        """Test decimals and datetimes are stored in JSON-friendly form"""
+        project = loaded_project(budget=Decimal("100.00"), deadline=None)
+        project.budget = Decimal("250.50")
+        project.deadline = datetime(2026, 11, 1, 12, 0)
+
+        assert diff(project, ["budget", "deadline"]) == {
+            "budget": ["100.00", "250.50"],
+            "deadline": [None, "2026-11-01T12:00:00"],
+        }
+
+    def test_snapshot_skips_empty_values(self):
+        """Test created records only carry the tracked values that are set"""
+        project = Project(status="submitted", freelancer_id=None, budget=Decimal("10"))
+
+        assert snapshot(project, ["status", "freelancer_id", "budget"]) == {
+            "status": "submitted",
+            "budget": "10",
+        }
+
+    def test_resource_type_is_snake_case(self):
+        """Test resource types follow table naming"""
+        assert resource_type(EscrowTransaction()) == "escrow_transaction"
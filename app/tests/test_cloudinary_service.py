@@ -159,3 +159,49 @@ class TestCloudinaryService:
 
         for filename in unknown_files:
             assert CloudinaryService.get_file_type(filename) == "unknown"
+
+    @patch("app.services.cloudinary_service.cloudinary.uploader.upload")
+    @patch("app.services.cloudinary_service.CloudinaryService.init_cloudinary")
+    def test_upload_file_requests_eager_derivatives(self, mock_init, mock_upload, mock_file):
+        """Test that uploads request eager derivatives and store their URLs"""
+        names = list(CloudinaryService.IMAGE_DERIVATIVES)
+        mock_upload.return_value = {
+            "secure_url": "https://res.cloudinary.com/test/image/upload/v123/test.jpg",
+            "public_id": "reelbrief/test_image",
+            "resource_type": "image",
+            "eager": [
+                {"secure_url": f"https://res.cloudinary.com/test/{name}.jpg"} for name in names
+            ],
+        }
+
+        result = CloudinaryService.upload_file(mock_file, folder="test", derivatives="image")
+
+        assert result["success"] is True
+        kwargs = mock_upload.call_args.kwargs
+        assert kwargs["eager"] == list(CloudinaryService.IMAGE_DERIVATIVES.values())
+        assert kwargs["eager_async"] is False
+        assert result["derivatives"]["placeholder"].endswith("/placeholder.jpg")
+        assert result["thumbnail_url"] == "https://res.cloudinary.com/test/thumbnail.jpg"
+
+    @patch("app.services.cloudinary_service.cloudinary.utils.cloudinary_url")
+    @patch("app.services.cloudinary_service.cloudinary.uploader.explicit")
+    @patch("app.services.cloudinary_service.CloudinaryService.init_cloudinary")
+    def test_request_derivatives_builds_async_video_urls(self, mock_init, mock_explicit, mock_url):
+        """Test backfilling video derivatives when Cloudinary processes them async"""
+        mock_explicit.return_value = {"public_id": "reelbrief/clip"}
+        mock_url.side_effect = lambda public_id, **options: (
+            f"https://res.cloudinary.com/test/{options['format']}",
+            {},
+        )
+
+        result = CloudinaryService.request_derivatives("reelbrief/clip", "video")
+
+        assert result["success"] is True
+        assert set(result["derivatives"]) == set(CloudinaryService.VIDEO_DERIVATIVES)
+        assert result["derivatives"]["preview"].endswith("/mp4")
+        assert mock_explicit.call_args.kwargs["eager_async"] is True
+
+    def test_request_derivatives_unsupported_type(self):
+        """Test that documents have no derivatives"""
+        result = CloudinaryService.request_derivatives("reelbrief/brief", "document")
+        assert result["success"] is False
@@ -0,0 +1,71 @@
+"""
+Cron Tests
+Owner: Caleb
+Description: Cron expression parsing and next fire times for job schedules
+"""
+
+# Run this test as pytest app/tests/test_cron.py -v
+
+from datetime import datetime
+
+import pytest
+
+from app.services.job_service import retry_delay
+from app.utils.cron import CronExpression
+
+
+class TestCron:
+    """Test suite for cron schedules"""
+
+    def test_every_minute_fires_on_next_minute(self):
+        """Test the next fire time is strictly after the given moment"""
+        cron = CronExpression("* * * * *")
+        assert cron.next_after(datetime(2026, 1, 1, 10, 0, 0)) == datetime(2026, 1, 1, 10, 1)
+        assert cron.next_after(datetime(2026, 1, 1, 10, 0, 59)) == datetime(2026, 1, 1, 10, 1)
+
+    def test_steps_ranges_and_lists(self):
+        """Test */15, ranges and lists combine across fields"""
+        cron = CronExpression("*/15 9-17 * * 1-5")
+        # Friday 17:50 -> next is Monday 09:00
+        assert cron.next_after(datetime(2026, 1, 2, 17, 50)) == datetime(2026, 1, 5, 9, 0)
+        assert CronExpression("0 6,18 * * *").next_after(datetime(2026, 1, 1, 7)) == datetime(
+            2026, 1, 1, 18, 0
+        )
+
+    def test_sunday_is_zero_or_seven(self):
+        """Test both 0 and 7 mean Sunday"""
+        moment = datetime(2026, 1, 1)  # a Thursday
+        assert CronExpression("0 0 * * 0").next_after(moment) == datetime(2026, 1, 4)
+        assert CronExpression("0 0 * * 7").next_after(moment) == datetime(2026, 1, 4)
+
+    def test_day_fields_match_either_when_both_restricted(self):
+        """Test day-of-month and day-of-week are OR'ed like Vixie cron"""
+        cron = CronExpression("0 0 13 * 5")
+        # Friday 2 January comes before the 13th
+        assert cron.next_after(datetime(2026, 1, 1)) == datetime(2026, 1, 2)
+
+    def test_aliases_and_leap_day(self):
+        """Test @-shortcuts and a schedule that only fires in leap years"""
+        assert CronExpression("@monthly").next_after(datetime(2026, 1, 15)) == datetime(2026, 2, 1)
+        assert CronExpression("0 0 29 2 *").next_after(datetime(2026, 3, 1)) == datetime(
+            2028, 2, 29
+        )
+
+    @pytest.mark.parametrize(
+        "expression", ["* * * *", "60 * * * *", "* * * 13 *", "*/0 * * * *", "a * * * *"]
+    )
+    def test_invalid_expressions(self, expression):
+        """Test malformed expressions are rejected"""
+        with pytest.raises(ValueError):
+            CronExpression(expression)
+
+    def test_never_firing_expression(self):
+        """Test an impossible date raises instead of looping forever"""
+        with pytest.raises(ValueError):
+            CronExpression("0 0 30 2 *").next_after(datetime(2026, 1, 1))
+
+    def test_job_retry_backoff_is_capped(self):
+        """Test failed jobs back off exponentially up to the cap"""
+        assert retry_delay(1).total_seconds() == 10
+        assert retry_delay(3).total_seconds() == 40
+        assert retry_delay(30).total_seconds() == 3600
@@ -0,0 +1,263 @@
+"""
+Deliverable Version Tests
+Owner: Cindy
+Description: Per-project version allocation under concurrent uploads, the
+project.latest_version_id pointer and the LAG-window version timeline
+"""
+
+# Run this test as pytest app/tests/test_deliverable_versions.py -v
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models.deliverable import Deliverable
+from app.models.feedback import Feedback
+from app.models.project import Project
+from app.models.project_version_head import ProjectVersionHead
+from app.models.user import User
+from app.resources.deliverable_resource import deliverable_bp
+
+UPLOADS = 200
+THREADS = 16
+
+
+@pytest.fixture
+def versions_app(sqlite_app):
+    sqlite_app.register_blueprint(deliverable_bp, url_prefix="/api/deliverable")
+    return sqlite_app
+
+
+def create_project():
+    freelancer = User(email="free@x.com", password_hash="x", first_name="F", last_name="L")
+    freelancer.role = "freelancer"
+    db.session.add(freelancer)
+    db.session.flush()
+    project = Project(
+        title="Launch video", description="D", client_id=freelancer.id, freelancer_id=freelancer.id
+    )
+    db.session.add(project)
+    db.session.commit()
+    return project.id, freelancer.id
+
+
+def add_version(project_id, user_id, version_number):
+    deliverable = Deliverable(
+        project_id=project_id,
+        version_number=version_number,
+        file_url="https://example.com/file.mp4",
+        file_type="video",
+        uploaded_by=user_id,
+        title=f"Version {version_number}",
+    )
+    db.session.add(deliverable)
+    db.session.flush()
+    deliverable.promote_to_latest()
+    return deliverable
+
+
+def upload_in_parallel(versions_app, project_id, user_id, count):
+    def upload(_):
+        with versions_app.app_context():
+            try:
+                version = Deliverable.get_next_version_number(project_id)
+                add_version(project_id, user_id, version)
+                db.session.commit()
+                return version
+            finally:
+                db.session.remove()
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        return list(pool.map(upload, range(count)))
+
+
+def latest_version_number(project_id):
+    project = db.session.get(Project, project_id)
+    return project.latest_version.version_number if project.latest_version else None
+
+
+class TestVersionAllocation:
+    """Test suite for ProjectVersionHead.allocate and the latest-version pointer"""
+
+    def test_parallel_uploads_get_unique_consecutive_versions(self, versions_app):
+        """Test concurrent uploads never share or skip a version and latest is the maximum"""
+        with versions_app.app_context():
+            project_id, user_id = create_project()
+
+        versions = upload_in_parallel(versions_app, project_id, user_id, UPLOADS)
+
+        assert sorted(versions) == list(range(1, UPLOADS + 1))
+        with versions_app.app_context():
+            stored = [
+                row.version_number
+                for row in Deliverable.query.filter_by(project_id=project_id).all()
+            ]
+            assert sorted(stored) == list(range(1, UPLOADS + 1))
+            assert latest_version_number(project_id) == UPLOADS
+            assert db.session.get(ProjectVersionHead, project_id).last_version == UPLOADS
+
+    def test_first_allocation_seeds_from_existing_versions(self, versions_app):
+        """Test a project with versions older than the counter continues after them"""
+        with versions_app.app_context():
+            project_id, user_id = create_project()
+            for version in (1, 2, 3):
+                add_version(project_id, user_id, version)
+            db.session.commit()
+
+            assert Deliverable.get_next_version_number(project_id) == 4
+            assert Deliverable.get_next_version_number(project_id) == 5
+
+    def test_seed_race_falls_back_to_the_counter(self, versions_app, monkeypatch):
+        """Test losing the race to create the head row still yields the next number"""
+        with versions_app.app_context():
+            project_id, _ = create_project()
+            execute = db.session.execute
+            calls = []
+
+            def racing_execute(statement, *args, **kwargs):
+                result = execute(statement, *args, **kwargs)
+                if not calls:
+                    # Another upload creates the head between our UPDATE and INSERT
+                    calls.append(statement)
+                    execute(
+                        insert(ProjectVersionHead).values(project_id=project_id, last_version=5)
+                    )
+                return result
+
+            monkeypatch.setattr(db.session, "execute", racing_execute)
+
+            assert ProjectVersionHead.allocate(project_id) == 6
+
+    def test_latest_pointer_never_moves_backwards(self, versions_app):
+        """Test promoting an older version leaves the newer one as latest"""
+        with versions_app.app_context():
+            project_id, user_id = create_project()
+            add_version(project_id, user_id, 2)
+            older = add_version(project_id, user_id, 1)
+            db.session.commit()
+
+            older.promote_to_latest()
+            db.session.commit()
+            assert latest_version_number(project_id) == 2
+
+    def test_refresh_after_deleting_the_latest_version(self, versions_app):
+        """Test deleting the newest version points latest at the next newest, then at none"""
+        with versions_app.app_context():
+            project_id, user_id = create_project()
+            first = add_version(project_id, user_id, 1)
+            second = add_version(project_id, user_id, 2)
+            db.session.commit()
+
+            db.session.delete(second)
+            Deliverable.refresh_latest_version(project_id)
+            db.session.commit()
+            db.session.expire_all()
+            assert latest_version_number(project_id) == 1
+
+            db.session.delete(first)
+            Deliverable.refresh_latest_version(project_id)
+            db.session.commit()
+            db.session.expire_all()
+            assert latest_version_number(project_id) is None
+
+    def test_latest_endpoint(self, versions_app):
+        """Test GET /projects/<id>/latest returns the newest version, 404 without one"""
+        with versions_app.app_context():
+            project_id, user_id = create_project()
+            token = create_access_token(str(user_id))
+        headers = {"Authorization": f"Bearer {token}"}
+        client = versions_app.test_client()
+
+        response = client.get(f"/api/deliverable/projects/{project_id}/latest", headers=headers)
+        assert response.status_code == 404
+
+        upload_in_parallel(versions_app, project_id, user_id, 5)
+        response = client.get(f"/api/deliverable/projects/{project_id}/latest", headers=headers)
+        assert response.status_code == 200
+        assert response.get_json()["deliverable"]["version_number"] == 5
+
+
+class TestVersionTimeline:
+    """Test suite for GET /api/deliverable/projects/<id>/timeline"""
+
+    def test_timeline_deltas(self, versions_app):
+        """Test per-version deltas against the predecessor; the first version has none"""
+        start = datetime(2026, 1, 1, 9, 0)
+        with versions_app.app_context():
+            project_id, user_id = create_project()
+            versions = []
+            for number, (size, status, hours) in enumerate(
+                [
+                    (1000, "rejected", 0),
+                    (1500, "revision_requested", 2),
+                    (1200, "revision_requested", 5),
+                ],
+                start=1,
+            ):
+                deliverable = add_version(project_id, user_id, number)
+                deliverable.file_size = size
+                deliverable.status = status
+                deliverable.uploaded_at = start + timedelta(hours=hours)
+                versions.append(deliverable)
+            db.session.add_all(
+                [
+                    Feedback(
+                        deliverable_id=versions[1].id,
+                        user_id=user_id,
+                        feedback_type="comment",
+                        content="Tighten the intro",
+                    ),
+                    Feedback(
+                        deliverable_id=versions[1].id,
+                        user_id=user_id,
+                        feedback_type="comment",
+                        content="Done",
+                        is_resolved=True,
+                    ),
+                ]
+            )
+            db.session.commit()
+            ids = [deliverable.id for deliverable in versions]
+            token = create_access_token(str(user_id))
+
+        response = versions_app.test_client().get(
+            f"/api/deliverable/projects/{project_id}/timeline",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body["total_versions"] == 3
+        first, second, third = body["timeline"]
+        assert [first["id"], second["id"], third["id"]] == ids
+        assert first["delta"] is None
+        assert second["delta"] == {
+            "previous_id": ids[0],
+            "size_diff_bytes": 500,
+            "time_diff_hours": 2.0,
+            "previous_status": "rejected",
+            "status_changed": True,
+        }
+        assert third["delta"]["size_diff_bytes"] == -300
+        assert third["delta"]["time_diff_hours"] == 3.0
+        assert third["delta"]["status_changed"] is False
+        assert (second["feedback_count"], second["unresolved_feedback_count"]) == (2, 1)
+        assert (first["feedback_count"], first["unresolved_feedback_count"]) == (0, 0)
+
+    def test_timeline_of_project_without_versions(self, versions_app):
+        """Test an empty project has an empty timeline"""
+        with versions_app.app_context():
+            project_id, user_id = create_project()
+            token = create_access_token(str(user_id))
+
+        response = versions_app.test_client().get(
+            f"/api/deliverable/projects/{project_id}/timeline",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 200
+        assert response.get_json()["timeline"] == []
@@ -0,0 +1,226 @@
+"""
+Escrow Service Tests
+Owner: Caleb
+Description: Escrow state machine transitions, concurrent release/refund contention and
+Idempotency-Key replay on the escrow endpoints
+"""
+
+# Run this test as pytest app/tests/test_escrow_service.py -v
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app.extensions import db
+from app.models.escrow_transaction import EscrowTransaction
+from app.models.idempotency_key import IdempotencyKey
+from app.models.invoice import Invoice
+from app.models.project import Project
+from app.models.user import User
+from app.resources.escrow_resource import escrow_bp
+from app.services import escrow_service
+from app.services.escrow_service import EscrowStateError
+
+THREADS = 16
+
+
+@pytest.fixture
+def escrow_app(sqlite_app):
+    sqlite_app.register_blueprint(escrow_bp)
+    return sqlite_app
+
+
+def create_escrows(count=1):
+    client = User(email="client@x.com", password_hash="x", first_name="C", last_name="L")
+    client.role = "client"
+    freelancer = User(email="free@x.com", password_hash="x", first_name="F", last_name="L")
+    freelancer.role = "freelancer"
+    db.session.add_all([client, freelancer])
+    db.session.flush()
+    projects = [
+        Project(
+            title=f"Project {index}",
+            description="D",
+            client_id=client.id,
+            freelancer_id=freelancer.id,
+        )
+        for index in range(count)
+    ]
+    db.session.add_all(projects)
+    # Escrow numbers are reserved on their own connection: SQLite allows one writer
+    db.session.commit()
+    escrows = []
+    for project in projects:
+        escrows.append(escrow_service.create_escrow(project, client.id, 100, admin_id=client.id))
+        db.session.commit()
+    return client.id, [escrow.id for escrow in escrows]
+
+
+def run_action(escrow_app, action, escrow_id, barrier):
+    with escrow_app.app_context():
+        try:
+            barrier.wait()
+            if action == "release":
+                escrow_service.release_escrow(escrow_id)
+            else:
+                escrow_service.refund_escrow(escrow_id, reason="cancelled")
+            db.session.commit()
+            return action
+        except EscrowStateError:
+            db.session.rollback()
+            return None
+        finally:
+            db.session.remove()
+
+
+class TestEscrowStateMachine:
+    """Test suite for escrow transitions"""
+
+    def test_release_pays_open_invoices(self, escrow_app):
+        """Test releasing an escrow settles its invoices and the project payment status"""
+        with escrow_app.app_context():
+            _, (escrow_id,) = create_escrows()
+            escrow = db.session.get(EscrowTransaction, escrow_id)
+            db.session.add(
+                Invoice(
+                    project_id=escrow.project_id,
+                    client_id=escrow.client_id,
+                    freelancer_id=escrow.freelancer_id,
+                    invoice_number="INV-1",
+                    amount=100,
+                    status="overdue",
+                    escrow_id=escrow_id,
+                )
+            )
+            db.session.commit()
+
+            escrow = escrow_service.release_escrow(escrow_id)
+            db.session.commit()
+
+            assert (escrow.status, escrow.version) == ("released", 2)
+            assert escrow.project.payment_status == "released"
+            assert Invoice.query.one().status == "paid"
+            with pytest.raises(EscrowStateError):
+                escrow_service.refund_escrow(escrow_id)
+
+    def test_disputes_are_resolved_by_admins_only(self, escrow_app):
+        """Test a disputed escrow cannot be released without resolve_dispute"""
+        with escrow_app.app_context():
+            _, (escrow_id,) = create_escrows()
+            escrow_service.dispute_escrow(escrow_id, reason="late delivery")
+            db.session.commit()
+
+            with pytest.raises(EscrowStateError):
+                escrow_service.release_escrow(escrow_id)
+            db.session.rollback()
+            escrow = escrow_service.refund_escrow(escrow_id, resolve_dispute=True)
+            assert escrow.status == "refunded"
+
+    def test_stale_version_is_rejected(self, escrow_app):
+        """Test an expected version older than the row fails"""
+        with escrow_app.app_context():
+            _, (escrow_id,) = create_escrows()
+            with pytest.raises(EscrowStateError):
+                escrow_service.release_escrow(escrow_id, expected_version=7)
+
+    def test_concurrent_release_and_refund_have_one_winner(self, escrow_app):
+        """Test racing release/refund requests change the escrow exactly once"""
+        with escrow_app.app_context():
+            _, (escrow_id,) = create_escrows()
+
+        actions = ["release", "refund"] * (THREADS // 2)
+        barrier = threading.Barrier(THREADS)
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(
+                pool.map(lambda action: run_action(escrow_app, action, escrow_id, barrier), actions)
+            )
+
+        winners = [result for result in results if result]
+        assert len(winners) == 1
+        with escrow_app.app_context():
+            escrow = db.session.get(EscrowTransaction, escrow_id)
+            assert escrow.status == {"release": "released", "refund": "refunded"}[winners[0]]
+            assert escrow.version == 2
+
+    def test_concurrent_releases_of_different_escrows_all_succeed(self, escrow_app):
+        """Test escrows are locked individually, not as a table"""
+        with escrow_app.app_context():
+            _, escrow_ids = create_escrows(THREADS)
+
+        barrier = threading.Barrier(THREADS)
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(
+                pool.map(
+                    lambda escrow_id: run_action(escrow_app, "release", escrow_id, barrier),
+                    escrow_ids,
+                )
+            )
+
+        assert results == ["release"] * THREADS
+
+
+class TestEscrowIdempotency:
+    """Test suite for Idempotency-Key handling on the escrow endpoints"""
+
+    def _post(self, client, token, path, body, key):
+        return client.post(
+            path,
+            json=body,
+            headers={"Authorization": f"Bearer {token}", "Idempotency-Key": key},
+        )
+
+    def test_retry_replays_the_first_response(self, escrow_app):
+        """Test a repeated release returns the stored response without a second change"""
+        with escrow_app.app_context():
+            client_id, (escrow_id,) = create_escrows()
+            token = create_access_token(str(client_id), additional_claims={"role": "client"})
+
+        http = escrow_app.test_client()
+        first = self._post(http, token, "/api/escrow/release", {"escrow_id": escrow_id}, "k1")
+        second = self._post(http, token, "/api/escrow/release", {"escrow_id": escrow_id}, "k1")
+        other = self._post(http, token, "/api/escrow/refund", {"escrow_id": escrow_id}, "k1")
+
+        assert first.status_code == second.status_code == 200
+        assert second.get_json() == first.get_json()
+        assert second.headers.get("Idempotent-Replayed") == "true"
+        assert other.status_code == 422
+        with escrow_app.app_context():
+            assert db.session.get(EscrowTransaction, escrow_id).version == 2
+
+    def test_concurrent_duplicates_run_once(self, escrow_app):
+        """Test simultaneous requests with one key all get the single release's response"""
+        with escrow_app.app_context():
+            client_id, (escrow_id,) = create_escrows()
+            token = create_access_token(str(client_id), additional_claims={"role": "client"})
+
+        barrier = threading.Barrier(THREADS)
+
+        def release(_):
+            http = escrow_app.test_client()
+            barrier.wait()
+            response = self._post(
+                http, token, "/api/escrow/release", {"escrow_id": escrow_id}, "same-key"
+            )
+            return response.status_code, response.get_json()
+
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            responses = list(pool.map(release, range(THREADS)))
+
+        assert {status for status, _ in responses} == {200}
+        assert len({body["escrow"]["version"] for _, body in responses}) == 1
+        with escrow_app.app_context():
+            assert db.session.get(EscrowTransaction, escrow_id).version == 2
+
+    def test_failed_request_can_be_retried(self, escrow_app):
+        """Test error responses are not stored under the key"""
+        with escrow_app.app_context():
+            client_id, (escrow_id,) = create_escrows()
+            token = create_access_token(str(client_id), additional_claims={"role": "client"})
+
+        http = escrow_app.test_client()
+        missing = self._post(http, token, "/api/escrow/release", {"escrow_id": 999}, "k2")
+        assert missing.status_code == 404
+        with escrow_app.app_context():
+            assert IdempotencyKey.query.count() == 0
@@ -0,0 +1,182 @@
+"""
+Event Bus Tests
+Owner: Ryan
+Description: Subscriber registration, event naming and outbox retry policy for the
+domain event bus
+"""
+
+# Run this test as pytest app/tests/test_event_bus.py -v
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from app.extensions import db
+from app.models.outbox import OutboxMessage
+from app.models.project import Project
+from app.models.user import User
+from app.services import email_service
+from app.services.event_bus import (
+    RETRY_MAX_SECONDS,
+    DeliverableApproved,
+    DeliverableRejected,
+    DomainEvent,
+    EventBus,
+    EventContext,
+    FreelancerAssigned,
+    RevisionRequested,
+    event_bus,
+    event_types,
+    retry_delay,
+)
+from app.services.event_handlers import email_freelancer_on_review, event_code
+
+
+class TestEventBus:
+    """Test suite for the domain event bus"""
+
+    def test_subscribers_include_base_class_handlers(self):
+        """Test a DomainEvent subscriber also receives every specific event"""
+        bus = EventBus()
+
+        @bus.subscribe(DomainEvent)
+        def audit(context):
+            pass
+
+        @bus.subscribe(DeliverableApproved)
+        def email(context):
+            pass
+
+        assert bus.subscribers(DeliverableApproved) == [email, audit]
+        assert bus.subscribers(DeliverableRejected) == [audit]
+
+    def test_event_serialization(self):
+        """Test events carry their name and fields"""
+        approved = DeliverableApproved(3, 1, 9, escrow_released_amount=250.0)
+
+        assert event_code(approved) == "deliverable_approved"
+        assert approved.to_dict() == {
+            "event": "DeliverableApproved",
+            "project_id": 3,
+            "actor_id": 1,
+            "deliverable_id": 9,
+            "portfolio_created": False,
+            "escrow_released_amount": 250.0,
+        }
+
+    def test_idempotency_keys(self):
+        """Test approvals dedupe per deliverable while other events are unique"""
+        assert (
+            DeliverableApproved(3, 1, 9).idempotency_key()
+            == DeliverableApproved(3, 2, 9).idempotency_key()
+        )
+        assert (
+            FreelancerAssigned(3, 1, 5).idempotency_key()
+            != FreelancerAssigned(3, 1, 5).idempotency_key()
+        )
+
+    def test_events_rebuild_from_outbox_payload(self):
+        """Test outbox topics map back to event classes"""
+        approved = DeliverableApproved(3, 1, 9, portfolio_created=True)
+        payload = {k: v for k, v in approved.to_dict().items() if k != "event"}
+
+        assert event_types()[approved.name](**payload) == approved
+
+    def test_retry_backoff_is_exponential_and_capped(self):
+        """Test retry delays double per attempt up to the cap"""
+        assert retry_delay(2) == 2 * retry_delay(1)
+        assert retry_delay(50) == timedelta(seconds=RETRY_MAX_SECONDS)
+
+
+class TestEventHandlers:
+    """Test suite for the domain event subscribers"""
+
+    def review_context(self, domain_event):
+        client = SimpleNamespace(id=1, email="client@x.com", first_name="C", last_name="L")
+        freelancer = SimpleNamespace(id=2, email="free@x.com", first_name="F", last_name="L")
+        project = SimpleNamespace(id=3, title="Launch video")
+        deliverable = SimpleNamespace(id=9, project_id=3, title="Cut 2", version_number=2)
+        return EventContext(domain_event, project, client, freelancer, deliverable)
+
+    def test_review_emails_reach_the_freelancer(self, monkeypatch):
+        """Test revision and rejection events email the freelancer with the reason"""
+        sent = []
+        monkeypatch.setattr(
+            email_service,
+            "send_email",
+            lambda to, subject, html, **kwargs: sent.append((to, subject, html)) or True,
+        )
+
+        with Flask(__name__).app_context():
+            email_freelancer_on_review(
+                self.review_context(RevisionRequested(3, 1, 9, feedback="Trim the intro"))
+            )
+            email_freelancer_on_review(
+                self.review_context(DeliverableRejected(3, 1, 9, reason="Wrong format"))
+            )
+
+        assert [(to, subject) for to, subject, _ in sent] == [
+            ("free@x.com", "Feedback: Cut 2"),
+            ("free@x.com", "Feedback: Cut 2"),
+        ]
+        assert "Trim the intro" in sent[0][2]
+        assert "REJECTED: Wrong format" in sent[1][2]
+
+
+class TestEmailDelivery:
+    """Test suite for retrying emails the mailer refused"""
+
+    @pytest.fixture
+    def bus_app(self, sqlite_app, monkeypatch):
+        monkeypatch.setattr(event_bus, "app", None)
+        event_bus.init_app(sqlite_app)
+        yield sqlite_app
+        event_bus.shutdown()
+
+    def test_refused_email_is_retried(self, bus_app, monkeypatch):
+        """Test an email send_email reports as failed stays undelivered and is resent"""
+        sent = []
+
+        def refuse(to, subject, html, **kwargs):
+            return False
+
+        def accept(to, subject, html, **kwargs):
+            sent.append(subject)
+            return True
+
+        monkeypatch.setattr(email_service, "send_email", refuse)
+        with bus_app.app_context():
+            client = User(email="client@x.com", password_hash="x", first_name="C", last_name="L")
+            freelancer = User(email="free@x.com", password_hash="x", first_name="F", last_name="L")
+            db.session.add_all([client, freelancer])
+            db.session.flush()
+            project = Project(
+                title="Launch video",
+                description="D",
+                client_id=client.id,
+                freelancer_id=freelancer.id,
+            )
+            db.session.add(project)
+            db.session.flush()
+            message_id = event_bus.publish(FreelancerAssigned(project.id, client.id, freelancer.id))
+            db.session.commit()
+
+            message = db.session.get(OutboxMessage, message_id)
+            delivered = {delivery.handler for delivery in message.deliveries}
+            assert message.status == "pending"
+            assert "email_freelancer_on_assignment" not in delivered
+            assert "notify_in_app" in delivered
+            assert "was not sent" in message.last_error
+            db.session.commit()
+
+            monkeypatch.setattr(email_service, "send_email", accept)
+            summary = event_bus.dispatch_pending(now=datetime.utcnow() + timedelta(days=1))
+
+            db.session.refresh(message)
+            assert summary == {"done": 1}
+            assert message.status == "done"
+            assert sent == ["New Project: Launch video"]
+            # Delivery borrows the request's session and leaves its settings as they were
+            assert db.session().expire_on_commit is True
@@ -0,0 +1,283 @@
+"""
+Feedback Counter Tests
+Owner: Cindy
+Description: The denormalized unresolved_feedback_count on deliverables and projects
+through create, batch resolve/unresolve and cascade delete, the bulk feedback paths and
+the validation of the count and batch endpoints
+"""
+
+# Run this test as pytest app/tests/test_feedback_counters.py -v
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app.extensions import db
+from app.models.deliverable import Deliverable
+from app.models.feedback import Feedback
+from app.models.project import Project
+from app.models.search_document import SearchDocument
+from app.models.user import User
+from app.resources.feedback_resource import feedback_bp
+from app.services.feedback_service import create_feedback_batch, set_feedback_resolution
+
+
+@pytest.fixture
+def feedback_app(sqlite_app):
+    sqlite_app.register_blueprint(feedback_bp, url_prefix="/api/feedback")
+    return sqlite_app
+
+
+def create_deliverables(count=2):
+    client = User(email="client@x.com", password_hash="x", first_name="C", last_name="L")
+    client.role = "client"
+    db.session.add(client)
+    db.session.flush()
+    project = Project(title="Brand refresh", description="D", client_id=client.id)
+    db.session.add(project)
+    db.session.flush()
+    deliverables = [
+        Deliverable(
+            project_id=project.id,
+            version_number=number,
+            file_url="https://example.com/file.pdf",
+            file_type="document",
+            uploaded_by=client.id,
+            title=f"Version {number}",
+        )
+        for number in range(1, count + 1)
+    ]
+    db.session.add_all(deliverables)
+    db.session.commit()
+    return client.id, project.id, [deliverable.id for deliverable in deliverables]
+
+
+def add_feedback(deliverable_id, user_id, resolved=False):
+    feedback = Feedback(
+        deliverable_id=deliverable_id,
+        user_id=user_id,
+        feedback_type="comment",
+        content="Adjust the kerning",
+        is_resolved=resolved,
+    )
+    db.session.add(feedback)
+    db.session.commit()
+    return feedback.id
+
+
+def counters(project_id, deliverable_ids):
+    """(project count, [deliverable counts]) straight from the tables"""
+    db.session.expire_all()
+    return (
+        db.session.get(Project, project_id).unresolved_feedback_count,
+        [db.session.get(Deliverable, id).unresolved_feedback_count for id in deliverable_ids],
+    )
+
+
+class TestUnresolvedFeedbackCounters:
+    """Test suite for the unresolved-feedback counters"""
+
+    def test_create_resolve_unresolve_and_delete(self, feedback_app):
+        """Test the counters follow every change to a feedback item's resolution"""
+        with feedback_app.app_context():
+            user_id, project_id, (first, second) = create_deliverables()
+            token = create_access_token(str(user_id))
+            ids = [add_feedback(first, user_id) for _ in range(3)]
+            ids.append(add_feedback(second, user_id))
+            add_feedback(second, user_id, resolved=True)
+            assert counters(project_id, [first, second]) == (4, [3, 1])
+
+        http = feedback_app.test_client()
+        headers = {"Authorization": f"Bearer {token}"}
+        response = http.put(
+            "/api/feedback/batch/resolve", json={"feedback_ids": ids[1:]}, headers=headers
+        )
+        assert response.status_code == 200
+        assert sorted(response.get_json()["updated_ids"]) == sorted(ids[1:])
+        with feedback_app.app_context():
+            assert counters(project_id, [first, second]) == (1, [1, 0])
+
+        # Already-resolved ids are left alone and not counted twice
+        response = http.put(
+            "/api/feedback/batch/resolve", json={"feedback_ids": ids[2:]}, headers=headers
+        )
+        assert response.get_json()["updated_ids"] == []
+        response = http.put(
+            "/api/feedback/batch/unresolve",
+            json={"feedback_ids": [ids[1], ids[3]]},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        with feedback_app.app_context():
+            assert counters(project_id, [first, second]) == (3, [2, 1])
+
+            db.session.delete(db.session.get(Deliverable, first))
+            db.session.commit()
+            assert counters(project_id, [second]) == (1, [1])
+
+    def test_single_item_resolve_and_delete(self, feedback_app):
+        """Test the ORM resolve/unresolve helpers and deleting one item"""
+        with feedback_app.app_context():
+            user_id, project_id, (first, _) = create_deliverables()
+            feedback = db.session.get(Feedback, add_feedback(first, user_id))
+
+            feedback.resolve()
+            assert counters(project_id, [first]) == (0, [0])
+            feedback.unresolve()
+            assert counters(project_id, [first]) == (1, [1])
+            # Changing other fields does not touch the counters
+            feedback.content = "Adjust the leading"
+            db.session.commit()
+            assert counters(project_id, [first]) == (1, [1])
+
+            db.session.delete(feedback)
+            db.session.commit()
+            assert counters(project_id, [first]) == (0, [0])
+
+
+class TestBulkFeedback:
+    """Test suite for the single-statement bulk insert and resolve paths"""
+
+    def test_bulk_insert_returns_rows_and_counts_them(self, feedback_app):
+        """Test POST /bulk inserts every item, returns them and bumps the counters once each"""
+        with feedback_app.app_context():
+            user_id, project_id, (first, second) = create_deliverables()
+            parent_id = add_feedback(first, user_id)
+            token = create_access_token(str(user_id))
+
+        items = [
+            {"feedback_type": "revision", "content": "Crop the hero", "priority": "high"},
+            {"feedback_type": "comment", "content": "Agreed", "parent_feedback_id": parent_id},
+            {"feedback_type": "approval", "content": "Footer is fine"},
+        ]
+        response = feedback_app.test_client().post(
+            "/api/feedback/bulk",
+            json={"deliverable_id": first, "items": items},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 201
+        returned = response.get_json()["feedback"]
+        assert [item["content"] for item in returned] == [item["content"] for item in items]
+        assert all(item["id"] and item["created_at"] for item in returned)
+        assert returned[0]["priority"] == "high"
+        assert returned[1]["parent_feedback_id"] == parent_id
+        assert {item["is_resolved"] for item in returned} == {False}
+        with feedback_app.app_context():
+            stored = Feedback.query.filter(Feedback.id.in_([item["id"] for item in returned]))
+            assert sorted(row.content for row in stored) == sorted(
+                item["content"] for item in items
+            )
+            assert {row.deliverable_id for row in stored} == {first}
+            assert counters(project_id, [first, second]) == (4, [4, 0])
+            indexed = SearchDocument.query.filter_by(entity_type="feedback").count()
+            assert indexed == 4
+
+    def test_invalid_item_saves_nothing(self, feedback_app):
+        """Test one invalid item rejects the whole batch"""
+        with feedback_app.app_context():
+            user_id, project_id, (first, _) = create_deliverables()
+            token = create_access_token(str(user_id))
+
+        response = feedback_app.test_client().post(
+            "/api/feedback/bulk",
+            json={
+                "deliverable_id": first,
+                "items": [
+                    {"feedback_type": "comment", "content": "Fine"},
+                    {"feedback_type": "praise", "content": "Lovely"},
+                ],
+            },
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 400
+        assert response.get_json()["details"]["items"][0]["index"] == 1
+        with feedback_app.app_context():
+            assert Feedback.query.count() == 0
+            assert counters(project_id, [first]) == (0, [0])
+
+    def test_bulk_resolve_adjusts_counters_per_deliverable(self, feedback_app):
+        """Test set_feedback_resolution returns the changed ids and applies their deltas"""
+        with feedback_app.app_context():
+            user_id, project_id, (first, second) = create_deliverables()
+            items = [{"feedback_type": "comment", "content": f"Note {n}"} for n in range(3)]
+            first_ids = [row.id for row in create_feedback_batch(first, user_id, items)]
+            second_ids = [row.id for row in create_feedback_batch(second, user_id, items[:2])]
+            db.session.commit()
+            assert counters(project_id, [first, second]) == (5, [3, 2])
+
+            changed = set_feedback_resolution(first_ids[:2] + second_ids, True)
+            db.session.commit()
+            assert sorted(changed) == sorted(first_ids[:2] + second_ids)
+            assert counters(project_id, [first, second]) == (1, [1, 0])
+
+            assert set_feedback_resolution(second_ids, True) == []
+            assert set_feedback_resolution([first_ids[0]], False) == [first_ids[0]]
+            db.session.commit()
+            assert counters(project_id, [first, second]) == (2, [2, 0])
+            assert db.session.get(Feedback, first_ids[0]).resolved_at is None
+
+
+class TestFeedbackEndpointValidation:
+    """Test suite for the unresolved-count and batch endpoints' responses"""
+
+    def request(self, feedback_app, method, url, **kwargs):
+        with feedback_app.app_context():
+            user_id, project_id, deliverable_ids = create_deliverables()
+            add_feedback(deliverable_ids[0], user_id)
+            token = create_access_token(str(user_id))
+        response = feedback_app.test_client().open(
+            url.format(project_id=project_id, deliverable_ids=deliverable_ids),
+            method=method,
+            headers={"Authorization": f"Bearer {token}"},
+            **kwargs,
+        )
+        return response, project_id, deliverable_ids
+
+    def test_get_unresolved_counts(self, feedback_app):
+        """Test badges for several deliverables and a project in one call"""
+        response, project_id, (first, second) = self.request(
+            feedback_app,
+            "GET",
+            "/api/feedback/unresolved-counts"
+            "?deliverable_ids={deliverable_ids[0]},{deliverable_ids[1]}&project_ids={project_id}",
+        )
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body["deliverables"] == {str(first): 1, str(second): 0}
+        assert body["projects"] == {str(project_id): 1}
+
+    def test_get_unresolved_counts_requires_ids(self, feedback_app):
+        """Test missing or non-numeric ids are rejected"""
+        response, _, _ = self.request(feedback_app, "GET", "/api/feedback/unresolved-counts")
+        assert response.status_code == 400
+
+        with feedback_app.app_context():
+            token = create_access_token("1")
+        response = feedback_app.test_client().get(
+            "/api/feedback/unresolved-counts?project_ids=abc",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 400
+
+    def test_submit_feedback_bulk_requires_items(self, feedback_app):
+        """Test a bulk submission without items is rejected"""
+        response, _, _ = self.request(
+            feedback_app,
+            "POST",
+            "/api/feedback/bulk",
+            json={"deliverable_id": 1},
+        )
+
+        assert response.status_code == 400
+        with feedback_app.app_context():
+            assert Feedback.query.count() == 1
+
+    def test_batch_resolve_requires_ids(self, feedback_app):
+        """Test a batch resolve without a list of ids is rejected"""
+        response, _, _ = self.request(
+            feedback_app, "PUT", "/api/feedback/batch/resolve", json={"feedback_ids": 3}
+        )
+
+        assert response.status_code == 400
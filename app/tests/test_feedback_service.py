@@ -0,0 +1,40 @@
+"""
+Feedback Service Tests
+Owner: Cindy
+Description: In-memory assembly of threaded feedback
+"""
+
+# Run this test as pytest app/tests/test_feedback_service.py -v
+
+from app.services.feedback_service import build_feedback_tree
+
+
+def item(id, parent=None, resolved=False):
+    return {"id": id, "parent_feedback_id": parent, "is_resolved": resolved, "content": f"#{id}"}
+
+
+class TestBuildFeedbackTree:
+    """Test suite for build_feedback_tree"""
+
+    def test_nests_replies_at_every_depth(self):
+        """Test replies of replies are nested under their parents"""
+        roots = build_feedback_tree([item(1), item(2, parent=1), item(3, parent=2), item(4)])
+
+        assert [root["id"] for root in roots] == [4, 1]
+        assert roots[1]["replies"][0]["id"] == 2
+        assert roots[1]["replies"][0]["replies"][0]["id"] == 3
+        assert roots[0]["replies"] == []
+
+    def test_replies_stay_chronological(self):
+        """Test replies keep their original (oldest first) order"""
+        roots = build_feedback_tree([item(1), item(2, parent=1), item(3, parent=1)])
+
+        assert [reply["id"] for reply in roots[0]["replies"]] == [2, 3]
+
+    def test_excludes_resolved_threads(self):
+        """Test resolved top-level threads can be filtered out"""
+        roots = build_feedback_tree(
+            [item(1, resolved=True), item(2, parent=1), item(3)], include_resolved=False
+        )
+
+        assert [root["id"] for root in roots] == [3]
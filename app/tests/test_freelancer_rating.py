@@ -0,0 +1,132 @@
+"""
+Freelancer Rating Aggregate Tests
+Owner: Caleb
+Description: Per-review contributions to the materialized rating statistics and their
+upkeep when reviews move between freelancers
+"""
+
+# Run this test as pytest app/tests/test_freelancer_rating.py -v
+
+
+from app.extensions import db
+from app.models.freelancer_rating import FreelancerRatingAggregate, star_bucket
+from app.models.project import Project
+from app.models.review import Review
+from app.models.user import User
+
+
+class TestFreelancerRatingAggregate:
+    """Test suite for FreelancerRatingAggregate"""
+
+    def test_contribution_with_subratings(self):
+        """Test sub-ratings drive the average and histogram bucket"""
+        delta = FreelancerRatingAggregate.contribution(
+            {"rating": 5, "communication_rating": 4, "quality_rating": 3, "timeliness_rating": None}
+        )
+
+        assert delta["review_count"] == 1
+        assert delta["rating_sum"] == 5
+        assert delta["average_rating_sum"] == 3.5
+        assert delta["stars_4"] == 1
+        assert delta["communication_sum"] == 4 and delta["communication_count"] == 1
+        assert "timeliness_count" not in delta
+
+    def test_contribution_without_subratings(self):
+        """Test the overall rating is used when no sub-ratings are given"""
+        delta = FreelancerRatingAggregate.contribution({"rating": 2})
+
+        assert delta["average_rating_sum"] == 2.0
+        assert delta["stars_2"] == 1
+
+    def test_aggregate_statistics(self):
+        """Test averages and distribution are derived from the running sums"""
+        aggregate = FreelancerRatingAggregate(
+            review_count=2,
+            rating_sum=9,
+            average_rating_sum=8.5,
+            communication_sum=7,
+            communication_count=2,
+            quality_sum=0,
+            quality_count=0,
+            timeliness_sum=5,
+            timeliness_count=1,
+            stars_1=0,
+            stars_2=0,
+            stars_3=0,
+            stars_4=1,
+            stars_5=1,
+        )
+
+        stats = aggregate.to_dict()
+        assert stats["total_reviews"] == 2
+        assert stats["average_rating"] == 4.25
+        assert stats["average_communication"] == 3.5
+        assert stats["average_quality"] == 0
+        assert stats["rating_distribution"] == {1: 0, 2: 0, 3: 0, 4: 1, 5: 1}
+
+    def test_star_bucket_rounds_like_round(self):
+        """Test histogram buckets round .5 averages to even, as round() does, within 1-5"""
+        assert star_bucket(2.5) == 2
+        assert star_bucket(3.5) == 4
+        assert star_bucket(4.5) == 4
+        assert star_bucket(4.51) == 5
+        assert star_bucket(1.0) == 1
+
+
+class TestRatingAggregateUpkeep:
+    """Test suite for the Review mapper events and FreelancerRatingAggregate.rebuild"""
+
+    def create_reviews(self, ratings):
+        client = User(email="client@x.com", password_hash="x", first_name="C", last_name="L")
+        first = User(email="first@x.com", password_hash="x", first_name="F", last_name="L")
+        second = User(email="second@x.com", password_hash="x", first_name="S", last_name="L")
+        db.session.add_all([client, first, second])
+        db.session.flush()
+        for index, (communication, quality) in enumerate(ratings):
+            project = Project(title=f"Project {index}", description="D", client_id=client.id)
+            db.session.add(project)
+            db.session.flush()
+            db.session.add(
+                Review(
+                    project_id=project.id,
+                    client_id=client.id,
+                    freelancer_id=first.id,
+                    rating=5,
+                    communication_rating=communication,
+                    quality_rating=quality,
+                )
+            )
+        db.session.commit()
+        return first.id, second.id
+
+    def stats(self, freelancer_id):
+        db.session.expire_all()
+        aggregate = db.session.get(FreelancerRatingAggregate, freelancer_id)
+        return aggregate.to_dict() if aggregate else FreelancerRatingAggregate.empty_stats()
+
+    def test_rebuild_matches_the_event_buckets(self, sqlite_app):
+        """Test the SQL rebuild puts .5 averages in the same buckets as the events"""
+        with sqlite_app.app_context():
+            first, _ = self.create_reviews([(2, 3), (3, 4), (4, 5)])
+            incremental = self.stats(first)
+
+            FreelancerRatingAggregate.rebuild([first])
+            db.session.commit()
+
+            assert incremental["rating_distribution"] == {1: 0, 2: 1, 3: 0, 4: 2, 5: 0}
+            assert self.stats(first) == incremental
+
+    def test_reassigned_review_leaves_the_previous_freelancer(self, sqlite_app):
+        """Test moving a review whose other fields are unloaded rebuilds both freelancers"""
+        with sqlite_app.app_context():
+            first, second = self.create_reviews([(2, 3), (4, 4)])
+            review = Review.query.filter_by(communication_rating=4).one()
+            db.session.expire(review)
+
+            review.freelancer_id = second
+            db.session.commit()
+
+            assert self.stats(first)["total_reviews"] == 1
+            assert self.stats(first)["rating_distribution"][2] == 1
+            assert self.stats(second)["total_reviews"] == 1
+            assert self.stats(second)["average_rating"] == 4.0
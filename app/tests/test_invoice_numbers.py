@@ -0,0 +1,85 @@
+"""
+Invoice Number Tests
+Owner: Caleb
+Description: Collision-free invoice numbering under concurrent invoice creation
+"""
+
+# Run this test as pytest app/tests/test_invoice_numbers.py -v
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.extensions import db
+from app.models.invoice import Invoice
+from app.services.invoice_number_service import format_number, invoice_numbers
+
+INVOICES = 2000
+THREADS = 16
+
+
+@pytest.fixture
+def numbering_app(sqlite_app):
+    sqlite_app.config["INVOICE_NUMBER_BLOCK_SIZE"] = 1
+    return sqlite_app
+
+
+def create_invoices(app, count):
+    def create(index):
+        with app.app_context():
+            try:
+                number = invoice_numbers.next("INV")
+                db.session.add(
+                    Invoice(
+                        project_id=1,
+                        client_id=1,
+                        freelancer_id=2,
+                        invoice_number=number,
+                        amount=index,
+                    )
+                )
+                db.session.commit()
+                return number
+            finally:
+                db.session.remove()
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        return list(pool.map(create, range(count)))
+
+
+class TestInvoiceNumbers:
+    """Test suite for the invoice number allocator"""
+
+    def test_number_format(self):
+        """Test numbers carry the prefix, year and a zero-padded counter"""
+        assert format_number("INV", 2026, 42) == "INV-2026-000042"
+
+    def test_parallel_invoices_get_unique_consecutive_numbers(self, numbering_app):
+        """Test thousands of concurrent invoices never collide or skip a number"""
+        numbers = create_invoices(numbering_app, INVOICES)
+
+        assert len(set(numbers)) == INVOICES
+        year = numbers[0].split("-")[1]
+        assert sorted(numbers) == [
+            format_number("INV", int(year), n) for n in range(1, INVOICES + 1)
+        ]
+        with numbering_app.app_context():
+            assert Invoice.query.count() == INVOICES
+
+    def test_preallocated_blocks_stay_unique(self, numbering_app):
+        """Test per-process blocks and batch reservations never overlap"""
+        numbering_app.config["INVOICE_NUMBER_BLOCK_SIZE"] = 50
+        numbers = create_invoices(numbering_app, 500)
+        with numbering_app.app_context():
+            batch = invoice_numbers.reserve_block("INV", 100)
+
+        assert len(set(numbers) | set(batch)) == 600
+        assert batch == sorted(batch)
+
+    def test_prefixes_and_years_count_separately(self, numbering_app):
+        """Test each prefix and year has its own sequence"""
+        with numbering_app.app_context():
+            assert invoice_numbers.next("INV", year=2026) == "INV-2026-000001"
+            assert invoice_numbers.next("ESC", year=2026) == "ESC-2026-000001"
+            assert invoice_numbers.next("INV", year=2027) == "INV-2027-000001"
+            assert invoice_numbers.next("INV", year=2026) == "INV-2026-000002"
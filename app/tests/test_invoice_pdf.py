@@ -0,0 +1,100 @@
+"""
+Invoice PDF Tests
+Owner: Caleb
+Description: PDF writer output and content-hash caching of rendered invoices
+"""
+
+# Run this test as pytest app/tests/test_invoice_pdf.py -v
+
+import os
+import re
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from flask import Flask
+
+from app.services import invoice_pdf_service
+from app.services.invoice_pdf_service import (
+    TEMPLATE_PATH,
+    content_hash,
+    invoice_context,
+    render_invoice_pdf,
+    render_many,
+)
+from app.utils.pdf import render_text_pdf
+
+TEMPLATE = open(
+    os.path.join(os.path.dirname(__file__), "..", TEMPLATE_PATH), encoding="utf-8"
+).read()
+
+
+def sample_invoice(**overrides):
+    person = SimpleNamespace(first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    invoice = {
+        "id": 7,
+        "invoice_number": "INV-2026-000007",
+        "status": "unpaid",
+        "amount": Decimal("1250.00"),
+        "currency": "USD",
+        "issue_date": datetime(2026, 10, 1),
+        "due_date": datetime(2026, 10, 15),
+        "paid_at": None,
+        "notes": None,
+        "escrow_id": None,
+        "project_id": 3,
+        "client": person,
+        "freelancer": person,
+    }
+    invoice.update(overrides)
+    return SimpleNamespace(**invoice)
+
+
+class TestInvoicePdf:
+    """Test suite for invoice PDF rendering"""
+
+    def test_pdf_structure(self):
+        """Test the output is a PDF whose cross-reference table points at the xref"""
+        pdf = render_text_pdf([("title", "Invoice"), ("body", "Total (USD) 10.00")])
+
+        assert pdf.startswith(b"%PDF-1.4") and pdf.endswith(b"%%EOF\n")
+        xref_offset = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+        assert pdf[xref_offset:].startswith(b"xref")
+        assert b"(Total \\(USD\\) 10.00) Tj" in pdf
+
+    def test_long_documents_span_pages(self):
+        """Test lines past the bottom margin start a new page"""
+        pdf = render_text_pdf([("body", f"line {n}") for n in range(150)])
+        assert b"/Count 3" in pdf
+
+    def test_rendering_is_deterministic(self):
+        """Test the same invoice renders to identical bytes (safe to cache by hash)"""
+        context = invoice_context(sample_invoice(), "Brand film")
+
+        assert render_invoice_pdf(context, TEMPLATE) == render_invoice_pdf(context, TEMPLATE)
+        assert b"INVOICE INV-2026-000007" in render_invoice_pdf(context, TEMPLATE)
+
+    def test_content_hash_tracks_invoice_and_template(self):
+        """Test a status change or template edit yields a new cache key"""
+        unpaid = invoice_context(sample_invoice(), "Brand film")
+        paid = invoice_context(
+            sample_invoice(status="paid", paid_at=datetime(2026, 10, 9)), "Brand film"
+        )
+
+        assert content_hash(unpaid, TEMPLATE) == content_hash(dict(unpaid), TEMPLATE)
+        assert content_hash(unpaid, TEMPLATE) != content_hash(paid, TEMPLATE)
+        assert content_hash(unpaid, TEMPLATE) != content_hash(unpaid, TEMPLATE + "\n")
+        assert b"PAID on 2026-10-09" in render_invoice_pdf(paid, TEMPLATE)
+
+    def test_gevent_workers_render_in_the_request(self, monkeypatch):
+        """Test the process pool is bypassed when gevent has monkey-patched the worker"""
+
+        def no_pool():
+            raise AssertionError("process pool used under gevent")
+
+        monkeypatch.setattr(invoice_pdf_service, "_gevent_patched", lambda: True)
+        monkeypatch.setattr(invoice_pdf_service, "_get_executor", no_pool)
+        context = invoice_context(sample_invoice(), "Brand film")
+
+        with Flask(__name__).app_context():
+            assert render_many([(context, TEMPLATE)]) == [render_invoice_pdf(context, TEMPLATE)]
@@ -0,0 +1,286 @@
+"""
+Invoice Service Tests
+Owner: Caleb
+Description: Batch billing and the overdue invoice sweeper, their rows and reminders,
+and both runs on SQLite
+"""
+
+# Run this test as pytest app/tests/test_invoice_service.py -v
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.extensions import db
+from app.models.escrow_transaction import EscrowTransaction
+from app.models.invoice import Invoice
+from app.models.notification import Notification, NotificationCounter
+from app.models.project import Project
+from app.models.user import User
+from app.services import invoice_service
+from app.services.invoice_service import (
+    _invoice_values,
+    _overdue_notifications,
+    generate_invoices,
+    mark_overdue_invoices,
+)
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+def create_parties():
+    client = User(email="client@x.com", password_hash="x", first_name="C", last_name="L")
+    client.role = "client"
+    freelancer = User(email="free@x.com", password_hash="x", first_name="F", last_name="L")
+    freelancer.role = "freelancer"
+    db.session.add_all([client, freelancer])
+    db.session.flush()
+    return client, freelancer
+
+
+def create_project(client, freelancer=None, **fields):
+    project = Project(
+        title="Launch video",
+        description="D",
+        client_id=client.id,
+        freelancer_id=freelancer.id if freelancer else None,
+        **fields,
+    )
+    db.session.add(project)
+    db.session.flush()
+    return project
+
+
+def billable_project(**overrides):
+    project = {
+        "id": 3,
+        "client_id": 10,
+        "freelancer_id": 20,
+        "budget": Decimal("800"),
+        "escrow_id": None,
+        "escrow_amount": None,
+        "currency": None,
+        "escrow_status": None,
+        "released_at": None,
+    }
+    project.update(overrides)
+    return SimpleNamespace(**project)
+
+
+class TestInvoiceService:
+    """Test suite for invoice background work"""
+
+    def test_overdue_reminders_for_both_parties(self):
+        """Test each overdue invoice reminds the client and informs the freelancer"""
+        row = SimpleNamespace(
+            id=7,
+            project_id=3,
+            client_id=10,
+            freelancer_id=20,
+            invoice_number="INV-2026-000042",
+            amount=Decimal("1250.5"),
+            currency="USD",
+            due_date=datetime(2026, 10, 1, 9, 30),
+        )
+        client, freelancer = _overdue_notifications([row])
+
+        assert (client["user_id"], freelancer["user_id"]) == (10, 20)
+        assert client["type"] == freelancer["type"] == "invoice_overdue"
+        assert client["related_project_id"] == 3
+        assert "INV-2026-000042 (1250.50 USD) was due on 2026-10-01" in client["message"]
+        assert "client has been reminded" in freelancer["message"]
+
+    def test_batch_invoice_from_budget_has_payment_terms(self):
+        """Test a project without escrow is invoiced unpaid with a due date"""
+        now = datetime(2026, 10, 31)
+        values = _invoice_values(billable_project(), Decimal("800"), "INV-2026-000001", now, 14)
+
+        assert values["status"] == "unpaid"
+        assert values["due_date"] == datetime(2026, 11, 14)
+        assert values["currency"] == "USD"
+        assert values["escrow_id"] is None
+
+    def test_batch_invoice_settled_by_released_escrow(self):
+        """Test an invoice linked to a released escrow is already paid"""
+        released_at = datetime(2026, 10, 20)
+        project = billable_project(
+            escrow_id=5,
+            escrow_amount=Decimal("950"),
+            currency="EUR",
+            escrow_status="released",
+            released_at=released_at,
+        )
+        values = _invoice_values(project, Decimal("950"), "INV-2026-000002", datetime.utcnow(), 0)
+
+        assert (values["status"], values["paid_at"]) == ("paid", released_at)
+        assert (values["escrow_id"], values["currency"]) == (5, "EUR")
+        assert values["due_date"] is None
+
+
+class TestOverdueSweep:
+    """Test suite for mark_overdue_invoices"""
+
+    def test_sweeps_in_batches_and_reminds_once(self, sqlite_app):
+        """Test a sweep over several batches flips every overdue invoice and reminds once"""
+        with sqlite_app.app_context():
+            client, freelancer = create_parties()
+            project = create_project(client, freelancer)
+            due_dates = [NOW - timedelta(days=day) for day in range(1, 8)]
+            due_dates += [NOW + timedelta(days=3), None]
+            for index, due_date in enumerate(due_dates):
+                db.session.add(
+                    Invoice(
+                        project_id=project.id,
+                        client_id=client.id,
+                        freelancer_id=freelancer.id,
+                        invoice_number=f"INV-{index}",
+                        amount=100,
+                        status="unpaid",
+                        due_date=due_date,
+                    )
+                )
+            db.session.add(
+                Invoice(
+                    project_id=project.id,
+                    client_id=client.id,
+                    freelancer_id=freelancer.id,
+                    invoice_number="INV-PAID",
+                    amount=100,
+                    status="paid",
+                    due_date=NOW - timedelta(days=30),
+                )
+            )
+            db.session.commit()
+            client_id, freelancer_id = client.id, freelancer.id
+
+            marked = mark_overdue_invoices(now=NOW, batch_size=3)
+
+            overdue = Invoice.query.filter_by(status="overdue").all()
+            assert sorted(marked) == sorted(invoice.id for invoice in overdue)
+            assert len(marked) == len(set(marked)) == 7
+            assert Invoice.query.filter_by(status="unpaid").count() == 2
+            assert Invoice.query.filter_by(invoice_number="INV-PAID").one().status == "paid"
+
+            reminders = Notification.query.filter_by(type="invoice_overdue").all()
+            assert len(reminders) == 14
+            per_party = {(reminder.user_id, reminder.message.split()[1]) for reminder in reminders}
+            assert len(per_party) == 14
+            assert NotificationCounter.get_unread_count(client_id) == 7
+            assert NotificationCounter.get_unread_count(freelancer_id) == 7
+
+            # A second run finds nothing left to do
+            assert mark_overdue_invoices(now=NOW, batch_size=3) == []
+            assert Notification.query.count() == 14
+            assert NotificationCounter.get_unread_count(client_id) == 7
+
+
+class TestGenerateInvoices:
+    """Test suite for generate_invoices"""
+
+    def test_invoices_completed_projects_once(self, sqlite_app):
+        """Test completed projects are invoiced, from escrow when funded, and only once"""
+        with sqlite_app.app_context():
+            client, freelancer = create_parties()
+            from_budget = create_project(client, freelancer, status="completed", budget=800)
+            released = create_project(client, freelancer, status="completed", budget=800)
+            unassigned = create_project(client, status="completed", budget=800)
+            in_progress = create_project(client, freelancer, status="in_progress", budget=800)
+            db.session.add(
+                EscrowTransaction(
+                    project_id=released.id,
+                    client_id=client.id,
+                    freelancer_id=freelancer.id,
+                    admin_id=client.id,
+                    amount=950,
+                    currency="EUR",
+                    status="released",
+                    invoice_number="ESC-1",
+                    released_at=NOW,
+                )
+            )
+            db.session.commit()
+            ids = from_budget.id, released.id, unassigned.id, in_progress.id
+
+            summary = generate_invoices(project_ids=list(ids), due_days=14)
+
+            results = {result["project_id"]: result for result in summary["results"]}
+            assert results[ids[0]]["status"] == results[ids[1]]["status"] == "created"
+            assert results[ids[2]]["reason"] == "no_freelancer"
+            assert results[ids[3]]["reason"] == "not_eligible"
+            invoices = {invoice.project_id: invoice for invoice in Invoice.query}
+            assert set(invoices) == {ids[0], ids[1]}
+            assert (invoices[ids[0]].status, float(invoices[ids[0]].amount)) == ("unpaid", 800)
+            assert invoices[ids[0]].due_date is not None
+            assert (invoices[ids[1]].status, invoices[ids[1]].paid_at) == ("paid", NOW)
+            assert (float(invoices[ids[1]].amount), invoices[ids[1]].currency) == (950, "EUR")
+
+            # A second run finds every project already invoiced
+            rerun = generate_invoices(project_ids=list(ids[:2]))
+            assert {result["reason"] for result in rerun["results"]} == {"not_eligible"}
+            assert Invoice.query.count() == 2
+
+    def test_project_invoiced_after_the_select_is_skipped(self, sqlite_app, monkeypatch):
+        """Test a project a concurrent run invoiced before our lock is skipped, not billed again"""
+        with sqlite_app.app_context():
+            client, freelancer = create_parties()
+            raced = create_project(client, freelancer, status="completed", budget=500)
+            free = create_project(client, freelancer, status="completed", budget=500)
+            db.session.commit()
+            ids = raced.id, free.id
+            parties = client.id, freelancer.id
+
+            billable_projects = invoice_service._billable_projects
+
+            def racing_billable_projects(*args, **kwargs):
+                projects = billable_projects(*args, **kwargs)
+                # Another run invoices and commits the first project after our SELECT
+                with db.engine.begin() as connection:
+                    connection.execute(
+                        Invoice.__table__.insert().values(
+                            project_id=ids[0],
+                            client_id=parties[0],
+                            freelancer_id=parties[1],
+                            invoice_number="INV-RACE",
+                            amount=500,
+                            status="unpaid",
+                        )
+                    )
+                return projects
+
+            monkeypatch.setattr(invoice_service, "_billable_projects", racing_billable_projects)
+
+            summary = generate_invoices(project_ids=list(ids))
+
+            results = {result["project_id"]: result for result in summary["results"]}
+            assert results[ids[0]] == {
+                "project_id": ids[0],
+                "status": "skipped",
+                "reason": "already_invoiced",
+            }
+            assert results[ids[1]]["status"] == "created"
+            assert Invoice.query.filter_by(project_id=ids[0]).one().invoice_number == "INV-RACE"
+            assert Invoice.query.filter_by(project_id=ids[1]).count() == 1
+
+    def test_cancelled_invoice_does_not_block_a_new_one(self, sqlite_app):
+        """Test a project whose only invoice was cancelled is billed again"""
+        with sqlite_app.app_context():
+            client, freelancer = create_parties()
+            project = create_project(client, freelancer, status="completed", budget=300)
+            db.session.add(
+                Invoice(
+                    project_id=project.id,
+                    client_id=client.id,
+                    freelancer_id=freelancer.id,
+                    invoice_number="INV-OLD",
+                    amount=300,
+                    status="cancelled",
+                )
+            )
+            db.session.commit()
+            project_id = project.id
+
+            summary = generate_invoices(project_ids=[project_id])
+
+            assert [result["status"] for result in summary["results"]] == ["created"]
+            statuses = sorted(invoice.status for invoice in Invoice.query)
+            assert statuses == ["cancelled", "unpaid"]
@@ -0,0 +1,316 @@
+"""
+Job Service Tests
+Owner: Caleb
+Description: Claiming, running, retrying and recovering background jobs, and enqueueing
+cron schedules, on a file-backed SQLite database
+"""
+
+# Run this test as pytest app/tests/test_job_service.py -v
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.extensions import db
+from app.models.job import Job, JobSchedule
+from app.services import job_service
+from app.services.job_service import (
+    TASKS,
+    TaskSpec,
+    Worker,
+    claim_jobs,
+    enqueue,
+    enqueue_due_schedules,
+    extend_leases,
+    recover_expired_leases,
+    retry_delay,
+    run_job,
+)
+
+THREADS = 8
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+@pytest.fixture
+def jobs_app(sqlite_app, monkeypatch):
+    calls = []
+
+    def flaky(fail=False):
+        calls.append(fail)
+        if fail:
+            raise RuntimeError("upstream timeout")
+        return {"ok": True}
+
+    monkeypatch.setitem(TASKS, "tests.flaky", TaskSpec("tests.flaky", flaky, 3, "default"))
+    sqlite_app.extensions["test_calls"] = calls
+    return sqlite_app
+
+
+def enqueue_jobs(count, **kwargs):
+    jobs = [enqueue("tests.flaky", run_at=NOW, **kwargs) for _ in range(count)]
+    db.session.commit()
+    return [job.id for job in jobs]
+
+
+class TestClaimJobs:
+    """Test suite for claim_jobs"""
+
+    def test_claims_due_jobs_in_priority_order(self, jobs_app):
+        """Test only due jobs of the worker's queues are leased, highest priority first"""
+        with jobs_app.app_context():
+            low = enqueue("tests.flaky", run_at=NOW)
+            high = enqueue("tests.flaky", run_at=NOW, priority=5)
+            enqueue("tests.flaky", run_at=NOW + timedelta(hours=1))
+            enqueue("tests.flaky", run_at=NOW, queue="reports")
+            db.session.commit()
+            low_id, high_id = low.id, high.id
+
+            assert claim_jobs("w1", ["default"], 1, now=NOW, lease_seconds=60) == [high_id]
+            assert claim_jobs("w1", ["default"], 10, now=NOW, lease_seconds=60) == [low_id]
+
+            job = db.session.get(Job, high_id)
+            assert (job.status, job.locked_by, job.attempts) == ("running", "w1", 1)
+            assert job.locked_until == NOW + timedelta(seconds=60)
+            assert claim_jobs("w2", ["default"], 10, now=NOW) == []
+
+    def test_candidates_skip_locked_rows(self, jobs_app, monkeypatch):
+        """Test the candidate query locks with SKIP LOCKED so workers never wait on each other"""
+        statements = []
+        scalars = db.session.scalars
+
+        def spy(statement, *args, **kwargs):
+            statements.append(statement)
+            return scalars(statement, *args, **kwargs)
+
+        with jobs_app.app_context():
+            enqueue_jobs(1)
+            monkeypatch.setattr(db.session, "scalars", spy)
+            claim_jobs("w1", ["default"], 1, now=NOW)
+
+        sql = str(statements[0].compile(dialect=postgresql.dialect()))
+        assert "FOR UPDATE SKIP LOCKED" in sql
+
+    def test_concurrent_workers_never_share_a_job(self, jobs_app):
+        """Test racing workers split the queue without claiming any job twice"""
+        with jobs_app.app_context():
+            job_ids = enqueue_jobs(40)
+        barrier = threading.Barrier(THREADS)
+
+        def claim(worker):
+            with jobs_app.app_context():
+                try:
+                    barrier.wait()
+                    claimed = []
+                    while batch := claim_jobs(f"w{worker}", ["default"], 3, now=NOW):
+                        claimed.extend(batch)
+                    return claimed
+                finally:
+                    db.session.remove()
+
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(pool.map(claim, range(THREADS)))
+
+        claimed = [job_id for batch in results for job_id in batch]
+        assert sorted(claimed) == sorted(job_ids)
+        with jobs_app.app_context():
+            assert {job.attempts for job in Job.query} == {1}
+
+
+class TestRunJob:
+    """Test suite for run_job outcomes, retries and backoff"""
+
+    def test_success_stores_the_result(self, jobs_app):
+        """Test a finished job records its result and releases the lease"""
+        with jobs_app.app_context():
+            (job_id,) = enqueue_jobs(1)
+            claim_jobs("w1", ["default"], 1, now=NOW)
+
+            assert run_job(job_id, "w1") == "succeeded"
+            job = db.session.get(Job, job_id)
+            assert job.result == {"ok": True}
+            assert (job.locked_by, job.locked_until) == (None, None)
+            assert job.finished_at is not None
+
+    def test_failures_back_off_then_fail(self, jobs_app):
+        """Test a failing job is requeued with exponential backoff until out of attempts"""
+        with jobs_app.app_context():
+            (job_id,) = enqueue_jobs(1, payload={"fail": True})
+            delays = []
+            now = NOW
+            for attempt in (1, 2):
+                assert claim_jobs("w1", ["default"], 1, now=now) == [job_id]
+                before = datetime.utcnow()
+                assert run_job(job_id, "w1") == "queued"
+                db.session.expire_all()
+                job = db.session.get(Job, job_id)
+                assert job.attempts == attempt
+                assert job.last_error == "RuntimeError: upstream timeout"
+                assert job.locked_by is None and job.finished_at is None
+                delays.append(job.run_at - before)
+                # Not claimable again until the backoff has passed
+                assert claim_jobs("w1", ["default"], 1, now=job.run_at - timedelta(seconds=1)) == []
+                now = job.run_at
+
+            assert claim_jobs("w1", ["default"], 1, now=now) == [job_id]
+            assert run_job(job_id, "w1") == "failed"
+            db.session.expire_all()
+            job = db.session.get(Job, job_id)
+            assert (job.status, job.attempts) == ("failed", 3)
+            assert job.finished_at is not None
+
+        assert retry_delay(1) <= delays[0] <= retry_delay(1) + timedelta(seconds=5)
+        assert retry_delay(2) <= delays[1] <= retry_delay(2) + timedelta(seconds=5)
+        assert retry_delay(2) == 2 * retry_delay(1)
+        assert jobs_app.extensions["test_calls"] == [True, True, True]
+
+    def test_only_the_lease_holder_records_the_outcome(self, jobs_app):
+        """Test a worker whose lease was taken over cannot overwrite the job"""
+        with jobs_app.app_context():
+            (job_id,) = enqueue_jobs(1)
+            claim_jobs("w1", ["default"], 1, now=NOW)
+
+            run_job(job_id, "stale-worker")
+            db.session.expire_all()
+            job = db.session.get(Job, job_id)
+            assert (job.status, job.locked_by) == ("running", "w1")
+
+    def test_unknown_task_fails_the_attempt(self, jobs_app):
+        """Test a job whose task is no longer registered is retried, not crashed"""
+        with jobs_app.app_context():
+            (job_id,) = enqueue_jobs(1)
+            db.session.get(Job, job_id).task = "tests.removed"
+            db.session.commit()
+            claim_jobs("w1", ["default"], 1, now=NOW)
+
+            assert run_job(job_id, "w1") == "queued"
+            assert "LookupError" in db.session.get(Job, job_id).last_error
+
+
+class TestRecoverExpiredLeases:
+    """Test suite for recover_expired_leases"""
+
+    def test_requeues_or_fails_abandoned_jobs(self, jobs_app):
+        """Test expired leases go back to the queue unless the job is out of attempts"""
+        with jobs_app.app_context():
+            retryable, exhausted, alive = enqueue_jobs(3)
+            db.session.get(Job, exhausted).max_attempts = 1
+            db.session.commit()
+            claim_jobs("dead", ["default"], 2, now=NOW, lease_seconds=60)
+            claim_jobs("alive", ["default"], 1, now=NOW, lease_seconds=3600)
+
+            assert recover_expired_leases(now=NOW + timedelta(minutes=5)) == 2
+            db.session.expire_all()
+            jobs = {job.id: job for job in Job.query}
+            assert (jobs[retryable].status, jobs[retryable].locked_by) == ("queued", None)
+            assert jobs[retryable].run_at == NOW + timedelta(minutes=5)
+            assert jobs[exhausted].status == "failed"
+            assert jobs[exhausted].last_error.startswith("Lease expired")
+            assert (jobs[alive].status, jobs[alive].locked_by) == ("running", "alive")
+
+    def test_heartbeat_extends_only_the_holders_lease(self, jobs_app):
+        """Test a renewed lease outlives its first expiry, and only its holder can renew it"""
+        with jobs_app.app_context():
+            (job_id,) = enqueue_jobs(1)
+            claim_jobs("w1", ["default"], 1, now=NOW, lease_seconds=60)
+
+            assert extend_leases("w2", [job_id], now=NOW + timedelta(seconds=50)) == 0
+            assert extend_leases("w1", [job_id], now=NOW + timedelta(seconds=50), lease_seconds=60)
+            assert recover_expired_leases(now=NOW + timedelta(seconds=100)) == 0
+            assert db.session.get(Job, job_id).locked_until == NOW + timedelta(seconds=110)
+
+    def test_worker_keeps_a_long_job_leased(self, jobs_app, monkeypatch):
+        """Test a job running past JOBS_LEASE_SECONDS is not recovered while it runs"""
+
+        def slow():
+            time.sleep(0.6)
+            # Another worker's sweep, well after the first lease ran out
+            return {"recovered": recover_expired_leases()}
+
+        monkeypatch.setitem(TASKS, "tests.slow", TaskSpec("tests.slow", slow, 1, "default"))
+        jobs_app.config.update(JOBS_LEASE_SECONDS=0.3, JOBS_POLL_INTERVAL=0.05)
+        with jobs_app.app_context():
+            job_id = enqueue("tests.slow").id
+            db.session.commit()
+
+        summary = {}
+        # Off the main thread, so the worker leaves pytest's signal handlers alone
+        runner = threading.Thread(
+            target=lambda: summary.update(Worker(jobs_app, concurrency=1).run(once=True))
+        )
+        runner.start()
+        runner.join(timeout=10)
+
+        assert summary == {"succeeded": 1}
+        with jobs_app.app_context():
+            job = db.session.get(Job, job_id)
+            assert (job.status, job.result, job.attempts) == ("succeeded", {"recovered": 0}, 1)
+
+
+class TestSchedules:
+    """Test suite for enqueue_due_schedules"""
+
+    def add_schedule(self, next_run_at=NOW):
+        db.session.add(
+            JobSchedule(
+                name="nightly", task="tests.flaky", cron="0 3 * * *", next_run_at=next_run_at
+            )
+        )
+        db.session.commit()
+
+    def test_due_schedule_enqueues_once_and_advances(self, jobs_app):
+        """Test a due schedule yields one job and moves to its next fire time"""
+        with jobs_app.app_context():
+            self.add_schedule()
+
+            (job_id,) = enqueue_due_schedules(now=NOW)
+            assert enqueue_due_schedules(now=NOW) == []
+
+            schedule = db.session.get(JobSchedule, "nightly")
+            assert schedule.next_run_at == datetime(2026, 10, 20, 3, 0)
+            assert (schedule.last_run_at, schedule.last_job_id) == (NOW, job_id)
+            assert db.session.get(Job, job_id).unique_key == f"schedule:nightly:{NOW.isoformat()}"
+
+    def test_duplicate_tick_is_rejected_by_unique_key(self, jobs_app):
+        """Test a tick that was already enqueued is not enqueued again"""
+        with jobs_app.app_context():
+            self.add_schedule()
+            enqueue_due_schedules(now=NOW)
+            # A worker that advanced from a stale copy re-arms the same tick
+            db.session.get(JobSchedule, "nightly").next_run_at = NOW
+            db.session.commit()
+
+            assert enqueue_due_schedules(now=NOW) == []
+            assert Job.query.count() == 1
+
+    def test_concurrent_workers_enqueue_a_tick_once(self, jobs_app, monkeypatch):
+        """Test the compare-and-set lets only one of several racing workers enqueue"""
+        with jobs_app.app_context():
+            self.add_schedule()
+        barrier = threading.Barrier(THREADS)
+        cron_expression = job_service.CronExpression
+
+        class RacingCron(cron_expression):
+            def next_after(self, moment):
+                # Every worker has read the due schedule before any of them advances it
+                barrier.wait()
+                return super().next_after(moment)
+
+        monkeypatch.setattr(job_service, "CronExpression", RacingCron)
+
+        def tick(_):
+            with jobs_app.app_context():
+                try:
+                    return enqueue_due_schedules(now=NOW)
+                finally:
+                    db.session.remove()
+
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(pool.map(tick, range(THREADS)))
+
+        assert sum(len(result) for result in results) == 1
+        with jobs_app.app_context():
+            assert Job.query.count() == 1
@@ -0,0 +1,89 @@
+"""
+Leaderboard Tests
+Owner: Caleb
+Description: Bayesian scoring and cursor encoding for the freelancer leaderboard, and
+keeping leaderboard rows in step with freelancer profiles
+"""
+
+# Run this test as pytest app/tests/test_leaderboard.py -v
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.extensions import db
+from app.models.freelancer_profile import FreelancerProfile
+from app.models.leaderboard import FreelancerLeaderboardEntry, bayesian_score
+from app.models.user import User
+from app.services.leaderboard_service import decode_cursor, encode_cursor
+
+
+class TestLeaderboard:
+    """Test suite for leaderboard scoring and pagination helpers"""
+
+    def test_score_without_reviews_is_prior(self):
+        """Test a freelancer with no reviews scores the prior mean"""
+        assert bayesian_score(0, 0, prior_mean=3.5, prior_weight=5) == 3.5
+
+    def test_few_perfect_reviews_rank_below_many_good_ones(self):
+        """Test shrinkage keeps one 5-star review below a long 4.8 record"""
+        one_review = bayesian_score(1, 5, prior_mean=3.5, prior_weight=5)
+        many_reviews = bayesian_score(100, 480, prior_mean=3.5, prior_weight=5)
+        assert one_review < many_reviews
+
+    def test_cursor_round_trip(self):
+        """Test cursors decode to the entry's score and id"""
+        entry = SimpleNamespace(score=4.123456789, freelancer_id=42)
+        assert decode_cursor(encode_cursor(entry)) == (4.123456789, 42)
+
+    def test_invalid_cursor(self):
+        """Test malformed cursors are rejected"""
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+class TestLeaderboardUpkeep:
+    """Test suite for the profile events that refresh leaderboard rows"""
+
+    def test_moving_a_profile_refreshes_both_users(self, sqlite_app):
+        """Test the previous user's row loses the profile and the new user's row gains it"""
+        with sqlite_app.app_context():
+            first, second = (
+                User(email=f"{name}@x.com", password_hash="x", first_name="F", last_name="L")
+                for name in ("first", "second")
+            )
+            db.session.add_all([first, second])
+            db.session.flush()
+            profile = FreelancerProfile(
+                user_id=first.id,
+                name="First",
+                email="first@x.com",
+                application_status="approved",
+                open_to_work=True,
+            )
+            db.session.add(profile)
+            db.session.commit()
+            first_id, second_id, profile_id = first.id, second.id, profile.id
+            entry = db.session.get(FreelancerLeaderboardEntry, first_id)
+            assert (entry.profile_id, entry.is_approved, entry.open_to_work) == (
+                profile_id,
+                True,
+                True,
+            )
+
+            profile.user_id = second_id
+            db.session.commit()
+            db.session.expire_all()
+
+            previous = db.session.get(FreelancerLeaderboardEntry, first_id)
+            assert (previous.profile_id, previous.is_approved, previous.open_to_work) == (
+                None,
+                False,
+                False,
+            )
+            current = db.session.get(FreelancerLeaderboardEntry, second_id)
+            assert (current.profile_id, current.is_approved, current.open_to_work) == (
+                profile_id,
+                True,
+                True,
+            )
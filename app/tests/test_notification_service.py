@@ -0,0 +1,140 @@
+"""
+Notification Service Tests
+Owner: Ryan
+Description: Inbox cursor encoding for keyset pagination and the cached unread counters
+"""
+
+# Run this test as pytest app/tests/test_notification_service.py -v
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.extensions import db
+from app.models.notification import Notification, NotificationCounter
+from app.models.user import User
+from app.services.notification_service import (
+    decode_cursor,
+    encode_cursor,
+    mark_all_read,
+    mark_read,
+    notify_many,
+)
+
+
+def create_users(count):
+    users = [
+        User(email=f"user{index}@x.com", password_hash="x", first_name="U", last_name="L")
+        for index in range(count)
+    ]
+    db.session.add_all(users)
+    db.session.commit()
+    return [user.id for user in users]
+
+
+def notify(user_id, is_read=False):
+    notification = Notification(user_id=user_id, title="Hi", message="Hello", is_read=is_read)
+    db.session.add(notification)
+    db.session.commit()
+    return notification
+
+
+def unread(user_id):
+    """The cached count, checked against a recount of the notifications table"""
+    cached = NotificationCounter.get_unread_count(user_id)
+    actual = Notification.query.filter_by(user_id=user_id, is_read=False).count()
+    assert cached == actual
+    return cached
+
+
+class TestNotificationService:
+    """Test suite for notification inbox helpers"""
+
+    def test_cursor_round_trip(self):
+        """Test cursors decode to the notification's created_at and id"""
+        created_at = datetime(2026, 10, 19, 12, 30, 45, 123456)
+        notification = SimpleNamespace(created_at=created_at, id=42)
+        assert decode_cursor(encode_cursor(notification)) == (created_at, 42)
+
+    def test_invalid_cursor(self):
+        """Test malformed cursors are rejected"""
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+class TestUnreadCounter:
+    """Test suite for the cached per-user unread counters"""
+
+    def test_mapper_events(self, sqlite_app):
+        """Test inserting, reading, unreading and deleting notifications move the counter"""
+        with sqlite_app.app_context():
+            (user_id,) = create_users(1)
+            first = notify(user_id)
+            second = notify(user_id)
+            notify(user_id, is_read=True)
+            assert unread(user_id) == 2
+
+            first.is_read = True
+            db.session.commit()
+            assert unread(user_id) == 1
+            # Re-reading an expired, already-read notification changes nothing
+            db.session.expire(first)
+            first.is_read = True
+            db.session.commit()
+            assert unread(user_id) == 1
+
+            first.is_read = False
+            db.session.commit()
+            assert unread(user_id) == 2
+
+            db.session.delete(second)
+            db.session.commit()
+            assert unread(user_id) == 1
+
+    def test_mark_read_counts_changed_rows_only(self, sqlite_app):
+        """Test mark_read decrements by the notifications that were actually unread"""
+        with sqlite_app.app_context():
+            user_id, other_id = create_users(2)
+            ids = [notify(user_id).id for _ in range(3)]
+            foreign = notify(other_id).id
+
+            assert mark_read(user_id, [ids[0], ids[1], foreign]) == 2
+            assert mark_read(user_id, [ids[0]]) == 0
+            db.session.commit()
+
+            assert unread(user_id) == 1
+            assert unread(other_id) == 1
+
+    def test_mark_all_read_decrements_by_rowcount(self, sqlite_app):
+        """Test mark_all_read subtracts the rows it changed instead of zeroing the counter"""
+        with sqlite_app.app_context():
+            (user_id,) = create_users(1)
+            for _ in range(3):
+                notify(user_id)
+            # A drifted counter stays off by the same amount rather than being reset
+            NotificationCounter.adjust({user_id: 5})
+            db.session.commit()
+
+            assert mark_all_read(user_id) == 3
+            db.session.commit()
+            assert NotificationCounter.get_unread_count(user_id) == 5
+            assert mark_all_read(user_id) == 0
+
+    def test_notify_many_upserts_counters(self, sqlite_app):
+        """Test fan-out creates missing counter rows and increments existing ones"""
+        with sqlite_app.app_context():
+            first, second, third = create_users(3)
+            notify(first)
+            assert db.session.get(NotificationCounter, second) is None
+
+            created = notify_many([first, second, second, third], "Release", "v2 is out")
+            db.session.commit()
+
+            assert sorted(notification.user_id for notification in created) == [
+                first,
+                second,
+                third,
+            ]
+            assert [unread(user_id) for user_id in (first, second, third)] == [2, 1, 1]
+            assert notify_many([], "Release", "v2 is out") == []
@@ -0,0 +1,53 @@
+"""
+Realtime Service Tests
+Owner: Ryan
+Description: In-process broker fan-out, slow-consumer overflow and SSE framing
+"""
+
+# Run this test as pytest app/tests/test_realtime_service.py -v
+
+from app.services.realtime_service import LocalBroker, format_sse
+
+
+class TestRealtimeService:
+    """Test suite for the realtime broker"""
+
+    def test_publish_reaches_only_target_users(self):
+        """Test every stream of a target user receives the event and others do not"""
+        broker = LocalBroker()
+        first, second = broker.subscribe(1), broker.subscribe(1)
+        other = broker.subscribe(2)
+
+        broker.publish({1}, {"event": "dashboard", "data": {"stale": True}})
+
+        assert first.get(0.01)["event"] == "dashboard"
+        assert second.get(0.01)["event"] == "dashboard"
+        assert other.get(0.01) is None
+
+    def test_close_unsubscribes(self):
+        """Test closed streams are forgotten"""
+        broker = LocalBroker()
+        subscription = broker.subscribe(1)
+        assert broker.connection_count() == 1
+
+        subscription.close()
+
+        assert broker.connection_count() == 0
+        broker.publish({1}, {"event": "dashboard"})
+
+    def test_overflow_replaces_queue_with_resync(self):
+        """Test a slow consumer gets a single resync instead of unbounded growth"""
+        broker = LocalBroker(max_queue=2)
+        subscription = broker.subscribe(1)
+
+        for i in range(3):
+            broker.publish({1}, {"event": "notification", "id": i, "data": {}})
+
+        assert subscription.get(0.01)["event"] == "resync"
+        assert subscription.get(0.01) is None
+
+    def test_format_sse(self):
+        """Test events are framed with id, event name and JSON data"""
+        frame = format_sse({"event": "notification", "id": 7, "data": {"title": "Hi"}})
+
+        assert frame == 'id: 7\nevent: notification\ndata: {"title": "Hi"}\n\n'
@@ -0,0 +1,169 @@
+"""
+Review Analytics Tests
+Owner: Caleb
+Description: Grouped SQL review statistics, rating trends and per-user review summaries
+"""
+
+# Run this test as pytest app/tests/test_review_analytics.py -v
+
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db
+from app.models.freelancer_rating import FreelancerRatingAggregate
+from app.models.project import Project
+from app.models.review import Review
+from app.models.user import User
+from app.services.review_analytics_service import (
+    compute_review_statistics,
+    get_rating_trends,
+    get_review_statistics,
+    get_user_review_summary,
+)
+
+
+@pytest.fixture
+def reviews(sqlite_app):
+    """Two freelancers; the first has three public reviews and one private one"""
+    with sqlite_app.app_context():
+        client = User(email="client@x.com", password_hash="x", first_name="C", last_name="L")
+        first = User(email="first@x.com", password_hash="x", first_name="F", last_name="L")
+        second = User(email="second@x.com", password_hash="x", first_name="S", last_name="L")
+        db.session.add_all([client, first, second])
+        db.session.flush()
+
+        rows = [
+            # freelancer, rating, (communication, quality, timeliness), public, created_at
+            (first, 5, (4, 5, None), True, datetime(2026, 1, 10)),
+            (first, 2, (None, None, None), True, datetime(2026, 1, 20)),
+            (first, 4, (3, 4, 5), True, datetime(2026, 3, 5)),
+            (first, 1, (1, 1, 1), False, datetime(2026, 3, 6)),
+            (second, 3, (None, None, None), True, datetime(2026, 2, 1)),
+        ]
+        for index, (freelancer, rating, subratings, public, created_at) in enumerate(rows):
+            project = Project(title=f"Project {index}", description="D", client_id=client.id)
+            db.session.add(project)
+            db.session.flush()
+            communication, quality, timeliness = subratings
+            db.session.add(
+                Review(
+                    project_id=project.id,
+                    client_id=client.id,
+                    freelancer_id=freelancer.id,
+                    rating=rating,
+                    communication_rating=communication,
+                    quality_rating=quality,
+                    timeliness_rating=timeliness,
+                    is_public=public,
+                    created_at=created_at,
+                )
+            )
+        db.session.commit()
+        return client.id, first.id, second.id
+
+
+class TestReviewStatistics:
+    """Test suite for compute_review_statistics and get_review_statistics"""
+
+    def test_grouped_statistics(self, sqlite_app, reviews):
+        """Test counts, averages and histograms per freelancer from one grouped query"""
+        _, first, second = reviews
+        with sqlite_app.app_context():
+            statistics = compute_review_statistics([first, second])
+
+        # Review averages: 4.5, 2.0 and 4.0
+        assert statistics[first] == {
+            "total_reviews": 3,
+            "average_rating": 3.5,
+            "rating_distribution": {1: 0, 2: 1, 3: 0, 4: 2, 5: 0},
+            "average_communication": 3.5,
+            "average_quality": 4.5,
+            "average_timeliness": 5.0,
+        }
+        assert statistics[second]["total_reviews"] == 1
+        assert statistics[second]["average_communication"] == 0
+
+    def test_private_reviews_are_opt_in(self, sqlite_app, reviews):
+        """Test public_only=False also counts private reviews"""
+        _, first, _ = reviews
+        with sqlite_app.app_context():
+            statistics = compute_review_statistics([first], public_only=False)[first]
+
+        assert statistics["total_reviews"] == 4
+        assert statistics["rating_distribution"][1] == 1
+
+    def test_freelancers_without_reviews_are_omitted(self, sqlite_app, reviews):
+        """Test only reviewed freelancers appear in the computed statistics"""
+        client, first, _ = reviews
+        with sqlite_app.app_context():
+            assert set(compute_review_statistics([first, client])) == {first}
+
+    def test_aggregates_agree_with_the_grouped_query(self, sqlite_app, reviews):
+        """Test the materialized rows and the fallback query give the same statistics"""
+        client, first, second = reviews
+        with sqlite_app.app_context():
+            computed = compute_review_statistics([first, second])
+            statistics = get_review_statistics([first, second, client])
+
+            FreelancerRatingAggregate.query.delete()
+            db.session.commit()
+            fallback = get_review_statistics([first, second, client])
+
+        assert statistics[first] == computed[first]
+        assert statistics[second] == computed[second]
+        assert statistics[client] == FreelancerRatingAggregate.empty_stats()
+        assert fallback == statistics
+
+
+class TestRatingTrends:
+    """Test suite for get_rating_trends"""
+
+    def test_monthly_buckets(self, sqlite_app, reviews):
+        """Test reviews are grouped per month, oldest first"""
+        _, first, second = reviews
+        with sqlite_app.app_context():
+            trends = get_rating_trends([first, second])
+
+        assert trends[first] == [
+            {"period": "2026-01", "total_reviews": 2, "average_rating": 3.25},
+            {"period": "2026-03", "total_reviews": 1, "average_rating": 4.0},
+        ]
+        assert trends[second] == [{"period": "2026-02", "total_reviews": 1, "average_rating": 3.0}]
+
+    def test_since_and_period(self, sqlite_app, reviews):
+        """Test the lower bound and yearly buckets, with private reviews included"""
+        _, first, _ = reviews
+        with sqlite_app.app_context():
+            trends = get_rating_trends(
+                [first], period="year", since=datetime(2026, 1, 15), public_only=False
+            )
+
+        assert trends[first] == [{"period": "2026", "total_reviews": 3, "average_rating": 2.33}]
+
+    def test_unknown_period(self, sqlite_app):
+        """Test an unsupported period is rejected"""
+        with sqlite_app.app_context():
+            with pytest.raises(ValueError):
+                get_rating_trends([1], period="week")
+
+
+class TestUserReviewSummary:
+    """Test suite for get_user_review_summary"""
+
+    def test_given_and_received(self, sqlite_app, reviews):
+        """Test given/received counts include private reviews, the rating only public ones"""
+        client, first, _ = reviews
+        with sqlite_app.app_context():
+            assert get_user_review_summary(first) == {
+                "total_reviews_given": 0,
+                "total_reviews_received": 4,
+                "average_rating_received": 3.5,
+                "public_reviews_count": 3,
+            }
+            assert get_user_review_summary(client) == {
+                "total_reviews_given": 5,
+                "total_reviews_received": 0,
+                "average_rating_received": 0,
+                "public_reviews_count": 0,
+            }
@@ -0,0 +1,160 @@
+"""
+Search Service Tests
+Owner: Cindy
+Description: Query building, index documents and end-to-end full-text search on the
+SQLite FTS5 index
+"""
+
+# Run this test as pytest app/tests/test_search_service.py -v
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.extensions import db
+from app.models.deliverable import Deliverable
+from app.models.feedback import Feedback
+from app.models.project import Project
+from app.models.search_document import deliverable_document
+from app.models.user import User
+from app.services.search_service import _fts5_query, render_snippet, search
+
+
+@pytest.fixture
+def indexed(sqlite_app):
+    """A client's project with a deliverable and feedback, plus another client's project"""
+    with sqlite_app.app_context():
+        users = []
+        for email, role in (("client@x.com", "client"), ("other@x.com", "client")):
+            user = User(email=email, password_hash="x", first_name="C", last_name="L")
+            user.role = role
+            users.append(user)
+        admin = User(email="admin@x.com", password_hash="x", first_name="A", last_name="L")
+        admin.role = "admin"
+        db.session.add_all([*users, admin])
+        db.session.flush()
+
+        project = Project(
+            title="Logo redesign", description="A bold wordmark", client_id=users[0].id
+        )
+        hidden = Project(title="Logo audit", description="Private", client_id=users[1].id)
+        db.session.add_all([project, hidden])
+        db.session.flush()
+        deliverable = Deliverable(
+            project_id=project.id,
+            version_number=1,
+            file_url="https://example.com/logo.png",
+            file_type="image",
+            uploaded_by=users[0].id,
+            title="Wordmark draft",
+            description="First pass at the logo",
+        )
+        db.session.add(deliverable)
+        db.session.flush()
+        db.session.add(
+            Feedback(
+                deliverable_id=deliverable.id,
+                user_id=users[0].id,
+                feedback_type="comment",
+                content='Make the logo <img src=x onerror="alert(1)"> & bolder',
+            )
+        )
+        db.session.commit()
+        return users[0].id, users[1].id, admin.id
+
+
+class TestFts5Query:
+    """Test suite for turning user input into an FTS5 MATCH expression"""
+
+    def test_quotes_terms_and_prefixes_the_last(self):
+        """Test every term must match and the last one may be partially typed"""
+        assert _fts5_query("logo typogr") == '"logo" "typogr"*'
+
+    def test_strips_fts_operators(self):
+        """Test operator characters cannot break the MATCH syntax"""
+        assert _fts5_query('logo" OR -(bold') == '"logo" "OR" "bold"*'
+
+    def test_returns_none_without_terms(self):
+        """Test punctuation-only input yields no query"""
+        assert _fts5_query("!!! ...") is None
+
+
+class TestDeliverableDocument:
+    """Test suite for deliverable index documents"""
+
+    def test_body_combines_description_and_change_notes(self):
+        """Test change notes are searchable alongside the description"""
+        deliverable = SimpleNamespace(
+            id=7, project_id=3, title="Logo v2", description="Second pass", change_notes=None
+        )
+        document = deliverable_document(deliverable)
+
+        assert document["body"] == "Second pass"
+        assert document["project_id"] == 3
+        assert document["deliverable_id"] == 7
+
+
+class TestRenderSnippet:
+    """Test suite for turning database snippets into safe HTML"""
+
+    def test_escapes_text_and_keeps_highlights(self):
+        """Test indexed markup is escaped while match delimiters become <mark> tags"""
+        assert render_snippet("<b>\ue000logo\ue001</b> & co") == (
+            "&lt;b&gt;<mark>logo</mark>&lt;/b&gt; &amp; co"
+        )
+
+    def test_none_passes_through(self):
+        """Test documents without text have no snippet"""
+        assert render_snippet(None) is None
+
+
+class TestSearch:
+    """Test suite for search() on the SQLite FTS5 index"""
+
+    def test_ranked_visible_results(self, sqlite_app, indexed):
+        """Test only the user's projects match and title hits outrank body hits"""
+        client, _, _ = indexed
+        with sqlite_app.app_context():
+            results = search(db.session.get(User, client), "logo")
+
+        assert {result["entity_type"] for result in results} == {
+            "project",
+            "deliverable",
+            "feedback",
+        }
+        assert "Logo audit" not in {result["title"] for result in results}
+        assert results[0]["title"] == "Logo redesign"
+        assert results == sorted(results, key=lambda result: -result["rank"])
+
+    def test_snippets_escape_indexed_html(self, sqlite_app, indexed):
+        """Test user-supplied markup comes back escaped around the highlighted match"""
+        client, _, _ = indexed
+        with sqlite_app.app_context():
+            (result,) = search(db.session.get(User, client), "bolder", entity_types=["feedback"])
+
+        assert result["snippet"] == (
+            "Make the logo &lt;img src=x onerror=&quot;alert(1)&quot;&gt; &amp; "
+            "<mark>bolder</mark>"
+        )
+        assert "<img" not in result["snippet"]
+
+    def test_prefix_matching_and_paging(self, sqlite_app, indexed):
+        """Test the last term matches as a prefix and limit/offset page the results"""
+        client, _, _ = indexed
+        with sqlite_app.app_context():
+            client = db.session.get(User, client)
+            everything = search(client, "wordm")
+            first_page = search(client, "wordm", limit=1)
+            second_page = search(client, "wordm", limit=1, offset=1)
+
+        assert len(everything) == 2
+        assert first_page + second_page == everything
+
+    def test_admins_see_every_project(self, sqlite_app, indexed):
+        """Test admins are not restricted to their own projects"""
+        client, other, admin = indexed
+        with sqlite_app.app_context():
+            client, other, admin = (db.session.get(User, id) for id in (client, other, admin))
+            assert [r["title"] for r in search(other, "logo")] == ["Logo audit"]
+            assert len(search(admin, "logo", entity_types=["project"])) == 2
+            assert search(client, "!!!") == []
@@ -0,0 +1,130 @@
+"""
+Storage Service Tests
+Owner: Cindy
+Description: Local-disk storage backend: saving, serving with Range/ETag, and web-server offload
+"""
+
+# Run this test as pytest app/tests/test_storage_service.py -v
+
+import io
+
+import pytest
+from flask import Flask
+from werkzeug.datastructures import FileStorage
+
+from app.resources.auth_resource import auth_bp
+from app.services.storage_service import CV_FOLDER, LocalStorage, get_storage
+
+
+@pytest.fixture
+def storage_app(tmp_path):
+    """Minimal Flask app serving the local backend (no database needed)"""
+    app = Flask(__name__)
+    app.config.update(
+        {
+            "TESTING": True,
+            "STORAGE_BACKEND": "local",
+            "LOCAL_STORAGE_ROOT": str(tmp_path),
+            "LOCAL_STORAGE_URL_PREFIX": "/files",
+        }
+    )
+
+    @app.route("/files/<path:key>")
+    def serve(key):
+        return get_storage().serve(key)
+
+    return app
+
+
+def upload(content=b"0123456789" * 100, filename="brief.pdf"):
+    return FileStorage(stream=io.BytesIO(content), filename=filename)
+
+
+class TestLocalStorage:
+    """Test suite for LocalStorage"""
+
+    def test_save_and_url(self, storage_app):
+        """Test saving an upload returns a routable key and URL"""
+        with storage_app.app_context():
+            result = get_storage().save(upload(), folder="cvs")
+
+        assert result["success"] is True
+        assert result["key"].startswith("cvs/")
+        assert result["key"].endswith("_brief.pdf")
+        assert result["url"] == f"/files/{result['key']}"
+        assert result["bytes"] == 1000
+
+    def test_serve_supports_etag_and_range(self, storage_app):
+        """Test files are served conditionally with ETag and byte ranges"""
+        with storage_app.app_context():
+            key = get_storage().save(upload(), folder="cvs")["key"]
+
+        client = storage_app.test_client()
+        full = client.get(f"/files/{key}")
+        assert full.status_code == 200
+        assert full.data == b"0123456789" * 100
+        etag = full.headers["ETag"]
+
+        cached = client.get(f"/files/{key}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+        partial = client.get(f"/files/{key}", headers={"Range": "bytes=10-19"})
+        assert partial.status_code == 206
+        assert partial.data == b"0123456789"
+
+    def test_serve_with_accel_redirect(self, storage_app):
+        """Test nginx offload only sends headers, never the file body"""
+        storage_app.config["LOCAL_STORAGE_ACCEL_REDIRECT"] = "/protected-uploads/"
+        with storage_app.app_context():
+            key = get_storage().save(upload(), folder="cvs")["key"]
+
+        response = storage_app.test_client().get(f"/files/{key}")
+        assert response.status_code == 200
+        assert response.headers["X-Accel-Redirect"] == f"/protected-uploads/{key}"
+        assert response.data == b""
+
+    def test_serve_rejects_path_traversal(self, storage_app):
+        """Test keys cannot escape the storage root"""
+        response = storage_app.test_client().get("/files/../secrets.txt")
+        assert response.status_code == 404
+
+    def test_public_upload_route_serves_cvs_only(self, tmp_path):
+        """Test the unauthenticated uploads route cannot reach deliverables or invoice PDFs"""
+        app = Flask(__name__)
+        app.config.update(
+            {
+                "TESTING": True,
+                "LOCAL_STORAGE_ROOT": str(tmp_path),
+                "LOCAL_STORAGE_URL_PREFIX": "/api/auth/uploads",
+            }
+        )
+        app.register_blueprint(auth_bp)
+        with app.app_context():
+            storage = get_storage("local")
+            cv = storage.save(upload(), folder=CV_FOLDER)
+            deliverable = storage.save(upload(), folder="reelbrief/project_1")
+            storage.save_bytes(b"%PDF-1.4", "invoices/abc.pdf")
+
+        client = app.test_client()
+        assert client.get(cv["url"]).status_code == 200
+        assert client.get(deliverable["url"]).status_code == 404
+        assert client.get("/api/auth/uploads/invoices/abc.pdf").status_code == 404
+        assert client.get(f"/api/auth/uploads/{CV_FOLDER}/../invoices/abc.pdf").status_code == 404
+
+    def test_save_bytes_and_delete(self, tmp_path):
+        """Test raw byte storage and deletion"""
+        storage = LocalStorage(root=str(tmp_path), url_prefix="/files")
+
+        result = storage.save_bytes(b"%PDF-1.4", "invoices/INV-1.pdf")
+        assert result["success"] is True
+        assert storage.exists("invoices/INV-1.pdf") is True
+
+        assert storage.delete("invoices/INV-1.pdf")["success"] is True
+        assert storage.exists("invoices/INV-1.pdf") is False
+        assert storage.delete("invoices/INV-1.pdf")["success"] is False
+
+    def test_unknown_backend(self, storage_app):
+        """Test an unknown backend name is rejected"""
+        with storage_app.app_context():
+            with pytest.raises(ValueError):
+                get_storage("s3")
@@ -0,0 +1,119 @@
+"""
+Cron Expressions
+Owner: Caleb
+Description: Minimal five-field cron parser (minute hour day-of-month month day-of-week)
+for job schedules. Supports *, lists, ranges, steps and the @hourly/@daily/@weekly/
+@monthly/@yearly shortcuts; times are UTC.
+"""
+
+from datetime import datetime, timedelta
+
+ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+}
+
+# (name, lowest, highest)
+FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day of month", 1, 31),
+    ("month", 1, 12),
+    ("day of week", 0, 7),
+)
+
+# Far enough for any satisfiable expression (Feb 29 on a given weekday recurs within 28 years)
+SEARCH_YEARS = 30
+
+
+def _parse_field(spec, name, lowest, highest):
+    values = set()
+    for part in spec.split(","):
+        step = 1
+        if "/" in part:
+            part, step_spec = part.split("/", 1)
+            if not step_spec.isdigit() or int(step_spec) == 0:
+                raise ValueError(f"Invalid step in {name}: {spec}")
+            step = int(step_spec)
+
+        if part == "*":
+            start, end = lowest, highest
+        elif "-" in part:
+            start_spec, end_spec = part.split("-", 1)
+            if not (start_spec.isdigit() and end_spec.isdigit()):
+                raise ValueError(f"Invalid range in {name}: {spec}")
+            start, end = int(start_spec), int(end_spec)
+        elif part.isdigit():
+            start = int(part)
+            # "5/15" means from 5 to the end in steps of 15
+            end = highest if step > 1 else start
+        else:
+            raise ValueError(f"Invalid {name}: {spec}")
+
+        if start < lowest or end > highest or start > end:
+            raise ValueError(f"{name} out of range: {spec}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronExpression:
+    """A parsed cron expression; next_after() gives the following fire time"""
+
+    def __init__(self, expression):
+        self.expression = expression.strip()
+        fields = ALIASES.get(self.expression, self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+
+        parsed = [_parse_field(spec, *field) for spec, field in zip(fields, FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # 7 is an alias for Sunday; Python counts Monday as 0, cron counts Sunday as 0
+        self.weekdays = {(day - 1) % 7 for day in weekdays}
+        # Vixie cron: when both day fields are restricted, either may match
+        self._day_restricted = fields[2] != "*"
+        self._weekday_restricted = fields[4] != "*"
+
+    def __repr__(self):
+        return f"<CronExpression '{self.expression}'>"
+
+    def _day_matches(self, moment):
+        day_ok = moment.day in self.days
+        weekday_ok = moment.weekday() in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment):
+        """
+        First fire time strictly after moment (to the minute).
+
+        Raises:
+            ValueError: If the expression never fires (e.g. 30 February)
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = datetime(moment.year + SEARCH_YEARS, 1, 1)
+
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = datetime(candidate.year + year, month + 1, 1)
+                continue
+            if not self._day_matches(candidate):
+                candidate = datetime(candidate.year, candidate.month, candidate.day) + timedelta(
+                    days=1
+                )
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
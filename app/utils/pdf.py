@@ -0,0 +1,101 @@
+"""
+PDF Writer
+Owner: Caleb
+Description: Minimal text-only PDF 1.4 writer for generated documents (invoices). Uses the
+standard Helvetica and Courier fonts, so no font files or third-party libraries are needed,
+and produces identical bytes for identical input (no timestamps), which lets rendered
+files be cached by content hash.
+"""
+
+PAGE_WIDTH = 595  # A4 in points
+PAGE_HEIGHT = 842
+MARGIN = 56
+
+# style -> (font resource, size, leading)
+STYLES = {
+    "title": ("F1", 18, 28),
+    "heading": ("F1", 12, 20),
+    "body": ("F2", 10, 14),
+}
+FONTS = {"F1": "Helvetica-Bold", "F2": "Courier"}
+
+
+def _escape(text):
+    text = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    # The standard fonts use WinAnsiEncoding; anything outside it degrades to "?"
+    return text.encode("cp1252", errors="replace").decode("latin-1")
+
+
+def _paginate(lines):
+    pages, current, y = [], [], PAGE_HEIGHT - MARGIN
+    for style, text in lines:
+        font, size, leading = STYLES[style]
+        if y - leading < MARGIN and current:
+            pages.append(current)
+            current, y = [], PAGE_HEIGHT - MARGIN
+        y -= leading
+        current.append((font, size, y, text))
+    pages.append(current)
+    return pages
+
+
+def _content_stream(page):
+    commands = []
+    for font, size, y, text in page:
+        if text:
+            commands.append(f"BT /{font} {size} Tf {MARGIN} {y} Td ({_escape(text)}) Tj ET")
+    return "\n".join(commands).encode("latin-1")
+
+
+def render_text_pdf(lines):
+    """
+    Lay out styled lines top to bottom, starting new pages as needed.
+
+    Args:
+        lines: Iterable of (style, text) with style in STYLES
+
+    Returns:
+        bytes: The PDF document
+    """
+    pages = _paginate(lines)
+    font_ids = {name: 3 + index for index, name in enumerate(FONTS)}
+    first_page_id = 3 + len(FONTS)
+    page_ids = [first_page_id + 2 * index for index in range(len(pages))]
+
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: (
+            f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] "
+            f"/Count {len(pages)} >>"
+        ).encode(),
+    }
+    for name, object_id in font_ids.items():
+        objects[object_id] = (
+            f"<< /Type /Font /Subtype /Type1 /BaseFont /{FONTS[name]} "
+            f"/Encoding /WinAnsiEncoding >>"
+        ).encode()
+    fonts = " ".join(f"/{name} {object_id} 0 R" for name, object_id in font_ids.items())
+    for page, page_id in zip(pages, page_ids):
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << {fonts} >> >> /Contents {page_id + 1} 0 R >>"
+        ).encode()
+        stream = _content_stream(page)
+        objects[page_id + 1] = (
+            f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream"
+        )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for object_id in sorted(objects):
+        offsets.append(len(output))
+        output += f"{object_id} 0 obj\n".encode() + objects[object_id] + b"\nendobj\n"
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode()
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode()
+    return bytes(output)
@@ -0,0 +1,26 @@
+"""
+Dialect Upserts
+Owner: Caleb
+Description: INSERT ... ON CONFLICT for the databases that support it (PostgreSQL, and
+SQLite in tests). Callers keep a plain-SQL fallback for any other database.
+"""
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+DIALECT_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def dialect_insert(bind, table):
+    """
+    An INSERT for table that supports on_conflict_do_update/on_conflict_do_nothing.
+
+    Args:
+        bind: Connection or engine the statement will run on
+        table: Table or mapped class to insert into
+
+    Returns:
+        Insert | None: None when the dialect has no ON CONFLICT support
+    """
+    insert = DIALECT_INSERTS.get(bind.dialect.name)
+    return None if insert is None else insert(table)
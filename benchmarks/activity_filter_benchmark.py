@@ -0,0 +1,107 @@
+"""
+activity_filter_benchmark.py
+Owner: Caleb
+Description: Times the GET /api/activity filters over a large seeded activity log: the
+trigram-indexed substring filter, the exact action_code filter and the unfiltered listing.
+Usage:
+    python benchmarks/activity_filter_benchmark.py [--rows 1000000] [--repeat 5] [--explain]
+Runs against DATABASE_URL; seeded rows use resource_type "benchmark" and are deleted afterwards.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, text  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.models import ActivityAction, ActivityLog  # noqa: E402
+from app.services.activity_service import filter_activities  # noqa: E402
+
+BENCHMARK_RESOURCE = "benchmark"
+ACTIONS = [
+    f"{verb} {noun}"
+    for verb in ("created", "updated", "approved", "rejected", "submitted", "released", "deleted")
+    for noun in ("project", "deliverable", "escrow payment", "invoice", "review", "feedback")
+]
+CASES = {
+    "no filter": {},
+    "action substring": {"action": "escrow"},
+    "action_code exact": {"action_code": "released escrow payment"},
+    "selective substring": {"action": "jected inv"},
+    "resource_type substring": {"resource_type": "enchm"},
+}
+
+
+def seed(rows, rng, batch_size=10000):
+    connection = db.session.connection()
+    action_ids = {code: ActivityAction.resolve_id(connection, code) for code in ACTIONS}
+    start = datetime.utcnow()
+    for offset in range(0, rows, batch_size):
+        batch = []
+        for i in range(offset, min(offset + batch_size, rows)):
+            action = rng.choice(ACTIONS)
+            batch.append(
+                {
+                    "action": action,
+                    "action_id": action_ids[action],
+                    "resource_type": BENCHMARK_RESOURCE,
+                    "resource_id": i,
+                    "created_at": start - timedelta(seconds=i),
+                }
+            )
+        connection.execute(insert(ActivityLog.__table__), batch)
+    db.session.commit()
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(text("ANALYZE activity_logs"))
+        db.session.commit()
+
+
+def run_case(filters, limit):
+    query = filter_activities(ActivityLog.query, **filters)
+    return query.order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc()).limit(limit).all()
+
+
+def explain(filters, limit):
+    query = filter_activities(ActivityLog.query, **filters)
+    statement = query.order_by(ActivityLog.created_at.desc()).limit(limit).statement
+    compiled = statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+    for (line,) in db.session.execute(text(f"EXPLAIN ANALYZE {compiled}")):
+        print(f"      {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--explain", action="store_true", help="Print plans (PostgreSQL only)")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        started = time.perf_counter()
+        seed(args.rows, random.Random(42))
+        print(f"Seeded {args.rows} rows in {time.perf_counter() - started:.1f}s")
+
+        try:
+            for label, filters in CASES.items():
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    run_case(filters, args.limit)
+                elapsed = (time.perf_counter() - start) / args.repeat
+                print(f"  {label:<26} {elapsed * 1000:9.2f} ms")
+                if args.explain and db.engine.dialect.name == "postgresql":
+                    explain(filters, args.limit)
+        finally:
+            ActivityLog.query.filter_by(resource_type=BENCHMARK_RESOURCE).delete()
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+audit_buffer_benchmark.py
+Owner: Caleb
+Description: Per-event cost of synchronous activity logging (one INSERT and commit per event)
+versus the buffered logger (enqueue now, batched INSERT/COPY in the background).
+Usage:
+    python benchmarks/audit_buffer_benchmark.py [--events 20000] [--threads 8]
+Runs against DATABASE_URL; benchmark rows use resource_type "benchmark" and are deleted afterwards.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db  # noqa: E402
+from app.models import ActivityLog  # noqa: E402
+from app.services.audit_buffer import audit_buffer  # noqa: E402
+
+BENCHMARK_RESOURCE = "benchmark"
+
+
+def run_threads(threads, events, fn):
+    per_thread = events // threads
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(worker_id):
+        local = []
+        for i in range(per_thread):
+            start = time.perf_counter()
+            fn(worker_id, i)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - started, sorted(latencies)
+
+
+def report(label, elapsed, latencies):
+    p50 = latencies[len(latencies) // 2] * 1e6
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+    print(
+        f"  {label:<12} {len(latencies) / elapsed:10.0f} events/s"
+        f"   p50 {p50:9.1f} us   p99 {p99:9.1f} us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    app = create_app()
+    app.config["AUDIT_BUFFER_ENABLED"] = True
+
+    def synchronous(worker_id, i):
+        with app.app_context():
+            db.session.add(
+                ActivityLog(
+                    action="benchmark event",
+                    resource_type=BENCHMARK_RESOURCE,
+                    resource_id=i,
+                    details={"worker": worker_id},
+                )
+            )
+            db.session.commit()
+
+    def buffered(worker_id, i):
+        audit_buffer.log(
+            "benchmark event", BENCHMARK_RESOURCE, resource_id=i, details={"worker": worker_id}
+        )
+
+    with app.app_context():
+        try:
+            report("synchronous", *run_threads(args.threads, args.events, synchronous))
+
+            elapsed, latencies = run_threads(args.threads, args.events, buffered)
+            drain_started = time.perf_counter()
+            audit_buffer.flush()
+            report("buffered", elapsed, latencies)
+            print(
+                f"  drain after last event: {(time.perf_counter() - drain_started) * 1000:.1f} ms"
+            )
+            print(f"  metrics: {audit_buffer.metrics()}")
+        finally:
+            ActivityLog.query.filter_by(resource_type=BENCHMARK_RESOURCE).delete()
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+audit_capture_benchmark.py
+Owner: Caleb
+Description: Overhead of automatic audit capture (before_flush diff + one bulk INSERT per
+flush) on single-row commits and on a large flush, with capture off vs on.
+Usage:
+    python benchmarks/audit_capture_benchmark.py [--commits 500] [--batch 1000]
+Runs against DATABASE_URL; needs at least one seeded project (python seed.py). Project status
+is restored and benchmark rows are deleted afterwards.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db  # noqa: E402
+from app.models import ActivityLog, Deliverable, Project  # noqa: E402
+
+
+def single_row_commits(project, commits):
+    statuses = ("in_progress", "submitted")
+    for i in range(commits):
+        project.status = statuses[i % 2]
+        db.session.commit()
+
+
+def large_flush(project, batch):
+    first_version = Deliverable.get_next_version_number(project.id)
+    deliverables = [
+        Deliverable(
+            project_id=project.id,
+            version_number=first_version + i,
+            title="Audit benchmark",
+            file_url="benchmark://audit",
+            uploaded_by=project.client_id,
+        )
+        for i in range(batch)
+    ]
+    db.session.add_all(deliverables)
+    db.session.commit()
+    for deliverable in deliverables:
+        deliverable.status = "approved"
+    db.session.commit()
+    for deliverable in deliverables:
+        db.session.delete(deliverable)
+    db.session.commit()
+
+
+def timed(label, fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commits", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        project = Project.query.first()
+        if not project:
+            sys.exit("No projects found; run python seed.py first")
+        original_status = project.status
+        started_at = datetime.utcnow()
+
+        try:
+            for label, fn, size in (
+                ("single-row commits", single_row_commits, args.commits),
+                ("create/update/delete batch", large_flush, args.batch),
+            ):
+                app.config["AUDIT_CAPTURE_ENABLED"] = False
+                off = timed(label, fn, project, size)
+                app.config["AUDIT_CAPTURE_ENABLED"] = True
+                on = timed(label, fn, project, size)
+                print(
+                    f"  {label:<28} off {off * 1000:9.1f} ms   on {on * 1000:9.1f} ms"
+                    f"   overhead {(on - off) / off * 100:6.1f}%"
+                )
+        finally:
+            project.status = original_status
+            app.config["AUDIT_CAPTURE_ENABLED"] = False
+            db.session.commit()
+            ActivityLog.query.filter(
+                ActivityLog.created_at >= started_at,
+                ActivityLog.resource_type.in_(["project", "deliverable"]),
+                ActivityLog.user_id.is_(None),
+            ).delete(synchronize_session=False)
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
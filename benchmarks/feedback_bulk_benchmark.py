@@ -0,0 +1,147 @@
+"""
+feedback_bulk_benchmark.py
+Owner: Cindy
+Description: Compares per-item feedback writes (one INSERT/UPDATE and commit each) with the
+batch paths behind POST /api/feedback/bulk and PUT /api/feedback/batch/resolve.
+Usage:
+    python benchmarks/feedback_bulk_benchmark.py [--items 500] [--rounds 3]
+Runs against DATABASE_URL; needs at least one seeded project (python seed.py). The benchmark
+deliverable and its feedback are removed afterwards and the project's unresolved-feedback
+counter, version counter and latest-version pointer are put back.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db  # noqa: E402
+from app.models import Deliverable, Feedback, Project  # noqa: E402
+from app.models.project_version_head import ProjectVersionHead  # noqa: E402
+from app.models.search_document import SearchDocument  # noqa: E402
+from app.services.feedback_service import (  # noqa: E402
+    create_feedback_batch,
+    set_feedback_resolution,
+)
+
+
+def make_items(count):
+    return [{"feedback_type": "comment", "content": f"Note at 00:{i:04d}"} for i in range(count)]
+
+
+def timed(label, count, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed * 1000:9.1f} ms  {count / elapsed:10.0f} rows/s")
+    return elapsed
+
+
+def bench_round(deliverable, user_id, count):
+    items = make_items(count)
+
+    def single_inserts():
+        for item in items:
+            db.session.add(
+                Feedback(deliverable_id=deliverable.id, user_id=user_id, is_resolved=False, **item)
+            )
+            db.session.commit()
+
+    def bulk_insert():
+        create_feedback_batch(deliverable.id, user_id, items)
+        db.session.commit()
+
+    timed("insert one-by-one", count, single_inserts)
+    timed("insert batch", count, bulk_insert)
+
+    ids = [
+        row.id
+        for row in db.session.query(Feedback.id).filter(Feedback.deliverable_id == deliverable.id)
+    ]
+    half = len(ids) // 2
+
+    def single_resolves():
+        for feedback in Feedback.query.filter(Feedback.id.in_(ids[:half])):
+            feedback.resolve()
+
+    def batch_resolve():
+        set_feedback_resolution(ids[half:], True)
+        db.session.commit()
+
+    timed("resolve one-by-one", half, single_resolves)
+    timed("resolve batch", len(ids) - half, batch_resolve)
+
+
+def clear_feedback(deliverable_id):
+    """
+    Bulk-delete a round's feedback. Query.delete() skips the mapper events, so the
+    unresolved counters and the search index are corrected here.
+    """
+    rows = (
+        db.session.query(Feedback.id, Feedback.is_resolved)
+        .filter(Feedback.deliverable_id == deliverable_id)
+        .all()
+    )
+    ids = [row.id for row in rows]
+    unresolved = sum(1 for row in rows if not row.is_resolved)
+    Feedback.query.filter(Feedback.id.in_(ids)).delete(synchronize_session=False)
+    Feedback.adjust_unresolved_counters({deliverable_id: -unresolved})
+    SearchDocument.remove(db.session.connection(), "feedback", ids)
+    db.session.commit()
+
+
+def restore_version_head(project_id, last_version):
+    """Undo the benchmark deliverable's version allocation"""
+    heads = ProjectVersionHead.query.filter_by(project_id=project_id)
+    if last_version is None:
+        heads.delete(synchronize_session=False)
+    else:
+        heads.update({"last_version": last_version}, synchronize_session=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        project = Project.query.first()
+        if not project:
+            sys.exit("No projects found; run python seed.py first")
+
+        last_version = (
+            db.session.query(ProjectVersionHead.last_version)
+            .filter_by(project_id=project.id)
+            .scalar()
+        )
+        deliverable = Deliverable(
+            project_id=project.id,
+            version_number=Deliverable.get_next_version_number(project.id),
+            title="Feedback benchmark",
+            file_url="benchmark://feedback",
+            uploaded_by=project.client_id,
+        )
+        db.session.add(deliverable)
+        db.session.commit()
+
+        try:
+            for round_number in range(1, args.rounds + 1):
+                print(f"Round {round_number} ({args.items} items)")
+                bench_round(deliverable, project.client_id, args.items)
+                clear_feedback(deliverable.id)
+        finally:
+            db.session.rollback()
+            clear_feedback(deliverable.id)
+            db.session.delete(deliverable)
+            db.session.flush()
+            Deliverable.refresh_latest_version(project.id)
+            restore_version_head(project.id, last_version)
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+search_benchmark.py
+Owner: Cindy
+Description: Compares the old substring scan (ILIKE '%term%') with the full-text index behind
+GET /api/search on a synthetic corpus.
+Usage:
+    python benchmarks/search_benchmark.py [--documents 50000] [--queries 20]
+Runs against DATABASE_URL; inserts temporary search_documents rows and deletes them afterwards.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db  # noqa: E402
+from app.models import SearchDocument  # noqa: E402
+from app.services.search_service import search  # noqa: E402
+
+BENCHMARK_TYPE = "benchmark"
+# Zipf-distributed synthetic vocabulary, so term frequencies look like real text
+VOCABULARY = [f"term{rank}" for rank in range(1, 5001)]
+WEIGHTS = [1 / rank for rank in range(1, 5001)]
+
+
+def words(rng, count):
+    return " ".join(rng.choices(VOCABULARY, weights=WEIGHTS, k=count))
+
+
+def make_documents(count, rng):
+    for i in range(count):
+        yield {
+            "entity_type": BENCHMARK_TYPE,
+            "entity_id": i,
+            "project_id": None,
+            "deliverable_id": None,
+            "title": words(rng, 4),
+            "body": words(rng, 60),
+        }
+
+
+def seed(count, rng, batch_size=2000):
+    connection = db.session.connection()
+    batch = []
+    for document in make_documents(count, rng):
+        batch.append(document)
+        if len(batch) == batch_size:
+            SearchDocument.upsert(connection, batch)
+            batch = []
+    SearchDocument.upsert(connection, batch)
+    db.session.commit()
+
+
+def timed(label, queries, fn):
+    start = time.perf_counter()
+    for term in queries:
+        fn(term)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<24} {elapsed * 1000 / len(queries):9.2f} ms/query")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    # Mid-frequency terms: common enough to match, rare enough to be selective
+    queries = [" ".join(rng.sample(VOCABULARY[50:500], 2)) for _ in range(args.queries)]
+    admin = SimpleNamespace(id=0, role="admin")
+
+    def substring_scan(term):
+        # Trailing space keeps "term1" from matching "term10"
+        filters = [
+            SearchDocument.title.ilike(f"%{word} %") | SearchDocument.body.ilike(f"%{word} %")
+            for word in term.split()
+        ]
+        SearchDocument.query.filter(*filters).order_by(SearchDocument.id.desc()).limit(20).all()
+
+    def full_text(term):
+        search(admin, term, limit=20)
+
+    app = create_app()
+    with app.app_context():
+        print(f"Seeding {args.documents} documents ({db.engine.dialect.name})")
+        seed(args.documents, rng)
+        try:
+            timed("ILIKE scan", queries, substring_scan)
+            timed("full-text index", queries, full_text)
+        finally:
+            SearchDocument.query.filter_by(entity_type=BENCHMARK_TYPE).delete()
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
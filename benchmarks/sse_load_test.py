@@ -0,0 +1,148 @@
+"""
+sse_load_test.py
+Owner: Ryan
+Description: Load test for the notification stream. Opens many concurrent Server-Sent Events
+connections for one user, then creates notifications through POST /api/test/notification and
+measures how long each one takes to reach every open stream.
+Usage:
+    gunicorn -c gunicorn.conf.py run:app    # in another shell
+    python benchmarks/sse_load_test.py --url http://localhost:5000 --token <access token>
+        [--connections 1000] [--events 20] [--ramp 200]
+Raise the open-file limit (ulimit -n) on both sides for more than ~1000 connections.
+"""
+
+import argparse
+import asyncio
+import json
+import ssl
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+
+class StreamClient:
+    """One raw-socket SSE connection that timestamps every notification it receives"""
+
+    def __init__(self, url, token):
+        self.url = url
+        self.token = token
+        self.ready = asyncio.Event()
+        self.received = {}
+        self.error = None
+
+    async def run(self):
+        parts = urlsplit(self.url)
+        secure = parts.scheme == "https"
+        port = parts.port or (443 if secure else 80)
+        try:
+            reader, writer = await asyncio.open_connection(
+                parts.hostname, port, ssl=ssl.create_default_context() if secure else None
+            )
+            path = f"{parts.path.rstrip('/')}/api/notifications/stream?token={self.token}"
+            writer.write(
+                (
+                    f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+                    "Accept: text/event-stream\r\nConnection: keep-alive\r\n\r\n"
+                ).encode()
+            )
+            await writer.drain()
+
+            status = await reader.readline()
+            if b" 200 " not in status:
+                raise RuntimeError(status.decode().strip())
+            event = None
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.decode().rstrip("\r\n")
+                if line.startswith("event: "):
+                    event = line[7:]
+                elif line.startswith("data: ") and event == "ready":
+                    self.ready.set()
+                elif line.startswith("data: ") and event == "notification":
+                    data = json.loads(line[6:])
+                    self.received[data["id"]] = time.perf_counter()
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.ready.set()
+
+
+def create_notification(url, token):
+    request = urllib.request.Request(
+        f"{url.rstrip('/')}/api/test/notification",
+        data=json.dumps({"type": "load_test"}).encode(),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())["notification"]["id"]
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--token", required=True, help="Access token of the test user")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--ramp", type=int, default=200, help="New connections per second")
+    parser.add_argument("--interval", type=float, default=0.5, help="Seconds between events")
+    args = parser.parse_args()
+
+    clients = [StreamClient(args.url, args.token) for _ in range(args.connections)]
+    started = time.perf_counter()
+    tasks = []
+    for i, client in enumerate(clients):
+        tasks.append(asyncio.create_task(client.run()))
+        if (i + 1) % args.ramp == 0:
+            await asyncio.sleep(1)
+    await asyncio.wait_for(asyncio.gather(*(c.ready.wait() for c in clients)), timeout=120)
+    connected = [c for c in clients if c.error is None]
+    print(
+        f"Connected {len(connected)}/{args.connections} streams "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    for error in sorted({c.error for c in clients if c.error})[:5]:
+        print(f"  error: {error}")
+
+    sent = {}
+    for _ in range(args.events):
+        before = time.perf_counter()
+        notification_id = await asyncio.to_thread(create_notification, args.url, args.token)
+        sent[notification_id] = before
+        await asyncio.sleep(args.interval)
+    await asyncio.sleep(2)
+
+    latencies = []
+    missed = 0
+    for client in connected:
+        for notification_id, sent_at in sent.items():
+            if notification_id in client.received:
+                latencies.append((client.received[notification_id] - sent_at) * 1000)
+            else:
+                missed += 1
+    latencies.sort()
+
+    print(f"\nFan-out of {len(sent)} notifications to {len(connected)} streams")
+    if latencies:
+        print(f"  delivered {len(latencies)}   missed {missed}")
+        print(
+            f"  latency ms: p50 {percentile(latencies, 0.5):.1f}   "
+            f"p95 {percentile(latencies, 0.95):.1f}   p99 {percentile(latencies, 0.99):.1f}   "
+            f"max {latencies[-1]:.1f}"
+        )
+    else:
+        print(f"  nothing delivered (missed {missed})")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+"""
+Gunicorn Configuration
+Owner: Ryan
+Description: Threaded workers by default: each open Server-Sent Events stream holds one
+thread (REALTIME_STREAM_MAX_SECONDS bounds it), and invoice PDFs still render in their
+process pool. GUNICORN_WORKER_CLASS=gevent is opt-in for many idle streams per worker;
+the process pool is not supported under gevent's monkey-patching, so PDFs then render
+in the request (see invoice_pdf_service.render_many).
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+# Requests (open streams included) served at once by each gthread worker
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+# Concurrent connections per gevent worker (open streams included)
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+# Streams send a keepalive every REALTIME_HEARTBEAT_SECONDS, well inside this
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+keepalive = 5
+
+
+def post_fork(server, worker):
+    # psycopg2 blocks the whole worker on I/O unless it yields to the gevent hub
+    if worker_class != "gevent":
+        return
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        server.log.warning("psycogreen not installed; database calls will block the worker")
+        return
+    patch_psycopg()
@@ -0,0 +1,137 @@
+"""Partition activity_logs by month
+
+Revision ID: d81f3b6a2c47
+Revises: c7e1a9d4b352
+Create Date: 2026-10-19 19:41:27.093518
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81f3b6a2c47'
+down_revision = 'c7e1a9d4b352'
+branch_labels = None
+depends_on = None
+
+PARTITIONS_AHEAD = 3
+INDEXES = [
+    "CREATE INDEX idx_activity_logs_created ON activity_logs (created_at DESC)",
+    "CREATE INDEX idx_activity_logs_user_created ON activity_logs (user_id, created_at DESC)",
+    "CREATE INDEX idx_activity_logs_action_created ON activity_logs (action_id, created_at DESC)",
+    "CREATE INDEX idx_activity_logs_action_trgm ON activity_logs USING gin (action gin_trgm_ops)",
+    "CREATE INDEX idx_activity_logs_resource_type_trgm ON activity_logs "
+    "USING gin (resource_type gin_trgm_ops)",
+]
+
+
+def _add_months(month, months):
+    years, index = divmod(month.month - 1 + months, 12)
+    return datetime(month.year + years, index + 1, 1)
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        with op.batch_alter_table('activity_logs', schema=None) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+            batch_op.create_index('idx_activity_logs_user_created', ['user_id', sa.text('created_at DESC')], unique=False)
+        return
+
+    # Rebuild as a RANGE-partitioned table; the partition key must be part of the primary key.
+    # The id sequence is detached first so dropping the old table keeps it.
+    op.execute("ALTER SEQUENCE activity_logs_id_seq OWNED BY NONE")
+    op.execute(
+        """
+        CREATE TABLE activity_logs_partitioned (
+            id INTEGER NOT NULL DEFAULT nextval('activity_logs_id_seq'),
+            user_id INTEGER CONSTRAINT activity_logs_user_id_fkey REFERENCES users (id),
+            action VARCHAR(100) NOT NULL,
+            action_id INTEGER
+                CONSTRAINT activity_logs_action_id_fkey REFERENCES activity_actions (id),
+            resource_type VARCHAR(50) NOT NULL,
+            resource_id INTEGER,
+            details JSON,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+            CONSTRAINT activity_logs_pkey_new PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute(
+        "CREATE TABLE activity_logs_default PARTITION OF activity_logs_partitioned DEFAULT"
+    )
+
+    # One partition per month from the oldest row up to PARTITIONS_AHEAD months from now
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM activity_logs")).scalar()
+    now = datetime.utcnow()
+    month = datetime((oldest or now).year, (oldest or now).month, 1)
+    last = _add_months(datetime(now.year, now.month, 1), PARTITIONS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE activity_logs_p{month:%Y_%m} PARTITION OF activity_logs_partitioned "
+            f"FOR VALUES FROM ('{month.isoformat(sep=' ')}') TO ('{upper.isoformat(sep=' ')}')"
+        )
+        month = upper
+
+    op.execute(
+        """
+        INSERT INTO activity_logs_partitioned
+            (id, user_id, action, action_id, resource_type, resource_id, details, created_at)
+        SELECT id, user_id, action, action_id, resource_type, resource_id, details,
+               COALESCE(created_at, now() AT TIME ZONE 'utc')
+        FROM activity_logs
+        """
+    )
+    op.execute("DROP TABLE activity_logs")
+    op.execute("ALTER TABLE activity_logs_partitioned RENAME TO activity_logs")
+    op.execute("ALTER TABLE activity_logs RENAME CONSTRAINT activity_logs_pkey_new TO activity_logs_pkey")
+    op.execute("ALTER SEQUENCE activity_logs_id_seq OWNED BY activity_logs.id")
+
+    # Indexes on the parent are created on every partition, current and future
+    for statement in INDEXES:
+        op.execute(statement)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        with op.batch_alter_table('activity_logs', schema=None) as batch_op:
+            batch_op.drop_index('idx_activity_logs_user_created')
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
+        return
+
+    op.execute("ALTER SEQUENCE activity_logs_id_seq OWNED BY NONE")
+    op.execute(
+        """
+        CREATE TABLE activity_logs_plain (
+            id INTEGER NOT NULL DEFAULT nextval('activity_logs_id_seq'),
+            user_id INTEGER CONSTRAINT activity_logs_user_id_fkey REFERENCES users (id),
+            action VARCHAR(100) NOT NULL,
+            action_id INTEGER
+                CONSTRAINT activity_logs_action_id_fkey REFERENCES activity_actions (id),
+            resource_type VARCHAR(50) NOT NULL,
+            resource_id INTEGER,
+            details JSON,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT activity_logs_pkey_new PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO activity_logs_plain
+        SELECT id, user_id, action, action_id, resource_type, resource_id, details, created_at
+        FROM activity_logs
+        """
+    )
+    op.execute("DROP TABLE activity_logs CASCADE")
+    op.execute("ALTER TABLE activity_logs_plain RENAME TO activity_logs")
+    op.execute("ALTER TABLE activity_logs RENAME CONSTRAINT activity_logs_pkey_new TO activity_logs_pkey")
+    op.execute("ALTER SEQUENCE activity_logs_id_seq OWNED BY activity_logs.id")
+    for statement in INDEXES:
+        if 'idx_activity_logs_user_created' not in statement:
+            op.execute(statement)